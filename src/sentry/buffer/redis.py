@@ -4,22 +4,30 @@ import logging
 import pickle
 from collections import defaultdict
 from collections.abc import Callable, Mapping
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime, timezone
 from enum import Enum
 from time import time
 from typing import Any, TypeVar
 
 import rb
+from django.core.exceptions import FieldDoesNotExist
+from django.db import DatabaseError, connections, router, transaction
+from django.db.models import Field
+from django.db.models.signals import post_save
 from django.utils.encoding import force_bytes, force_str
 from rediscluster import RedisCluster
 
+from sentry import options
 from sentry.buffer.base import Buffer, BufferField
 from sentry.db import models
+from sentry.db.models.fields.bounded import BoundedPositiveIntegerField
+from sentry.signals import buffer_incr_complete
 from sentry.tasks.process_buffer import process_incr
 from sentry.utils import json, metrics
 from sentry.utils.hashlib import md5_text
 from sentry.utils.imports import import_string
+from sentry.utils.local_buffer import LocalWriteBuffer
 from sentry.utils.redis import (
     get_cluster_routing_client,
     get_dynamic_cluster_from_options,
@@ -75,6 +83,13 @@ def _validate_json_roundtrip(value: dict[str, Any], model: type[models.Model]) -
             logger.exception("buffer.invalid_value", extra={"value": value, "model": model})
 
 
+def _get_concrete_field(model: type[models.Model], name: str) -> Field[Any, Any]:
+    field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+    if not isinstance(field, Field) or not field.concrete or field.many_to_many:
+        raise FieldDoesNotExist(f"{model.__name__}.{name} is not a concrete column")
+    return field
+
+
 # Callable to get the queue name for the given model_key.
 # May return None to not assign a queue for the given model_key.
 ChooseQueueFunction = Callable[[str], str | None]
@@ -214,6 +229,72 @@ class PendingBuffer:
         return rv
 
 
+@dataclass
+class PendingIncr:
+    model: type[models.Model]
+    filters: dict[str, BufferField]
+    columns: dict[str, int] = field(default_factory=dict)
+    extra: dict[str, Any] = field(default_factory=dict)
+    signal_only: bool | None = None
+
+    def merge(
+        self, columns: dict[str, int], extra: dict[str, Any] | None, signal_only: bool | None
+    ) -> None:
+        for column, amount in columns.items():
+            self.columns[column] = self.columns.get(column, 0) + amount
+        if extra:
+            # Last write wins, same as the `hset` done for extra values in Redis
+            self.extra.update(extra)
+        if signal_only:
+            self.signal_only = True
+
+
+class LocalIncrAggregator(LocalWriteBuffer[str, PendingIncr]):
+    """
+    Coalesces `RedisBuffer.incr` calls in process, so that many increments of the same
+    (model, filters) key reach Redis as a single one.
+
+    Increments are summed and extra values are last-writer-wins, like they are in the Redis hash.
+    Every increment is written at least once, unless the process is killed before it is flushed.
+    Pending increments aren't visible to `RedisBuffer.get` until they are flushed.
+    """
+
+    def __init__(self, write: Callable[[list[PendingIncr]], list[PendingIncr]]):
+        super().__init__("buffer-local-aggregation")
+        # `write` returns the increments it didn't manage to write.
+        self._write_incrs = write
+
+    def add(
+        self,
+        key: str,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, BufferField],
+        extra: dict[str, Any] | None,
+        signal_only: bool | None,
+        max_keys: int,
+        max_age: float,
+    ) -> bool:
+        """
+        Returns `False` if too many increments are pending, in which case the increment has to be
+        written directly.
+        """
+        pending = PendingIncr(model=model, filters=filters)
+        pending.merge(columns, extra, signal_only)
+        return self._add(key, pending, max_keys, max_age)
+
+    def _write(self, pending: dict[str, PendingIncr]) -> dict[str, PendingIncr]:
+        failed = self._write_incrs(list(pending.values()))
+        return {make_key(incr.model, incr.filters): incr for incr in failed}
+
+    def _merge(self, pending: PendingIncr, newer: PendingIncr) -> int:
+        pending.merge(newer.columns, newer.extra, newer.signal_only)
+        return 0
+
+    def _size_of(self, pending: PendingIncr) -> int:
+        return 1
+
+
 class RedisBuffer(Buffer):
     key_expire = 60 * 60  # 1 hour
     pending_key = "b:p"
@@ -224,6 +305,7 @@ class RedisBuffer(Buffer):
         )
         self.incr_batch_size = incr_batch_size
         assert self.incr_batch_size > 0
+        self._local_aggregator = LocalIncrAggregator(self._write_pending_incrs)
 
     def validate(self) -> None:
         validate_dynamic_cluster(self.is_redis_cluster, self.cluster)
@@ -505,8 +587,51 @@ class RedisBuffer(Buffer):
             - Perform a set (last write wins) on extra
             - Perform a set on signal_only (only if True)
         - Add hashmap key to pending flushes
+
+        With the `buffer.local-aggregation.max-keys` option set, increments are first coalesced in
+        process by a `LocalIncrAggregator`.
         """
         key = make_key(model, filters)
+        max_keys = options.get("buffer.local-aggregation.max-keys")
+        if max_keys > 0 and self._local_aggregator.add(
+            key,
+            model,
+            columns,
+            filters,
+            extra,
+            signal_only,
+            max_keys=max_keys,
+            max_age=options.get("buffer.local-aggregation.max-age-ms") / 1000,
+        ):
+            return
+
+        self._incr(key, model, columns, filters, extra, signal_only)
+
+    def _write_pending_incrs(self, pending_incrs: list[PendingIncr]) -> list[PendingIncr]:
+        for i, pending in enumerate(pending_incrs):
+            try:
+                self._incr(
+                    make_key(pending.model, pending.filters),
+                    pending.model,
+                    pending.columns,
+                    pending.filters,
+                    pending.extra,
+                    pending.signal_only,
+                )
+            except Exception:
+                logger.exception("buffer.local-aggregation.write-failed")
+                return pending_incrs[i:]
+        return []
+
+    def _incr(
+        self,
+        key: str,
+        model: type[models.Model],
+        columns: dict[str, int],
+        filters: dict[str, BufferField],
+        extra: dict[str, Any] | None = None,
+        signal_only: bool | None = None,
+    ) -> None:
         # We can't use conn.map() due to wanting to support multiple pending
         # keys (one per Redis partition)
         pipe = self.get_redis_connection(key)
@@ -557,7 +682,12 @@ class RedisBuffer(Buffer):
 
         try:
             keycount = 0
+            oldest_scores: list[float] = []
             if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+                oldest_scores.extend(
+                    score
+                    for _, score in self.cluster.zrange(self.pending_key, 0, 0, withscores=True)
+                )
                 keys: list[str] = self.cluster.zrange(self.pending_key, 0, -1)
                 keycount += len(keys)
 
@@ -576,7 +706,11 @@ class RedisBuffer(Buffer):
 
             elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
                 with self.cluster.all() as conn:
+                    oldest = conn.zrange(self.pending_key, 0, 0, withscores=True)
                     results = conn.zrange(self.pending_key, 0, -1)
+                oldest_scores.extend(
+                    score for host_oldest in oldest.value.values() for _, score in host_oldest
+                )
 
                 with self.cluster.all() as conn:
                     for host_id, keysb in results.value.items():
@@ -611,6 +745,10 @@ class RedisBuffer(Buffer):
                     )
 
             metrics.distribution("buffer.pending-size", keycount)
+            if oldest_scores:
+                # Scores are bumped on every `incr`, so this is how long the
+                # least recently written key has been waiting for a flush.
+                metrics.distribution("buffer.flush-lag", time() - min(oldest_scores), unit="second")
         finally:
             client.delete(lock_key)
 
@@ -622,7 +760,10 @@ class RedisBuffer(Buffer):
         if key is not None:
             batch_keys = [key]
 
-        if batch_keys is not None:
+        max_rows = options.get("buffer.bulk-flush.max-rows")
+        if batch_keys is not None and len(batch_keys) > 1 and max_rows > 0:
+            self._process_batch(batch_keys, max_rows)
+        elif batch_keys is not None:
             for key in batch_keys:
                 self._process_single_incr(key)
 
@@ -636,6 +777,249 @@ class RedisBuffer(Buffer):
     ) -> Any:
         return super().process(model, columns, filters, extra, signal_only)
 
+    def _process_batch(self, keys: list[str], max_rows: int) -> None:
+        """
+        Flush ``keys`` in bulk: locks are taken and hashes drained with one
+        pipeline per shard, and the increments are applied with multi-row
+        ``UPDATE`` statements of at most ``max_rows`` rows.
+        """
+        locked = self._lock_keys(keys, ex=10)
+        if len(locked) < len(keys):
+            metrics.incr(
+                "buffer.revoked",
+                amount=len(keys) - len(locked),
+                tags={"reason": "locked"},
+                skip_internal=False,
+            )
+        if not locked:
+            return
+
+        try:
+            pending = []
+            for key, values in self._drain_keys(locked).items():
+                pending_incr = self._load_pending_incr(key, values)
+                if pending_incr is not None:
+                    pending.append(pending_incr)
+
+            self._apply_pending_incrs(pending, max_rows)
+        finally:
+            self._unlock_keys(locked)
+
+    def _lock_keys(self, keys: list[str], ex: int) -> list[str]:
+        lock_keys = [self._make_lock_key(key) for key in keys]
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for lock_key in lock_keys:
+                pipe.set(lock_key, "1", nx=True, ex=ex)
+            results = pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.map() as client:
+                promises = [client.set(lock_key, "1", nx=True, ex=ex) for lock_key in lock_keys]
+            results = [promise.value for promise in promises]
+        else:
+            raise AssertionError("unreachable")
+
+        return [key for key, acquired in zip(keys, results) if acquired]
+
+    def _unlock_keys(self, keys: list[str]) -> None:
+        lock_keys = [self._make_lock_key(key) for key in keys]
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            pipe = self.cluster.pipeline(transaction=False)
+            for lock_key in lock_keys:
+                pipe.delete(lock_key)
+            pipe.execute()
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            with self.cluster.map() as client:
+                for lock_key in lock_keys:
+                    client.delete(lock_key)
+        else:
+            raise AssertionError("unreachable")
+
+    def _drain_keys(self, keys: list[str]) -> dict[str, dict[Any, Any]]:
+        """
+        Read and delete the hashes of ``keys`` and remove them from the
+        pending set, with one pipeline per shard.
+        """
+        shards: list[tuple[Any, list[str]]]
+        if is_instance_redis_cluster(self.cluster, self.is_redis_cluster):
+            shards = [(self.cluster, keys)]
+        elif is_instance_rb_cluster(self.cluster, self.is_redis_cluster):
+            # `incr` adds keys to the pending set of the host that owns them
+            router = self.cluster.get_router()
+            keys_by_host: dict[int, list[str]] = defaultdict(list)
+            for key in keys:
+                keys_by_host[router.get_host_for_key(key)].append(key)
+            shards = [
+                (self.cluster.get_local_client(host), host_keys)
+                for host, host_keys in keys_by_host.items()
+            ]
+        else:
+            raise AssertionError("unreachable")
+
+        rv: dict[str, dict[Any, Any]] = {}
+        for conn, shard_keys in shards:
+            pipe = conn.pipeline(transaction=False)
+            for key in shard_keys:
+                pipe.hgetall(key)
+                pipe.zrem(self.pending_key, key)
+                pipe.delete(key)
+            results = pipe.execute()
+            rv.update(zip(shard_keys, results[::3]))
+        return rv
+
+    def _apply_pending_incrs(self, pending: list[PendingIncr], max_rows: int) -> None:
+        """
+        Apply drained increments with one ``UPDATE`` per model and set of
+        filtered, incremented and replaced columns. Increments that cannot be
+        written that way, or match no row, go through ``Buffer.process``.
+        """
+        shapes: dict[tuple[Any, ...], list[PendingIncr]] = defaultdict(list)
+        fallback = []
+        for pending_incr in pending:
+            if pending_incr.signal_only or not (pending_incr.columns or pending_incr.extra):
+                fallback.append(pending_incr)
+                continue
+            shape = (
+                pending_incr.model,
+                tuple(sorted(pending_incr.filters)),
+                tuple(sorted(pending_incr.columns)),
+                tuple(sorted(pending_incr.extra)),
+            )
+            shapes[shape].append(pending_incr)
+
+        for (model, filter_names, column_names, extra_names), pending_incrs in shapes.items():
+            for i in range(0, len(pending_incrs), max_rows):
+                fallback.extend(
+                    self._bulk_update(
+                        model,
+                        filter_names,
+                        column_names,
+                        extra_names,
+                        pending_incrs[i : i + max_rows],
+                    )
+                )
+
+        for pending_incr in fallback:
+            self._base_process(
+                pending_incr.model,
+                pending_incr.columns,
+                pending_incr.filters,
+                pending_incr.extra,
+                pending_incr.signal_only,
+            )
+
+    def _bulk_update(
+        self,
+        model: type[models.Model],
+        filter_names: tuple[str, ...],
+        column_names: tuple[str, ...],
+        extra_names: tuple[str, ...],
+        pending_incrs: list[PendingIncr],
+    ) -> list[PendingIncr]:
+        """
+        Write ``pending_incrs`` with a single ``UPDATE ... FROM (VALUES ...)``
+        and return the increments that did not match any row.
+        """
+        from sentry.models.group import Group
+
+        if not filter_names:
+            return pending_incrs
+        try:
+            pk_field = _get_concrete_field(model, "pk")
+            filter_fields = [_get_concrete_field(model, name) for name in filter_names]
+            column_fields = [_get_concrete_field(model, name) for name in column_names]
+            extra_fields = [_get_concrete_field(model, name) for name in extra_names]
+        except FieldDoesNotExist:
+            return pending_incrs
+        fields = [*filter_fields, *column_fields, *extra_fields]
+
+        using = router.db_for_write(model)
+        connection = connections[using]
+        qn = connection.ops.quote_name
+
+        params: list[Any] = []
+        for n, pending_incr in enumerate(pending_incrs):
+            # Same as `Buffer.process`, which parses these before `group.update()`
+            for name in ("last_seen", "first_seen"):
+                if isinstance(pending_incr.extra.get(name), str):
+                    pending_incr.extra[name] = datetime.fromisoformat(pending_incr.extra[name])
+
+            params.append(n)
+            for names, values, row_fields in (
+                (filter_names, pending_incr.filters, filter_fields),
+                (column_names, pending_incr.columns, column_fields),
+                (extra_names, pending_incr.extra, extra_fields),
+            ):
+                params.extend(
+                    f.get_db_prep_save(values[name], connection)
+                    for name, f in zip(names, row_fields)
+                )
+
+        assignments = []
+        for i, f in enumerate(column_fields):
+            column = qn(f.column)
+            if model is Group and f.name == "times_seen":
+                # Saturate rather than overflow, as `Buffer.process` does
+                assignments.append(
+                    f"{column} = LEAST(t.{column}::bigint + v.c{i}, "
+                    f"{BoundedPositiveIntegerField.MAX_VALUE})"
+                )
+            else:
+                assignments.append(f"{column} = t.{column} + v.c{i}")
+        assignments.extend(f"{qn(f.column)} = v.e{i}" for i, f in enumerate(extra_fields))
+
+        aliases = [
+            "n",
+            *(f"f{i}" for i in range(len(filter_fields))),
+            *(f"c{i}" for i in range(len(column_fields))),
+            *(f"e{i}" for i in range(len(extra_fields))),
+        ]
+        row = "(%s::integer, {})".format(
+            ", ".join(f"%s::{f.cast_db_type(connection)}" for f in fields)
+        )
+        conditions = " AND ".join(f"t.{qn(f.column)} = v.f{i}" for i, f in enumerate(filter_fields))
+        sql = (
+            f"UPDATE {qn(model._meta.db_table)} AS t SET {', '.join(assignments)} "
+            f"FROM (VALUES {', '.join([row] * len(pending_incrs))}) AS v ({', '.join(aliases)}) "
+            f"WHERE {conditions} RETURNING v.n, t.{qn(pk_field.column)}"
+        )
+
+        tags = {"module": model.__module__, "model": model.__name__}
+        try:
+            with transaction.atomic(using=using), connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                updated = dict(cursor.fetchall())
+        except DatabaseError:
+            logger.exception("buffer.bulk-flush.failed", extra={"model": model.__name__})
+            metrics.incr("buffer.bulk-flush.fallback", amount=len(pending_incrs), tags=tags)
+            return pending_incrs
+
+        metrics.distribution("buffer.bulk-flush.rows-per-statement", len(pending_incrs), tags=tags)
+
+        if model is Group and updated:
+            # `Buffer.process` goes through `group.update()` so that `post_save`
+            # refreshes the group cache, do the same for the whole batch.
+            update_fields = [*column_names, *extra_names]
+            for group in Group.objects.using(using).filter(id__in=updated.values()):
+                post_save.send_robust(
+                    sender=Group, instance=group, created=False, update_fields=update_fields
+                )
+
+        unmatched = []
+        for n, pending_incr in enumerate(pending_incrs):
+            if n not in updated:
+                unmatched.append(pending_incr)
+                continue
+            buffer_incr_complete.send_robust(
+                model=model,
+                columns=pending_incr.columns,
+                filters=pending_incr.filters,
+                extra=pending_incr.extra,
+                created=False,
+                sender=model,
+            )
+        return unmatched
+
     def _process_single_incr(self, key: str) -> None:
         client = get_cluster_routing_client(self.cluster, self.is_redis_cluster)
         lock_key = self._lock_key(client, key, ex=10)
@@ -651,39 +1035,52 @@ class RedisBuffer(Buffer):
             pipe.delete(key)
             values = pipe.execute()[0]
 
-            # XXX(python3): In python2 this isn't as important since redis will
-            # return string tyes (be it, byte strings), but in py3 we get bytes
-            # back, and really we just want to deal with keys as strings.
-            values = {force_str(k): v for k, v in values.items()}
-
-            if not values:
-                metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
-                logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            pending = self._load_pending_incr(key, values)
+            if pending is None:
                 return
 
-            model = import_string(force_str(values.pop("m")))
-
-            if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
-                filters = self._load_values(json.loads(force_str(values.pop("f"))))
-            else:
-                # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                filters = pickle.loads(force_bytes(values.pop("f")))
-
-            incr_values = {}
-            extra_values = {}
-            signal_only = None
-            for k, v in values.items():
-                if k.startswith("i+"):
-                    incr_values[k[2:]] = int(v)
-                elif k.startswith("e+"):
-                    if v.startswith(b"[" if not self.is_redis_cluster else "["):
-                        extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
-                    else:
-                        # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
-                        extra_values[k[2:]] = pickle.loads(force_bytes(v))
-                elif k == "s":
-                    signal_only = bool(int(v))  # Should be 1 if set
-
-            self._base_process(model, incr_values, filters, extra_values, signal_only)
+            self._base_process(
+                pending.model,
+                pending.columns,
+                pending.filters,
+                pending.extra,
+                pending.signal_only,
+            )
         finally:
             client.delete(lock_key)
+
+    def _load_pending_incr(self, key: str, values: dict[Any, Any]) -> PendingIncr | None:
+        # XXX(python3): In python2 this isn't as important since redis will
+        # return string tyes (be it, byte strings), but in py3 we get bytes
+        # back, and really we just want to deal with keys as strings.
+        values = {force_str(k): v for k, v in values.items()}
+
+        if not values:
+            metrics.incr("buffer.revoked", tags={"reason": "empty"}, skip_internal=False)
+            logger.debug("buffer.revoked.empty", extra={"redis_key": key})
+            return None
+
+        model = import_string(force_str(values.pop("m")))
+
+        if values["f"].startswith(b"{" if not self.is_redis_cluster else "{"):
+            filters = self._load_values(json.loads(force_str(values.pop("f"))))
+        else:
+            # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+            filters = pickle.loads(force_bytes(values.pop("f")))
+
+        incr_values = {}
+        extra_values = {}
+        signal_only = None
+        for k, v in values.items():
+            if k.startswith("i+"):
+                incr_values[k[2:]] = int(v)
+            elif k.startswith("e+"):
+                if v.startswith(b"[" if not self.is_redis_cluster else "["):
+                    extra_values[k[2:]] = self._load_value(json.loads(force_str(v)))
+                else:
+                    # TODO(dcramer): legacy pickle support - remove in Sentry 9.1
+                    extra_values[k[2:]] = pickle.loads(force_bytes(v))
+            elif k == "s":
+                signal_only = bool(int(v))  # Should be 1 if set
+
+        return PendingIncr(model, filters, incr_values, extra_values, signal_only)
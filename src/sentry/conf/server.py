@@ -1636,6 +1636,9 @@ SENTRY_SNUBA_CACHE_TTL_SECONDS = 60
 # Node storage backend
 SENTRY_NODESTORE = "sentry.services.nodestore.django.DjangoNodeStorage"
 SENTRY_NODESTORE_OPTIONS: dict[str, Any] = {}
+# Directory holding per-platform zstd dictionaries (``<platform>.<version>.zdict``) used
+# by the nodestore zstd codec. See ``sentry nodestore train-dictionary``.
+SENTRY_NODESTORE_DICTIONARY_DIR: str | None = None
 
 # Tag storage backend
 SENTRY_TAGSTORE = os.environ.get("SENTRY_TAGSTORE", "sentry.tagstore.snuba.SnubaTagStorage")
@@ -3,10 +3,12 @@ from __future__ import annotations
 import ipaddress
 import logging
 import uuid
-from collections.abc import Callable, Mapping, MutableMapping, Sequence
+from collections.abc import Callable, Generator, Mapping, MutableMapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import TYPE_CHECKING, Any, Literal, TypedDict, overload
+from typing import TYPE_CHECKING, Any, Literal, TypedDict, TypeVar, overload
 
 import orjson
 import psycopg2.errors
@@ -334,13 +336,50 @@ ProjectsMapping = Mapping[int, Project]
 
 Job = MutableMapping[str, Any]
 
+T = TypeVar("T")
+
+_shared_lookups: ContextVar[dict[tuple[Any, ...], Any] | None] = ContextVar(
+    "event_manager_shared_lookups", default=None
+)
+
+
+@contextmanager
+def shared_save_lookups() -> Generator[None]:
+    """
+    Share project, release, distribution, environment and project key lookups
+    between all events saved within this block. This is used when a batch of
+    events of the same project is saved at once, where most events resolve to
+    the same rows. Lookups are only kept for the duration of the block.
+    """
+    token = _shared_lookups.set({})
+    try:
+        yield
+    finally:
+        _shared_lookups.reset(token)
+
+
+def _shared_lookup(key: tuple[Any, ...], func: Callable[[], T]) -> T:
+    lookups = _shared_lookups.get()
+    if lookups is None:
+        return func()
+
+    if key in lookups:
+        metrics.incr("event_manager.shared_lookup.hit", tags={"kind": key[0]})
+        return lookups[key]
+
+    rv = lookups[key] = func()
+    return rv
+
 
 def resolve_project(project_id: int) -> Project:
-    project = Project.objects.get_from_cache(id=project_id)
-    project.set_cached_field_value(
-        "organization", Organization.objects.get_from_cache(id=project.organization_id)
-    )
-    return project
+    def _resolve() -> Project:
+        project = Project.objects.get_from_cache(id=project_id)
+        project.set_cached_field_value(
+            "organization", Organization.objects.get_from_cache(id=project.organization_id)
+        )
+        return project
+
+    return _shared_lookup(("project", project_id), _resolve)
 
 
 class EventManager:
@@ -529,9 +568,11 @@ class EventManager:
         _get_event_user_many(jobs, projects)
 
         job["project_key"] = None
-        if job["key_id"] is not None:
+        if (key_id := job["key_id"]) is not None:
             try:
-                job["project_key"] = ProjectKey.objects.get_from_cache(id=job["key_id"])
+                job["project_key"] = _shared_lookup(
+                    ("project_key", key_id), lambda: ProjectKey.objects.get_from_cache(id=key_id)
+                )
             except ProjectKey.DoesNotExist:
                 pass
 
@@ -739,10 +780,13 @@ def _get_or_create_release_many(jobs: Sequence[Job], projects: ProjectsMapping)
         date = job["event"].datetime
 
         try:
-            release = Release.get_or_create(
-                project=project,
-                version=data["release"],
-                date_added=date,
+            release = _shared_lookup(
+                ("release", project.id, data["release"]),
+                lambda: Release.get_or_create(
+                    project=project,
+                    version=data["release"],
+                    date_added=date,
+                ),
             )
         except ValidationError:
             logger.exception(
@@ -760,7 +804,9 @@ def _get_or_create_release_many(jobs: Sequence[Job], projects: ProjectsMapping)
         set_tag(data, "sentry:release", release.version)
 
         if data.get("dist"):
-            job["dist"] = release.add_dist(data["dist"], date)
+            job["dist"] = _shared_lookup(
+                ("dist", release.id, data["dist"]), lambda: release.add_dist(data["dist"], date)
+            )
 
             # don't allow a conflicting 'dist' tag
             pop_tag(job["data"], "dist")
@@ -901,8 +947,11 @@ def _get_group_processing_kwargs(job: Job) -> dict[str, Any]:
 @sentry_sdk.tracing.trace
 def _get_or_create_environment_many(jobs: Sequence[Job], projects: ProjectsMapping) -> None:
     for job in jobs:
-        job["environment"] = Environment.get_or_create(
-            project=projects[job["project_id"]], name=job["environment"]
+        project = projects[job["project_id"]]
+        name = job["environment"]
+        job["environment"] = _shared_lookup(
+            ("environment", project.id, name),
+            lambda: Environment.get_or_create(project=project, name=name),
         )
 
 
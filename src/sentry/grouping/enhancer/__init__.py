@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 import base64
+import hashlib
 import logging
 import os
 import re
+import threading
 import zlib
-from collections.abc import Sequence
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Sequence
 from dataclasses import dataclass
 from functools import cached_property
 from typing import Any, Literal
@@ -18,6 +21,7 @@ from sentry_ophio.enhancers import Cache as RustCache
 from sentry_ophio.enhancers import Component as RustFrame
 from sentry_ophio.enhancers import Enhancements as RustEnhancements
 
+from sentry import options
 from sentry.grouping.component import FrameGroupingComponent, StacktraceGroupingComponent
 from sentry.models.project import Project
 from sentry.stacktraces.functions import set_in_app
@@ -35,6 +39,11 @@ logger = logging.getLogger(__name__)
 # So this leaves quite a bit of headroom for custom enhancement rules as well.
 RUST_CACHE = RustCache(1_000)
 
+# Maximum number of compiled `EnhancementsConfig` objects kept by `ENHANCEMENTS_CONFIG_CACHE`. Each
+# project with custom rules needs one entry per config it's loaded from (rules text and base64
+# string), while all projects without custom rules share the entries of their base.
+ENHANCEMENTS_CONFIG_CACHE_SIZE = 2_000
+
 # TODO: Version 2 can be removed once all events with that config have expired, 90 days after this
 # comment is merged
 VERSIONS = [2, 3]
@@ -372,6 +381,57 @@ def get_enhancements_version(project: Project, grouping_config_id: str = "") ->
     return DEFAULT_ENHANCEMENTS_VERSION
 
 
+class EnhancementsConfigCache:
+    """
+    A bounded, process-wide LRU of `EnhancementsConfig` objects, keyed by a hash of the inputs they
+    were created from. Cached objects are shared between all callers (grouping, profiling, the
+    grouping info endpoint) and must therefore not be modified.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._entries: OrderedDict[Hashable, EnhancementsConfig] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_create(
+        self, key: Hashable, source: str, create: Callable[[], EnhancementsConfig]
+    ) -> EnhancementsConfig:
+        with self._lock:
+            enhancements = self._entries.get(key)
+            if enhancements is not None:
+                self._entries.move_to_end(key)
+
+        metrics.incr(
+            "grouping.enhancements.cache",
+            tags={"source": source, "result": "miss" if enhancements is None else "hit"},
+        )
+        if enhancements is not None:
+            return enhancements
+
+        # Concurrent misses for the same key may both compile the config. That's cheaper than
+        # holding the lock while compiling, and the results are identical.
+        enhancements = create()
+        with self._lock:
+            self._entries[key] = enhancements
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return enhancements
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+ENHANCEMENTS_CONFIG_CACHE = EnhancementsConfigCache(ENHANCEMENTS_CONFIG_CACHE_SIZE)
+
+
+def _hash_enhancements_input(input: str | bytes) -> bytes:
+    return hashlib.sha1(input.encode("utf-8") if isinstance(input, str) else input).digest()
+
+
 class EnhancementsConfig:
     # NOTE: You must add a version to ``VERSIONS`` any time attributes are added
     # to this class, s.t. no enhancements lacking these attributes are loaded
@@ -591,6 +651,18 @@ class EnhancementsConfig:
     ) -> EnhancementsConfig:
         """Convert a base64 string into an `EnhancementsConfig` object"""
 
+        if options.get("grouping.enhancements.use_process_cache"):
+            return ENHANCEMENTS_CONFIG_CACHE.get_or_create(
+                ("base64_string", _hash_enhancements_input(base64_string)),
+                "base64_string",
+                lambda: cls._from_base64_string(base64_string, referrer),
+            )
+        return cls._from_base64_string(base64_string, referrer)
+
+    @classmethod
+    def _from_base64_string(
+        cls, base64_string: str | bytes, referrer: str | None = None
+    ) -> EnhancementsConfig:
         with metrics.timer("grouping.enhancements.creation") as metrics_timer_tags:
             metrics_timer_tags.update({"source": "base64_string", "referrer": referrer})
 
@@ -635,9 +707,38 @@ class EnhancementsConfig:
         id: str | None = None,
         version: int | None = None,
         referrer: str | None = None,
+        use_cache: bool = True,
     ) -> EnhancementsConfig:
-        """Create an `EnhancementsConfig` object from a text blob containing stacktrace rules"""
+        """
+        Create an `EnhancementsConfig` object from a text blob containing stacktrace rules.
+
+        Unless `use_cache` is False, the result may be shared with other callers if the
+        `grouping.enhancements.use_process_cache` option is set.
+        """
+
+        if use_cache and options.get("grouping.enhancements.use_process_cache"):
+            return ENHANCEMENTS_CONFIG_CACHE.get_or_create(
+                (
+                    "rules_text",
+                    _hash_enhancements_input(rules_text),
+                    tuple(bases or ()),
+                    id,
+                    version or DEFAULT_ENHANCEMENTS_VERSION,
+                ),
+                "rules_text",
+                lambda: cls._from_rules_text(rules_text, bases, id, version, referrer),
+            )
+        return cls._from_rules_text(rules_text, bases, id, version, referrer)
 
+    @classmethod
+    def _from_rules_text(
+        cls,
+        rules_text: str,
+        bases: list[str] | None = None,
+        id: str | None = None,
+        version: int | None = None,
+        referrer: str | None = None,
+    ) -> EnhancementsConfig:
         with metrics.timer("grouping.enhancements.creation") as metrics_timer_tags:
             metrics_timer_tags.update(
                 {"split": version == 3, "source": "rules_text", "referrer": referrer}
@@ -662,8 +763,10 @@ def _load_configs() -> dict[str, EnhancementsConfig]:
                 # We cannot use `:` in filenames on Windows but we already have ids with
                 # `:` in their names hence this trickery.
                 filename = filename.replace("@", ":")
+                # Options aren't available yet at import time, and these are kept around in
+                # `ENHANCEMENT_BASES` anyway
                 enhancements = EnhancementsConfig.from_rules_text(
-                    f.read(), id=filename, referrer="default_rules"
+                    f.read(), id=filename, referrer="default_rules", use_cache=False
                 )
                 enhancement_bases[filename] = enhancements
     return enhancement_bases
@@ -678,3 +781,23 @@ del _load_configs
 # if we make a new default in the meantime, the old name should still point to
 # `all-platforms:2023-01-11`.)
 ENHANCEMENT_BASES["newstyle:2023-01-11"] = ENHANCEMENT_BASES["all-platforms:2023-01-11"]
+
+
+def warm_enhancements_cache() -> None:
+    """
+    Compile the enhancements of every built-in base into `ENHANCEMENTS_CONFIG_CACHE`, both from
+    rules text and from the base64 string stored with events, so that the first events a worker
+    processes for projects without custom rules don't pay for it. Meant to be called at worker
+    start.
+    """
+    if not options.get("grouping.enhancements.use_process_cache"):
+        return
+
+    with metrics.timer("grouping.enhancements.warm_cache"):
+        for base_id in ENHANCEMENT_BASES:
+            enhancements = EnhancementsConfig.from_rules_text(
+                "", bases=[base_id], version=DEFAULT_ENHANCEMENTS_VERSION, referrer="warm_cache"
+            )
+            EnhancementsConfig.from_base64_string(
+                enhancements.base64_string, referrer="warm_cache"
+            )
@@ -37,8 +37,11 @@ def invalidate_grouphash_cache_on_save(instance: GroupHash, **kwargs: Any) -> No
     if not options.get("grouping.use_ingest_grouphash_caching"):
         return
 
-    # `create` call - grouphash hasn't had a chance to be cached yet, so nothing to invalidate
+    # `create` call - the grouphash object hasn't had a chance to be cached yet, but the hash may
+    # have been cached as non-existent
     if not instance.id:
+        existence_cache_key = get_grouphash_existence_cache_key(instance.hash, instance.project.id)
+        cache.delete(existence_cache_key, version=get_grouphash_cache_version("existence"))
         return
 
     cache_key = get_grouphash_object_cache_key(instance.hash, instance.project.id)
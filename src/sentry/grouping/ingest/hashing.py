@@ -317,6 +317,208 @@ def _get_or_create_single_grouphash(
         return (grouphash, created)
 
 
+def _get_cache_expiries(
+    cache_keys: Iterable[str], cache_type: Literal["existence", "object"]
+) -> tuple[dict[str, int], int]:
+    """
+    Bulk version of `_get_cache_expiry`. Returns the expiry for each cache key, along with the
+    option version, which is the same for all keys of the given cache type.
+    """
+    option_name = f"grouping.ingest_grouphash_{cache_type}_cache_expiry.trial_values"
+    possible_cache_expiries = options.get(option_name)
+    option_version = abs(hash(tuple(possible_cache_expiries)))
+
+    expiries = {
+        cache_key: possible_cache_expiries[hash(cache_key) % len(possible_cache_expiries)]
+        for cache_key in cache_keys
+    }
+    return (expiries, option_version)
+
+
+def _set_many_with_expiries(
+    values: dict[str, object], expiries: dict[str, int], option_version: int
+) -> None:
+    values_by_expiry: dict[int, dict[str, object]] = {}
+    for cache_key, value in values.items():
+        values_by_expiry.setdefault(expiries[cache_key], {})[cache_key] = value
+
+    for expiry, values_for_expiry in values_by_expiry.items():
+        cache.set_many(values_for_expiry, expiry, version=option_version)
+
+
+def _bulk_cache_result(num_keys: int, num_misses: int) -> str:
+    if num_misses == 0:
+        return "hit"
+    return "miss" if num_misses == num_keys else "partial"
+
+
+def _grouphashes_exist_for_hash_values(
+    hash_values: Sequence[str], project: Project, use_caching: bool
+) -> set[str]:
+    """
+    Bulk version of `_grouphash_exists_for_hash_value`. Return the subset of the given hash values
+    which have a corresponding `GroupHash` record.
+    """
+    return bulk_check_grouphash_existence([(project, hash_values)], use_caching)[0]
+
+
+def bulk_check_grouphash_existence(
+    batch: Sequence[tuple[Project, Sequence[str]]], use_caching: bool
+) -> list[set[str]]:
+    """
+    Check grouphash existence for a micro-batch of events, given as `(project, hash_values)` pairs,
+    using a single cache round-trip and at most one database query for the whole batch. Return,
+    for each pair, the subset of its hash values which have a corresponding `GroupHash` record.
+
+    Non-existence is only cached for `grouping.ingest_grouphash_existence_cache_negative_expiry`
+    seconds, since creating a grouphash does not reliably invalidate the cached `False` (the entry
+    can be re-populated by a concurrent lookup before the new row is committed).
+    """
+    with metrics.timer(
+        "grouping.get_or_create_grouphashes.check_secondary_hash_existence_bulk"
+    ) as metrics_tags:
+        existing: set[tuple[int, str]] = set()
+        missing = _unique_batch_keys(batch)
+
+        if use_caching:
+            cache_keys = {key: get_grouphash_existence_cache_key(key[1], key[0]) for key in missing}
+            expiries, option_version = _get_cache_expiries(cache_keys.values(), "existence")
+            cached = cache.get_many(list(cache_keys.values()), version=option_version)
+
+            missing = []
+            for key, cache_key in cache_keys.items():
+                if cache_key not in cached:
+                    missing.append(key)
+                elif cached[cache_key]:
+                    existing.add(key)
+
+            metrics_tags["cache_result"] = _bulk_cache_result(len(cache_keys), len(missing))
+
+        if missing:
+            found = _query_grouphash_keys(missing)
+            existing |= found
+
+            if use_caching:
+                _set_many_with_expiries(
+                    {cache_keys[key]: True for key in found}, expiries, option_version
+                )
+                negative_expiry = options.get(
+                    "grouping.ingest_grouphash_existence_cache_negative_expiry"
+                )
+                if negative_expiry > 0:
+                    cache.set_many(
+                        {cache_keys[key]: False for key in missing if key not in found},
+                        negative_expiry,
+                        version=option_version,
+                    )
+
+        return [
+            {hash_value for hash_value in hash_values if (project.id, hash_value) in existing}
+            for project, hash_values in batch
+        ]
+
+
+def _unique_batch_keys(batch: Sequence[tuple[Project, Sequence[str]]]) -> list[tuple[int, str]]:
+    return list(
+        dict.fromkeys(
+            (project.id, hash_value) for project, hash_values in batch for hash_value in hash_values
+        )
+    )
+
+
+def _query_grouphash_keys(keys: Sequence[tuple[int, str]]) -> set[tuple[int, str]]:
+    """
+    Return the `(project_id, hash)` pairs among `keys` which have a `GroupHash` record, with a
+    single query.
+    """
+    wanted = set(keys)
+    rows = GroupHash.objects.filter(
+        project_id__in={project_id for project_id, _ in keys},
+        hash__in={hash_value for _, hash_value in keys},
+    ).values_list("project_id", "hash")
+    return {row for row in rows if row in wanted}
+
+
+def _get_or_create_grouphashes_bulk(
+    hash_values: Sequence[str], project: Project, use_caching: bool
+) -> list[tuple[GroupHash, bool]]:
+    """
+    Bulk version of `_get_or_create_single_grouphash`. Results are returned in the order of
+    `hash_values`.
+    """
+    return bulk_get_or_create_grouphashes([(project, hash_values)], use_caching)[0]
+
+
+def bulk_get_or_create_grouphashes(
+    batch: Sequence[tuple[Project, Sequence[str]]], use_caching: bool
+) -> list[list[tuple[GroupHash, bool]]]:
+    """
+    Create or retrieve the `GroupHash` records for a micro-batch of events, given as
+    `(project, hash_values)` pairs. Cached grouphashes are fetched with a single cache round-trip,
+    and the remaining ones with a single database query for the whole batch. Only grouphashes which
+    don't exist yet are created one by one.
+
+    Return, for each pair, the `(grouphash, created)` results in the order of its hash values.
+    """
+    with metrics.timer(
+        "grouping.get_or_create_grouphashes.get_or_create_grouphash_bulk"
+    ) as metrics_tags:
+        projects = {project.id: project for project, _ in batch}
+        results: dict[tuple[int, str], tuple[GroupHash, bool]] = {}
+        missing = _unique_batch_keys(batch)
+
+        if use_caching:
+            cache_keys = {key: get_grouphash_object_cache_key(key[1], key[0]) for key in missing}
+            expiries, option_version = _get_cache_expiries(cache_keys.values(), "object")
+            cached = cache.get_many(list(cache_keys.values()), version=option_version)
+
+            missing = []
+            for key, cache_key in cache_keys.items():
+                if cache_key in cached:
+                    results[key] = (cached[cache_key], False)
+                else:
+                    missing.append(key)
+
+            metrics_tags["cache_result"] = _bulk_cache_result(len(cache_keys), len(missing))
+
+        if missing:
+            wanted = set(missing)
+            # Fetch metadata along with the grouphashes, since it's read for every grouphash below
+            existing = GroupHash.objects.filter(
+                project_id__in={project_id for project_id, _ in missing},
+                hash__in={hash_value for _, hash_value in missing},
+            ).select_related("_metadata")
+            for grouphash in existing:
+                key = (grouphash.project_id, grouphash.hash)
+                if key in wanted:
+                    results[key] = (grouphash, False)
+
+            for key in missing:
+                if key not in results:
+                    project_id, hash_value = key
+                    results[key] = GroupHash.objects.get_or_create(
+                        project=projects[project_id], hash=hash_value
+                    )
+
+            # As in `_get_or_create_single_grouphash`, only grouphashes which already have a group
+            # assigned are worth caching.
+            if use_caching:
+                _set_many_with_expiries(
+                    {
+                        cache_keys[key]: results[key][0]
+                        for key in missing
+                        if results[key][0].group_id is not None
+                    },
+                    expiries,
+                    option_version,
+                )
+
+        return [
+            [results[(project.id, hash_value)] for hash_value in hash_values]
+            for project, hash_values in batch
+        ]
+
+
 def get_or_create_grouphashes(
     event: Event,
     project: Project,
@@ -326,21 +528,33 @@ def get_or_create_grouphashes(
 ) -> list[GroupHash]:
     is_secondary = grouping_config_id == project.get_option("sentry:secondary_grouping_config")
     use_caching = options.get("grouping.use_ingest_grouphash_caching")
+    use_bulk_lookup = options.get("grouping.use_ingest_grouphash_bulk_lookup")
     grouphashes: list[GroupHash] = []
 
     if is_secondary:
         # The only utility of secondary hashes is to link new primary hashes to an existing group
         # via an existing grouphash. Secondary hashes which are new are therefore of no value, so
         # filter them out before creating grouphash records.
-        hashes = [
-            hash_value
+        if use_bulk_lookup:
+            hashes = list(hashes)
+            existing_hashes = _grouphashes_exist_for_hash_values(hashes, project, use_caching)
+            hashes = [hash_value for hash_value in hashes if hash_value in existing_hashes]
+        else:
+            hashes = [
+                hash_value
+                for hash_value in hashes
+                if _grouphash_exists_for_hash_value(hash_value, project, use_caching)
+            ]
+
+    if use_bulk_lookup:
+        results = _get_or_create_grouphashes_bulk(list(hashes), project, use_caching)
+    else:
+        results = [
+            _get_or_create_single_grouphash(hash_value, project, use_caching)
             for hash_value in hashes
-            if _grouphash_exists_for_hash_value(hash_value, project, use_caching)
         ]
 
-    for hash_value in hashes:
-        grouphash, created = _get_or_create_single_grouphash(hash_value, project, use_caching)
-
+    for grouphash, created in results:
         if options.get("grouping.grouphash_metadata.ingestion_writes_enabled"):
             try:
                 # We don't expect this to throw any errors, but collecting this metadata
@@ -1,14 +1,22 @@
 import dataclasses
+import functools
 import re
 from collections import defaultdict
 from collections.abc import Callable, Sequence
 
 __all__ = [
     "ParameterizationCallable",
+    "ParameterizationMatcher",
     "ParameterizationRegex",
     "Parameterizer",
+    "get_parameterization_matcher",
 ]
 
+# Results for messages up to this length are memoized per matcher. Messages are trimmed to two
+# lines before parameterization, so most of them fit.
+MEMO_MAX_MESSAGE_LENGTH = 1024
+MEMO_CACHE_SIZE = 10_000
+
 
 @dataclasses.dataclass
 class ParameterizationRegex:
@@ -18,6 +26,10 @@ class ParameterizationRegex:
     raw_pattern_experimental: str | None = None
     lookbehind: str | None = None  # positive lookbehind prefix if needed
     lookahead: str | None = None  # positive lookahead postfix if needed
+    # Regex (without `(?x)`) which is found in every string the pattern (and its experimental
+    # variant) can match. Content in which no prefilter of any pattern is found is returned
+    # without running the full pattern. `None` means the pattern cannot be prefiltered.
+    prefilter: str | None = None
     counter: int = 0
 
     # These need to be used with `(?x)`, to tell the regex compiler to ignore comments
@@ -45,8 +57,13 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
     ParameterizationRegex(
         name="email",
         raw_pattern=r"""[a-zA-Z0-9.!#$%&'*+/=?^_`{|}~-]+@[a-zA-Z0-9-]+(?:\.[a-zA-Z0-9-]+)*""",
+        prefilter="@",
+    ),
+    ParameterizationRegex(
+        name="url",
+        raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*""",
+        prefilter="://",
     ),
-    ParameterizationRegex(name="url", raw_pattern=r"""\b(wss?|https?|ftp)://[^\s/$.?#].[^\s]*"""),
     ParameterizationRegex(
         name="hostname",
         raw_pattern=r"""
@@ -59,6 +76,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             )
             \b
         """,
+        prefilter=r"\.",
     ),
     ParameterizationRegex(
         name="ip",
@@ -86,6 +104,8 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
                 (25[0-5]|(2[0-4]|1{0,1}[0-9]){0,1}[0-9])\b
             )
         """,
+        # IPv6 addresses contain colons, IPv4 addresses dots.
+        prefilter="[.:]",
     ),
     ParameterizationRegex(
         name="traceparent",
@@ -96,13 +116,19 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             # https://docs.aws.amazon.com/elasticloadbalancing/latest/application/load-balancer-request-tracing.html#request-tracing-syntax
             (\b1-[0-9a-f]{8}-[0-9a-f]{24}\b)
         """,
+        prefilter=r"\d",
     ),
     ParameterizationRegex(
         name="uuid",
         raw_pattern=r"""\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b""",
+        prefilter="-",
+    ),
+    ParameterizationRegex(
+        name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b""", prefilter=r"\d|[a-fA-F]{40}"
+    ),
+    ParameterizationRegex(
+        name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b""", prefilter=r"\d|[a-fA-F]{32}"
     ),
-    ParameterizationRegex(name="sha1", raw_pattern=r"""\b[0-9a-fA-F]{40}\b"""),
-    ParameterizationRegex(name="md5", raw_pattern=r"""\b[0-9a-fA-F]{32}\b"""),
     ParameterizationRegex(
         name="date",
         raw_pattern=r"""
@@ -158,8 +184,11 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             ) |
             (datetime.datetime\(.*?\))
         """,
+        prefilter=r"\d|datetime",
+    ),
+    ParameterizationRegex(
+        name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b""", prefilter=r"\d"
     ),
-    ParameterizationRegex(name="duration", raw_pattern=r"""\b(\d+ms) | (\d+(\.\d+)?s)\b"""),
     ParameterizationRegex(
         name="hex",
         raw_pattern=r"""
@@ -177,9 +206,12 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             (\b(?=.*[0-9])[0-9a-f]{8}\b) |
             (\b(?=.*[0-9])[0-9a-f]{16}\b)
         """,
+        prefilter=r"\d",
     ),
-    ParameterizationRegex(name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b"""),
-    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b"""),
+    ParameterizationRegex(
+        name="float", raw_pattern=r"""-\d+\.\d+\b | \b\d+\.\d+\b""", prefilter=r"\d"
+    ),
+    ParameterizationRegex(name="int", raw_pattern=r"""-\d+\b | \b\d+\b""", prefilter=r"\d"),
     ParameterizationRegex(
         name="quoted_str",
         raw_pattern=r"""# Using `=`lookbehind which guarantees we'll only match the value half of key-value pairs,
@@ -187,6 +219,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             '([^']+)' | "([^"]+)"
         """,
         lookbehind="=",
+        prefilter="=",
     ),
     ParameterizationRegex(
         name="bool",
@@ -198,6 +231,7 @@ DEFAULT_PARAMETERIZATION_REGEXES = [
             false
         """,
         lookbehind="=",
+        prefilter="=",
     ),
 ]
 
@@ -206,6 +240,80 @@ DEFAULT_PARAMETERIZATION_REGEXES_MAP = {r.name: r.pattern for r in DEFAULT_PARAM
 EXPERIMENTAL_PARAMETERIZATION_REGEXES_MAP = {
     r.name: r.experimental_pattern for r in DEFAULT_PARAMETERIZATION_REGEXES
 }
+PARAMETERIZATION_PREFILTERS_MAP = {r.name: r.prefilter for r in DEFAULT_PARAMETERIZATION_REGEXES}
+
+
+class ParameterizationMatcher:
+    """
+    The combined regex for a set of pattern keys, along with its prefilter and a memo of recent
+    results. Matchers are immutable and shared process-wide, use `get_parameterization_matcher`
+    rather than creating them directly.
+    """
+
+    def __init__(self, pattern_keys: Sequence[str], experimental: bool = False):
+        regexes_map = (
+            EXPERIMENTAL_PARAMETERIZATION_REGEXES_MAP
+            if experimental
+            else DEFAULT_PARAMETERIZATION_REGEXES_MAP
+        )
+        # The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace, so we
+        # can use newlines and indentation for better legibility in patterns above.
+        self.regex = re.compile(rf"(?x){'|'.join(regexes_map[k] for k in pattern_keys)}")
+
+        prefilters = [PARAMETERIZATION_PREFILTERS_MAP[k] for k in pattern_keys]
+        self.prefilter: re.Pattern[str] | None = None
+        if prefilters and None not in prefilters:
+            self.prefilter = re.compile("|".join(dict.fromkeys(prefilters)))
+
+        self._memoized_parameterize = functools.lru_cache(maxsize=MEMO_CACHE_SIZE)(
+            self._parameterize
+        )
+
+    def parameterize(self, content: str) -> tuple[str, tuple[tuple[str, int], ...]]:
+        """
+        Replace all matches in the content with placeholders.
+
+        @returns: The parameterized content and the number of replacements per pattern key.
+        """
+        if len(content) > MEMO_MAX_MESSAGE_LENGTH:
+            return self._parameterize(content)
+        return self._memoized_parameterize(content)
+
+    def _parameterize(self, content: str) -> tuple[str, tuple[tuple[str, int], ...]]:
+        if self.prefilter is not None and self.prefilter.search(content) is None:
+            return content, ()
+
+        matches_counter: defaultdict[str, int] = defaultdict(int)
+
+        def _handle_regex_match(match: re.Match[str]) -> str:
+            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
+            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
+            # replacement for the original value in the string.
+            for key, value in match.groupdict().items():
+                if value is not None:
+                    matches_counter[key] += 1
+                    return f"<{key}>"
+            return ""
+
+        return self.regex.sub(_handle_regex_match, content), tuple(matches_counter.items())
+
+
+@functools.cache
+def _get_parameterization_matcher(
+    pattern_keys: tuple[str, ...], experimental: bool
+) -> ParameterizationMatcher:
+    return ParameterizationMatcher(pattern_keys, experimental)
+
+
+def get_parameterization_matcher(
+    pattern_keys: Sequence[str], experimental: bool = False
+) -> ParameterizationMatcher:
+    """
+    Returns the process-wide matcher for the given pattern keys, compiling it on first use.
+
+    @raises: KeyError on a pattern key not in `DEFAULT_PARAMETERIZATION_REGEXES`
+    """
+    return _get_parameterization_matcher(tuple(pattern_keys), experimental)
 
 
 @dataclasses.dataclass
@@ -227,51 +335,21 @@ class Parameterizer:
         experimental: bool = False,
     ):
         self._experimental = experimental
-        self._parameterization_regex = self._make_regex_from_patterns(regex_pattern_keys)
+        self._matcher = get_parameterization_matcher(regex_pattern_keys, experimental)
         self.matches_counter: defaultdict[str, int] = defaultdict(int)
 
-    def _make_regex_from_patterns(self, pattern_keys: Sequence[str]) -> re.Pattern[str]:
-        """
-        Takes list of pattern keys and returns a compiled regex pattern that matches any of them.
-
-        @param pattern_keys: A list of keys to match in the _parameterization_regex_components dict.
-        @returns: A compiled regex pattern that matches any of the given keys.
-        @raises: KeyError on pattern key not in the _parameterization_regex_components dict
-
-        The `(?x)` tells the regex compiler to ignore comments and unescaped whitespace,
-        so we can use newlines and indentation for better legibility in patterns above.
-        """
-
-        regexes_map = (
-            EXPERIMENTAL_PARAMETERIZATION_REGEXES_MAP
-            if self._experimental
-            else DEFAULT_PARAMETERIZATION_REGEXES_MAP
-        )
-
-        return re.compile(rf"(?x){'|'.join(regexes_map[k] for k in pattern_keys)}")
-
     def parametrize_w_regex(self, content: str) -> str:
         """
         Replace all matches of the given regex in the content with a placeholder string.
 
         @param content: The string to replace matches in.
-        @param parameterization_regex: The compiled regex pattern to match.
-        @param match_callback: An optional callback function to call with the key of the matched pattern.
 
         @returns: The content with all matches replaced with placeholders.
         """
-
-        def _handle_regex_match(match: re.Match[str]) -> str:
-            # Find the first (should be only) non-None match entry, and sub in the placeholder. For
-            # example, given the groupdict item `('hex', '0x40000015')`, this returns '<hex>' as a
-            # replacement for the original value in the string.
-            for key, value in match.groupdict().items():
-                if value is not None:
-                    self.matches_counter[key] += 1
-                    return f"<{key}>"
-            return ""
-
-        return self._parameterization_regex.sub(_handle_regex_match, content)
+        parameterized, matches = self._matcher.parameterize(content)
+        for key, count in matches:
+            self.matches_counter[key] += count
+        return parameterized
 
     def parameterize_all(self, content: str) -> str:
         return self.parametrize_w_regex(content)
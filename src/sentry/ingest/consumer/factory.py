@@ -1,25 +1,30 @@
 from __future__ import annotations
 
+from collections import deque
 from collections.abc import Callable, Mapping
 from functools import partial
-from typing import NamedTuple, TypeVar
+from typing import Any, NamedTuple, TypeVar
 
 from arroyo.backends.kafka.consumer import KafkaPayload
+from arroyo.dlq import InvalidMessage
 from arroyo.processing.strategies import (
+    BatchStep,
     CommitOffsets,
     FilterStep,
+    MessageRejected,
     ProcessingStrategy,
     ProcessingStrategyFactory,
     RunTask,
 )
 from arroyo.types import Commit, FilteredPayload, Message, Partition
 
+from sentry import options
 from sentry.ingest.types import ConsumerType
 from sentry.processing.backpressure.arroyo import HealthChecker, create_backpressure_step
 from sentry.utils.arroyo import MultiprocessingPool, run_task_with_multiprocessing
 
 from .attachment_event import decode_and_process_chunks, process_attachments_and_events
-from .simple_event import process_simple_event_message
+from .simple_event import process_simple_event_batch, process_simple_event_message
 
 
 class MultiProcessConfig(NamedTuple):
@@ -58,6 +63,49 @@ def maybe_multiprocess_step(
         )
 
 
+class RaiseInvalidMessages(ProcessingStrategy[FilteredPayload | list[InvalidMessage]]):
+    """
+    Routes the invalid messages returned by `process_simple_event_batch` to
+    the DLQ, raising one per `poll`, before forwarding the batch to be
+    committed.
+    """
+
+    def __init__(self, next_step: ProcessingStrategy[Any]) -> None:
+        self.__next_step = next_step
+        self.__invalid_messages: deque[InvalidMessage] = deque()
+        self.__pending: Message[Any] | None = None
+
+    def poll(self) -> None:
+        self.__next_step.poll()
+
+        if self.__invalid_messages:
+            raise self.__invalid_messages.popleft()
+
+        if self.__pending is not None:
+            self.__next_step.submit(self.__pending)
+            self.__pending = None
+
+    def submit(self, message: Message[FilteredPayload | list[InvalidMessage]]) -> None:
+        if self.__pending is not None:
+            raise MessageRejected()
+
+        if isinstance(message.payload, FilteredPayload) or not message.payload:
+            self.__next_step.submit(message)
+            return
+
+        self.__invalid_messages.extend(message.payload)
+        self.__pending = message
+
+    def close(self) -> None:
+        self.__next_step.close()
+
+    def terminate(self) -> None:
+        self.__next_step.terminate()
+
+    def join(self, timeout: float | None = None) -> None:
+        self.__next_step.join(timeout)
+
+
 class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
     def __init__(
         self,
@@ -100,6 +148,26 @@ class IngestStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
         final_step = CommitOffsets(commit)
 
+        save_batch_size = options.get("store.save-event-batch.max-size")
+        if self.consumer_type == ConsumerType.Events and save_batch_size > 1:
+            batch_function = partial(
+                process_simple_event_batch,
+                consumer_type=self.consumer_type,
+                reprocess_only_stuck_events=self.reprocess_only_stuck_events,
+                max_save_batch_size=save_batch_size,
+            )
+            next_step = maybe_multiprocess_step(
+                mp, batch_function, RaiseInvalidMessages(final_step), self._pool
+            )
+            batch_step = BatchStep(
+                max_batch_size=save_batch_size,
+                max_batch_time=options.get("store.save-event-batch.max-time-ms") / 1000,
+                next_step=next_step,
+            )
+            return create_backpressure_step(
+                health_checker=self.health_checker, next_step=batch_step
+            )
+
         if not self.is_attachment_topic:
             event_function = partial(
                 process_simple_event_message,
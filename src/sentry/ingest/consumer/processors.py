@@ -25,7 +25,13 @@ from sentry.services.eventstore.processing import (
     transaction_processing_store,
 )
 from sentry.signals import event_accepted
-from sentry.tasks.store import preprocess_event, save_event_feedback, save_event_transaction
+from sentry.tasks.store import (
+    defer_until_submitted,
+    is_pending_submission,
+    preprocess_event,
+    save_event_feedback,
+    save_event_transaction,
+)
 from sentry.usage_accountant import record
 from sentry.utils import metrics
 from sentry.utils.cache import cache_key_for_event
@@ -113,7 +119,9 @@ def process_event(
         except Exception as exc:
             raise Retriable(exc)
 
-        if cached_value is not None:
+        # Within a batch, the marker of an accepted event is only set once the
+        # batch is submitted, so duplicates in the same batch are checked here.
+        if cached_value is not None or is_pending_submission(deduplication_key):
             logger.warning(
                 "pre-process-forwarder detected a duplicated event" " with id:%s for project:%s.",
                 event_id,
@@ -261,15 +269,20 @@ def process_event(
                     has_attachments=bool(attachments),
                 )
 
-        # remember for an 1 hour that we saved this event (deduplication protection)
-        with sentry_sdk.start_span(op="cache.set"):
-            cache.set(deduplication_key, "", CACHE_TIMEOUT)
+        def mark_accepted() -> None:
+            # remember for an 1 hour that we saved this event (deduplication protection)
+            with sentry_sdk.start_span(op="cache.set"):
+                cache.set(deduplication_key, "", CACHE_TIMEOUT)
 
-        # emit event_accepted once everything is done
-        with sentry_sdk.start_span(op="event_accepted.send_robust"):
-            event_accepted.send_robust(
-                ip=remote_addr, data=data, project=project, sender=process_event
-            )
+            # emit event_accepted once everything is done
+            with sentry_sdk.start_span(op="event_accepted.send_robust"):
+                event_accepted.send_robust(
+                    ip=remote_addr, data=data, project=project, sender=process_event
+                )
+
+        # When events are batched, the event must only be marked as processed
+        # once its save_event task has actually been submitted.
+        defer_until_submitted(mark_accepted, deduplication_key)
     except Exception as exc:
         if isinstance(exc, KeyError):  # ex: missing event_id in message["payload"]
             raise
@@ -3,9 +3,11 @@ import logging
 import msgpack
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.dlq import InvalidMessage
+from arroyo.processing.strategies.batching import ValuesBatch
 from arroyo.types import BrokerValue, Message
 
 from sentry.models.project import Project
+from sentry.tasks.store import batch_save_events
 from sentry.utils import metrics
 
 from .processors import IngestMessage, Retriable, process_event
@@ -70,3 +72,91 @@ def process_simple_event_message(
         raw_value = raw_message.value
         assert isinstance(raw_value, BrokerValue)
         raise InvalidMessage(raw_value.partition, raw_value.offset) from exc
+
+
+def process_simple_event_batch(
+    raw_message: Message[ValuesBatch[KafkaPayload]],
+    consumer_type: str,
+    reprocess_only_stuck_events: bool,
+    max_save_batch_size: int,
+) -> list[InvalidMessage]:
+    """
+    Processes a batch of Kafka Messages containing "simple" Event payloads.
+
+    Every message is processed like in `process_simple_event_message`, but
+    events that go straight to `save_event` are collected and saved per
+    project by `save_event_batch` tasks, and projects are fetched once per
+    batch.
+
+    Invalid messages do not stop the batch: they are returned as
+    `InvalidMessage`s for the next step to route to the DLQ one by one, and the
+    remaining messages are processed. A retriable error fails the whole batch,
+    after the events that were already handed off are submitted and marked as
+    processed, so that they are skipped when the batch is retried.
+    """
+
+    projects: dict[int, Project | None] = {}
+    invalid_messages: list[InvalidMessage] = []
+
+    try:
+        with batch_save_events(max_save_batch_size):
+            for item in raw_message.payload:
+                assert isinstance(item, BrokerValue)
+                try:
+                    _process_batched_event(
+                        item, projects, consumer_type, reprocess_only_stuck_events
+                    )
+                except InvalidMessage as exc:
+                    invalid_messages.append(exc)
+    except Retriable:
+        raise
+    except Exception as exc:
+        # Submitting the collected save_event tasks failed.
+        raise Retriable(exc)
+
+    return invalid_messages
+
+
+def _process_batched_event(
+    item: BrokerValue[KafkaPayload],
+    projects: dict[int, Project | None],
+    consumer_type: str,
+    reprocess_only_stuck_events: bool,
+) -> None:
+    raw_payload = item.payload.value
+    metrics.distribution(
+        "ingest_consumer.payload_size",
+        len(raw_payload),
+        tags={"consumer": consumer_type},
+        unit="byte",
+    )
+
+    try:
+        message: IngestMessage = msgpack.unpackb(raw_payload, use_list=False)
+
+        message_type = message["type"]
+        project_id = message["project_id"]
+
+        if message_type != "event":
+            raise ValueError(f"Unsupported message type: {message_type}")
+
+        if project_id not in projects:
+            try:
+                with metrics.timer("ingest_consumer.fetch_project"):
+                    projects[project_id] = Project.objects.get_from_cache(id=project_id)
+            except Project.DoesNotExist:
+                projects[project_id] = None
+
+        project = projects[project_id]
+        if project is None:
+            return
+
+        process_event(consumer_type, message, project, reprocess_only_stuck_events)
+
+    except Exception as exc:
+        # If the retriable exception was raised, we should not DLQ
+        if isinstance(exc, Retriable):
+            raise
+
+        metrics.incr("ingest_consumer.batch.invalid_message", tags={"consumer": consumer_type})
+        raise InvalidMessage(item.partition, item.offset) from exc
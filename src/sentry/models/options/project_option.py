@@ -176,6 +176,37 @@ class ProjectOptionManager(OptionManager["ProjectOption"]):
 
         return self._option_cache.get(cache_key, {})
 
+    def get_all_values_bulk(self, project_ids: Sequence[int]) -> Mapping[int, Mapping[str, Any]]:
+        """
+        Like :meth:`get_all_values` for many projects at once, with at most one
+        cache read and one query for the projects not in the local cache.
+        """
+        missing = {
+            self._make_key(project_id): project_id
+            for project_id in project_ids
+            if self._make_key(project_id) not in self._option_cache
+        }
+        if missing:
+            self._option_cache.update(cache.get_many(list(missing)))
+
+            uncached = [
+                project_id
+                for cache_key, project_id in missing.items()
+                if cache_key not in self._option_cache
+            ]
+            if uncached:
+                results: dict[int, dict[str, Any]] = {project_id: {} for project_id in uncached}
+                for option in self.filter(project_id__in=uncached):
+                    results[option.project_id][option.key] = option.value
+                loaded = {self._make_key(project_id): rv for project_id, rv in results.items()}
+                cache.set_many(loaded)
+                self._option_cache.update(loaded)
+
+        return {
+            project_id: self._option_cache.get(self._make_key(project_id), {})
+            for project_id in project_ids
+        }
+
     def reload_cache(
         self, project_id: int, update_reason: str, option_key: str | None = None
     ) -> Mapping[str, Any]:
@@ -516,6 +516,7 @@ class Project(Model):
         from sentry.monitors.models import Monitor, MonitorEnvironment, MonitorStatus
         from sentry.snuba.models import SnubaQuery
         from sentry.workflow_engine.models import DataConditionGroup, DataSource, Detector, Workflow
+        from sentry.workflow_engine.models.workflow import invalidate_workflow_graphs
 
         old_org_id = self.organization_id
         org_changed = old_org_id != organization.id
@@ -689,6 +690,11 @@ class Project(Model):
             Workflow.objects.filter(id__in=exclusive_workflow_ids).update(
                 organization_id=organization.id
             )
+            # Queryset updates send no signals, clear the cached workflow graph explicitly.
+            transaction.on_commit(
+                lambda: invalidate_workflow_graphs([self.id]),
+                using=router.db_for_write(Workflow),
+            )
 
             # Update DataConditionGroups connected to the transferred workflows
             # These are linked via WorkflowDataConditionGroup with a unique constraint on condition_group
@@ -949,6 +949,22 @@ register(
 # Killswitch to stop storing any reprocessing payloads.
 register("store.reprocessing-force-disable", default=False, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
+# Micro-batching of error events in the ingest consumer. When the batch size is
+# larger than 1, events that go straight to save_event are collected for up to
+# the given time and saved per project by a single save_event_batch task.
+register(
+    "store.save-event-batch.max-size",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "store.save-event-batch.max-time-ms",
+    type=Int,
+    default=50,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Enable calling the severity modeling API on group creation
 register(
     "processing.calculate-severity-on-group-creation",
@@ -1329,6 +1345,14 @@ register(
     default=[],
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Number of threads used to run independent post_process_group pipeline steps concurrently. With
+# 0 or 1, the steps run one after another on the task's thread.
+register(
+    "post_process.pipeline.max-concurrent-steps",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "api.organization.disable-last-deploys",
     type=Sequence,
@@ -1437,6 +1461,28 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Seconds for which sections of project configs are memoized between rebuilds,
+# see `sentry.relay.config.sections`. `0` disables the memoization.
+register(
+    "relay.project-config.section-cache-ttl",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Recompute the project configs of an organization in bulk on org-wide
+# invalidations, see `sentry.relay.config.get_project_configs_bulk`.
+register(
+    "relay.project-config.bulk-org-compute",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Store a content digest next to every cached project config and skip writes of
+# configs which did not change, only extending the lifetime of the cached config.
+register(
+    "relay.projectconfig-cache.skip-unchanged-writes",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Write new kafka headers in eventstream
 register("eventstream:kafka-headers", default=True, flags=FLAG_AUTOMATOR_MODIFIABLE)
 
@@ -1655,6 +1701,23 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Number of indexed strings the caching indexer keeps in process, in front of the
+# shared indexer cache. 0 disables the in-process cache.
+register(
+    "sentry-metrics.indexer.local-cache.max-size",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Seconds for which the caching indexer remembers strings that were missing from the
+# indexer cache and sends them straight to postgres. 0 disables the filter. Only
+# takes effect when the in-process cache is enabled.
+register(
+    "sentry-metrics.indexer.absent-filter.ttl",
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # Option to control sampling percentage of schema validation on the generic metrics pipeline
 # based on namespace.
 register(
@@ -1678,6 +1741,14 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Copy serialized metric values from the ingest payload into the output message instead
+# of serializing them again in reconstruct_messages. Implies orjson.
+register(
+    "sentry-metrics.indexer.reconstruct.splice-raw-values",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 
 # Option to remove support for percentiles on a per-use case basis.
 # Add the use case name (e.g. "custom") to this list
@@ -2337,6 +2408,31 @@ register(
     default=True,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Enables the in-process LRU tier in front of the nodestore backend.
+register(
+    "nodestore.local-cache.enabled",
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Upper bound on the encoded payload bytes held by the in-process tier.
+register(
+    "nodestore.local-cache.max-bytes",
+    default=64 * 1024 * 1024,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Seconds a payload may be served from the in-process tier.
+register(
+    "nodestore.local-cache.ttl",
+    default=5.0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Codec used when writing node payloads, either "json" (plain) or "zstd".
+# Reads understand every codec regardless of this setting.
+register(
+    "nodestore.codec",
+    default="json",
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # === Backpressure related runtime options ===
 
@@ -2995,6 +3091,32 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Resolve all grouphashes of an event with a single cache round-trip and database query, rather
+# than one hash at a time
+register(
+    "grouping.use_ingest_grouphash_bulk_lookup",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# How long to cache the fact that a secondary grouphash does not exist, when using bulk lookups
+register(
+    "grouping.ingest_grouphash_existence_cache_negative_expiry",
+    type=Int,
+    default=10,  # seconds
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Keep compiled `EnhancementsConfig` objects in a process-wide cache, keyed by a hash of the rules
+# and bases they were created from, rather than parsing and merging them again for every event
+register(
+    "grouping.enhancements.use_process_cache",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 
 # Sample rate for double writing to experimental dsn
 register(
@@ -3010,6 +3132,48 @@ register(
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
 
+# Coalesce `RedisBuffer.incr` calls in process before writing them to Redis. Pending increments are
+# flushed once there are this many distinct keys, or once the oldest one has been waiting for
+# `buffer.local-aggregation.max-age-ms`. 0 disables local aggregation.
+register(
+    "buffer.local-aggregation.max-keys",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "buffer.local-aggregation.max-age-ms",
+    type=Int,
+    default=1000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Flush batches of `RedisBuffer` keys in bulk: locks and hashes are read with one pipeline per
+# shard and increments are written with multi-row `UPDATE` statements of at most this many rows.
+# Batches are sized by the buffer's `incr_batch_size`. 0 flushes keys one by one.
+register(
+    "buffer.bulk-flush.max-rows",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
+# Combine `RedisTSDB` counter increments and distinct counter additions in process, and write them
+# with one pipeline per host every `tsdb.write-combiner.flush-interval-ms`, or once there are this
+# many pending entries. 0 writes them on every call.
+register(
+    "tsdb.write-combiner.max-entries",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+register(
+    "tsdb.write-combiner.flush-interval-ms",
+    type=Int,
+    default=1000,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+
 # SPAN BUFFER
 # Span buffer killswitch
 register(
@@ -3086,6 +3250,23 @@ register(
     default=60,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Load and produce segments one at a time, page by page, instead of loading
+# all flushable segments into memory at once. Segments exceeding
+# `spans.buffer.max-segment-bytes` are truncated instead of dropped.
+register(
+    "spans.buffer.flusher.streaming",
+    type=Bool,
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of segments whose first page is fetched in a single Redis pipeline
+# when streaming segments.
+register(
+    "spans.buffer.flusher.stream-prefetch-segments",
+    type=Int,
+    default=50,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 
 # Compression level for spans buffer segments. Default -1 disables compression, 0-22 for zstd levels
 register(
@@ -3102,6 +3283,31 @@ register(
     default=0,
     flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Target latency in milliseconds for a full Redis pipeline of add-buffer script
+# calls. When set, the pipeline batch size adapts to observed latency, with
+# `spans.buffer.pipeline-batch-size` as the upper bound. Set to 0 to disable.
+register(
+    "spans.buffer.pipeline-target-latency-ms",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Pack all subsegments of a trace into a single add-buffer script call instead
+# of one call per subsegment.
+register(
+    "spans.buffer.batch-subsegments",
+    type=Bool,
+    default=False,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Number of threads used to compress span payloads off the consumer thread.
+# Set to 0 to compress inline.
+register(
+    "spans.buffer.compression.threads",
+    type=Int,
+    default=0,
+    flags=FLAG_PRIORITIZE_DISK | FLAG_AUTOMATOR_MODIFIABLE,
+)
 # Latency threshold in milliseconds for logging slow EVALSHA pipeline operations
 register(
     "spans.buffer.evalsha-latency-threshold",
@@ -3356,6 +3562,14 @@ register(
     default=False,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Number of small projects evaluated together by one delayed processing task, sharing Snuba
+# queries within an organization. 0 or 1 schedules a task per project.
+register(
+    "delayed_processing.bulk_project_count",
+    type=Int,
+    default=0,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "delayed_workflow.rollout",
     type=Bool,
@@ -3424,6 +3638,22 @@ register(
     default=50,
     flags=FLAG_AUTOMATOR_MODIFIABLE,
 )
+# Evaluate DataConditionGroups from compiled plans cached in process, see
+# `sentry.workflow_engine.processors.data_condition_group.ConditionGroupPlan`.
+register(
+    "workflow_engine.condition_group_plans.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
+# Resolve the workflows of an event from the cached detector -> workflow graph of its project,
+# see `sentry.workflow_engine.models.workflow.get_workflow_graph_for_project`.
+register(
+    "workflow_engine.workflow_graph_cache.enabled",
+    type=Bool,
+    default=False,
+    flags=FLAG_AUTOMATOR_MODIFIABLE,
+)
 register(
     "workflow_engine.evaluation_log_sample_rate",
     type=Float,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import logging
 import uuid
 from collections.abc import Iterable, Mapping, MutableMapping, Sequence
@@ -34,15 +35,18 @@ from sentry.ingest.transaction_clusterer.rules import (
     get_sorted_rules,
 )
 from sentry.interfaces.security import DEFAULT_DISALLOWED_SOURCES
+from sentry.models.options.organization_option import OrganizationOption
+from sentry.models.options.project_option import ProjectOption
 from sentry.models.organization import Organization
 from sentry.models.project import Project
-from sentry.models.projectkey import ProjectKey
+from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
 from sentry.quotas.base import RETENTIONS_CONFIG_MAPPING
 from sentry.relay.config.experimental import TimeChecker, add_experimental_config
 from sentry.relay.config.metric_extraction import (
     get_metric_conditional_tagging_rules,
     get_metric_extraction_config,
 )
+from sentry.relay.config.sections import get_memoized_section
 from sentry.relay.datascrubbing import get_datascrubbing_settings, get_pii_config
 from sentry.relay.types.generic_filters import GenericFilter
 from sentry.relay.utils import to_camel_case_name
@@ -90,10 +94,14 @@ MIN_CLUSTERER_RUNS = 10
 logger = logging.getLogger(__name__)
 
 
-def get_exposed_features(project: Project) -> Sequence[str]:
+def get_exposed_features(
+    project: Project, batch_features: Mapping[str, bool | None] | None = None
+) -> Sequence[str]:
     active_features = []
     for feature in EXPOSABLE_FEATURES:
-        if feature.startswith("organizations:"):
+        if batch_features and batch_features.get(feature) is not None:
+            has_feature = bool(batch_features[feature])
+        elif feature.startswith("organizations:"):
             has_feature = features.has(feature, project.organization)
         elif feature.startswith("projects:"):
             has_feature = features.has(feature, project)
@@ -115,6 +123,32 @@ def get_exposed_features(project: Project) -> Sequence[str]:
     return active_features
 
 
+def get_exposed_features_bulk(
+    organization: Organization, projects: Sequence[Project]
+) -> Mapping[int, Mapping[str, bool | None]]:
+    """
+    Checks the exposable features of many projects of an organization with
+    one batch feature check per feature type. Features the batch check could
+    not handle are missing from the result, pass the result for a project to
+    :func:`get_exposed_features` to fall back to regular checks for them.
+    """
+    org_features = [f for f in EXPOSABLE_FEATURES if f.startswith("organizations:")]
+    project_features = [f for f in EXPOSABLE_FEATURES if f.startswith("projects:")]
+
+    org_results = features.batch_has(org_features, organization=organization) or {}
+    project_results = (
+        features.batch_has(project_features, projects=projects, organization=organization) or {}
+    )
+
+    return {
+        project.id: {
+            **org_results.get(f"organization:{organization.id}", {}),
+            **project_results.get(f"project:{project.id}", {}),
+        }
+        for project in projects
+    }
+
+
 def get_public_key_configs(
     project_keys: Iterable[ProjectKey] | None = None,
 ) -> list[Mapping[str, Any]]:
@@ -217,6 +251,13 @@ def get_quotas(project: Project, keys: Iterable[ProjectKey] | None = None) -> li
         return computed_quotas
 
 
+def _project_keys_variant(project_keys: Iterable[ProjectKey] | None) -> str:
+    """Quotas are computed for the given keys, so memoize them per set of keys."""
+    if project_keys is None:
+        return ""
+    return ",".join(str(key_id) for key_id in sorted(key.id for key in project_keys))
+
+
 class SlidingWindow(TypedDict):
     windowSeconds: int
     granularitySeconds: int
@@ -315,7 +356,9 @@ def get_cardinality_limits(timeout: TimeChecker, project: Project) -> list[Cardi
 
 
 def get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    batch_features: Mapping[str, bool | None] | None = None,
 ) -> ProjectConfig:
     """Constructs the ProjectConfig information.
     :param project: The project to load configuration for. Ensure that
@@ -325,6 +368,8 @@ def get_project_config(
         no project keys are provided it is assumed that the config does not
         need to contain auth information (this is the case when used in
         python's StoreView)
+    :param batch_features: Pre-fetched results of the exposable features, see
+        :func:`get_exposed_features_bulk`.
     :return: a ProjectConfig object for the given project
     """
     with sentry_sdk.isolation_scope() as scope:
@@ -333,7 +378,75 @@ def get_project_config(
             sentry_sdk.start_transaction(name="get_project_config"),
             metrics.timer("relay.config.get_project_config.duration"),
         ):
-            return _get_project_config(project, project_keys=project_keys)
+            return _get_project_config(
+                project, project_keys=project_keys, batch_features=batch_features
+            )
+
+
+def get_project_configs_bulk(
+    organization: Organization,
+    projects: Sequence[Project],
+    project_keys: Mapping[int, Sequence[ProjectKey]],
+) -> dict[str, MutableMapping[str, Any]]:
+    """Constructs the configs of many project keys of an organization.
+
+    The result is the same as calling :func:`get_project_config` for every
+    active key, but inputs shared by the projects of the organization are
+    loaded once, and the config of a project is built once for all its keys.
+    :param organization: The organization of all ``projects``.
+    :param projects: The projects to build configs for.
+    :param project_keys: The keys to build configs for, by project id.
+    :return: The config of every key by public key. Inactive keys are disabled.
+    """
+    OrganizationOption.objects.get_all_values(organization)
+    ProjectOption.objects.get_all_values_bulk([project.id for project in projects])
+    batch_features = get_exposed_features_bulk(organization, projects)
+
+    configs: dict[str, MutableMapping[str, Any]] = {}
+    for project in projects:
+        project.set_cached_field_value("organization", organization)
+
+        active_keys = []
+        for key in project_keys.get(project.id, ()):
+            key.set_cached_field_value("project", project)
+            if key.status == ProjectKeyStatus.ACTIVE:
+                active_keys.append(key)
+            else:
+                configs[key.public_key] = {"disabled": True}
+
+        if not active_keys:
+            continue
+
+        project_config = get_project_config(
+            project, project_keys=active_keys, batch_features=batch_features.get(project.id)
+        ).to_dict()
+        for key in active_keys:
+            configs[key.public_key] = _get_key_config(project_config, key)
+
+    return configs
+
+
+def _get_key_config(
+    project_config: Mapping[str, Any], key: ProjectKey
+) -> MutableMapping[str, Any]:
+    """Narrows a config built for all keys of a project down to a single key."""
+    if "config" not in project_config:
+        return dict(project_config)
+
+    config = dict(project_config["config"])
+    key_quotas = [
+        quota
+        for quota in config.pop("quotas", ())
+        if quota.get("scope") != "key" or quota.get("scopeId") == str(key.id)
+    ]
+    if key_quotas:
+        config["quotas"] = key_quotas
+
+    return {
+        **project_config,
+        "publicKeys": get_public_key_configs(project_keys=[key]),
+        "config": config,
+    }
 
 
 def get_dynamic_sampling_config(timeout: TimeChecker, project: Project) -> Mapping[str, Any] | None:
@@ -413,9 +526,8 @@ def _should_extract_abnormal_mechanism(project: Project) -> bool:
     )
 
 
-def _get_desktop_browser_performance_profiles(
-    organization: Organization,
-) -> list[dict[str, Any]]:
+@functools.cache
+def _get_desktop_browser_performance_profiles() -> list[dict[str, Any]]:
     return [
         {
             "name": "Chrome",
@@ -671,9 +783,8 @@ def _get_desktop_browser_performance_profiles(
     ]
 
 
-def _get_mobile_browser_performance_profiles(
-    organization: Organization,
-) -> list[dict[str, Any]]:
+@functools.cache
+def _get_mobile_browser_performance_profiles() -> list[dict[str, Any]]:
     return [
         {
             "name": "Chrome Mobile",
@@ -924,9 +1035,8 @@ def _get_mobile_browser_performance_profiles(
     ]
 
 
-def _get_default_browser_performance_profiles(
-    organization: Organization,
-) -> list[dict[str, Any]]:
+@functools.cache
+def _get_default_browser_performance_profiles() -> list[dict[str, Any]]:
     return [
         {
             "name": "Default",
@@ -992,6 +1102,11 @@ def _get_mobile_performance_profiles(
     ):
         return []
 
+    return _get_static_mobile_performance_profiles()
+
+
+@functools.cache
+def _get_static_mobile_performance_profiles() -> list[dict[str, Any]]:
     return [
         {
             "name": "Mobile",
@@ -1052,7 +1167,9 @@ def _get_mobile_performance_profiles(
 
 
 def _get_project_config(
-    project: Project, project_keys: Iterable[ProjectKey] | None = None
+    project: Project,
+    project_keys: Iterable[ProjectKey] | None = None,
+    batch_features: Mapping[str, bool | None] | None = None,
 ) -> ProjectConfig:
     if project.status != ObjectStatus.ACTIVE:
         return ProjectConfig(project, disabled=True)
@@ -1093,7 +1210,7 @@ def _get_project_config(
         }
 
     with sentry_sdk.start_span(op="get_exposed_features"):
-        if exposed_features := get_exposed_features(project):
+        if exposed_features := get_exposed_features(project, batch_features):
             config["features"] = exposed_features
 
     # NOTE: Omitting dynamicSampling because of a failure increases the number
@@ -1133,7 +1250,9 @@ def _get_project_config(
             project,
         )
 
-        if metric_extraction := get_metric_extraction_config(project):
+        if metric_extraction := get_memoized_section(
+            "metricExtraction", project, lambda: get_metric_extraction_config(project)
+        ):
             config["metricExtraction"] = metric_extraction
 
     config["sessionMetrics"] = {
@@ -1144,17 +1263,20 @@ def _get_project_config(
         ),
     }
 
+    # The static profiles are built once per process and shared between configs.
     performance_score_profiles = [
-        *_get_desktop_browser_performance_profiles(project.organization),
-        *_get_mobile_browser_performance_profiles(project.organization),
+        *_get_desktop_browser_performance_profiles(),
+        *_get_mobile_browser_performance_profiles(),
         *_get_mobile_performance_profiles(project.organization),
-        *_get_default_browser_performance_profiles(project.organization),
+        *_get_default_browser_performance_profiles(),
     ]
     if performance_score_profiles:
         config["performanceScore"] = {"profiles": performance_score_profiles}
 
     with sentry_sdk.start_span(op="get_filter_settings"):
-        if filter_settings := get_filter_settings(project):
+        if filter_settings := get_memoized_section(
+            "filterSettings", project, lambda: get_filter_settings(project)
+        ):
             config["filterSettings"] = filter_settings
     with sentry_sdk.start_span(op="get_grouping_config_dict_for_project"):
         grouping_config = get_grouping_config_dict_for_project(project)
@@ -1181,7 +1303,12 @@ def _get_project_config(
             config["retentions"] = retentions_config
 
     with sentry_sdk.start_span(op="get_all_quotas"):
-        if quotas_config := get_quotas(project, keys=project_keys):
+        if quotas_config := get_memoized_section(
+            "quotas",
+            project,
+            lambda: get_quotas(project, keys=project_keys),
+            variant=_project_keys_variant(project_keys),
+        ):
             config["quotas"] = quotas_config
 
     return ProjectConfig(project, **cfg)
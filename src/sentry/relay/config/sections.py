@@ -0,0 +1,140 @@
+"""
+Memoization of individual project config sections.
+
+Most project config invalidations are caused by a change to the inputs of a
+single section, e.g. dynamic sampling rebalancing or a rate limit change on a
+project key, yet every invalidation rebuilds the whole config. Every memoized
+section has a version per organization and per project, which
+:func:`bump_section_versions` replaces whenever an invalidation is scheduled
+for a trigger that affects the section. Sections are cached under their
+current versions, so a rebuild only recomputes the sections whose inputs
+changed.
+
+Versions are bumped when the invalidation is scheduled rather than when the
+task runs, because debouncing may fold invalidations with different triggers
+into a single task.
+
+Changes which never schedule an invalidation (e.g. feature flags) are picked up
+once the memoized section expires, after ``relay.project-config.section-cache-ttl``
+seconds.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import uuid
+from collections.abc import Callable
+from typing import TypeVar
+
+from django.core.cache import cache
+
+from sentry import options
+from sentry.models.project import Project
+from sentry.utils import metrics
+
+T = TypeVar("T")
+
+#: Sections of the project config which are memoized between rebuilds.
+#:
+#: Dynamic sampling is deliberately absent: its inputs are partially stored in
+#: Redis and updated without scheduling an invalidation.
+MEMOIZED_SECTIONS = ("filterSettings", "quotas", "metricExtraction")
+
+#: Invalidation triggers which are known to only affect the inputs of some
+#: memoized sections. All other triggers invalidate every memoized section.
+TRIGGER_SECTIONS: dict[str, tuple[str, ...]] = {
+    "projectkey.post_save": ("quotas",),
+    "projectkey.post_delete": ("quotas",),
+    "monitors:monitor_created": ("quotas",),
+    "alerts:create-on-demand-metric": ("metricExtraction",),
+    "dashboards:create-on-demand-metric": ("metricExtraction",),
+    "dynamic_sampling:boost_release": (),
+    "dynamic_sampling:custom_rule_upsert": (),
+    "dynamic_sampling_boost_low_volume_projects": (),
+    "dynamic_sampling_boost_low_volume_transactions": (),
+}
+
+#: Versions only need to outlive the memoized sections. An expired or evicted
+#: version is replaced by a new one, which only causes a cache miss.
+VERSION_TTL = 24 * 60 * 60
+
+
+def _version_key(section: str, scope: str, scope_id: int) -> str:
+    return f"relayconfig-section-version:{section}:{scope}:{scope_id}"
+
+
+def bump_section_versions(
+    trigger: str, organization_id: int | None = None, project_id: int | None = None
+) -> None:
+    """
+    Invalidates the memoized sections affected by ``trigger`` for a project or,
+    if no project is given, for all projects of an organization.
+    """
+    if project_id is not None:
+        scope, scope_id = "project", project_id
+    elif organization_id is not None:
+        scope, scope_id = "org", organization_id
+    else:
+        return
+
+    sections = TRIGGER_SECTIONS.get(trigger, MEMOIZED_SECTIONS)
+    if not sections:
+        return
+
+    version = uuid.uuid4().hex
+    cache.set_many(
+        {_version_key(section, scope, scope_id): version for section in sections}, VERSION_TTL
+    )
+
+
+def _get_section_version(section: str, project: Project) -> str | None:
+    keys = [
+        _version_key(section, "org", project.organization_id),
+        _version_key(section, "project", project.id),
+    ]
+    versions = cache.get_many(keys)
+
+    missing = [key for key in keys if key not in versions]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, VERSION_TTL)
+        # Read the versions back, a concurrent build might have won the race.
+        versions.update(cache.get_many(missing))
+        if any(key not in versions for key in keys):
+            return None
+
+    return ":".join(versions[key] for key in keys)
+
+
+def get_memoized_section(
+    section: str, project: Project, build: Callable[[], T | None], variant: str = ""
+) -> T | None:
+    """
+    Returns the ``section`` of the project config for ``project``, calling
+    ``build`` only if the section's inputs changed since it was memoized.
+
+    ``variant`` distinguishes builds of the same section with different
+    arguments. ``None`` results are not memoized, since builders also return
+    ``None`` when they fail.
+    """
+    ttl = options.get("relay.project-config.section-cache-ttl")
+    if not ttl:
+        return build()
+
+    version = _get_section_version(section, project)
+    if version is None:
+        return build()
+
+    digest = hashlib.md5(f"{version}:{variant}".encode()).hexdigest()
+    cache_key = f"relayconfig-section:{section}:{project.id}:{digest}"
+
+    value = cache.get(cache_key)
+    if value is not None:
+        metrics.incr("relay.config.section_cache", tags={"section": section, "outcome": "hit"})
+        return value
+
+    metrics.incr("relay.config.section_cache", tags={"section": section, "outcome": "miss"})
+    value = build()
+    if value is not None:
+        cache.set(cache_key, value, ttl)
+    return value
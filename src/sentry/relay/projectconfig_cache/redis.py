@@ -1,9 +1,12 @@
+import hashlib
 import logging
+from collections import defaultdict
 from collections.abc import Mapping
 from typing import Any
 
 import zstandard
 
+from sentry import options
 from sentry.relay.projectconfig_cache.base import ProjectConfigCache
 from sentry.utils import json, metrics, redis
 from sentry.utils.redis import validate_dynamic_cluster
@@ -14,6 +17,20 @@ COMPRESSION_LEVEL = 3  # 3 is the default level of compression
 logger = logging.getLogger(__name__)
 
 
+#: Fields which change on every build of a config, regardless of its contents.
+VOLATILE_FIELDS = ("rev", "lastFetch", "lastChange")
+
+
+def _content_digest(config: Mapping[str, Any]) -> str:
+    """Hashes the contents of a config, ignoring fields which differ between builds.
+
+    Configs are built in a deterministic order. Should two equal configs still
+    serialize differently, the only consequence is a redundant write.
+    """
+    contents = {key: value for key, value in config.items() if key not in VOLATILE_FIELDS}
+    return hashlib.sha1(json.dumps(contents).encode()).hexdigest()
+
+
 class RedisProjectConfigCache(ProjectConfigCache):
     def __init__(self, **options):
         cluster_key = options.get("cluster", "default")
@@ -33,18 +50,57 @@ class RedisProjectConfigCache(ProjectConfigCache):
     def __get_redis_rev_key(self, public_key) -> str:
         return f"{self.__get_redis_key(public_key)}.rev"
 
+    def __get_redis_hash_key(self, public_key) -> str:
+        return f"{self.__get_redis_key(public_key)}.hash"
+
     def set_many(self, configs: dict[str, Mapping[str, Any]]):
         metrics.incr("relay.projectconfig_cache.write", amount=len(configs), tags={"action": "set"})
 
+        skip_unchanged = options.get("relay.projectconfig-cache.skip-unchanged-writes")
+        if skip_unchanged:
+            digests = {
+                public_key: _content_digest(config) for public_key, config in configs.items()
+            }
+            stored_digests = self.__get_digests(list(digests))
+            unchanged = {
+                public_key
+                for public_key, digest in digests.items()
+                if stored_digests.get(public_key) == digest
+            }
+            if unchanged:
+                metrics.incr(
+                    "relay.projectconfig_cache.write",
+                    amount=len(unchanged),
+                    tags={"action": "skip_unchanged"},
+                )
+        else:
+            unchanged = set()
+
+        # Configs of different keys are often identical, e.g. for disabled keys.
+        compressed_by_serialized: dict[bytes, bytes] = {}
+        org_bytes: dict[int | None, int] = defaultdict(int)
+
         # Note: Those are multiple pipelines, one per cluster node.
         p = self.cluster.pipeline(transaction=False)
         for public_key, config in configs.items():
+            if public_key in unchanged:
+                # The stored config is identical, only extend its lifetime. The
+                # revision is kept, so Relay will not refetch the config either.
+                p.expire(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT)
+                p.expire(self.__get_redis_rev_key(public_key), REDIS_CACHE_TIMEOUT)
+                p.expire(self.__get_redis_hash_key(public_key), REDIS_CACHE_TIMEOUT)
+                continue
+
             serialized = json.dumps(config).encode()
-            compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+            compressed = compressed_by_serialized.get(serialized)
+            if compressed is None:
+                compressed = zstandard.compress(serialized, level=COMPRESSION_LEVEL)
+                compressed_by_serialized[serialized] = compressed
             metrics.distribution(
                 "relay.projectconfig_cache.uncompressed_size", len(serialized), unit="byte"
             )
             metrics.distribution("relay.projectconfig_cache.size", len(compressed), unit="byte")
+            org_bytes[config.get("organizationId")] += len(compressed)
 
             p.setex(self.__get_redis_key(public_key), REDIS_CACHE_TIMEOUT, compressed)
             # Update the revision after updating the config, while not strictly necessary
@@ -60,13 +116,48 @@ class RedisProjectConfigCache(ProjectConfigCache):
             else:
                 p.delete(self.__get_redis_rev_key(public_key))
 
+            if skip_unchanged:
+                p.setex(
+                    self.__get_redis_hash_key(public_key), REDIS_CACHE_TIMEOUT, digests[public_key]
+                )
+            else:
+                # Without digest maintenance a stored digest could go stale.
+                p.delete(self.__get_redis_hash_key(public_key))
+
         p.execute()
 
+        # Bytes written per organization in this batch, org-wide invalidations
+        # write all cached configs of an organization at once.
+        for size in org_bytes.values():
+            metrics.distribution("relay.projectconfig_cache.org_size", size, unit="byte")
+
+    def __get_digests(self, public_keys: list[str]) -> dict[str, str]:
+        """Returns the content digests of the configs stored for ``public_keys``."""
+        # Read from the write cluster, a lagging replica could report the digest of a
+        # config which was already overwritten.
+        #
+        # Note: Those are multiple pipelines, one per cluster node.
+        p = self.cluster.pipeline(transaction=False)
+        for public_key in public_keys:
+            p.get(self.__get_redis_hash_key(public_key))
+            # The config itself could have been evicted while its digest was not.
+            p.exists(self.__get_redis_key(public_key))
+        results = p.execute()
+        return {
+            public_key: digest.decode()
+            for public_key, digest, exists in zip(public_keys, results[::2], results[1::2])
+            if digest is not None and exists
+        }
+
     def delete_many(self, public_keys):
         # Note: Those are multiple pipelines, one per cluster node
         with self.cluster.pipeline() as p:
             for public_key in public_keys:
-                p.delete(self.__get_redis_key(public_key), self.__get_redis_rev_key(public_key))
+                p.delete(
+                    self.__get_redis_key(public_key),
+                    self.__get_redis_rev_key(public_key),
+                    self.__get_redis_hash_key(public_key),
+                )
             return_values = p.execute()
 
         # Count deletions of project configs, not deletions of individual Redis keys.
@@ -84,6 +175,14 @@ class RedisProjectConfigCache(ProjectConfigCache):
             return json.loads(rv)
         return None
 
+    def exists_many(self, public_keys) -> set[str]:
+        public_keys = list(public_keys)
+        # Note: Those are multiple pipelines, one per cluster node.
+        p = self.cluster_read.pipeline(transaction=False)
+        for public_key in public_keys:
+            p.exists(self.__get_redis_key(public_key))
+        return {public_key for public_key, exists in zip(public_keys, p.execute()) if exists}
+
     def get_rev(self, public_key) -> str | None:
         if value := self.cluster_read.get(self.__get_redis_rev_key(public_key)):
             return value.decode()
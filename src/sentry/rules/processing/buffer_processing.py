@@ -10,8 +10,10 @@ from typing import Any, ClassVar, Protocol
 from sentry import options
 from sentry.buffer.base import BufferField
 from sentry.db import models
+from sentry.models.project import Project
 from sentry.taskworker.task import Task
 from sentry.utils import metrics
+from sentry.utils.iterators import chunked
 from sentry.utils.registry import NoRegistrationExistsError, Registry
 
 logger = logging.getLogger("sentry.delayed_processing")
@@ -89,6 +91,14 @@ class DelayedProcessingBase(ABC):
     def buffer_backend() -> BufferProtocol:
         raise NotImplementedError
 
+    @staticmethod
+    def bulk_processing_task() -> Task | None:
+        """
+        A task taking a list of `project_ids` that processes several small projects at once, if
+        the processing type supports it.
+        """
+        return None
+
 
 delayed_processing_registry = Registry[type[DelayedProcessingBase]]()
 
@@ -116,7 +126,12 @@ def bucket_num_groups(num_groups: int) -> str:
     return "1"
 
 
-def process_in_batches(buffer: BufferProtocol, project_id: int, processing_type: str) -> None:
+def process_in_batches(
+    buffer: BufferProtocol,
+    project_id: int,
+    processing_type: str,
+    bulk_project_ids: list[int] | None = None,
+) -> None:
     """
     This will check the number of alertgroup_to_event_data items in the Redis buffer for a project.
 
@@ -130,6 +145,9 @@ def process_in_batches(buffer: BufferProtocol, project_id: int, processing_type:
     redis doesn't maintain the sort order of the hash keys.
 
     `processing_task` will fetch the batch from redis and process the rules.
+
+    If `bulk_project_ids` is given, projects that fit into a single batch are appended to it
+    instead of being scheduled, so they can be handed to `process_in_bulk` together.
     """
     batch_size = options.get("delayed_processing.batch_size")
     should_emit_logs = options.get("delayed_processing.emit_logs")
@@ -152,6 +170,9 @@ def process_in_batches(buffer: BufferProtocol, project_id: int, processing_type:
     metrics.distribution(f"{processing_type}.event_count", event_count)
 
     if event_count < batch_size:
+        if bulk_project_ids is not None:
+            bulk_project_ids.append(project_id)
+            return None
         return task.apply_async(
             kwargs={"project_id": project_id}, headers={"sentry-propagate-traces": False}
         )
@@ -186,6 +207,26 @@ def process_in_batches(buffer: BufferProtocol, project_id: int, processing_type:
             )
 
 
+def process_in_bulk(project_ids: list[int], processing_type: str, task: Task) -> None:
+    """
+    Schedule `task` for chunks of small projects, so that it can share Snuba queries between
+    them. Queries can only be shared within an organization, so projects of the same
+    organization are kept next to each other.
+    """
+    if not project_ids:
+        return
+
+    bulk_size = options.get("delayed_processing.bulk_project_count")
+    project_to_org = dict(
+        Project.objects.filter(id__in=project_ids).values_list("id", "organization_id")
+    )
+    project_ids = sorted(project_ids, key=lambda pid: (project_to_org.get(pid, 0), pid))
+    metrics.distribution(f"{processing_type}.bulk_project_count", len(project_ids))
+
+    for chunk in chunked(project_ids, bulk_size):
+        task.apply_async(kwargs={"project_ids": chunk}, headers={"sentry-propagate-traces": False})
+
+
 def process_buffer_for_type(processing_type: str, handler: type[DelayedProcessingBase]) -> None:
     """
     Process buffers for a specific processing type and handler.
@@ -222,8 +263,15 @@ def process_buffer_for_type(processing_type: str, handler: type[DelayedProcessin
             logger.info(log_name, extra={"project_ids": log_str})
 
         project_ids = list(all_project_ids_and_timestamps.keys())
-        for project_id in project_ids:
-            process_in_batches(buffer, project_id, processing_type)
+        bulk_task = handler.bulk_processing_task()
+        if bulk_task is not None and options.get("delayed_processing.bulk_project_count") > 1:
+            bulk_project_ids: list[int] = []
+            for project_id in project_ids:
+                process_in_batches(buffer, project_id, processing_type, bulk_project_ids)
+            process_in_bulk(bulk_project_ids, processing_type, bulk_task)
+        else:
+            for project_id in project_ids:
+                process_in_batches(buffer, project_id, processing_type)
 
         buffer.delete_keys(
             buffer_keys,
@@ -24,6 +24,7 @@ from sentry.rules.conditions.event_frequency import (
     DEFAULT_COMPARISON_INTERVAL,
     BaseEventFrequencyCondition,
     ComparisonType,
+    EventFrequencyCondition,
     EventFrequencyConditionData,
     percent_increase,
 )
@@ -664,49 +665,122 @@ def cleanup_redis_buffer(
         )
 
 
-@instrumented_task(
-    name="sentry.rules.processing.delayed_processing",
-    namespace=issues_tasks,
-    processing_deadline_duration=60,
-    retry=Retry(times=5, delay=5),
-    silo_mode=SiloMode.REGION,
-)
-def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **kwargs: Any) -> None:
+@dataclass
+class DelayedProjectData:
     """
-    Grab rules, groups, and events from the Redis buffer, evaluate the "slow" conditions in a bulk snuba query, and fire them if they pass
+    Everything read from the buffer and the database to evaluate the delayed rules of a project.
     """
-    sentry_sdk.get_current_scope().set_tag("project_id", project_id)
-    with sentry_sdk.start_span(
-        op="delayed_processing.prepare_data", name="Fetch data from buffers in delayed processing"
-    ):
-        project = fetch_project(project_id)
-        if not project:
-            return
 
-        log_config = LogConfig.create(project)
+    project: Project
+    log_config: LogConfig
+    rulegroup_to_event_data: dict[str, str]
+    rules_to_groups: DefaultDict[int, set[int]]
+    alert_rules: list[Rule]
+    condition_groups: dict[UniqueConditionQuery, DataAndGroups]
 
-        rulegroup_to_event_data = fetch_rulegroup_to_event_data(project_id, batch_key)
-        rules_to_groups = get_rules_to_groups(rulegroup_to_event_data)
-        alert_rules = fetch_alert_rules(list(rules_to_groups.keys()))
-        condition_groups = get_condition_query_groups(alert_rules, rules_to_groups)
-        logger.info(
-            "delayed_processing.condition_groups",
-            extra={
-                "condition_groups": len(condition_groups),
-                "project_id": project_id,
-                "rules_to_groups": rules_to_groups,
-            },
-        )
-    sentry_sdk.get_current_scope().set_tag("organization_slug", project.organization.slug)
 
-    with (
-        metrics.timer("delayed_processing.get_condition_group_results.duration"),
-        sentry_sdk.start_span(
-            op="delayed_processing.get_condition_group_results",
-            name="Fetch condition group results in delayed processing",
-        ),
-    ):
-        condition_group_results = get_condition_group_results(condition_groups, project)
+def fetch_project_data(project_id: int, batch_key: str | None = None) -> DelayedProjectData | None:
+    project = fetch_project(project_id)
+    if not project:
+        return None
+
+    log_config = LogConfig.create(project)
+
+    rulegroup_to_event_data = fetch_rulegroup_to_event_data(project_id, batch_key)
+    rules_to_groups = get_rules_to_groups(rulegroup_to_event_data)
+    alert_rules = fetch_alert_rules(list(rules_to_groups.keys()))
+    condition_groups = get_condition_query_groups(alert_rules, rules_to_groups)
+    logger.info(
+        "delayed_processing.condition_groups",
+        extra={
+            "condition_groups": len(condition_groups),
+            "project_id": project_id,
+            "rules_to_groups": rules_to_groups,
+        },
+    )
+    return DelayedProjectData(
+        project=project,
+        log_config=log_config,
+        rulegroup_to_event_data=rulegroup_to_event_data,
+        rules_to_groups=rules_to_groups,
+        alert_rules=alert_rules,
+        condition_groups=condition_groups,
+    )
+
+
+def get_bulk_condition_group_results(
+    projects_data: list[DelayedProjectData],
+) -> dict[int, dict[UniqueConditionQuery, dict[int, int | float]]]:
+    """
+    Like `get_condition_group_results` for several projects at once. Group ids are unique across
+    projects, so `EventFrequencyCondition` queries of projects in the same organization are
+    merged into a single query over all of their groups, and the result is split back up per
+    project. Other conditions depend on their project or rule and are queried per project.
+
+    Queries are not shared across organizations, as Snuba attributes and rate limits queries
+    by organization.
+    """
+    results: dict[int, dict[UniqueConditionQuery, dict[int, int | float]]] = {}
+    shared: dict[tuple[int, UniqueConditionQuery], tuple[Project, DataAndGroups]] = {}
+    num_queries = 0
+
+    for data in projects_data:
+        project = data.project
+        own_condition_groups: dict[UniqueConditionQuery, DataAndGroups] = {}
+        for unique_condition, data_and_groups in data.condition_groups.items():
+            if unique_condition.cls_id != EventFrequencyCondition.id:
+                own_condition_groups[unique_condition] = data_and_groups
+                continue
+
+            num_queries += 1
+            key = (project.organization_id, unique_condition)
+            if key in shared:
+                shared[key][1].group_ids.update(data_and_groups.group_ids)
+            else:
+                shared[key] = (
+                    project,
+                    data_and_groups._replace(group_ids=set(data_and_groups.group_ids)),
+                )
+
+        results[project.id] = get_condition_group_results(own_condition_groups, project) or {}
+
+    metrics.incr("delayed_processing.bulk.shared_queries", amount=num_queries - len(shared))
+
+    shared_results: dict[tuple[int, UniqueConditionQuery], dict[int, int | float]] = {}
+    for key, (project, data_and_groups) in shared.items():
+        unique_condition = key[1]
+        query_results = get_condition_group_results({unique_condition: data_and_groups}, project)
+        shared_results[key] = (query_results or {}).get(unique_condition, {})
+
+    for data in projects_data:
+        project = data.project
+        for unique_condition, data_and_groups in data.condition_groups.items():
+            if unique_condition.cls_id != EventFrequencyCondition.id:
+                continue
+
+            query_results = shared_results[(project.organization_id, unique_condition)]
+            results[project.id][unique_condition] = {
+                group_id: query_results[group_id]
+                for group_id in data_and_groups.group_ids
+                if group_id in query_results
+            }
+
+    return results
+
+
+def process_project_results(
+    data: DelayedProjectData,
+    condition_group_results: dict[UniqueConditionQuery, dict[int, int | float]] | None,
+    batch_key: str | None = None,
+) -> None:
+    """
+    Fire the rules of a project whose conditions passed and clean up its buffer.
+    """
+    project = data.project
+    project_id = project.id
+    log_config = data.log_config
+    rules_to_groups = data.rules_to_groups
+    alert_rules = data.alert_rules
 
     if log_config.num_events_issue_debugging:
         serialized_results = (
@@ -759,7 +833,9 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
     with sentry_sdk.start_span(
         op="delayed_processing.fire_rules", name="Fire rules in delayed processing"
     ):
-        parsed_rulegroup_to_event_data = parse_rulegroup_to_event_data(rulegroup_to_event_data)
+        parsed_rulegroup_to_event_data = parse_rulegroup_to_event_data(
+            data.rulegroup_to_event_data
+        )
         with metrics.timer("delayed_processing.fire_rules.duration"):
             fire_rules(
                 log_config, rules_to_fire, parsed_rulegroup_to_event_data, alert_rules, project
@@ -772,6 +848,82 @@ def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **k
         cleanup_redis_buffer(log_config, project, rules_to_groups, batch_key)
 
 
+@instrumented_task(
+    name="sentry.rules.processing.delayed_processing",
+    namespace=issues_tasks,
+    processing_deadline_duration=60,
+    retry=Retry(times=5, delay=5),
+    silo_mode=SiloMode.REGION,
+)
+def apply_delayed(project_id: int, batch_key: str | None = None, *args: Any, **kwargs: Any) -> None:
+    """
+    Grab rules, groups, and events from the Redis buffer, evaluate the "slow" conditions in a bulk snuba query, and fire them if they pass
+    """
+    sentry_sdk.get_current_scope().set_tag("project_id", project_id)
+    with sentry_sdk.start_span(
+        op="delayed_processing.prepare_data", name="Fetch data from buffers in delayed processing"
+    ):
+        data = fetch_project_data(project_id, batch_key)
+        if not data:
+            return
+
+    project = data.project
+    sentry_sdk.get_current_scope().set_tag("organization_slug", project.organization.slug)
+
+    with (
+        metrics.timer("delayed_processing.get_condition_group_results.duration"),
+        sentry_sdk.start_span(
+            op="delayed_processing.get_condition_group_results",
+            name="Fetch condition group results in delayed processing",
+        ),
+    ):
+        condition_group_results = get_condition_group_results(data.condition_groups, project)
+
+    process_project_results(data, condition_group_results, batch_key)
+
+
+@instrumented_task(
+    name="sentry.rules.processing.delayed_processing.apply_delayed_bulk",
+    namespace=issues_tasks,
+    processing_deadline_duration=120,
+    retry=Retry(times=5, delay=5),
+    silo_mode=SiloMode.REGION,
+)
+def apply_delayed_bulk(project_ids: list[int], *args: Any, **kwargs: Any) -> None:
+    """
+    Run `apply_delayed` for several small projects, sharing their frequency condition queries.
+    """
+    with sentry_sdk.start_span(
+        op="delayed_processing.prepare_data", name="Fetch data from buffers in delayed processing"
+    ):
+        projects_data = [
+            data for project_id in project_ids if (data := fetch_project_data(project_id))
+        ]
+
+    with (
+        metrics.timer("delayed_processing.get_bulk_condition_group_results.duration"),
+        sentry_sdk.start_span(
+            op="delayed_processing.get_condition_group_results",
+            name="Fetch condition group results in delayed processing",
+        ),
+    ):
+        results = get_bulk_condition_group_results(projects_data)
+
+    for data in projects_data:
+        # A failing project must not hold back the others. Its id is no longer in the buffer's
+        # project list, so it is retried on its own by `apply_delayed`, which reads what is left
+        # of its buffer.
+        try:
+            process_project_results(data, results.get(data.project.id))
+        except Exception:
+            logger.exception(
+                "delayed_processing.bulk_project_failed", extra={"project_id": data.project.id}
+            )
+            apply_delayed.apply_async(
+                kwargs={"project_id": data.project.id}, headers={"sentry-propagate-traces": False}
+            )
+
+
 @delayed_processing_registry.register("delayed_processing")  # default delayed processing
 class DelayedRule(DelayedProcessingBase):
     buffer_key = PROJECT_ID_BUFFER_LIST_KEY
@@ -788,3 +940,7 @@ class DelayedRule(DelayedProcessingBase):
     @staticmethod
     def buffer_backend() -> BufferProtocol:
         return buffer.backend
+
+    @staticmethod
+    def bulk_processing_task() -> Task:
+        return apply_delayed_bulk
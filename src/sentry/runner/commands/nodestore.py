@@ -0,0 +1,85 @@
+import os
+
+import click
+
+from sentry.runner.decorators import configuration
+
+
+@click.group()
+def nodestore() -> None:
+    """Tools for interacting with the node storage."""
+
+
+@nodestore.command("train-dictionary")
+@click.option("--project", "project_ids", type=int, multiple=True, required=True)
+@click.option("--platform", required=True, help="Platform to sample events of.")
+@click.option("--samples", default=5000, show_default=True, help="Number of nodes to sample.")
+@click.option(
+    "--dict-size", default=112640, show_default=True, help="Size of the dictionary in bytes."
+)
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False),
+    help="Defaults to SENTRY_NODESTORE_DICTIONARY_DIR.",
+)
+@configuration
+def train_dictionary(
+    project_ids: tuple[int, ...],
+    platform: str,
+    samples: int,
+    dict_size: int,
+    output_dir: str | None,
+) -> None:
+    """
+    Train a zstd dictionary for the nodestore codec from sampled event nodes.
+
+    The dictionary is written to `<output-dir>/<platform>.<version>.zdict`
+    and supersedes older dictionaries of the platform for writes once it is
+    deployed to every process's SENTRY_NODESTORE_DICTIONARY_DIR. Keep older
+    dictionaries around, stored nodes reference them by id.
+    """
+    from django.conf import settings
+    from django.utils import timezone
+
+    from sentry.services import eventstore
+    from sentry.services.eventstore.models import Event
+    from sentry.services.nodestore import backend as nodestore
+    from sentry.services.nodestore.codecs import (
+        DICTIONARY_SUFFIX,
+        decode_payload,
+        train_dictionary,
+    )
+
+    output_dir = output_dir or settings.SENTRY_NODESTORE_DICTIONARY_DIR
+    if not output_dir:
+        raise click.UsageError("--output-dir is required when no dictionary dir is configured.")
+
+    events = eventstore.backend.get_unfetched_events(
+        filter=eventstore.Filter(
+            project_ids=list(project_ids), conditions=[["platform", "=", platform]]
+        ),
+        limit=samples,
+        referrer="nodestore.train_dictionary",
+        tenant_ids={"referrer": "nodestore.train_dictionary"},
+    )
+    node_ids = [Event.generate_node_id(event.project_id, event.event_id) for event in events]
+
+    payloads = []
+    for node_id in node_ids:
+        value = nodestore.get_bytes(node_id)
+        if value:
+            payloads.append(decode_payload(value))
+
+    if not payloads:
+        raise click.ClickException("No nodes found to train on.")
+
+    click.echo(f"Training {dict_size} byte dictionary from {len(payloads)} nodes")
+    dictionary = train_dictionary(payloads, dict_size)
+
+    os.makedirs(output_dir, exist_ok=True)
+    version = timezone.now().strftime("%Y%m%d%H%M%S")
+    path = os.path.join(output_dir, f"{platform}.{version}{DICTIONARY_SUFFIX}")
+    with open(path, "wb") as f:
+        f.write(dictionary.as_bytes())
+
+    click.echo(f"Wrote dictionary {dictionary.dict_id()} to {path}")
@@ -4,6 +4,7 @@ import logging
 import os
 import random
 import signal
+import socket
 import time
 from typing import Any
 
@@ -132,9 +133,21 @@ def web(
     help="The rediscluster name to store run state in.",
     default="default",
 )
+@click.option(
+    "--partitions",
+    help="Run multiple schedulers together by splitting schedules into this many partitions. Every scheduler instance must use the same value. 0 runs a single scheduler.",
+    default=0,
+)
+@click.option(
+    "--runner-id",
+    help="Unique id of this scheduler instance when using partitions. Defaults to hostname and pid.",
+    default=None,
+)
 @log_options()
 @configuration
-def taskworker_scheduler(redis_cluster: str, **options: Any) -> None:
+def taskworker_scheduler(
+    redis_cluster: str, partitions: int, runner_id: str | None, **options: Any
+) -> None:
     """
     Run a scheduler for taskworkers
 
@@ -143,14 +156,23 @@ def taskworker_scheduler(redis_cluster: str, **options: Any) -> None:
     from django.conf import settings
 
     from sentry.taskworker.runtime import app
-    from sentry.taskworker.scheduler.runner import RunStorage, ScheduleRunner
+    from sentry.taskworker.scheduler.runner import RunStorage, ScheduleRunner, ScheduleSharding
     from sentry.utils.redis import redis_clusters
 
     app.load_modules()
-    run_storage = RunStorage(redis_clusters.get(redis_cluster))
+    redis = redis_clusters.get(redis_cluster)
+    run_storage = RunStorage(redis)
+
+    sharding = None
+    if partitions:
+        sharding = ScheduleSharding(
+            redis,
+            runner_id=runner_id or f"{socket.gethostname()}:{os.getpid()}",
+            partition_count=partitions,
+        )
 
     with managed_bgtasks(role="taskworker-scheduler"):
-        runner = ScheduleRunner(app, run_storage)
+        runner = ScheduleRunner(app, run_storage, sharding=sharding)
         for key, schedule_data in settings.TASKWORKER_SCHEDULES.items():
             runner.add(key, schedule_data)
 
@@ -162,9 +184,13 @@ def taskworker_scheduler(redis_cluster: str, **options: Any) -> None:
         )
 
         runner.log_startup()
-        while True:
-            sleep_time = runner.tick()
-            time.sleep(sleep_time)
+        try:
+            while True:
+                sleep_time = runner.tick()
+                time.sleep(sleep_time)
+        finally:
+            if sharding is not None:
+                sharding.release()
 
 
 @run.command()
@@ -300,6 +326,28 @@ def worker(ignore_unknown_queues: bool, **options: Any) -> None:
     help="The number of seconds before touching the health check file",
     default=taskworker_constants.DEFAULT_WORKER_HEALTH_CHECK_SEC_PER_TOUCH,
 )
+@click.option(
+    "--fetch-batch-size",
+    help="The maximum number of tasks to fetch from the broker at once. Tasks that do not fit into the child tasks queue are kept in a local prefetch buffer",
+    default=taskworker_constants.DEFAULT_WORKER_FETCH_BATCH_SIZE,
+)
+@click.option(
+    "--process-type",
+    help="How child processes are started. Forked children can share preloaded modules with the parent",
+    type=click.Choice(["spawn", "fork"]),
+    default="spawn",
+)
+@click.option(
+    "--preload",
+    help="Import task modules and warm caches before forking child processes. Requires --process-type=fork",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--standby-children",
+    help="Number of initialized child processes kept in reserve to replace children that exit",
+    default=0,
+)
 @log_options()
 @configuration
 def taskworker(**options: Any) -> None:
@@ -324,6 +372,10 @@ def run_taskworker(
     processing_pool_name: str,
     health_check_file_path: str | None,
     health_check_sec_per_touch: float,
+    fetch_batch_size: int,
+    process_type: str,
+    preload: bool,
+    standby_children: int,
     **options: Any,
 ) -> None:
     """
@@ -347,6 +399,10 @@ def run_taskworker(
             processing_pool_name=processing_pool_name,
             health_check_file_path=health_check_file_path,
             health_check_sec_per_touch=health_check_sec_per_touch,
+            fetch_batch_size=fetch_batch_size,
+            process_type=process_type,
+            preload=preload,
+            standby_children=standby_children,
             **options,
         )
         exitcode = worker.start()
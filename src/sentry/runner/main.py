@@ -55,6 +55,7 @@ for cmd in map(
         "sentry.runner.commands.help.help",
         "sentry.runner.commands.init.init",
         "sentry.runner.commands.migrations.migrations",
+        "sentry.runner.commands.nodestore.nodestore",
         "sentry.runner.commands.plugins.plugins",
         "sentry.runner.commands.repair.repair",
         "sentry.runner.commands.rpcschema.rpcschema",
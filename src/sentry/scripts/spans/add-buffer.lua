@@ -18,179 +18,201 @@ This implies that it has to operate according to these steps:
 3. Update the redirect set to reflect the current state of the tree.
 
 
+Several subsegments of the same trace can be added in one call, they are
+processed in order exactly as if the script was called once per subsegment.
+
 KEYS:
 - "project_id:trace_id" -- just for redis-cluster routing, all keys that the script uses are sharded like this/have this hashtag.
 
 ARGS:
-- num_spans -- int -- Number of spans in the subsegment.
-- parent_span_id -- str -- The parent span id of the root of the subsegment.
-- has_root_span -- "true" or "false" -- Whether the subsegment contains the root of the segment.
 - set_timeout -- int
 - max_segment_bytes -- int -- The maximum number of bytes the segment can contain.
-- byte_count -- int -- The total number of bytes in the subsegment.
-- *span_id -- str[] -- The span ids in the subsegment.
+- num_subsegments -- int -- Number of subsegments that follow.
+- For each subsegment:
+  - num_spans -- int -- Number of spans in the subsegment.
+  - parent_span_id -- str -- The parent span id of the root of the subsegment.
+  - has_root_span -- "true" or "false" -- Whether the subsegment contains the root of the segment.
+  - byte_count -- int -- The total number of bytes in the subsegment.
+  - *span_id -- str[] -- The span ids in the subsegment.
 
 RETURNS:
-- redirect_depth -- int
+A list with one entry per subsegment, each containing:
 - set_key -- str
 - has_root_span -- bool
-- latency_ms -- number (milliseconds elapsed during script execution)
+- latency_ms -- number (milliseconds elapsed while adding the subsegment)
+- latency_table -- list of (step, latency_ms) pairs
+- metrics_table -- list of (metric, value) pairs
 
 ]]--
 
-local project_and_trace = KEYS[1]
-
-local num_spans = ARGV[1]
-local parent_span_id = ARGV[2]
-local has_root_span = ARGV[3] == "true"
-local set_timeout = tonumber(ARGV[4])
-local max_segment_bytes = tonumber(ARGV[5])
-local byte_count = tonumber(ARGV[6])
-local NUM_ARGS = 6
-
 local function get_time_ms()
     local time = redis.call("TIME")
     return tonumber(time[1]) * 1000 + tonumber(time[2]) / 1000
 end
 
--- Capture start time for latency measurement
-local start_time_ms = get_time_ms()
+local project_and_trace = KEYS[1]
 
-local set_span_id = parent_span_id
-local redirect_depth = 0
+local set_timeout = tonumber(ARGV[1])
+local max_segment_bytes = tonumber(ARGV[2])
+local num_subsegments = tonumber(ARGV[3])
 
 local main_redirect_key = string.format("span-buf:sr:{%s}", project_and_trace)
 
--- Navigates the tree up to the highest level parent span we can find. Such
--- span is needed to know the segment we need to merge the subsegment into.
-for i = 0, 100 do -- Theoretic maximum depth of redirects is 100
-    local new_set_span = redis.call("hget", main_redirect_key, set_span_id)
-    redirect_depth = i
-    if not new_set_span or new_set_span == set_span_id then
-        break
-    end
+local function add_subsegment(parent_span_id, has_root_span, byte_count, span_ids)
+    -- Capture start time for latency measurement
+    local start_time_ms = get_time_ms()
 
-    set_span_id = new_set_span
-end
+    local set_span_id = parent_span_id
+    local redirect_depth = 0
 
-local latency_table = {}
-local metrics_table = {}
-table.insert(metrics_table, {"redirect_table_size", redis.call("hlen", main_redirect_key)})
-table.insert(metrics_table, {"redirect_depth", redirect_depth})
-local redirect_end_time_ms = get_time_ms()
-table.insert(latency_table, {"redirect_step_latency_ms", redirect_end_time_ms - start_time_ms})
-
-local set_key = string.format("span-buf:z:{%s}:%s", project_and_trace, set_span_id)
-local parent_key = string.format("span-buf:z:{%s}:%s", project_and_trace, parent_span_id)
-
--- Reset the set expiry as we saw a new subsegment for this set
-local has_root_span_key = string.format("span-buf:hrs:%s", set_key)
-has_root_span = has_root_span or redis.call("get", has_root_span_key) == "1"
-if has_root_span then
-    redis.call("setex", has_root_span_key, set_timeout, "1")
-end
-
-local hset_args = {}
-local sunionstore_args = {}
-
--- Merge the subsegment into the segment we are assembling.
--- Merging the spans (`sunionstore_args`) is needed to compose the payloads in
--- the same segment for them to be flushed later.
--- Updating the redirect set instead is needed when we receive higher level spans
--- for a tree we are assembling as the segment root each span points at in the
--- redirect set changes when a new root is found.
-if set_span_id ~= parent_span_id and redis.call("zcard", parent_key) > 0 then
-    table.insert(sunionstore_args, parent_key)
-end
-
-for i = NUM_ARGS + 1, NUM_ARGS + num_spans do
-    local span_id = ARGV[i]
-    local is_root_span = span_id == parent_span_id
+    -- Navigates the tree up to the highest level parent span we can find. Such
+    -- span is needed to know the segment we need to merge the subsegment into.
+    for i = 0, 100 do -- Theoretic maximum depth of redirects is 100
+        local new_set_span = redis.call("hget", main_redirect_key, set_span_id)
+        redirect_depth = i
+        if not new_set_span or new_set_span == set_span_id then
+            break
+        end
 
-    table.insert(hset_args, span_id)
-    table.insert(hset_args, set_span_id)
+        set_span_id = new_set_span
+    end
 
-    if not is_root_span then
-        local span_key = string.format("span-buf:z:{%s}:%s", project_and_trace, span_id)
-        table.insert(sunionstore_args, span_key)
+    local latency_table = {}
+    local metrics_table = {}
+    table.insert(metrics_table, {"redirect_table_size", redis.call("hlen", main_redirect_key)})
+    table.insert(metrics_table, {"redirect_depth", redirect_depth})
+    local redirect_end_time_ms = get_time_ms()
+    table.insert(latency_table, {"redirect_step_latency_ms", redirect_end_time_ms - start_time_ms})
+
+    local set_key = string.format("span-buf:z:{%s}:%s", project_and_trace, set_span_id)
+    local parent_key = string.format("span-buf:z:{%s}:%s", project_and_trace, parent_span_id)
+
+    -- Reset the set expiry as we saw a new subsegment for this set
+    local has_root_span_key = string.format("span-buf:hrs:%s", set_key)
+    has_root_span = has_root_span or redis.call("get", has_root_span_key) == "1"
+    if has_root_span then
+        redis.call("setex", has_root_span_key, set_timeout, "1")
     end
-end
 
-redis.call("hset", main_redirect_key, unpack(hset_args))
-redis.call("expire", main_redirect_key, set_timeout)
+    local hset_args = {}
+    local sunionstore_args = {}
+
+    -- Merge the subsegment into the segment we are assembling.
+    -- Merging the spans (`sunionstore_args`) is needed to compose the payloads in
+    -- the same segment for them to be flushed later.
+    -- Updating the redirect set instead is needed when we receive higher level spans
+    -- for a tree we are assembling as the segment root each span points at in the
+    -- redirect set changes when a new root is found.
+    if set_span_id ~= parent_span_id and redis.call("zcard", parent_key) > 0 then
+        table.insert(sunionstore_args, parent_key)
+    end
 
-local sunionstore_args_end_time_ms = get_time_ms()
-table.insert(latency_table, {"sunionstore_args_step_latency_ms", sunionstore_args_end_time_ms - redirect_end_time_ms})
+    for _, span_id in ipairs(span_ids) do
+        local is_root_span = span_id == parent_span_id
 
--- Merge spans into the parent span set.
--- Used outside the if statement
-local zpopmin_end_time_ms = -1
-if #sunionstore_args > 0 then
-    local start_output_size = redis.call("zcard", set_key)
-    local output_size = redis.call("zunionstore", set_key, #sunionstore_args + 1, set_key, unpack(sunionstore_args))
-    redis.call("unlink", unpack(sunionstore_args))
+        table.insert(hset_args, span_id)
+        table.insert(hset_args, set_span_id)
 
-    local zunionstore_end_time_ms = get_time_ms()
-    table.insert(latency_table, {"zunionstore_step_latency_ms", zunionstore_end_time_ms - sunionstore_args_end_time_ms})
-    table.insert(metrics_table, {"parent_span_set_before_size", start_output_size})
-    table.insert(metrics_table, {"parent_span_set_after_size", output_size})
+        if not is_root_span then
+            local span_key = string.format("span-buf:z:{%s}:%s", project_and_trace, span_id)
+            table.insert(sunionstore_args, span_key)
+        end
+    end
 
-    -- Merge ingested count keys for merged spans
-    local ingested_count_key = string.format("span-buf:ic:%s", set_key)
-    local ingested_byte_count_key = string.format("span-buf:ibc:%s", set_key)
-    for i = 1, #sunionstore_args do
-        local merged_key = sunionstore_args[i]
-        local merged_ic_key = string.format("span-buf:ic:%s", merged_key)
-        local merged_ibc_key = string.format("span-buf:ibc:%s", merged_key)
-        local merged_count = redis.call("get", merged_ic_key)
-        local merged_byte_count = redis.call("get", merged_ibc_key)
-        if merged_count then
-            redis.call("incrby", ingested_count_key, merged_count)
+    redis.call("hset", main_redirect_key, unpack(hset_args))
+    redis.call("expire", main_redirect_key, set_timeout)
+
+    local sunionstore_args_end_time_ms = get_time_ms()
+    table.insert(latency_table, {"sunionstore_args_step_latency_ms", sunionstore_args_end_time_ms - redirect_end_time_ms})
+
+    -- Merge spans into the parent span set.
+    -- Used outside the if statement
+    local zpopmin_end_time_ms = -1
+    if #sunionstore_args > 0 then
+        local start_output_size = redis.call("zcard", set_key)
+        local output_size = redis.call("zunionstore", set_key, #sunionstore_args + 1, set_key, unpack(sunionstore_args))
+        redis.call("unlink", unpack(sunionstore_args))
+
+        local zunionstore_end_time_ms = get_time_ms()
+        table.insert(latency_table, {"zunionstore_step_latency_ms", zunionstore_end_time_ms - sunionstore_args_end_time_ms})
+        table.insert(metrics_table, {"parent_span_set_before_size", start_output_size})
+        table.insert(metrics_table, {"parent_span_set_after_size", output_size})
+
+        -- Merge ingested count keys for merged spans
+        local ingested_count_key = string.format("span-buf:ic:%s", set_key)
+        local ingested_byte_count_key = string.format("span-buf:ibc:%s", set_key)
+        for i = 1, #sunionstore_args do
+            local merged_key = sunionstore_args[i]
+            local merged_ic_key = string.format("span-buf:ic:%s", merged_key)
+            local merged_ibc_key = string.format("span-buf:ibc:%s", merged_key)
+            local merged_count = redis.call("get", merged_ic_key)
+            local merged_byte_count = redis.call("get", merged_ibc_key)
+            if merged_count then
+                redis.call("incrby", ingested_count_key, merged_count)
+            end
+            if merged_byte_count then
+                redis.call("incrby", ingested_byte_count_key, merged_byte_count)
+            end
+            redis.call("del", merged_ic_key)
+            redis.call("del", merged_ibc_key)
         end
-        if merged_byte_count then
-            redis.call("incrby", ingested_byte_count_key, merged_byte_count)
+
+        local arg_cleanup_end_time_ms = get_time_ms()
+        table.insert(latency_table, {"arg_cleanup_step_latency_ms", arg_cleanup_end_time_ms - zunionstore_end_time_ms})
+
+        local zpopcalls = 0
+        while (redis.call("memory", "usage", set_key) or 0) > max_segment_bytes do
+            redis.call("zpopmin", set_key)
+            zpopcalls = zpopcalls + 1
         end
-        redis.call("del", merged_ic_key)
-        redis.call("del", merged_ibc_key)
+
+        zpopmin_end_time_ms = get_time_ms()
+        table.insert(latency_table, {"zpopmin_step_latency_ms", zpopmin_end_time_ms - arg_cleanup_end_time_ms})
+        table.insert(metrics_table, {"zpopcalls", zpopcalls})
     end
 
-    local arg_cleanup_end_time_ms = get_time_ms()
-    table.insert(latency_table, {"arg_cleanup_step_latency_ms", arg_cleanup_end_time_ms - zunionstore_end_time_ms})
 
-    local zpopcalls = 0
-    while (redis.call("memory", "usage", set_key) or 0) > max_segment_bytes do
-        redis.call("zpopmin", set_key)
-        zpopcalls = zpopcalls + 1
+    -- Track total number of spans ingested for this segment
+    local ingested_count_key = string.format("span-buf:ic:%s", set_key)
+    local ingested_byte_count_key = string.format("span-buf:ibc:%s", set_key)
+    redis.call("incrby", ingested_count_key, #span_ids)
+    redis.call("incrby", ingested_byte_count_key, byte_count)
+    redis.call("expire", ingested_count_key, set_timeout)
+    redis.call("expire", ingested_byte_count_key, set_timeout)
+
+    redis.call("expire", set_key, set_timeout)
+
+    local ingested_count_end_time_ms = get_time_ms()
+    local ingested_count_step_latency_ms = 0
+    if zpopmin_end_time_ms >= 0 then
+        ingested_count_step_latency_ms = ingested_count_end_time_ms - zpopmin_end_time_ms
+    else
+        ingested_count_step_latency_ms = ingested_count_end_time_ms - sunionstore_args_end_time_ms
     end
+    table.insert(latency_table, {"ingested_count_step_latency_ms", ingested_count_step_latency_ms})
 
-    zpopmin_end_time_ms = get_time_ms()
-    table.insert(latency_table, {"zpopmin_step_latency_ms", zpopmin_end_time_ms - arg_cleanup_end_time_ms})
-    table.insert(metrics_table, {"zpopcalls", zpopcalls})
-end
-
+    -- Capture end time and calculate latency in milliseconds
+    local end_time_ms = get_time_ms()
+    local latency_ms = end_time_ms - start_time_ms
+    table.insert(latency_table, {"total_step_latency_ms", latency_ms})
 
--- Track total number of spans ingested for this segment
-local ingested_count_key = string.format("span-buf:ic:%s", set_key)
-local ingested_byte_count_key = string.format("span-buf:ibc:%s", set_key)
-redis.call("incrby", ingested_count_key, num_spans)
-redis.call("incrby", ingested_byte_count_key, byte_count)
-redis.call("expire", ingested_count_key, set_timeout)
-redis.call("expire", ingested_byte_count_key, set_timeout)
+    return {set_key, has_root_span, latency_ms, latency_table, metrics_table}
+end
 
-redis.call("expire", set_key, set_timeout)
+local results = {}
+local arg_index = 4
+for _ = 1, num_subsegments do
+    local num_spans = tonumber(ARGV[arg_index])
+    local parent_span_id = ARGV[arg_index + 1]
+    local has_root_span = ARGV[arg_index + 2] == "true"
+    local byte_count = tonumber(ARGV[arg_index + 3])
+    local span_ids = {}
+    for i = arg_index + 4, arg_index + 3 + num_spans do
+        table.insert(span_ids, ARGV[i])
+    end
+    arg_index = arg_index + 4 + num_spans
 
-local ingested_count_end_time_ms = get_time_ms()
-local ingested_count_step_latency_ms = 0
-if zpopmin_end_time_ms >= 0 then
-    ingested_count_step_latency_ms = ingested_count_end_time_ms - zpopmin_end_time_ms
-else
-    ingested_count_step_latency_ms = ingested_count_end_time_ms - sunionstore_args_end_time_ms
+    table.insert(results, add_subsegment(parent_span_id, has_root_span, byte_count, span_ids))
 end
-table.insert(latency_table, {"ingested_count_step_latency_ms", ingested_count_step_latency_ms})
-
--- Capture end time and calculate latency in milliseconds
-local end_time_ms = get_time_ms()
-local latency_ms = end_time_ms - start_time_ms
-table.insert(latency_table, {"total_step_latency_ms", latency_ms})
 
-return {set_key, has_root_span, latency_ms, latency_table, metrics_table}
+return results
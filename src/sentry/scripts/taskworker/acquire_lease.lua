@@ -0,0 +1,23 @@
+-- Acquire or renew a scheduler partition lease.
+--
+-- keys:
+--   * the lease key of the partition
+-- args:
+--   * owner (the id of the scheduler instance requesting the lease)
+--   * duration (lease duration in seconds)
+--
+-- Returns 1 when the lease is held by `owner` afterwards, 0 otherwise.
+
+local key = KEYS[1]
+local owner = ARGV[1]
+local duration = tonumber(ARGV[2])
+
+local current = redis.call('GET', key)
+if not current then
+    redis.call('SET', key, owner, 'EX', duration)
+    return 1
+elseif current == owner then
+    redis.call('EXPIRE', key, duration)
+    return 1
+end
+return 0
@@ -0,0 +1,14 @@
+-- Release a scheduler partition lease if it is held by `owner`.
+--
+-- keys:
+--   * the lease key of the partition
+-- args:
+--   * owner (the id of the scheduler instance releasing the lease)
+
+local key = KEYS[1]
+local owner = ARGV[1]
+
+if redis.call('GET', key) == owner then
+    return redis.call('DEL', key)
+end
+return 0
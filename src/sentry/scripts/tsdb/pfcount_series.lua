@@ -0,0 +1,6 @@
+-- Returns the cardinality of each HyperLogLog in KEYS, in the order given.
+local counts = {}
+for i, key in ipairs(KEYS) do
+    counts[i] = redis.call('PFCOUNT', key)
+end
+return counts
@@ -54,6 +54,44 @@ def valid_metric_name(name: str | None) -> bool:
     return True
 
 
+def find_raw_value(payload: bytes, value: Any) -> bytes | None:
+    """
+    Locate the serialized list or gauge object of the top-level `value` field in
+    an ingest metric payload, so that it can be copied into the output as is
+    instead of being serialized again.
+
+    Returns None for scalar values and whenever the field cannot be located
+    unambiguously, e.g. because a tag is called "value" too.
+    """
+    if not isinstance(value, (list, dict)) or payload.count(b'"value"') != 1:
+        return None
+
+    start = payload.index(b'"value"') + len(b'"value"')
+    colon = payload.find(b":", start)
+    if colon == -1 or payload[start:colon].strip():
+        return None
+    start = colon + 1
+    while start < len(payload) and payload[start] in b" \t\r\n":
+        start += 1
+
+    # Values only contain numbers, so the first closing bracket ends them.
+    if isinstance(value, list) and payload.startswith(b"[", start):
+        end = payload.find(b"]", start) + 1
+        separators = len(value) - 1 if value else 0
+        separator = b","
+    elif isinstance(value, dict) and payload.startswith(b"{", start):
+        end = payload.find(b"}", start) + 1
+        separators = len(value)
+        separator = b":"
+    else:
+        return None
+
+    raw = payload[start:end]
+    if end <= start or raw.count(separator) != separators:
+        return None
+    return raw
+
+
 def _should_sample_debug_log() -> bool:
     rate: float = settings.SENTRY_METRICS_INDEXER_DEBUG_LOG_SAMPLE_RATE
     return (rate > 0) and random.random() <= rate
@@ -113,6 +151,10 @@ class IndexerBatch:
         self.invalid_msg_meta: set[BrokerMeta] = set()
         self.filtered_msg_meta: set[BrokerMeta] = set()
         self.parsed_payloads_by_meta: MutableMapping[BrokerMeta, ParsedMessage] = {}
+        # Serialized `value` fields that are copied into the output messages
+        # without serializing them again, see `find_raw_value`.
+        self.splice_raw_values = options.get("sentry-metrics.indexer.reconstruct.splice-raw-values")
+        self.raw_values_by_meta: MutableMapping[BrokerMeta, bytes] = {}
 
         self._extract_messages()
 
@@ -148,6 +190,10 @@ class IndexerBatch:
                 parsed_payload = self._extract_message(msg)
                 self._validate_message(parsed_payload)
                 self.parsed_payloads_by_meta[broker_meta] = parsed_payload
+                if self.splice_raw_values:
+                    raw_value = find_raw_value(msg.payload.value, parsed_payload["value"])
+                    if raw_value is not None:
+                        self.raw_values_by_meta[broker_meta] = raw_value
             except Exception as e:
                 self.invalid_msg_meta.add(broker_meta)
                 logger.exception(
@@ -290,6 +336,10 @@ class IndexerBatch:
     ) -> IndexerOutputMessageBatch:
         new_messages: MutableSequence[Message[RoutingPayload | KafkaPayload | InvalidMessage]] = []
         cogs_usage: MutableMapping[UseCaseID, int] = defaultdict(int)
+        # Raw values can only be spliced in with orjson.
+        use_orjson = self.splice_raw_values or in_random_rollout(
+            "sentry-metrics.indexer.reconstruct.enable-orjson"
+        )
 
         for message in self.outer_message.payload:
             used_tags: set[str] = set()
@@ -308,6 +358,7 @@ class IndexerBatch:
                 )
                 continue
             old_payload_value = self.parsed_payloads_by_meta.pop(broker_meta)
+            raw_value = self.raw_values_by_meta.pop(broker_meta, None)
 
             metric_name = old_payload_value["name"]
             org_id = old_payload_value["org_id"]
@@ -480,7 +531,11 @@ class IndexerBatch:
                 with metrics.timer(
                     "metrics_consumer.reconstruct_messages.build_new_payload.json_step"
                 ):
-                    if in_random_rollout("sentry-metrics.indexer.reconstruct.enable-orjson"):
+                    if raw_value is not None:
+                        serialized_msg = orjson.dumps(
+                            {**new_payload_value, "value": orjson.Fragment(raw_value)}
+                        )
+                    elif use_orjson:
                         serialized_msg = orjson.dumps(new_payload_value)
                     else:
                         serialized_msg = rapidjson.dumps(new_payload_value).encode()
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
+import itertools
 import logging
+import math
 import random
+import time
+from collections import OrderedDict
 from collections.abc import Collection, Iterable, Mapping, MutableMapping, Sequence
 from datetime import UTC, datetime, timedelta
 
@@ -34,6 +39,9 @@ _INDEXER_CACHE_DOUBLE_WRITE_METRIC = "sentry_metrics.indexer.memcache.double-wri
 _INDEXER_CACHE_DOUBLE_READ_METRIC = "sentry_metrics.indexer.memcache.new-schema-read"
 _INDEXER_CACHE_STALE_KEYS_METRIC = "sentry_metrics.indexer.memcache.stale-keys"
 
+_INDEXER_LOCAL_CACHE_METRIC = "sentry_metrics.indexer.local_cache"
+_INDEXER_ABSENT_FILTER_METRIC = "sentry_metrics.indexer.absent_filter.skipped"
+
 # only used to compare to the older version of the PGIndexer
 _INDEXER_CACHE_FETCH_METRIC = "sentry_metrics.indexer.memcache.fetch"
 
@@ -44,6 +52,16 @@ NAMESPACED_READ_FEAT_FLAG = "sentry-metrics.indexer.read-new-cache-namespace"
 BULK_RECORD_CACHE_NAMESPACE = "br"
 RESOLVE_CACHE_NAMESPACE = "res"
 
+LOCAL_CACHE_SIZE_OPTION = "sentry-metrics.indexer.local-cache.max-size"
+ABSENT_FILTER_TTL_OPTION = "sentry-metrics.indexer.absent-filter.ttl"
+
+# Entries of the in-process cache are dropped after this many seconds, well
+# before values in the shared cache are considered stale.
+LOCAL_CACHE_TTL = 60 * 60
+# The number of absent keys per use case an absent key filter is sized for,
+# at a false positive rate of 1%.
+ABSENT_FILTER_CAPACITY = 1_000_000
+
 
 class StringIndexerCache:
     def __init__(self, cache_name: str, partition_key: str):
@@ -205,10 +223,136 @@ class StringIndexerCache:
             )
 
 
+class LocalIndexerCache:
+    """
+    An in-process LRU of indexed ids, keyed by "use_case_id:org_id:string" like
+    the keys passed to `StringIndexerCache`.
+
+    The strings a consumer indexes are very stable, so most lookups of a batch
+    can be answered without a round trip to the shared cache. Ids never change
+    once a string is indexed, entries only expire so that the cache doesn't
+    outlive the shared cache by much.
+    """
+
+    def __init__(self, max_size: int, ttl: float = LOCAL_CACHE_TTL) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, tuple[int, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def configure(self, max_size: int) -> None:
+        self.max_size = max_size
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_many(self, keys: Iterable[str]) -> dict[str, int]:
+        now = time.monotonic()
+        results = {}
+        for key in keys:
+            entry = self._entries.get(key)
+            if entry is None:
+                continue
+            value, expires_at = entry
+            if expires_at <= now:
+                del self._entries[key]
+                continue
+            self._entries.move_to_end(key)
+            results[key] = value
+        return results
+
+    def set_many(self, key_values: Mapping[str, int]) -> None:
+        expires_at = time.monotonic() + self.ttl
+        for key, value in key_values.items():
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def record_lookups(self, hits: int, misses: int) -> None:
+        self.hits += hits
+        self.misses += misses
+        metrics.incr(_INDEXER_LOCAL_CACHE_METRIC, tags={"cache_hit": "true"}, amount=hits)
+        metrics.incr(_INDEXER_LOCAL_CACHE_METRIC, tags={"cache_hit": "false"}, amount=misses)
+        metrics.gauge(f"{_INDEXER_LOCAL_CACHE_METRIC}.hit_rate", self.hit_rate)
+        metrics.gauge(f"{_INDEXER_LOCAL_CACHE_METRIC}.size", len(self._entries))
+
+
+class BloomFilter:
+    """A fixed size bloom filter of strings."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing, see Kirsch & Mitzenmacher "Less Hashing, Same Performance".
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key)
+        )
+
+
+class AbsentKeyFilter:
+    """
+    Remembers, per use case, the keys that were missing from the shared cache.
+
+    Looking those keys up again is almost always a wasted round trip: either
+    the string is indexed for the first time and the lookup is followed by a
+    database write that also fills the local cache, or the string is rejected
+    by the indexer's limits and stays uncached. Filters are reset every
+    `ttl` seconds. A false positive only costs a database read of a key that
+    could have been served from the shared cache.
+
+    Only used together with the in-process cache, which serves the keys that
+    were recorded after being found absent.
+    """
+
+    def __init__(self, ttl: float, capacity: int = ABSENT_FILTER_CAPACITY) -> None:
+        self.ttl = ttl
+        self.capacity = capacity
+        self._filters: dict[str, tuple[BloomFilter, float]] = {}
+
+    def _get_filter(self, use_case_id: str) -> BloomFilter:
+        now = time.monotonic()
+        entry = self._filters.get(use_case_id)
+        if entry is None or entry[1] <= now:
+            entry = self._filters[use_case_id] = (BloomFilter(self.capacity), now + self.ttl)
+        return entry[0]
+
+    def contains(self, key: str) -> bool:
+        return key in self._get_filter(key.split(":", 1)[0])
+
+    def add_many(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._get_filter(key.split(":", 1)[0]).add(key)
+
+
 class CachingIndexer(StringIndexer):
     def __init__(self, cache: StringIndexerCache, indexer: StringIndexer) -> None:
         self.cache = cache
         self.indexer = indexer
+        # Both are only used when enabled by their options.
+        self.local_cache = LocalIndexerCache(max_size=0)
+        self.absent_filter = AbsentKeyFilter(ttl=0)
 
     def bulk_record(
         self, strings: Mapping[UseCaseID, Mapping[OrgId, set[str]]]
@@ -216,7 +360,33 @@ class CachingIndexer(StringIndexer):
         cache_keys = UseCaseKeyCollection(strings)
         metrics.gauge("sentry_metrics.indexer.lookups_per_batch", value=cache_keys.size)
         cache_key_strs = cache_keys.as_strings()
-        cache_results = self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+
+        local_cache_size = options.get(LOCAL_CACHE_SIZE_OPTION)
+        local_results: Mapping[str, int] = {}
+        if local_cache_size > 0:
+            self.local_cache.configure(local_cache_size)
+            local_results = self.local_cache.get_many(cache_key_strs)
+            self.local_cache.record_lookups(
+                hits=len(local_results), misses=len(cache_key_strs) - len(local_results)
+            )
+            cache_key_strs = [k for k in cache_key_strs if k not in local_results]
+
+        # Absent keys that get indexed are only served from the in-process cache
+        # afterwards, so without it they would hit postgres on every batch.
+        absent_filter_ttl = options.get(ABSENT_FILTER_TTL_OPTION) if local_cache_size > 0 else 0
+        if absent_filter_ttl > 0:
+            self.absent_filter.ttl = absent_filter_ttl
+            lookup_key_strs = [k for k in cache_key_strs if not self.absent_filter.contains(k)]
+            metrics.incr(
+                _INDEXER_ABSENT_FILTER_METRIC, amount=len(cache_key_strs) - len(lookup_key_strs)
+            )
+            cache_key_strs = lookup_key_strs
+
+        cache_results = (
+            self.cache.get_many(BULK_RECORD_CACHE_NAMESPACE, cache_key_strs)
+            if cache_key_strs
+            else {}
+        )
 
         hits = [k for k, v in cache_results.items() if v is not None]
 
@@ -238,9 +408,18 @@ class CachingIndexer(StringIndexer):
             amount=cache_keys.size,
         )
 
+        cache_hits = {k: v for k, v in cache_results.items() if v is not None}
+        if local_cache_size > 0:
+            self.local_cache.set_many(cache_hits)
+        if absent_filter_ttl > 0:
+            self.absent_filter.add_many(k for k, v in cache_results.items() if v is None)
+
         cache_key_results = UseCaseKeyResults()
         cache_key_results.add_use_case_key_results(
-            [UseCaseKeyResult.from_string(k, v) for k, v in cache_results.items() if v is not None],
+            [
+                UseCaseKeyResult.from_string(k, v)
+                for k, v in itertools.chain(local_results.items(), cache_hits.items())
+            ],
             FetchType.CACHE_HIT,
         )
 
@@ -256,9 +435,10 @@ class CachingIndexer(StringIndexer):
             }
         )
 
-        self.cache.set_many(
-            BULK_RECORD_CACHE_NAMESPACE, db_record_key_results.get_mapped_strings_to_ints()
-        )
+        db_mapped = db_record_key_results.get_mapped_strings_to_ints()
+        self.cache.set_many(BULK_RECORD_CACHE_NAMESPACE, db_mapped)
+        if local_cache_size > 0:
+            self.local_cache.set_many(db_mapped)
 
         return cache_key_results.merge(db_record_key_results)
 
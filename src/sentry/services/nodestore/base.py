@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+import weakref
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from threading import local
@@ -10,6 +12,8 @@ from django.core.cache import BaseCache, InvalidCacheBackendError, caches
 from django.utils.functional import cached_property
 
 from sentry import options
+from sentry.services.nodestore.codecs import ZstdCompressors, decode_payload, encode_payload
+from sentry.services.nodestore.local_cache import LocalNodeCache
 from sentry.utils import json, metrics
 from sentry.utils.services import Service
 
@@ -28,6 +32,13 @@ json_dumps = json.JSONEncoder(
 
 json_loads = json.loads
 
+# NodeStorage instances are thread-locals, so the process-wide local cache
+# tier cannot live on the instance itself.
+_local_caches: weakref.WeakKeyDictionary[NodeStorage, LocalNodeCache] = (
+    weakref.WeakKeyDictionary()
+)
+_local_caches_lock = threading.Lock()
+
 
 class NodeStorage(local, Service):
     """
@@ -100,7 +111,7 @@ class NodeStorage(local, Service):
         if value is None:
             return None
 
-        lines_iter = iter(value.splitlines())
+        lines_iter = iter(decode_payload(value).splitlines())
         try:
             if subkey is not None:
                 # Those keys should be statically known identifiers in the app, such as
@@ -147,7 +158,13 @@ class NodeStorage(local, Service):
                     return item_from_cache
 
             span.set_tag("subkey", str(subkey))
-            bytes_data = self._get_bytes(id)
+            local_cache = self.local_cache
+            if local_cache is not None:
+                bytes_data = local_cache.fetch_many(
+                    [id], lambda ids: {ids[0]: self._get_bytes(ids[0])}
+                ).get(id)
+            else:
+                bytes_data = self._get_bytes(id)
             rv = self._decode(bytes_data, subkey=subkey)
             if subkey is None:
                 # set cache item only after we know decoding did not fail
@@ -196,9 +213,13 @@ class NodeStorage(local, Service):
                 uncached_ids = id_list
 
             with sentry_sdk.start_span(op="nodestore._get_bytes_multi_and_decode") as span:
+                local_cache = self.local_cache
+                if local_cache is not None:
+                    bytes_items = local_cache.fetch_many(uncached_ids, self._get_bytes_multi)
+                else:
+                    bytes_items = self._get_bytes_multi(uncached_ids)
                 items = {
-                    id: self._decode(value, subkey=subkey)
-                    for id, value in self._get_bytes_multi(uncached_ids).items()
+                    id: self._decode(value, subkey=subkey) for id, value in bytes_items.items()
                 }
             if subkey is None:
                 self._set_cache_items(items)
@@ -217,21 +238,33 @@ class NodeStorage(local, Service):
 
         >>> _encode({"unprocessed": {}, None: {"stacktrace": {}}})
         b'{"stacktrace": {}}\nunprocessed\n{}'
+
+        The joined lines are then passed through the codec configured by the
+        ``nodestore.codec`` option, see ``sentry.services.nodestore.codecs``.
         """
-        lines = [json_dumps(data.pop(None)).encode("utf8")]
+        main = data.pop(None)
+        lines = [json_dumps(main).encode("utf8")]
         for key, value in data.items():
             if key is not None:
                 lines.append(key.encode("ascii"))
                 lines.append(json_dumps(value).encode("utf8"))
 
-        return b"\n".join(lines)
+        platform = main.get("platform")
+        return encode_payload(
+            b"\n".join(lines),
+            platform=platform if isinstance(platform, str) else None,
+            compressors=self._zstd_compressors,
+        )
 
     def set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         """
         >>> nodestore.set_bytes('key1', b"{'foo': 'bar'}")
         """
         metrics.distribution("nodestore.set_bytes", len(data))
-        return self._set_bytes(item_id, data, ttl)
+        try:
+            return self._set_bytes(item_id, data, ttl)
+        finally:
+            self._delete_local_cache_items([item_id])
 
     def _set_bytes(self, item_id: str, data: bytes, ttl: timedelta | None = None) -> None:
         raise NotImplementedError
@@ -296,16 +329,51 @@ class NodeStorage(local, Service):
             self.cache.set_many(items)
 
     def _delete_cache_item(self, item_id: str) -> None:
+        self._delete_local_cache_items([item_id])
         if self.cache:
             self.cache.delete(item_id)
 
     def _delete_cache_items(self, id_list: list[str]) -> None:
+        self._delete_local_cache_items(id_list)
         if self.cache:
             self.cache.delete_many([item_id for item_id in id_list])
 
+    def _delete_local_cache_items(self, id_list: list[str]) -> None:
+        # Invalidate even while the tier is disabled so that re-enabling it
+        # never serves payloads that were overwritten in the meantime.
+        local_cache = _local_caches.get(self)
+        if local_cache is not None:
+            local_cache.delete_many(id_list)
+
+    @property
+    def local_cache(self) -> LocalNodeCache | None:
+        """
+        The process-wide in-memory tier in front of the backend, shared by
+        all threads using this nodestore. ``None`` while it is disabled.
+        """
+        if not options.get("nodestore.local-cache.enabled"):
+            return None
+
+        max_bytes = options.get("nodestore.local-cache.max-bytes")
+        ttl = options.get("nodestore.local-cache.ttl")
+        local_cache = _local_caches.get(self)
+        if local_cache is None:
+            with _local_caches_lock:
+                local_cache = _local_caches.get(self)
+                if local_cache is None:
+                    local_cache = _local_caches[self] = LocalNodeCache(max_bytes, ttl)
+        elif local_cache.max_bytes != max_bytes or local_cache.ttl != ttl:
+            local_cache.configure(max_bytes, ttl)
+        return local_cache
+
     @cached_property
     def cache(self) -> BaseCache | None:
         try:
             return caches["nodedata"]
         except InvalidCacheBackendError:
             return None
+
+    @cached_property
+    def _zstd_compressors(self) -> ZstdCompressors:
+        # Per thread, since NodeStorage is a thread-local.
+        return ZstdCompressors()
@@ -0,0 +1,185 @@
+"""
+Payload codecs for nodestore values.
+
+Historically nodes are stored as plain JSON lines (see ``NodeStorage._encode``)
+and compressed one by one by the backend, if at all. Event payloads of the
+same platform share most of their structure (sdk blocks, contexts, frame
+paths), which a per-platform zstd dictionary can exploit far better than
+compressing each payload in isolation.
+
+Encoded values start with ``CODEC_HEADER`` followed by a single byte holding
+the ``CodecVersion``. Values without the header are legacy JSON (or pickle in
+the Django backend) and are returned untouched, so existing data keeps
+decoding. The dictionary a zstd frame was compressed with is identified by
+the dictionary id zstd embeds in the frame header.
+
+Backend compression (such as the Bigtable backend's ``compression`` option)
+is configured independently and is not changed by the codec.
+"""
+
+from __future__ import annotations
+
+import enum
+import os
+import threading
+from collections.abc import Sequence
+
+import zstandard
+from django.conf import settings
+
+from sentry import options
+from sentry.utils import metrics
+
+# JSON payloads always start with "{" and pickles with "\x80", so a leading
+# NUL byte can never be confused with legacy data.
+CODEC_HEADER = b"\x00ns"
+
+DICTIONARY_SUFFIX = ".zdict"
+
+
+class CodecVersion(enum.IntEnum):
+    ZSTD = 1
+
+
+class UnknownCodecError(ValueError):
+    pass
+
+
+class ZstdDictionaries:
+    """
+    Trained zstd dictionaries, loaded lazily from
+    ``SENTRY_NODESTORE_DICTIONARY_DIR``.
+
+    Files are named ``<platform>.<version>.zdict``. Every file is available
+    for decoding, while writes use the dictionary with the highest version of
+    each platform. Dictionaries must never be removed while nodes written
+    with them may still be read.
+    """
+
+    def __init__(self, path: str | None) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._by_platform: dict[str, zstandard.ZstdCompressionDict] | None = None
+        self._by_id: dict[int, zstandard.ZstdCompressionDict] = {}
+
+    def _load(self) -> dict[str, zstandard.ZstdCompressionDict]:
+        if self._by_platform is not None:
+            return self._by_platform
+
+        with self._lock:
+            if self._by_platform is not None:
+                return self._by_platform
+
+            by_platform = {}
+            if self.path and os.path.isdir(self.path):
+                for filename in sorted(os.listdir(self.path)):
+                    if not filename.endswith(DICTIONARY_SUFFIX):
+                        continue
+                    with open(os.path.join(self.path, filename), "rb") as f:
+                        dictionary = zstandard.ZstdCompressionDict(f.read())
+                    # Sorted iteration lets the highest version win.
+                    by_platform[filename.split(".", 1)[0]] = dictionary
+                    self._by_id[dictionary.dict_id()] = dictionary
+
+            self._by_platform = by_platform
+            return by_platform
+
+    def for_platform(self, platform: str | None) -> zstandard.ZstdCompressionDict | None:
+        if platform is None:
+            return None
+        return self._load().get(platform)
+
+    def for_id(self, dict_id: int) -> zstandard.ZstdCompressionDict | None:
+        self._load()
+        return self._by_id.get(dict_id)
+
+
+_dictionaries: ZstdDictionaries | None = None
+
+
+def get_dictionaries() -> ZstdDictionaries:
+    global _dictionaries
+    if _dictionaries is None:
+        _dictionaries = ZstdDictionaries(settings.SENTRY_NODESTORE_DICTIONARY_DIR)
+    return _dictionaries
+
+
+class ZstdCompressors:
+    """
+    zstd compressors for ``encode_payload``, built once per dictionary.
+    Compressors must not be shared between threads, so every (thread-local)
+    ``NodeStorage`` holds its own instance.
+    """
+
+    def __init__(self) -> None:
+        self._by_dict_id: dict[int, zstandard.ZstdCompressor] = {}
+
+    def get(self, dictionary: zstandard.ZstdCompressionDict | None) -> zstandard.ZstdCompressor:
+        dict_id = dictionary.dict_id() if dictionary is not None else 0
+        compressor = self._by_dict_id.get(dict_id)
+        if compressor is None:
+            if dictionary is not None:
+                compressor = zstandard.ZstdCompressor(dict_data=dictionary)
+            else:
+                compressor = zstandard.ZstdCompressor()
+            self._by_dict_id[dict_id] = compressor
+        return compressor
+
+
+def has_codec_header(value: bytes) -> bool:
+    return value.startswith(CODEC_HEADER)
+
+
+def encode_payload(
+    value: bytes, platform: str | None = None, compressors: ZstdCompressors | None = None
+) -> bytes:
+    """
+    Encode a serialized node with the codec selected by the
+    ``nodestore.codec`` option. ``platform`` picks the trained dictionary.
+    Pass ``compressors`` to reuse compressors across calls.
+    """
+    if options.get("nodestore.codec") != "zstd":
+        return value
+
+    dictionary = get_dictionaries().for_platform(platform)
+    compressor = (compressors or ZstdCompressors()).get(dictionary)
+
+    rv = CODEC_HEADER + bytes([CodecVersion.ZSTD]) + compressor.compress(value)
+    metrics.distribution(
+        "nodestore.codec.compression_ratio",
+        len(rv) / max(len(value), 1),
+        tags={"codec": "zstd", "dictionary": dictionary is not None},
+    )
+    return rv
+
+
+def decode_payload(value: bytes) -> bytes:
+    """
+    Undo ``encode_payload``. Values written before codecs existed are
+    returned as-is.
+    """
+    if not has_codec_header(value):
+        return value
+
+    version = value[len(CODEC_HEADER)]
+    data = value[len(CODEC_HEADER) + 1 :]
+    if version != CodecVersion.ZSTD:
+        raise UnknownCodecError(f"Unknown nodestore codec version {version}")
+
+    dict_id = zstandard.get_frame_parameters(data).dict_id
+    if dict_id:
+        dictionary = get_dictionaries().for_id(dict_id)
+        if dictionary is None:
+            raise UnknownCodecError(f"Missing zstd dictionary {dict_id}")
+        return zstandard.ZstdDecompressor(dict_data=dictionary).decompress(data)
+
+    return zstandard.ZstdDecompressor().decompress(data)
+
+
+def train_dictionary(samples: Sequence[bytes], dict_size: int) -> zstandard.ZstdCompressionDict:
+    """
+    Train a zstd dictionary from serialized node samples. Samples should be
+    the plain JSON payloads (as passed to ``encode_payload``) of a single
+    platform.
+    """
+    return zstandard.train_dictionary(dict_size, list(samples))
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+
+from sentry.utils import metrics
+
+# How long a caller waits for a concurrent fetch of the same id before giving
+# up and loading the node itself.
+COALESCE_TIMEOUT = 5.0
+
+
+@dataclass
+class _Entry:
+    data: bytes
+    expires_at: float
+
+
+@dataclass
+class _Flight:
+    done: threading.Event = field(default_factory=threading.Event)
+    value: bytes | None = None
+    failed: bool = False
+    # Set when the node is written or deleted while the load is in progress,
+    # in which case the loaded value must not be cached.
+    stale: bool = False
+
+
+class LocalNodeCache:
+    """
+    A size-bounded, process-local LRU of raw node payloads that sits between
+    ``NodeStorage.get``/``get_multi`` and the storage backend.
+
+    Values are kept as the encoded bytes returned by the backend and are
+    accounted by their length, so every hit is decoded again and callers never
+    share mutable payloads. Concurrent fetches of the same id are coalesced:
+    the first caller loads the node from the backend, every other caller waits
+    for that result instead of issuing its own read.
+
+    The cache is only invalidated by writes and deletes that go through this
+    process, so ``ttl`` should stay short.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.size = 0
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def configure(self, max_bytes: int, ttl: float) -> None:
+        with self._lock:
+            self.max_bytes = max_bytes
+            self.ttl = ttl
+            self._evict()
+
+    def get(self, id: str) -> bytes | None:
+        return self.get_many([id]).get(id)
+
+    def get_many(self, id_list: Iterable[str]) -> dict[str, bytes]:
+        now = time.monotonic()
+        rv: dict[str, bytes] = {}
+        expired = 0
+        with self._lock:
+            for id in id_list:
+                entry = self._entries.get(id)
+                if entry is None:
+                    continue
+                if entry.expires_at <= now:
+                    self._remove(id)
+                    expired += 1
+                    continue
+                self._entries.move_to_end(id)
+                rv[id] = entry.data
+
+        if expired:
+            metrics.incr("nodestore.local_cache.expired", amount=expired)
+        return rv
+
+    def set(self, id: str, data: bytes) -> None:
+        self.set_many({id: data})
+
+    def set_many(self, items: dict[str, bytes | None]) -> None:
+        with self._lock:
+            for id, data in items.items():
+                self._invalidate(id)
+                self._insert(id, data)
+            self._evict()
+
+    def delete(self, id: str) -> None:
+        self.delete_many([id])
+
+    def delete_many(self, id_list: Iterable[str]) -> None:
+        with self._lock:
+            for id in id_list:
+                self._invalidate(id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def fetch_many(
+        self, id_list: list[str], loader: Callable[[list[str]], dict[str, bytes | None]]
+    ) -> dict[str, bytes | None]:
+        """
+        Return the payloads for ``id_list``, serving what is cached and
+        loading the rest through ``loader``. Ids that another thread is
+        already loading are waited on rather than loaded again.
+        """
+        rv: dict[str, bytes | None] = dict(self.get_many(id_list))
+        misses = [id for id in id_list if id not in rv]
+        metrics.incr("nodestore.local_cache.get", amount=len(rv), tags={"cache": "hit"})
+        if not misses:
+            return rv
+
+        metrics.incr("nodestore.local_cache.get", amount=len(misses), tags={"cache": "miss"})
+
+        owned: dict[str, _Flight] = {}
+        joined: dict[str, _Flight] = {}
+        with self._lock:
+            for id in misses:
+                flight = self._flights.get(id)
+                if flight is None:
+                    owned[id] = self._flights[id] = _Flight()
+                else:
+                    joined[id] = flight
+
+        if owned:
+            try:
+                loaded = loader(list(owned))
+            except Exception:
+                self._land(owned, {}, failed=True)
+                raise
+            self._land(owned, loaded, failed=False)
+            rv.update((id, loaded[id]) for id in owned if id in loaded)
+
+        if joined:
+            metrics.incr("nodestore.local_cache.coalesced", amount=len(joined))
+            retry = []
+            deadline = time.monotonic() + COALESCE_TIMEOUT
+            for id, flight in joined.items():
+                if flight.done.wait(max(deadline - time.monotonic(), 0)) and not flight.failed:
+                    rv[id] = flight.value
+                else:
+                    retry.append(id)
+            if retry:
+                metrics.incr("nodestore.local_cache.coalesce_fallback", amount=len(retry))
+                rv.update(loader(retry))
+
+        return rv
+
+    def _land(
+        self, flights: dict[str, _Flight], loaded: dict[str, bytes | None], failed: bool
+    ) -> None:
+        with self._lock:
+            for id, flight in flights.items():
+                flight.value = loaded.get(id)
+                flight.failed = failed
+                if not failed and not flight.stale:
+                    self._insert(id, flight.value)
+                if self._flights.get(id) is flight:
+                    del self._flights[id]
+                flight.done.set()
+            self._evict()
+
+    def _insert(self, id: str, data: bytes | None) -> None:
+        # Payloads that could never fit are not worth evicting the whole
+        # cache for.
+        if data is None or len(data) > self.max_bytes:
+            return
+        self._remove(id)
+        self._entries[id] = _Entry(data, time.monotonic() + self.ttl)
+        self.size += len(data)
+
+    def _invalidate(self, id: str) -> None:
+        self._remove(id)
+        flight = self._flights.get(id)
+        if flight is not None:
+            flight.stale = True
+
+    def _remove(self, id: str) -> None:
+        entry = self._entries.pop(id, None)
+        if entry is not None:
+            self.size -= len(entry.data)
+
+    def _evict(self) -> None:
+        evicted = 0
+        while self.size > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.size -= len(entry.data)
+            evicted += 1
+
+        if evicted:
+            metrics.incr("nodestore.local_cache.evicted", amount=evicted)
+        metrics.gauge("nodestore.local_cache.bytes", self.size)
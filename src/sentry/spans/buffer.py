@@ -65,10 +65,14 @@ Glossary for types of keys:
 
 from __future__ import annotations
 
+import collections
 import itertools
 import logging
 import math
-from collections.abc import Generator, MutableMapping, Sequence
+import threading
+import time
+from collections.abc import Generator, Iterator, MutableMapping, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, NamedTuple
 
 import orjson
@@ -122,6 +126,19 @@ def parse_segment_key(segment_key: SegmentKey) -> tuple[bytes, bytes, bytes]:
     return project_id, trace_id, span_id
 
 
+def _make_output_span(payload: bytes, segment_span_id: str) -> OutputSpan:
+    span = orjson.loads(payload)
+
+    if not attribute_value(span, "sentry.segment.id"):
+        span.setdefault("attributes", {})["sentry.segment.id"] = {
+            "type": "string",
+            "value": segment_span_id,
+        }
+
+    span["is_segment"] = segment_span_id == span["span_id"]
+    return OutputSpan(payload=span)
+
+
 def get_redis_client() -> RedisCluster[bytes] | StrictRedis[bytes]:
     return redis.redis_clusters.get_binary(settings.SENTRY_SPAN_BUFFER_CLUSTER)
 
@@ -150,6 +167,59 @@ class Span(NamedTuple):
             return self.segment_id or self.parent_span_id or self.span_id
 
 
+# A single call of the add-buffer script: the trace all subsegments belong to,
+# and the subsegments as (parent_span_id, spans) pairs.
+ScriptCall = tuple[str, list[tuple[str, list[Span]]]]
+
+
+class AdaptiveBatchSize:
+    """
+    Sizes the Redis pipelines of `process_spans`, counted in add-buffer script
+    calls.
+
+    Without `spans.buffer.pipeline-target-latency-ms` this is simply
+    `spans.buffer.pipeline-batch-size`. With a target latency, the batch size
+    is adjusted after each pipeline by additive increase and multiplicative
+    decrease, based on the observed latency per script call, and
+    `spans.buffer.pipeline-batch-size` acts as the upper bound.
+    """
+
+    MIN_BATCH_SIZE = 1
+
+    def __init__(self) -> None:
+        self.current: int | None = None
+
+    def get(self) -> int:
+        max_batch_size = options.get("spans.buffer.pipeline-batch-size")
+        target_latency = options.get("spans.buffer.pipeline-target-latency-ms")
+        if max_batch_size <= 0 or target_latency <= 0:
+            self.current = None
+            return max_batch_size
+
+        if self.current is None:
+            self.current = max_batch_size
+        self.current = min(self.current, max_batch_size)
+        return self.current
+
+    def observe(self, num_calls: int, latency_ms: float) -> None:
+        if self.current is None or num_calls == 0:
+            return
+
+        max_batch_size = options.get("spans.buffer.pipeline-batch-size")
+        target_latency = options.get("spans.buffer.pipeline-target-latency-ms")
+        # Scale the latency of the observed pipeline to a full batch, so that
+        # a short trailing batch does not look artificially fast.
+        projected_latency = latency_ms / num_calls * self.current
+
+        if projected_latency > target_latency:
+            self.current = max(self.MIN_BATCH_SIZE, self.current // 2)
+        else:
+            self.current = min(max_batch_size, self.current + max(1, max_batch_size // 10))
+
+        metrics.timing("spans.buffer.process_spans.pipeline_latency_ms", latency_ms)
+        metrics.gauge("spans.buffer.process_spans.pipeline_batch_size", self.current)
+
+
 class OutputSpan(NamedTuple):
     payload: dict[str, Any]
 
@@ -170,6 +240,10 @@ class SpansBuffer:
         self._zstd_decompressor = zstandard.ZstdDecompressor()
         self._buffer_logger = BufferLogger()
         self._debug_trace_logger: DebugTraceLogger | None = None
+        self._batch_size = AdaptiveBatchSize()
+        self._compression_pool: ThreadPoolExecutor | None = None
+        self._compression_pool_size = 0
+        self._thread_compressors = threading.local()
 
     @cached_property
     def client(self) -> RedisCluster[bytes] | StrictRedis[bytes]:
@@ -209,21 +283,25 @@ class SpansBuffer:
 
         with metrics.timer("spans.buffer.process_spans.push_payloads"):
             trees = self._group_by_parent(spans)
-            pipeline_batch_size = options.get("spans.buffer.pipeline-batch-size")
+            calls = self._group_script_calls(trees)
+            batch_size = self._batch_size.get()
 
-            tree_items = list(trees.items())
-            tree_batches: Sequence[Sequence[tuple[tuple[str, str], list[Span]]]]
-            if pipeline_batch_size > 0:
-                tree_batches = list(itertools.batched(tree_items, pipeline_batch_size))
+            call_batches: Sequence[Sequence[ScriptCall]]
+            if batch_size > 0:
+                call_batches = list(itertools.batched(calls, batch_size))
             else:
-                tree_batches = [tree_items]
+                call_batches = [calls]
+
+            prepared_payloads = self._prepare_all_payloads(
+                [subsegment for _, subsegments in calls for _, subsegment in subsegments]
+            )
 
-            for batch in tree_batches:
+            for batch in call_batches:
                 with self.client.pipeline(transaction=False) as p:
-                    for (project_and_trace, parent_span_id), subsegment in batch:
-                        set_key = self._get_span_key(project_and_trace, parent_span_id)
-                        prepared = self._prepare_payloads(subsegment)
-                        p.zadd(set_key, prepared)
+                    for project_and_trace, subsegments in batch:
+                        for parent_span_id, _ in subsegments:
+                            set_key = self._get_span_key(project_and_trace, parent_span_id)
+                            p.zadd(set_key, next(prepared_payloads))
 
                     p.execute()
 
@@ -234,40 +312,56 @@ class SpansBuffer:
             add_buffer_sha = self._ensure_script()
 
             results: list[Any] = []
-            for batch in tree_batches:
+            for batch in call_batches:
                 with self.client.pipeline(transaction=False) as p:
-                    for (project_and_trace, parent_span_id), subsegment in batch:
-                        byte_count = sum(len(span.payload) for span in subsegment)
-
-                        _, _, trace_id = project_and_trace.partition(":")
-                        if trace_id in debug_traces:
-                            try:
-                                if self._debug_trace_logger is None:
-                                    self._debug_trace_logger = DebugTraceLogger(self.client)
-                                self._debug_trace_logger.log_subsegment_info(
-                                    project_and_trace, parent_span_id, subsegment
+                    for project_and_trace, subsegments in batch:
+                        args: list[str | int] = []
+                        for parent_span_id, subsegment in subsegments:
+                            byte_count = sum(len(span.payload) for span in subsegment)
+
+                            _, _, trace_id = project_and_trace.partition(":")
+                            if trace_id in debug_traces:
+                                try:
+                                    if self._debug_trace_logger is None:
+                                        self._debug_trace_logger = DebugTraceLogger(self.client)
+                                    self._debug_trace_logger.log_subsegment_info(
+                                        project_and_trace, parent_span_id, subsegment
+                                    )
+                                except Exception:
+                                    logger.exception("Failed to log debug trace info")
+
+                            args.extend(
+                                (
+                                    len(subsegment),
+                                    parent_span_id,
+                                    (
+                                        "true"
+                                        if any(span.is_segment_span for span in subsegment)
+                                        else "false"
+                                    ),
+                                    byte_count,
                                 )
-                            except Exception:
-                                logger.exception("Failed to log debug trace info")
+                            )
+                            args.extend(span.span_id for span in subsegment)
+
+                            is_root_span_count += sum(span.is_segment_span for span in subsegment)
+                            result_meta.append((project_and_trace, parent_span_id))
 
                         p.execute_command(
                             "EVALSHA",
                             add_buffer_sha,
                             1,
                             project_and_trace,
-                            len(subsegment),
-                            parent_span_id,
-                            "true" if any(span.is_segment_span for span in subsegment) else "false",
                             redis_ttl,
                             max_segment_bytes,
-                            byte_count,
-                            *[span.span_id for span in subsegment],
+                            len(subsegments),
+                            *args,
                         )
 
-                        is_root_span_count += sum(span.is_segment_span for span in subsegment)
-                        result_meta.append((project_and_trace, parent_span_id))
-
-                    results.extend(p.execute())
+                    start = time.monotonic()
+                    for call_results in p.execute():
+                        results.extend(call_results)
+                    self._batch_size.observe(len(batch), (time.monotonic() - start) * 1000)
 
         with metrics.timer("spans.buffer.process_spans.update_queue"):
             queue_deletes: dict[bytes, set[bytes]] = {}
@@ -397,6 +491,74 @@ class SpansBuffer:
 
         return trees
 
+    def _group_script_calls(self, trees: dict[tuple[str, str], list[Span]]) -> list[ScriptCall]:
+        """
+        Assigns subsegments to calls of the add-buffer script. All keys used
+        by one call must share a cluster slot, so at most the subsegments of
+        one trace can be packed into the same call. Without
+        `spans.buffer.batch-subsegments` every subsegment gets its own call.
+        """
+        if not options.get("spans.buffer.batch-subsegments"):
+            return [
+                (project_and_trace, [(parent_span_id, subsegment)])
+                for (project_and_trace, parent_span_id), subsegment in trees.items()
+            ]
+
+        calls: dict[str, list[tuple[str, list[Span]]]] = {}
+        for (project_and_trace, parent_span_id), subsegment in trees.items():
+            calls.setdefault(project_and_trace, []).append((parent_span_id, subsegment))
+
+        metrics.timing("spans.buffer.process_spans.num_script_calls", len(calls))
+        return list(calls.items())
+
+    def _prepare_all_payloads(
+        self, subsegments: list[list[Span]]
+    ) -> Iterator[dict[str | bytes, float]]:
+        """
+        Prepares the payloads of all subsegments, in order. With
+        `spans.buffer.compression.threads` set, compression runs on a thread
+        pool so that it does not block the consumer thread; zstd releases the
+        GIL while compressing.
+        """
+        num_threads = options.get("spans.buffer.compression.threads")
+        if num_threads != self._compression_pool_size:
+            self.close()
+
+        if num_threads <= 0 or self._zstd_compressor is None or len(subsegments) < 2:
+            return map(self._prepare_payloads, subsegments)
+
+        if self._compression_pool is None:
+            self._compression_pool = ThreadPoolExecutor(
+                max_workers=num_threads, thread_name_prefix="spans-buffer-compression"
+            )
+            self._compression_pool_size = num_threads
+
+        return self._compression_pool.map(self._prepare_payloads, subsegments)
+
+    def close(self) -> None:
+        """
+        Shuts down the compression thread pool. The buffer stays usable and
+        starts a new pool when it is needed again.
+        """
+        if self._compression_pool is not None:
+            self._compression_pool.shutdown(wait=False)
+            self._compression_pool = None
+            self._compression_pool_size = 0
+
+    def _get_compressor(self) -> zstandard.ZstdCompressor:
+        # Compressors must not be shared between threads.
+        if threading.current_thread() is threading.main_thread():
+            assert self._zstd_compressor is not None
+            return self._zstd_compressor
+
+        level = self._current_compression_level
+        compressor = getattr(self._thread_compressors, "compressor", None)
+        if compressor is None or self._thread_compressors.level != level:
+            compressor = zstandard.ZstdCompressor(level=level)
+            self._thread_compressors.compressor = compressor
+            self._thread_compressors.level = level
+        return compressor
+
     def _prepare_payloads(self, spans: list[Span]) -> dict[str | bytes, float]:
         if self._zstd_compressor is None:
             return {span.payload: span.end_timestamp for span in spans}
@@ -405,7 +567,7 @@ class SpansBuffer:
         original_size = len(combined)
 
         with metrics.timer("spans.buffer.compression.cpu_time"):
-            compressed = self._zstd_compressor.compress(combined)
+            compressed = self._get_compressor().compress(combined)
 
         compressed_size = len(compressed)
 
@@ -448,7 +610,14 @@ class SpansBuffer:
     def get_memory_info(self) -> Generator[ServiceMemory]:
         return iter_cluster_memory_usage(self.client)
 
-    def flush_segments(self, now: int) -> dict[SegmentKey, FlushedSegment]:
+    def _load_flushable_segment_keys(
+        self, now: int
+    ) -> tuple[list[tuple[int, QueueKey, SegmentKey]], int]:
+        """
+        Returns the keys of all segments that are due to be flushed at `now`,
+        as (shard, queue_key, segment_key), together with the maximum number
+        of segments fetched per shard.
+        """
         cutoff = now
 
         queue_keys = []
@@ -470,6 +639,11 @@ class SpansBuffer:
             for segment_key in keys:
                 segment_keys.append((shard, queue_key, segment_key))
 
+        return segment_keys, max_segments_per_shard
+
+    def flush_segments(self, now: int) -> dict[SegmentKey, FlushedSegment]:
+        segment_keys, max_segments_per_shard = self._load_flushable_segment_keys(now)
+
         with metrics.timer("spans.buffer.flush_segments.load_segment_data"):
             segments = self._load_segment_data([k for _, _, k in segment_keys])
 
@@ -490,20 +664,11 @@ class SpansBuffer:
             # This incr metric is needed to get a rate overall.
             metrics.incr("spans.buffer.flush_segments.count_spans_per_segment", amount=len(segment))
             for payload in segment:
-                span = orjson.loads(payload)
-
-                if not attribute_value(span, "sentry.segment.id"):
-                    span.setdefault("attributes", {})["sentry.segment.id"] = {
-                        "type": "string",
-                        "value": segment_span_id,
-                    }
-
-                is_segment = segment_span_id == span["span_id"]
-                span["is_segment"] = is_segment
-                if is_segment:
+                output_span = _make_output_span(payload, segment_span_id)
+                if output_span.payload["is_segment"]:
                     has_root_span = True
 
-                output_spans.append(OutputSpan(payload=span))
+                output_spans.append(output_span)
 
             metrics.incr(
                 "spans.buffer.flush_segments.num_segments_per_shard", tags={"shard_i": shard}
@@ -567,6 +732,26 @@ class SpansBuffer:
                 else:
                     cursors[key] = cursor
 
+        self._track_dropped_spans({key: len(payloads.get(key, [])) for key in segment_keys})
+
+        for key, spans in payloads.items():
+            if not spans:
+                # This is a bug, most likely the input topic is not
+                # partitioned by trace_id so multiple consumers are writing
+                # over each other. The consequence is duplicated segments,
+                # worst-case.
+                metrics.incr("spans.buffer.empty_segments")
+
+        return payloads
+
+    def _track_dropped_spans(self, loaded_counts: dict[SegmentKey, int]) -> None:
+        """
+        Compares the number of spans loaded per segment against the number
+        of spans originally ingested into it, and emits outcomes for the
+        difference.
+        """
+        segment_keys = list(loaded_counts)
+
         # Fetch ingested counts for all segments to calculate dropped spans
         with self.client.pipeline(transaction=False) as p:
             for key in segment_keys:
@@ -593,7 +778,7 @@ class SpansBuffer:
                 metrics.timing(
                     "spans.buffer.flush_segments.ingested_spans_per_segment", total_ingested
                 )
-                successfully_loaded = len(payloads.get(key, []))
+                successfully_loaded = loaded_counts[key]
                 dropped = total_ingested - successfully_loaded
                 if dropped <= 0:
                     continue
@@ -618,34 +803,220 @@ class SpansBuffer:
                         quantity=dropped,
                     )
 
-        for key, spans in payloads.items():
-            if not spans:
-                # This is a bug, most likely the input topic is not
-                # partitioned by trace_id so multiple consumers are writing
-                # over each other. The consequence is duplicated segments,
-                # worst-case.
+    def stream_segments(self, now: int) -> list[SegmentStream]:
+        """
+        Like `flush_segments`, but does not load any span payloads upfront.
+        Each returned `SegmentStream` loads its segment incrementally while
+        it is iterated, so only one page of a segment has to be held in
+        memory at a time. Once all streams have been consumed and produced,
+        pass them to `done_flush_segment_streams`.
+        """
+        segment_keys, max_segments_per_shard = self._load_flushable_segment_keys(now)
+        # Unlike `flush_segments`, which compares the number of spans in a
+        # segment against the per-shard limit, backpressure is signalled when a
+        # shard returned as many flushable segments as it may flush per cycle.
+        # Span counts are not known before the streams are consumed.
+        self.any_shard_at_limit = any(
+            count >= max_segments_per_shard
+            for count in collections.Counter(shard for shard, _, _ in segment_keys).values()
+        )
+
+        max_segment_bytes = options.get("spans.buffer.max-segment-bytes")
+        metrics.timing("spans.buffer.flush_segments.num_segments", len(segment_keys))
+
+        loader = SegmentPageLoader(
+            self.client,
+            [segment_key for _, _, segment_key in segment_keys],
+            page_size=options.get("spans.buffer.segment-page-size"),
+            prefetch=options.get("spans.buffer.flusher.stream-prefetch-segments"),
+        )
+        return [
+            SegmentStream(self, loader, queue_key, segment_key, max_segment_bytes)
+            for _, queue_key, segment_key in segment_keys
+        ]
+
+    def done_flush_segment_streams(self, streams: Sequence[SegmentStream]) -> None:
+        """
+        Emits outcomes for spans that were truncated or dropped from the
+        streamed segments and removes the segments from Redis.
+        """
+        num_has_root_spans = 0
+        for stream in streams:
+            metrics.timing("spans.buffer.flush_segments.num_spans_per_segment", stream.num_spans)
+            metrics.incr(
+                "spans.buffer.flush_segments.count_spans_per_segment", amount=stream.num_spans
+            )
+            num_has_root_spans += int(stream.has_root_span)
+            if not stream.span_ids:
                 metrics.incr("spans.buffer.empty_segments")
+        metrics.timing("spans.buffer.flush_segments.has_root_span", num_has_root_spans)
 
-        return payloads
+        self._track_dropped_spans({stream.segment_key: stream.num_spans for stream in streams})
+        self._delete_flushed_segments(
+            [(stream.segment_key, stream.queue_key, stream.span_ids) for stream in streams]
+        )
 
     def done_flush_segments(self, segment_keys: dict[SegmentKey, FlushedSegment]):
-        metrics.timing("spans.buffer.done_flush_segments.num_segments", len(segment_keys))
+        self._delete_flushed_segments(
+            [
+                (
+                    segment_key,
+                    flushed_segment.queue_key,
+                    [output_span.payload["span_id"] for output_span in flushed_segment.spans],
+                )
+                for segment_key, flushed_segment in segment_keys.items()
+            ]
+        )
+
+    def _delete_flushed_segments(
+        self, segments: Sequence[tuple[SegmentKey, QueueKey, Sequence[str]]]
+    ) -> None:
+        metrics.timing("spans.buffer.done_flush_segments.num_segments", len(segments))
         with metrics.timer("spans.buffer.done_flush_segments"):
             with self.client.pipeline(transaction=False) as p:
-                for segment_key, flushed_segment in segment_keys.items():
+                for segment_key, queue_key, span_ids in segments:
                     p.delete(b"span-buf:hrs:" + segment_key)
                     p.delete(b"span-buf:ic:" + segment_key)
                     p.delete(b"span-buf:ibc:" + segment_key)
                     p.unlink(segment_key)
-                    p.zrem(flushed_segment.queue_key, segment_key)
+                    p.zrem(queue_key, segment_key)
 
                     project_id, trace_id, _ = parse_segment_key(segment_key)
                     redirect_map_key = b"span-buf:sr:{%s:%s}" % (project_id, trace_id)
 
-                    for span_batch in itertools.batched(flushed_segment.spans, 100):
-                        p.hdel(
-                            redirect_map_key,
-                            *[output_span.payload["span_id"] for output_span in span_batch],
-                        )
+                    for span_id_batch in itertools.batched(span_ids, 100):
+                        p.hdel(redirect_map_key, *span_id_batch)
 
                 p.execute()
+
+
+class SegmentPageLoader:
+    """
+    Fetches the pages of all segments returned by one `stream_segments` call.
+
+    Whenever a stream needs a page that has not been fetched yet, the first
+    pages of the following segments are fetched in the same pipeline, up to
+    `prefetch` scans per round trip. Most segments fit into a single page, so
+    they are read without a round trip of their own, while at most `prefetch`
+    compressed pages are held in memory.
+    """
+
+    def __init__(
+        self,
+        client: RedisCluster[bytes] | StrictRedis[bytes],
+        segment_keys: Sequence[SegmentKey],
+        page_size: int,
+        prefetch: int,
+    ) -> None:
+        self.client = client
+        self.page_size = page_size
+        self.prefetch = max(1, prefetch)
+
+        # Segments whose first page has not been fetched yet, in flush order.
+        self._unfetched: dict[SegmentKey, None] = dict.fromkeys(segment_keys)
+        self._first_pages: dict[SegmentKey, tuple[int, list[Any]]] = {}
+
+    def get_page(self, segment_key: SegmentKey, cursor: int) -> tuple[int, list[Any]]:
+        """
+        Returns the next cursor and the scanned values of the page of
+        `segment_key` starting at `cursor`.
+        """
+        if cursor == 0 and segment_key in self._first_pages:
+            return self._first_pages.pop(segment_key)
+
+        self._unfetched.pop(segment_key, None)
+        prefetch_keys = list(itertools.islice(self._unfetched, self.prefetch - 1))
+        for key in prefetch_keys:
+            del self._unfetched[key]
+
+        with self.client.pipeline(transaction=False) as p:
+            for key, key_cursor in [(segment_key, cursor), *((key, 0) for key in prefetch_keys)]:
+                if key.startswith(b"span-buf:z:"):
+                    p.zscan(key, cursor=key_cursor, count=self.page_size)
+                else:
+                    p.sscan(key, cursor=key_cursor, count=self.page_size)
+
+            page, *prefetched_pages = p.execute()
+
+        self._first_pages.update(zip(prefetch_keys, prefetched_pages))
+        return page
+
+
+class SegmentStream:
+    """
+    A segment that is due to be flushed, loaded page by page from Redis while
+    it is iterated. Iterating yields lists of output spans, one per scanned
+    page.
+
+    Loading stops once the decompressed payloads exceed `max_segment_bytes`.
+    Instead of dropping the segment, the spans loaded so far are kept and the
+    segment is marked as truncated; the remaining spans are reported as
+    dropped by `SpansBuffer.done_flush_segment_streams`.
+    """
+
+    def __init__(
+        self,
+        buffer: SpansBuffer,
+        loader: SegmentPageLoader,
+        queue_key: QueueKey,
+        segment_key: SegmentKey,
+        max_segment_bytes: int,
+    ) -> None:
+        self.buffer = buffer
+        self.loader = loader
+        self.queue_key = queue_key
+        self.segment_key = segment_key
+        self.max_segment_bytes = max_segment_bytes
+
+        self.span_ids: list[str] = []
+        self.num_bytes = 0
+        self.has_root_span = False
+        self.truncated = False
+
+    @property
+    def num_spans(self) -> int:
+        return len(self.span_ids)
+
+    def __iter__(self) -> Iterator[list[OutputSpan]]:
+        self.span_ids = []
+        self.num_bytes = 0
+        self.has_root_span = False
+        self.truncated = False
+
+        segment_span_id = _segment_key_to_span_id(self.segment_key).decode("ascii")
+
+        cursor = 0
+        while True:
+            cursor, scan_values = self.loader.get_page(self.segment_key, cursor)
+
+            chunk = []
+            for scan_value in scan_values:
+                span_data = scan_value[0] if isinstance(scan_value, tuple) else scan_value
+                for payload in self.buffer._decompress_batch(span_data):
+                    if self.num_bytes + len(payload) > self.max_segment_bytes:
+                        self.truncated = True
+                        break
+
+                    self.num_bytes += len(payload)
+                    output_span = _make_output_span(payload, segment_span_id)
+                    self.has_root_span |= output_span.payload["is_segment"]
+                    self.span_ids.append(output_span.payload["span_id"])
+                    chunk.append(output_span)
+
+                if self.truncated:
+                    break
+
+            if chunk:
+                yield chunk
+
+            if self.truncated:
+                metrics.incr("spans.buffer.flush_segments.segment_truncated")
+                logger.warning(
+                    "Truncating too large segment after %s spans, byte size %s",
+                    self.num_spans,
+                    self.num_bytes,
+                )
+                return
+
+            if cursor == 0:
+                return
@@ -65,6 +65,8 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         self.produce_to_pipe = produce_to_pipe
         self.kafka_slice_id = kafka_slice_id
 
+        self._buffer: SpansBuffer | None = None
+
         if self.num_processes != 1:
             self.__pool = MultiprocessingPool(num_processes)
 
@@ -83,7 +85,11 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
 
         committer = CommitOffsets(commit)
 
-        buffer = SpansBuffer(
+        # The strategy of the previous assignment has been joined by now.
+        if self._buffer is not None:
+            self._buffer.close()
+
+        buffer = self._buffer = SpansBuffer(
             assigned_shards=[p.index for p in partitions],
             slice_id=self.kafka_slice_id,
         )
@@ -151,6 +157,8 @@ class ProcessSpansStrategyFactory(ProcessingStrategyFactory[KafkaPayload]):
         return SetJoinTimeout(0.0, add_timestamp)
 
     def shutdown(self) -> None:
+        if self._buffer is not None:
+            self._buffer.close()
         if self.num_processes != 1:
             self.__pool.close()
 
@@ -18,7 +18,7 @@ from django.conf import settings
 from sentry import options
 from sentry.conf.types.kafka_definition import Topic
 from sentry.processing.backpressure.memory import ServiceMemory
-from sentry.spans.buffer import SpansBuffer
+from sentry.spans.buffer import FlushedSegment, SegmentKey, SegmentStream, SpansBuffer
 from sentry.utils import metrics
 from sentry.utils.arroyo import run_with_initialized_sentry
 from sentry.utils.kafka_config import get_kafka_producer_cluster_options, get_topic_definition
@@ -281,7 +281,11 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
             while not stopped.value:
                 system_now = int(time.time())
                 now = system_now + current_drift.value
-                flushed_segments = buffer.flush_segments(now=now)
+                flushed_segments: dict[SegmentKey, FlushedSegment] | list[SegmentStream]
+                if options.get("spans.buffer.flusher.streaming"):
+                    flushed_segments = buffer.stream_segments(now=now)
+                else:
+                    flushed_segments = buffer.flush_segments(now=now)
 
                 if first_iteration:
                     logger.info("Flusher first flush_segments completed for shards %s", shard_tag)
@@ -305,18 +309,31 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
                     continue
 
                 with metrics.timer("spans.buffer.flusher.produce", tags={"shard": shard_tag}):
-                    for flushed_segment in flushed_segments.values():
-                        if not flushed_segment.spans:
-                            continue
-
-                        spans = [span.payload for span in flushed_segment.spans]
-                        kafka_payload = KafkaPayload(None, orjson.dumps({"spans": spans}), [])
-                        metrics.timing(
-                            "spans.buffer.segment_size_bytes",
-                            len(kafka_payload.value),
-                            tags={"shard": shard_tag},
-                        )
-                        produce(kafka_payload)
+                    if isinstance(flushed_segments, list):
+                        for stream in flushed_segments:
+                            kafka_payload = SpanFlusher._encode_segment_stream(stream)
+                            if kafka_payload is None:
+                                continue
+
+                            metrics.timing(
+                                "spans.buffer.segment_size_bytes",
+                                len(kafka_payload.value),
+                                tags={"shard": shard_tag},
+                            )
+                            produce(kafka_payload)
+                    else:
+                        for flushed_segment in flushed_segments.values():
+                            if not flushed_segment.spans:
+                                continue
+
+                            spans = [span.payload for span in flushed_segment.spans]
+                            kafka_payload = KafkaPayload(None, orjson.dumps({"spans": spans}), [])
+                            metrics.timing(
+                                "spans.buffer.segment_size_bytes",
+                                len(kafka_payload.value),
+                                tags={"shard": shard_tag},
+                            )
+                            produce(kafka_payload)
 
                 with metrics.timer("spans.buffer.flusher.wait_produce", tags={"shards": shard_tag}):
                     for future in producer_futures:
@@ -324,7 +341,10 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
 
                 producer_futures.clear()
 
-                buffer.done_flush_segments(flushed_segments)
+                if isinstance(flushed_segments, list):
+                    buffer.done_flush_segment_streams(flushed_segments)
+                else:
+                    buffer.done_flush_segments(flushed_segments)
 
             if producer_manager is not None:
                 producer_manager.close()
@@ -334,6 +354,28 @@ class SpanFlusher(ProcessingStrategy[FilteredPayload | int]):
             sentry_sdk.capture_exception()
             raise
 
+    @staticmethod
+    def _encode_segment_stream(stream: SegmentStream) -> KafkaPayload | None:
+        """
+        Serializes a streamed segment into the same message as
+        `orjson.dumps({"spans": spans})`, one page of spans at a time, so that
+        parsed span payloads never accumulate for the whole segment.
+        """
+        value = bytearray(b'{"spans":[')
+        empty = True
+        for chunk in stream:
+            for span in chunk:
+                if not empty:
+                    value += b","
+                value += orjson.dumps(span.payload)
+                empty = False
+
+        if empty:
+            return None
+
+        value += b"]}"
+        return KafkaPayload(None, bytes(value), [])
+
     def poll(self) -> None:
         self.next_step.poll()
 
@@ -1,5 +1,6 @@
-from collections import defaultdict
-from collections.abc import Iterator, Sequence
+import itertools
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
 from typing import Any
 
 from sentry_conventions.attributes import ATTRIBUTE_NAMES
@@ -72,23 +73,115 @@ def _find_segment_span(spans: list[SpanEvent]) -> SpanEvent | None:
     return None
 
 
+class SegmentTimings:
+    """
+    Array-backed representation of the span tree of a segment.
+
+    Spans are addressed by their position in the segment. ``parents`` holds the
+    position of each span's parent, or ``-1`` if the parent is not part of the
+    segment. ``starts`` and ``ends`` hold the span timestamps in microseconds.
+    If several spans share a span ID, ``parents`` and ``positions`` refer to
+    the last one, while exclusive times treat the children as children of
+    every span with that ID.
+    """
+
+    def __init__(self, spans: Sequence[SpanEvent]) -> None:
+        self.starts = array("q", [_us(span["start_timestamp"]) for span in spans])
+        self.ends = array("q", [_us(span["end_timestamp"]) for span in spans])
+
+        self.positions: dict[str, int] = {}
+        # Positions of all spans sharing a span ID, keyed by the last one.
+        self.duplicates: dict[int, list[int]] = {}
+        for i, span in enumerate(spans):
+            if "span_id" not in span:
+                continue
+            if (previous := self.positions.get(span["span_id"])) is not None:
+                self.duplicates[i] = self.duplicates.pop(previous, [previous]) + [i]
+            self.positions[span["span_id"]] = i
+        self.parents = array(
+            "q",
+            [
+                self.positions.get(parent_span_id, -1)
+                if (parent_span_id := span.get("parent_span_id"))
+                else -1
+                for span in spans
+            ],
+        )
+
+    def __len__(self) -> int:
+        return len(self.parents)
+
+    def iter_ancestors(self, position: int) -> Iterator[int]:
+        """Iterates over the positions of the ancestors of a span towards the root."""
+        parent = self.parents[position]
+        while parent >= 0:
+            yield parent
+            parent = self.parents[parent]
+
+    def exclusive_times_us(self) -> array:
+        """
+        Computes the exclusive time of all spans in the segment at once.
+
+        The exclusive time is the time spent in a span's own code. This is the sum
+        of all time intervals where no child span was active.
+
+        All child intervals are sorted in a single pass by parent, start ASC and
+        end DESC, which groups siblings and lets nested intervals be skipped. A
+        single sweep over the sorted intervals then fills in every parent.
+        """
+
+        starts = self.starts.tolist()
+        ends = self.ends.tolist()
+        rv = [max(end - start, 0) for start, end in zip(starts, ends)]
+        children = sorted(
+            (parent, start, -end)
+            for parent, start, end in zip(self.parents, starts, ends)
+            if parent >= 0
+        )
+
+        for parent, siblings in itertools.groupby(children, key=lambda child: child[0]):
+            intervals = [(start, -neg_end) for _, start, neg_end in siblings]
+            for position in self.duplicates.get(parent, (parent,)):
+                rv[position] = _exclusive_time_us(starts[position], ends[position], intervals)
+
+        return array("q", rv)
+
+
+def _exclusive_time_us(start: int, end: int, intervals: Iterable[tuple[int, int]]) -> int:
+    """
+    Returns the time between ``start`` and ``end`` not covered by any of the
+    child ``intervals``, which must be sorted by start ASC and end DESC.
+    """
+
+    exclusive_time_us = 0
+    # Progressively add time gaps before the next child and then skip to its end.
+    for child_start, child_end in intervals:
+        if child_start >= end:
+            break
+        if child_start > start:
+            exclusive_time_us += child_start - start
+        start = max(start, child_end)
+
+    # Add any remaining time not covered by children
+    return exclusive_time_us + max(end - start, 0)
+
+
 class TreeEnricher:
     """Enriches spans with information from their parent, child and sibling spans."""
 
     def __init__(self, spans: list[SpanEvent]) -> None:
+        self._spans = spans
         self._segment_span = _find_segment_span(spans)
 
         self._ttid_ts = _timestamp_by_op(spans, "ui.load.initial_display")
         self._ttfd_ts = _timestamp_by_op(spans, "ui.load.full_display")
 
-        self._span_intervals: dict[str, list[tuple[int, int]]] = {}
-        self._spans_by_id: dict[str, SpanEvent] = {}
-        for span in spans:
-            if "span_id" in span:
-                self._spans_by_id[span["span_id"]] = span
-            if parent_span_id := span.get("parent_span_id"):
-                interval = _span_interval(span)
-                self._span_intervals.setdefault(parent_span_id, []).append(interval)
+        self._timings = SegmentTimings(spans)
+        # Keyed by span identity, since span IDs are not guaranteed to be unique.
+        self._exclusive_times_us = dict(zip(map(id, spans), self._timings.exclusive_times_us()))
+        self._spans_by_id: dict[str, SpanEvent] = {
+            span_id: spans[i] for span_id, i in self._timings.positions.items()
+        }
 
     def _attributes(self, span: SpanEvent) -> dict[str, Any]:
         attributes: dict[str, Any] = {**(span.get("attributes") or {})}
@@ -157,47 +250,22 @@ class TreeEnricher:
         """
         Iterates over the ancestors of a span in order towards the root using the "parent_span_id" attribute.
         """
-        current: SpanEvent | None = span
-        parent_span_id: str | None = None
-
-        while current is not None:
-            parent_span_id = current.get("parent_span_id")
-            if parent_span_id is not None:
-                current = self._spans_by_id.get(parent_span_id)
-            else:
-                current = None
-            if current is not None:
-                yield current
-            else:
-                break
+        parent_span_id = span.get("parent_span_id")
+        position = self._timings.positions.get(parent_span_id) if parent_span_id else None
+        if position is None:
+            return
+
+        yield self._spans[position]
+        for ancestor in self._timings.iter_ancestors(position):
+            yield self._spans[ancestor]
 
     def _exclusive_time(self, span: SpanEvent) -> float:
         """
-        Sets the exclusive time on all spans in the list.
-
-        The exclusive time is the time spent in a span's own code. This is the sum
-        of all time intervals where no child span was active.
+        Returns the exclusive time of a span in milliseconds. See
+        ``SegmentTimings.exclusive_times_us``.
         """
 
-        intervals = self._span_intervals.get(span["span_id"], [])
-        # Sort by start ASC, end DESC to skip over nested intervals efficiently
-        intervals.sort(key=lambda x: (x[0], -x[1]))
-
-        exclusive_time_us: int = 0  # microseconds to prevent rounding issues
-        start, end = _span_interval(span)
-
-        # Progressively add time gaps before the next span and then skip to its end.
-        for child_start, child_end in intervals:
-            if child_start >= end:
-                break
-            if child_start > start:
-                exclusive_time_us += child_start - start
-            start = max(start, child_end)
-
-        # Add any remaining time not covered by children
-        exclusive_time_us += max(end - start, 0)
-
-        return exclusive_time_us / 1_000
+        return self._exclusive_times_us[id(span)] / 1_000
 
     def enrich_span(self, span: SpanEvent) -> SpanEvent:
         attributes = self._attributes(span)
@@ -287,35 +355,42 @@ def _compute_span_ops(spans: Sequence[SpanEvent], config: Any) -> dict[str, floa
     if not matches:
         return {}
 
-    intervals_by_op = defaultdict(list)
+    intervals = []
     for span in spans:
         op = get_span_op(span)
         if operation_name := next(filter(lambda m: op.startswith(m), matches), None):
-            intervals_by_op[operation_name].append(_span_interval(span))
+            intervals.append((operation_name, *_span_interval(span)))
 
     ret: dict[str, float] = {}
-    for operation_name, intervals in intervals_by_op.items():
-        duration = _get_duration_us(intervals)
+    for operation_name, duration in _get_durations_us(intervals).items():
         ret[f"ops.{operation_name}"] = duration / 1000  # unit: millisecond
     return ret
 
 
-def _get_duration_us(intervals: list[tuple[int, int]]) -> int:
+def _get_durations_us(intervals: list[tuple[str, int, int]]) -> dict[str, int]:
     """
-    Get the wall clock time duration covered by the intervals in microseconds.
+    Get the wall clock time duration covered by the intervals of each key in
+    microseconds.
 
     Overlapping intervals are merged so that they are not counted twice. For
     example, the intervals [(1, 3), (2, 4)] would yield a duration of 3, not 4.
+    The intervals of all keys are sorted once and merged in a single sweep.
     """
 
-    duration = 0
+    durations: dict[str, int] = {}
+    current = None
     last_end = 0
 
-    intervals.sort(key=lambda x: (x[0], -x[1]))
-    for start, end in intervals:
-        # Ensure the current interval doesn't overlap with the last one
+    intervals.sort()
+    for key, start, end in intervals:
+        if key != current:
+            current = key
+            durations[key] = 0
+            last_end = start
+
+        # Ensure the current interval doesn't overlap with the previous ones
         start = max(start, last_end)
-        duration += max(end - start, 0)
-        last_end = end
+        durations[key] += max(end - start, 0)
+        last_end = max(last_end, end)
 
-    return duration
+    return durations
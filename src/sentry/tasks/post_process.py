@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import contextvars
 import logging
 import random
+import threading
 import uuid
-from collections.abc import MutableMapping, Sequence
+from collections import defaultdict
+from collections.abc import Callable, MutableMapping, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from datetime import datetime
+from functools import cache
 from time import time
 from typing import TYPE_CHECKING, Any, TypedDict
 
 import sentry_sdk
 from django.conf import settings
+from django.db import close_old_connections
 from django.db.models.signals import post_save
 from django.utils import timezone
 from google.api_core.exceptions import ServiceUnavailable
@@ -75,6 +82,25 @@ class PostProcessJob(TypedDict, total=False):
     has_escalated: bool
 
 
+PostProcessStep = Callable[[PostProcessJob], None]
+
+
+@dataclass(frozen=True)
+class PostProcessStepDependencies:
+    """
+    The parts of a `PostProcessJob` a pipeline step reads and writes. Besides the job keys, "group"
+    stands for the event's `Group` and the rows hanging off it (inbox, snooze, owners, assignee),
+    which several steps update in place. `event` and `is_reprocessed` are read by nearly every step
+    and never written, so they aren't listed.
+    """
+
+    reads: frozenset[str] = frozenset()
+    writes: frozenset[str] = frozenset()
+
+    def conflicts_with(self, other: PostProcessStepDependencies) -> bool:
+        return bool(self.writes & (other.reads | other.writes) or other.writes & self.reads)
+
+
 def _should_send_error_created_hooks(project):
     from sentry.models.organization import Organization
     from sentry.sentry_apps.models.servicehook import ServiceHook
@@ -673,41 +699,149 @@ def run_post_process_job(job: PostProcessJob) -> None:
         # pipeline for generic issues
         pipeline = GENERIC_POST_PROCESS_PIPELINE
 
-    for pipeline_step in pipeline:
-        try:
-            with (
-                metrics.timer(
-                    "tasks.post_process.run_post_process_job.pipeline.duration",
-                    tags={
-                        "pipeline": pipeline_step.__name__,
-                        "issue_category": issue_category_metric,
-                        "is_reprocessed": job["is_reprocessed"],
-                    },
-                ),
-                sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"),
-            ):
-                pipeline_step(job)
-        except Exception:
-            metrics.incr(
-                "sentry.tasks.post_process.post_process_group.exception",
+    max_workers = options.get("post_process.pipeline.max-concurrent-steps")
+    if max_workers > 1 and len(pipeline) > 1:
+        _run_pipeline_concurrently(job, pipeline, issue_category_metric, max_workers)
+    else:
+        for pipeline_step in pipeline:
+            _run_pipeline_step(job, pipeline_step, issue_category_metric)
+
+
+def _run_pipeline_step(
+    job: PostProcessJob, pipeline_step: PostProcessStep, issue_category_metric: str | None
+) -> None:
+    group_event = job["event"]
+    try:
+        with (
+            metrics.timer(
+                "tasks.post_process.run_post_process_job.pipeline.duration",
                 tags={
-                    "issue_category": issue_category_metric,
                     "pipeline": pipeline_step.__name__,
-                },
-            )
-            logger.exception(
-                "Failed to process pipeline step %s",
-                pipeline_step.__name__,
-                extra={"event": group_event, "group": group_event.group},
-            )
-        else:
-            metrics.incr(
-                "sentry.tasks.post_process.post_process_group.completed",
-                tags={
                     "issue_category": issue_category_metric,
-                    "pipeline": pipeline_step.__name__,
+                    "is_reprocessed": job["is_reprocessed"],
                 },
+            ),
+            sentry_sdk.start_span(op=f"tasks.post_process_group.{pipeline_step.__name__}"),
+        ):
+            pipeline_step(job)
+    except Exception:
+        metrics.incr(
+            "sentry.tasks.post_process.post_process_group.exception",
+            tags={
+                "issue_category": issue_category_metric,
+                "pipeline": pipeline_step.__name__,
+            },
+        )
+        logger.exception(
+            "Failed to process pipeline step %s",
+            pipeline_step.__name__,
+            extra={"event": group_event, "group": group_event.group},
+        )
+    else:
+        metrics.incr(
+            "sentry.tasks.post_process.post_process_group.completed",
+            tags={
+                "issue_category": issue_category_metric,
+                "pipeline": pipeline_step.__name__,
+            },
+        )
+
+
+_pipeline_executor: ThreadPoolExecutor | None = None
+_pipeline_executor_size = 0
+_pipeline_executor_lock = threading.Lock()
+
+
+def _get_pipeline_executor(max_workers: int) -> ThreadPoolExecutor:
+    global _pipeline_executor, _pipeline_executor_size
+    with _pipeline_executor_lock:
+        if _pipeline_executor is None or _pipeline_executor_size != max_workers:
+            if _pipeline_executor is not None:
+                # Steps already submitted to the old pool still run to completion
+                _pipeline_executor.shutdown(wait=False)
+            _pipeline_executor = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="post-process-step"
             )
+            _pipeline_executor_size = max_workers
+        return _pipeline_executor
+
+
+@cache
+def get_pipeline_step_dependencies(pipeline: tuple[PostProcessStep, ...]) -> list[frozenset[int]]:
+    """
+    For each step of the pipeline, the indices of the earlier steps which have to finish before it
+    can start, because one of the two writes something the other reads or writes. Steps without
+    declared dependencies wait for every step before them, and every step after them waits for them.
+    """
+    declared = [
+        POST_PROCESS_STEP_DEPENDENCIES.get(getattr(step, "__wrapped__", step))
+        for step in pipeline
+    ]
+    rv = []
+    for i, dependencies in enumerate(declared):
+        rv.append(
+            frozenset(
+                j
+                for j, earlier in enumerate(declared[:i])
+                if dependencies is None or earlier is None or dependencies.conflicts_with(earlier)
+            )
+        )
+    return rv
+
+
+def _run_pipeline_concurrently(
+    job: PostProcessJob,
+    pipeline: Sequence[PostProcessStep],
+    issue_category_metric: str | None,
+    max_workers: int,
+) -> None:
+    """
+    Run the pipeline steps on a shared thread pool, starting each step as soon as the steps it
+    depends on (see `get_pipeline_step_dependencies`) are done. Steps that fail are logged by
+    `_run_pipeline_step` and don't stop their dependents, just like when running sequentially.
+    """
+    executor = _get_pipeline_executor(max_workers)
+    start = time()
+
+    def run_step(pipeline_step: PostProcessStep) -> None:
+        metrics.distribution(
+            "tasks.post_process.run_post_process_job.pipeline.start_offset",
+            (time() - start) * 1000,
+            tags={"pipeline": pipeline_step.__name__, "issue_category": issue_category_metric},
+            unit="millisecond",
+        )
+        try:
+            _run_pipeline_step(job, pipeline_step, issue_category_metric)
+        finally:
+            close_old_connections()
+
+    dependencies = get_pipeline_step_dependencies(tuple(pipeline))
+    waiting_on = {i: set(step_dependencies) for i, step_dependencies in enumerate(dependencies)}
+    dependents: defaultdict[int, list[int]] = defaultdict(list)
+    for i, step_dependencies in enumerate(dependencies):
+        for j in step_dependencies:
+            dependents[j].append(i)
+
+    running: dict[Future[None], int] = {}
+    while waiting_on or running:
+        for i in [i for i, remaining in waiting_on.items() if not remaining]:
+            del waiting_on[i]
+            # Each step gets its own copy of the context, so spans and scope data set by the
+            # caller propagate into the worker threads.
+            context = contextvars.copy_context()
+            running[executor.submit(context.run, run_step, pipeline[i])] = i
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            finished = running.pop(future)
+            for i in dependents[finished]:
+                waiting_on[i].discard(finished)
+
+    metrics.timing(
+        "tasks.post_process.run_post_process_job.pipeline.total_duration",
+        time() - start,
+        tags={"issue_category": issue_category_metric, "concurrent": True},
+    )
 
 
 def process_event(data: MutableMapping[str, Any], group_id: int | None) -> Event:
@@ -1393,6 +1527,8 @@ def feedback_filter_decorator(func):
             return
         return func(job)
 
+    # Lets the wrapper share the dependencies declared for `func`
+    wrapper.__wrapped__ = func  # type: ignore[attr-defined]
     return wrapper
 
 
@@ -1686,6 +1822,52 @@ def kick_off_seer_automation(job: PostProcessJob) -> None:
                 generate_summary_and_run_automation.delay(group.id)
 
 
+def _dependencies(
+    reads: Sequence[str] = (), writes: Sequence[str] = ()
+) -> PostProcessStepDependencies:
+    return PostProcessStepDependencies(reads=frozenset(reads), writes=frozenset(writes))
+
+
+# What each pipeline step reads from and writes to the job (see `PostProcessStepDependencies`).
+# When steps run concurrently, a step only waits for the earlier steps it conflicts with, so keep
+# this up to date when changing a step. Steps which aren't listed here run on their own, after
+# every step before them and before every step after them.
+POST_PROCESS_STEP_DEPENDENCIES: dict[PostProcessStep, PostProcessStepDependencies] = {
+    _capture_group_stats: _dependencies(reads=["group_state"]),
+    process_snoozes: _dependencies(
+        reads=["has_reappeared", "group"], writes=["has_reappeared", "has_escalated", "group"]
+    ),
+    process_inbox_adds: _dependencies(reads=["group_state", "has_reappeared"], writes=["group"]),
+    detect_new_escalation: _dependencies(reads=["group"], writes=["has_escalated", "group"]),
+    process_commits: _dependencies(reads=["group_state"]),
+    handle_owner_assignment: _dependencies(writes=["group"]),
+    handle_auto_assignment: _dependencies(writes=["group"]),
+    kick_off_seer_automation: _dependencies(reads=["group"]),
+    process_rules: _dependencies(
+        reads=["group_state", "has_reappeared", "has_escalated", "group"], writes=["has_alert"]
+    ),
+    process_workflow_engine_issue_alerts: _dependencies(
+        reads=["group_state", "has_reappeared", "has_escalated", "group"]
+    ),
+    process_workflow_engine_metric_issues: _dependencies(
+        reads=["group_state", "has_reappeared", "has_escalated", "group"]
+    ),
+    process_service_hooks: _dependencies(reads=["has_alert"]),
+    process_resource_change_bounds: _dependencies(reads=["group_state"]),
+    process_data_forwarding: _dependencies(),
+    process_plugins: _dependencies(reads=["group_state", "group"]),
+    process_code_mappings: _dependencies(),
+    process_similarity: _dependencies(),
+    update_existing_attachments: _dependencies(),
+    fire_error_processed: _dependencies(reads=["group"]),
+    sdk_crash_monitoring: _dependencies(),
+    process_replay_link: _dependencies(),
+    link_event_to_user_report: _dependencies(),
+    detect_base_urls_for_uptime: _dependencies(),
+    check_if_flags_sent: _dependencies(),
+}
+
+
 GROUP_CATEGORY_POST_PROCESS_PIPELINE = {
     GroupCategory.ERROR: [
         _capture_group_stats,
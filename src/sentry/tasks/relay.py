@@ -1,9 +1,11 @@
 import logging
 import time
+from collections import defaultdict
 
 import sentry_sdk
 from django.db import router, transaction
 
+from sentry import options
 from sentry.models.organization import Organization
 from sentry.relay import projectconfig_cache, projectconfig_debounce_cache
 from sentry.silo.base import SiloMode
@@ -117,7 +119,9 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     validate_args(organization_id, project_id, public_key)
     configs = {}
 
-    if organization_id:
+    if organization_id and options.get("relay.project-config.bulk-org-compute"):
+        configs = compute_org_configs_bulk(organization_id)
+    elif organization_id:
         # We want to re-compute all projects in an organization, instead of simply
         # removing the configs and rely on relay requests to lazily re-compute them.  This
         # is done because we do want want to delete project configs in `invalidate_project_config`
@@ -179,6 +183,50 @@ def compute_configs(organization_id=None, project_id=None, public_key=None):
     return configs
 
 
+def compute_org_configs_bulk(organization_id):
+    """Computes the configs of all cached keys in the organization at once.
+
+    Same as :func:`compute_configs` for an organization, but project keys, cache
+    presence and inputs shared by the projects are loaded in bulk.  See
+    :func:`sentry.relay.config.get_project_configs_bulk`.
+    """
+    from sentry.models.project import Project
+    from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config import get_project_configs_bulk
+
+    configs = {}
+    for organization in Organization.objects.filter(id=organization_id):
+        keys = list(ProjectKey.objects.filter(project__organization_id=organization_id))
+        # Like in `compute_configs`, only configs found in the cache were active and
+        # are recomputed.
+        cached = projectconfig_cache.backend.exists_many(key.public_key for key in keys)
+
+        keys_by_project = defaultdict(list)
+        for key in keys:
+            if key.public_key in cached:
+                keys_by_project[key.project_id].append(key)
+
+        for action, amount in (
+            ("recompute", len(cached)),
+            ("not-cached", len(keys) - len(cached)),
+        ):
+            metrics.incr(
+                "relay.projectconfig_cache.invalidation.recompute",
+                amount=amount,
+                tags={"action": action, "scope": "organization"},
+            )
+
+        if keys_by_project:
+            projects = list(
+                Project.objects.filter(
+                    organization_id=organization_id, id__in=list(keys_by_project)
+                )
+            )
+            configs.update(get_project_configs_bulk(organization, projects, keys_by_project))
+
+    return configs
+
+
 def compute_projectkey_config(key):
     """Computes a single config for the given :class:`ProjectKey`.
 
@@ -337,6 +385,7 @@ def _schedule_invalidate_project_config(
     """For param docs, see :func:`schedule_invalidate_project_config`."""
     from sentry.models.project import Project
     from sentry.models.projectkey import ProjectKey
+    from sentry.relay.config.sections import bump_section_versions
 
     validate_args(organization_id, project_id, public_key)
 
@@ -367,6 +416,14 @@ def _schedule_invalidate_project_config(
         else:
             check_debounce_keys["organization_id"] = org_id
 
+    # Bump section versions even if the invalidation is debounced, the already
+    # scheduled task must not reuse sections memoized before this change.
+    bump_section_versions(
+        trigger,
+        organization_id=check_debounce_keys["organization_id"],
+        project_id=check_debounce_keys["project_id"],
+    )
+
     with quiet_redis_noise():
         if projectconfig_debounce_cache.invalidation.is_debounced(**check_debounce_keys):
             # If this task is already in the queue, do not schedule another task.
@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import logging
 import random
-from collections.abc import Mapping, MutableMapping
-from dataclasses import dataclass
+from collections import defaultdict
+from collections.abc import Callable, Generator, Mapping, MutableMapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from time import time
 from typing import Any
 
@@ -94,6 +97,85 @@ class SaveEventTaskKind:
     from_reprocessing: bool = False
 
 
+@dataclass
+class SaveEventBatch:
+    """
+    Collects ``save_event`` submissions so that they can be sent as one
+    ``save_event_batch`` task per project. Callbacks registered with
+    ``defer_until_submitted`` run once the tasks have been submitted.
+    """
+
+    max_size: int
+    events: dict[int, list[dict[str, Any]]] = field(default_factory=lambda: defaultdict(list))
+    callbacks: list[Callable[[], None]] = field(default_factory=list)
+    # Deduplication keys of events whose callbacks are still deferred.
+    pending_keys: set[str] = field(default_factory=set)
+
+    def submit(self) -> None:
+        for project_id, events in self.events.items():
+            for i in range(0, len(events), self.max_size):
+                save_event_batch.delay(project_id=project_id, events=events[i : i + self.max_size])
+            metrics.distribution("events.save_event_batch.size", len(events))
+        self.events.clear()
+
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+        self.pending_keys.clear()
+
+
+_save_event_batch: ContextVar[SaveEventBatch | None] = ContextVar("save_event_batch", default=None)
+
+
+@contextmanager
+def batch_save_events(max_size: int) -> Generator[SaveEventBatch]:
+    """
+    Collect events submitted to ``save_event`` within this block and submit
+    them per project in batches of up to ``max_size`` events once the block
+    exits. Events with attachments or from reprocessing are not batched.
+
+    Whatever was collected is submitted even if the block raises, so that
+    deferred callbacks (such as deduplication markers) are not lost for
+    events that were already handed off.
+    """
+    batch = SaveEventBatch(max_size=max_size)
+    token = _save_event_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _save_event_batch.reset(token)
+        batch.submit()
+
+
+def defer_until_submitted(
+    callback: Callable[[], None], deduplication_key: str | None = None
+) -> None:
+    """
+    Run ``callback`` once pending ``save_event`` submissions of the current
+    ``batch_save_events`` block have been submitted, or immediately if there
+    is no such block.
+
+    Until then, ``deduplication_key`` is reported by ``is_pending_submission``
+    so that duplicates within the same batch can be skipped.
+    """
+    batch = _save_event_batch.get()
+    if batch is None:
+        callback()
+    else:
+        batch.callbacks.append(callback)
+        if deduplication_key is not None:
+            batch.pending_keys.add(deduplication_key)
+
+
+def is_pending_submission(deduplication_key: str) -> bool:
+    """
+    Whether an event with ``deduplication_key`` was already accepted by the
+    current ``batch_save_events`` block, but not submitted yet.
+    """
+    batch = _save_event_batch.get()
+    return batch is not None and deduplication_key in batch.pending_keys
+
+
 def submit_save_event(
     task_kind: SaveEventTaskKind,
     project_id: int,
@@ -105,6 +187,13 @@ def submit_save_event(
     if cache_key:
         data = None
 
+    batch = _save_event_batch.get()
+    if batch is not None and cache_key and task_kind == SaveEventTaskKind():
+        batch.events[project_id].append(
+            {"cache_key": cache_key, "event_id": event_id, "start_time": start_time}
+        )
+        return
+
     # XXX: honor from_reprocessing
     if task_kind.has_attachments:
         task = save_event_attachments
@@ -672,6 +761,63 @@ def save_event(
     )
 
 
+#: Time after which ``save_event_batch`` hands its remaining events to a new
+#: task. What is left of the deadline is the deadline of a single ``save_event``,
+#: enough to finish the event in progress.
+SAVE_EVENT_BATCH_TIME_BUDGET = 180 - 65
+
+
+@instrumented_task(
+    name="sentry.tasks.store.save_event_batch",
+    namespace=ingest_errors_tasks,
+    processing_deadline_duration=180,
+    silo_mode=SiloMode.REGION,
+)
+def save_event_batch(
+    project_id: int,
+    events: list[dict[str, Any]],
+    **kwargs: Any,
+) -> None:
+    """
+    Saves several events of the same project, as collected by
+    ``batch_save_events``. Lookups shared between the events, such as
+    releases and environments, are only resolved once.
+
+    Events which are not saved within ``SAVE_EVENT_BATCH_TIME_BUDGET``, or
+    which follow an event that failed to save, are handed to a new task. The
+    failure itself is raised like it is by ``save_event``.
+    """
+    from sentry.event_manager import shared_save_lookups
+
+    started = time()
+    with shared_save_lookups():
+        for i, event in enumerate(events):
+            if i > 0 and time() - started > SAVE_EVENT_BATCH_TIME_BUDGET:
+                _requeue_save_event_batch(project_id, events[i:], reason="deadline")
+                return
+
+            try:
+                _do_save_event(
+                    cache_key=event["cache_key"],
+                    start_time=event["start_time"],
+                    event_id=event["event_id"],
+                    project_id=project_id,
+                    consumer_type=ConsumerType.Events,
+                )
+            except Exception:
+                metrics.incr("events.save_event_batch.failed")
+                _requeue_save_event_batch(project_id, events[i + 1 :], reason="error")
+                raise
+
+
+def _requeue_save_event_batch(project_id: int, events: list[dict[str, Any]], reason: str) -> None:
+    if not events:
+        return
+
+    metrics.incr("events.save_event_batch.requeued", amount=len(events), tags={"reason": reason})
+    save_event_batch.delay(project_id=project_id, events=events)
+
+
 @instrumented_task(
     name="sentry.tasks.store.save_event_transaction",
     namespace=ingest_transactions_tasks,
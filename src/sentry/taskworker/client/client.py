@@ -288,6 +288,69 @@ class TaskworkerClient:
             )
         return None
 
+    def get_tasks(
+        self, namespace: str | None = None, count: int = 1
+    ) -> list[InflightTaskActivation]:
+        """
+        Fetch up to `count` pending tasks from the current broker.
+
+        The GetTask calls are issued concurrently, so a batch costs roughly one
+        round trip. Fewer tasks are returned when the broker runs out of pending
+        tasks. Errors are only raised when no task could be fetched, as fetched
+        tasks are already claimed on the broker and must not be dropped.
+        """
+        if count <= 1:
+            task = self.get_task(namespace)
+            return [task] if task else []
+
+        self._emit_health_check()
+
+        request = GetTaskRequest(application=self._application, namespace=namespace)
+        host, stub = self._get_cur_stub()
+        # _get_cur_stub() accounts for one task, the rest of the batch counts
+        # towards the rebalance as well.
+        self._num_tasks_before_rebalance -= count - 1
+
+        tasks: list[InflightTaskActivation] = []
+        error: grpc.RpcError | None = None
+        with metrics.timer("taskworker.get_tasks.rpc", tags={"host": host}):
+            futures = [stub.GetTask.future(request) for _ in range(count)]
+            for future in futures:
+                try:
+                    response = future.result()
+                except grpc.RpcError as err:
+                    metrics.incr(
+                        "taskworker.client.rpc_error",
+                        tags={"method": "GetTask", "status": err.code().name},
+                    )
+                    error = error or err
+                    continue
+                if response.HasField("task"):
+                    metrics.incr(
+                        "taskworker.client.get_task",
+                        tags={"namespace": response.task.namespace},
+                    )
+                    tasks.append(
+                        InflightTaskActivation(
+                            activation=response.task, host=host, receive_timestamp=time.monotonic()
+                        )
+                    )
+
+        metrics.distribution("taskworker.client.get_tasks.batch_size", len(tasks))
+        if error is not None and error.code() == grpc.StatusCode.NOT_FOUND:
+            # Because our current broker ran out of tasks, try rebalancing.
+            self._num_tasks_before_rebalance = 0
+        elif error is not None and not tasks:
+            if error.code() == grpc.StatusCode.UNAVAILABLE:
+                self._num_consecutive_unavailable_errors += 1
+                self._check_consecutive_unavailable_errors()
+            raise error
+
+        if tasks:
+            self._num_consecutive_unavailable_errors = 0
+            self._temporary_unavailable_hosts.pop(host, None)
+        return tasks
+
     def update_task(
         self,
         processing_result: ProcessingResult,
@@ -29,6 +29,11 @@ The size of multiprocessing.Queue used to communicate
 with child processes.
 """
 
+DEFAULT_WORKER_FETCH_BATCH_SIZE = 1
+"""
+The maximum number of tasks a worker fetches from the broker at once.
+"""
+
 DEFAULT_CHILD_TASK_COUNT = 10000
 """
 The number of tasks a worker child process will process
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import hashlib
 import heapq
 import logging
+import time
 from collections.abc import Mapping
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Any
@@ -17,12 +19,16 @@ from sentry.taskworker.app import TaskworkerApp
 from sentry.taskworker.scheduler.schedules import CrontabSchedule, Schedule, TimedeltaSchedule
 from sentry.taskworker.task import Task
 from sentry.utils import metrics
+from sentry.utils.redis import load_redis_script
 
 logger = logging.getLogger("taskworker.scheduler")
 
 if TYPE_CHECKING:
     from sentry_sdk._types import MonitorConfig
 
+acquire_lease = load_redis_script("taskworker/acquire_lease.lua")
+release_lease = load_redis_script("taskworker/release_lease.lua")
+
 
 class RunStorage:
     """
@@ -52,6 +58,20 @@ class RunStorage:
         result = self._redis.set(self._make_key(taskname), now.isoformat(), ex=duration, nx=True)
         return bool(result)
 
+    def set_many(self, next_runtimes: Mapping[str, datetime]) -> dict[str, bool]:
+        """
+        Record spawn times for many tasks in a single round trip.
+        See `set()` for the meaning of the return values.
+        """
+        now = timezone.now()
+        tasknames = list(next_runtimes)
+        with self._redis.pipeline(transaction=False) as pipeline:
+            for taskname in tasknames:
+                duration = max(int((next_runtimes[taskname] - now).total_seconds()), 1)
+                pipeline.set(self._make_key(taskname), now.isoformat(), ex=duration, nx=True)
+            results = pipeline.execute()
+        return {taskname: bool(result) for taskname, result in zip(tasknames, results)}
+
     def read(self, taskname: str) -> datetime | None:
         """
         Retrieve the last run time of a task
@@ -80,6 +100,112 @@ class RunStorage:
         self._redis.delete(self._make_key(taskname))
 
 
+class ScheduleSharding:
+    """
+    Partitions schedule entries across multiple scheduler instances.
+
+    Entries are hashed into a fixed number of partitions. Each partition is
+    assigned to one of the live scheduler instances by rendezvous hashing, so
+    only the partitions of an instance that joins or leaves move. The assigned
+    instance holds a lease on the partition in redis and only spawns the tasks
+    of partitions it holds a lease for. When an instance stops heartbeating its
+    partitions are assigned to the remaining instances once its leases expire.
+
+    Spawns stay deduplicated by `RunStorage.set()`, leases only prevent
+    instances from doing redundant work.
+    """
+
+    def __init__(
+        self,
+        redis: RedisCluster[str] | StrictRedis[str],
+        runner_id: str,
+        partition_count: int,
+        lease_duration: int = 30,
+    ) -> None:
+        self._redis = redis
+        self.runner_id = runner_id
+        self.partition_count = partition_count
+        self.lease_duration = lease_duration
+        self._owned: frozenset[int] = frozenset()
+        self._next_refresh = 0.0
+
+    @property
+    def refresh_interval(self) -> float:
+        # Renew well before leases expire.
+        return self.lease_duration / 3
+
+    def _lease_key(self, partition: int) -> str:
+        return f"tw:scheduler:lease:{partition}"
+
+    def _members_key(self) -> str:
+        return "tw:scheduler:runners"
+
+    def partition_for(self, fullname: str) -> int:
+        digest = hashlib.md5(fullname.encode("utf-8")).hexdigest()
+        return int(digest, 16) % self.partition_count
+
+    def preferred_runner(self, partition: int, runners: list[str]) -> str:
+        def weight(runner: str) -> int:
+            return int(hashlib.md5(f"{runner}:{partition}".encode()).hexdigest(), 16)
+
+        return max(runners, key=weight)
+
+    def _live_runners(self) -> list[str]:
+        now = time.time()
+        with self._redis.pipeline(transaction=False) as pipeline:
+            pipeline.zadd(self._members_key(), {self.runner_id: now})
+            pipeline.zremrangebyscore(self._members_key(), "-inf", now - self.lease_duration)
+            pipeline.zrange(self._members_key(), 0, -1)
+            pipeline.expire(self._members_key(), self.lease_duration)
+            _, _, runners, _ = pipeline.execute()
+        return list(runners)
+
+    def seconds_until_refresh(self) -> float:
+        return max(self._next_refresh - time.monotonic(), 0)
+
+    def owned_partitions(self) -> frozenset[int]:
+        """
+        Heartbeat, and acquire or renew the leases of the partitions assigned
+        to this instance. Leases are refreshed every `refresh_interval`
+        seconds, in between the current partitions are returned.
+        """
+        if time.monotonic() < self._next_refresh:
+            return self._owned
+
+        runners = self._live_runners()
+        owned = set()
+        for partition in range(self.partition_count):
+            key = self._lease_key(partition)
+            if self.preferred_runner(partition, runners) == self.runner_id:
+                if acquire_lease([key], [self.runner_id, self.lease_duration], client=self._redis):
+                    owned.add(partition)
+            elif partition in self._owned:
+                # Hand the partition over to its preferred instance.
+                release_lease([key], [self.runner_id], client=self._redis)
+
+        if owned != self._owned:
+            logger.info(
+                "taskworker.scheduler.partitions_changed",
+                extra={
+                    "runner_id": self.runner_id,
+                    "runners": len(runners),
+                    "partitions": sorted(owned),
+                },
+            )
+        metrics.gauge("taskworker.scheduler.owned_partitions", len(owned))
+        self._owned = frozenset(owned)
+        self._next_refresh = time.monotonic() + self.refresh_interval
+        return self._owned
+
+    def release(self) -> None:
+        """Release all leases held by this instance, for clean shutdowns."""
+        for partition in self._owned:
+            release_lease([self._lease_key(partition)], [self.runner_id], client=self._redis)
+        self._redis.zrem(self._members_key(), self.runner_id)
+        self._owned = frozenset()
+        self._next_refresh = 0.0
+
+
 class ScheduleEntry:
     """An individual task that can be scheduled to be run."""
 
@@ -176,13 +302,25 @@ class ScheduleRunner:
     Contains a collection of ScheduleEntry objects which are composed
     using `ScheduleRunner.add()`. Once the scheduler is built, `tick()`
     is used in a while loop to spawn tasks and sleep.
+
+    When `sharding` is provided, multiple runners can be operated together.
+    Each runner only spawns the entries of the partitions it holds a lease for,
+    and all due entries are spawned with a single `RunStorage.set_many()`.
     """
 
-    def __init__(self, app: TaskworkerApp, run_storage: RunStorage) -> None:
+    def __init__(
+        self,
+        app: TaskworkerApp,
+        run_storage: RunStorage,
+        sharding: ScheduleSharding | None = None,
+    ) -> None:
         self._entries: list[ScheduleEntry] = []
         self._app = app
         self._run_storage = run_storage
         self._heap: list[tuple[int, ScheduleEntry]] = []
+        self._sharding = sharding
+        self._owned_entries: list[ScheduleEntry] = []
+        self._owned_partitions: frozenset[int] | None = None
 
     def add(self, key: str, task_config: ScheduleConfig) -> None:
         """Add a scheduled task to the runner."""
@@ -195,6 +333,7 @@ class ScheduleRunner:
         entry = ScheduleEntry(key=key, task=task, schedule=task_config["schedule"])
         self._entries.append(entry)
         self._heap = []
+        self._owned_partitions = None
 
     def log_startup(self) -> None:
         task_names = [entry.fullname for entry in self._entries]
@@ -206,6 +345,9 @@ class ScheduleRunner:
 
         Returns the number of seconds to sleep until the next task is due.
         """
+        if self._sharding is not None:
+            return self._tick_sharded(self._sharding)
+
         self._update_heap()
 
         if not self._heap:
@@ -229,6 +371,64 @@ class ScheduleRunner:
                 break
         return self._heap[0][0]
 
+    def _tick_sharded(self, sharding: ScheduleSharding) -> float:
+        owned_partitions = sharding.owned_partitions()
+        if owned_partitions != self._owned_partitions:
+            self._owned_entries = [
+                entry
+                for entry in self._entries
+                if sharding.partition_for(entry.fullname) in owned_partitions
+            ]
+            self._owned_partitions = owned_partitions
+            if self._owned_entries:
+                self._load_last_run(self._owned_entries)
+
+        due = [entry for entry in self._owned_entries if entry.is_due()]
+        if due:
+            try:
+                self._spawn_many(due)
+            except Exception as e:
+                capture_exception(e)
+
+        # Wake up in time to renew partition leases.
+        sleep_time = sharding.seconds_until_refresh()
+        if self._owned_entries:
+            next_due = min(entry.remaining_seconds() for entry in self._owned_entries)
+            sleep_time = min(sleep_time, next_due)
+        return sleep_time
+
+    def _spawn_many(self, entries: list[ScheduleEntry]) -> None:
+        now = timezone.now()
+        spawned = self._run_storage.set_many(
+            {entry.fullname: entry.runtime_after(now) for entry in entries}
+        )
+        for entry in entries:
+            # Whether we spawned the task or another scheduler did, advance
+            # to the present. See `_try_spawn()`.
+            entry.set_last_run(now)
+            if not spawned.get(entry.fullname):
+                metrics.incr(
+                    "taskworker.scheduler.sync_with_storage",
+                    tags={"taskname": entry.taskname, "namespace": entry.namespace},
+                )
+                continue
+
+            try:
+                entry.delay_task()
+            except Exception as e:
+                capture_exception(e)
+                continue
+
+            logger.debug("taskworker.scheduler.delay_task", extra={"fullname": entry.fullname})
+            metrics.incr(
+                "taskworker.scheduler.delay_task",
+                tags={
+                    "taskname": entry.taskname,
+                    "namespace": entry.namespace,
+                },
+                sample_rate=1.0,
+            )
+
     def _try_spawn(self, entry: ScheduleEntry) -> None:
         now = timezone.now()
         next_runtime = entry.runtime_after(now)
@@ -275,21 +475,23 @@ class ScheduleRunner:
         heapq.heapify(heap_items)
         self._heap = heap_items
 
-    def _load_last_run(self) -> None:
+    def _load_last_run(self, entries: list[ScheduleEntry] | None = None) -> None:
         """
         load last_run state from storage
 
         We synchronize each time the schedule set is modified and
         then incrementally as tasks spawn attempts are made.
         """
-        last_run_times = self._run_storage.read_many([item.fullname for item in self._entries])
-        for item in self._entries:
+        if entries is None:
+            entries = self._entries
+        last_run_times = self._run_storage.read_many([item.fullname for item in entries])
+        for item in entries:
             last_run = last_run_times.get(item.fullname, None)
             item.set_last_run(last_run)
         logger.info(
             "taskworker.scheduler.load_last_run",
             extra={
-                "entry_count": len(self._entries),
+                "entry_count": len(entries),
                 "loaded_count": len(last_run_times),
             },
         )
@@ -1,14 +1,17 @@
 from __future__ import annotations
 
+import gc
 import logging
 import multiprocessing
 import queue
 import signal
 import threading
 import time
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from multiprocessing.context import ForkContext, SpawnContext
 from multiprocessing.process import BaseProcess
+from multiprocessing.synchronize import Event
 from pathlib import Path
 from typing import Any
 
@@ -26,11 +29,12 @@ from sentry.taskworker.client.inflight_task_activation import InflightTaskActiva
 from sentry.taskworker.client.processing_result import ProcessingResult
 from sentry.taskworker.constants import (
     DEFAULT_REBALANCE_AFTER,
+    DEFAULT_WORKER_FETCH_BATCH_SIZE,
     DEFAULT_WORKER_HEALTH_CHECK_SEC_PER_TOUCH,
     DEFAULT_WORKER_QUEUE_SIZE,
     MAX_BACKOFF_SECONDS_WHEN_HOST_UNAVAILABLE,
 )
-from sentry.taskworker.workerchild import child_process
+from sentry.taskworker.workerchild import child_process, preload_app
 from sentry.utils import metrics
 
 logger = logging.getLogger("sentry.taskworker.worker")
@@ -63,6 +67,9 @@ class TaskWorker:
         process_type: str = "spawn",
         health_check_file_path: str | None = None,
         health_check_sec_per_touch: float = DEFAULT_WORKER_HEALTH_CHECK_SEC_PER_TOUCH,
+        fetch_batch_size: int = DEFAULT_WORKER_FETCH_BATCH_SIZE,
+        preload: bool = False,
+        standby_children: int = 0,
         **kwargs: dict[str, Any],
     ) -> None:
         self.options = kwargs
@@ -98,7 +105,16 @@ class TaskWorker:
         self._processed_tasks: multiprocessing.Queue[ProcessingResult] = self.mp_context.Queue(
             maxsize=result_queue_maxsize
         )
+        self._child_tasks_queue_maxsize = child_tasks_queue_maxsize
+        # Tasks that were fetched in a batch but did not fit into the child
+        # tasks queue yet.
+        self._fetch_batch_size = fetch_batch_size
+        self._prefetched: deque[InflightTaskActivation] = deque()
         self._children: list[BaseProcess] = []
+        # Initialized children waiting to replace children that exit.
+        self._standby_children = standby_children
+        self._standby: list[tuple[BaseProcess, Event]] = []
+        self._preload = preload
         self._shutdown_event = self.mp_context.Event()
         self._result_thread: threading.Thread | None = None
         self._spawn_children_thread: threading.Thread | None = None
@@ -115,6 +131,8 @@ class TaskWorker:
         Once started a Worker will loop until it is killed, or
         completes its max_task_count when it shuts down.
         """
+        if self._preload:
+            self.preload()
         self.start_result_thread()
         self.start_spawn_children_thread()
 
@@ -133,6 +151,31 @@ class TaskWorker:
             self.shutdown()
             raise
 
+    def preload(self) -> None:
+        """
+        Import task modules and warm caches in the parent process, so that
+        forked children don't have to do it after every restart.
+        """
+        if self._process_type != "fork":
+            logger.warning(
+                "taskworker.worker.preload.requires_fork",
+                extra={"processing_pool": self._processing_pool_name},
+            )
+            return
+
+        with metrics.timer(
+            "taskworker.worker.preload", tags={"processing_pool": self._processing_pool_name}
+        ):
+            preload_app(self._app_module)
+
+        from django.db import connections
+
+        # Children must not share the parent's database connections.
+        connections.close_all()
+        # Move everything allocated so far out of the garbage collector's view,
+        # collections in children would otherwise touch and copy shared pages.
+        gc.freeze()
+
     def run_once(self) -> None:
         """Access point for tests to run a single worker loop"""
         self._add_task()
@@ -150,9 +193,10 @@ class TaskWorker:
             self._spawn_children_thread.join()
 
         logger.info("taskworker.worker.shutdown.children")
-        for child in self._children:
+        children = self._children + [child for child, _ in self._standby]
+        for child in children:
             child.terminate()
-        for child in self._children:
+        for child in children:
             child.join()
 
         logger.info("taskworker.worker.shutdown.result")
@@ -190,6 +234,9 @@ class TaskWorker:
             time.sleep(0.1)
             return False
 
+        if self._fetch_batch_size > 1:
+            return self._add_prefetched_tasks()
+
         inflight = self.fetch_task()
         if inflight:
             try:
@@ -216,6 +263,40 @@ class TaskWorker:
         else:
             return False
 
+    def _add_prefetched_tasks(self) -> bool:
+        """
+        Move prefetched tasks into the child tasks queue, fetching a new batch
+        sized to the free slots of the queue once the prefetched tasks run out.
+        Returns False if there was no task to add.
+        """
+        if not self._prefetched:
+            self._prefetched.extend(self.fetch_tasks(self._free_child_task_slots()))
+        if not self._prefetched:
+            return False
+
+        while self._prefetched:
+            inflight = self._prefetched.popleft()
+            try:
+                self._child_tasks.put_nowait(inflight)
+            except queue.Full:
+                self._prefetched.appendleft(inflight)
+                break
+
+        metrics.gauge(
+            "taskworker.worker.prefetched_tasks",
+            len(self._prefetched),
+            tags={"processing_pool": self._processing_pool_name},
+        )
+        return True
+
+    def _free_child_task_slots(self) -> int:
+        try:
+            free = self._child_tasks_queue_maxsize - self._child_tasks.qsize()
+        except NotImplementedError:
+            # qsize() is not available on macOS
+            free = 1
+        return max(1, min(free, self._fetch_batch_size))
+
     def start_result_thread(self) -> None:
         """
         Start a thread that delivers results and fetches new tasks.
@@ -266,7 +347,10 @@ class TaskWorker:
 
         if fetch:
             fetch_next = None
-            if not self._child_tasks.full():
+            # Prefetched tasks are waiting for a slot in the child tasks
+            # queue, don't claim more tasks from the broker until they are
+            # handed out.
+            if not self._child_tasks.full() and not self._prefetched:
                 fetch_next = FetchNextTask(namespace=self._namespace)
 
             next = self._send_update_task(result, fetch_next)
@@ -338,39 +422,102 @@ class TaskWorker:
             logger.debug("taskworker.worker.spawn_children_thread.started")
             while not self._shutdown_event.is_set():
                 self._children = [child for child in self._children if child.is_alive()]
-                if len(self._children) >= self._concurrency:
+                self._standby = [
+                    (child, event) for child, event in self._standby if child.is_alive()
+                ]
+                if (
+                    len(self._children) >= self._concurrency
+                    and len(self._standby) >= self._standby_children
+                ):
                     time.sleep(0.1)
                     continue
-                for i in range(self._concurrency - len(self._children)):
-                    process = self.mp_context.Process(
-                        name=f"taskworker-child-{i}",
-                        target=child_process,
-                        args=(
-                            self._app_module,
-                            self._child_tasks,
-                            self._processed_tasks,
-                            self._shutdown_event,
-                            self._max_child_task_count,
-                            self._processing_pool_name,
-                            self._process_type,
-                        ),
-                    )
-                    process.start()
+
+                # Replace exited children with initialized standby children first.
+                while len(self._children) < self._concurrency and self._standby:
+                    process, standby_event = self._standby.pop(0)
+                    standby_event.set()
                     self._children.append(process)
-                    logger.info(
-                        "taskworker.spawn_child",
-                        extra={"pid": process.pid, "processing_pool": self._processing_pool_name},
-                    )
                     metrics.incr(
-                        "taskworker.worker.spawn_child",
+                        "taskworker.worker.promote_standby_child",
                         tags={"processing_pool": self._processing_pool_name},
                     )
+                for i in range(self._concurrency - len(self._children)):
+                    self._children.append(self._spawn_child(f"taskworker-child-{i}"))
+                for i in range(self._standby_children - len(self._standby)):
+                    standby_event = self.mp_context.Event()
+                    process = self._spawn_child(f"taskworker-standby-{i}", standby_event)
+                    self._standby.append((process, standby_event))
 
         self._spawn_children_thread = threading.Thread(
             name="spawn-children", target=spawn_children_thread, daemon=True
         )
         self._spawn_children_thread.start()
 
+    def _spawn_child(self, name: str, standby_event: Event | None = None) -> BaseProcess:
+        process = self.mp_context.Process(
+            name=name,
+            target=child_process,
+            args=(
+                self._app_module,
+                self._child_tasks,
+                self._processed_tasks,
+                self._shutdown_event,
+                self._max_child_task_count,
+                self._processing_pool_name,
+                self._process_type,
+                standby_event,
+            ),
+        )
+        process.start()
+        logger.info(
+            "taskworker.spawn_child",
+            extra={
+                "pid": process.pid,
+                "processing_pool": self._processing_pool_name,
+                "standby": standby_event is not None,
+            },
+        )
+        metrics.incr(
+            "taskworker.worker.spawn_child",
+            tags={
+                "processing_pool": self._processing_pool_name,
+                "standby": standby_event is not None,
+            },
+        )
+        return process
+
+    def fetch_tasks(self, count: int) -> list[InflightTaskActivation]:
+        # Use the shutdown_event as a sleep mechanism
+        self._shutdown_event.wait(self._gettask_backoff_seconds)
+        try:
+            activations = self.client.get_tasks(self._namespace, count)
+        except grpc.RpcError as e:
+            logger.info(
+                "taskworker.fetch_task.failed",
+                extra={"error": e, "processing_pool": self._processing_pool_name},
+            )
+
+            self._gettask_backoff_seconds = min(
+                self._gettask_backoff_seconds + 4, MAX_BACKOFF_SECONDS_WHEN_HOST_UNAVAILABLE
+            )
+            return []
+
+        metrics.distribution(
+            "taskworker.worker.fetch_tasks.batch_size",
+            len(activations),
+            tags={"processing_pool": self._processing_pool_name},
+        )
+        if not activations:
+            metrics.incr(
+                "taskworker.worker.fetch_task.not_found",
+                tags={"processing_pool": self._processing_pool_name},
+            )
+            self._gettask_backoff_seconds = min(self._gettask_backoff_seconds + 1, 5)
+            return []
+
+        self._gettask_backoff_seconds = 0
+        return activations
+
     def fetch_task(self) -> InflightTaskActivation | None:
         # Use the shutdown_event as a sleep mechanism
         self._shutdown_event.wait(self._gettask_backoff_seconds)
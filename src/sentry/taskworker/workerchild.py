@@ -48,6 +48,34 @@ def child_worker_init(process_type: str) -> None:
         configure()
 
 
+def preload_app(app_module: str) -> None:
+    """
+    Import the task modules of an application and warm caches that tasks
+    would otherwise populate on their first execution.
+
+    Children call this during startup. Workers using fork based children can
+    call it before forking, so that children start with modules loaded and
+    share that memory with the parent copy-on-write.
+
+    Option and feature flag values are not warmed. Both are read through the
+    options store's local cache, whose entries expire after a few seconds, so
+    values loaded before forking would be gone by the time most children (and
+    especially standby children) run their first task. The option and feature
+    registries themselves are populated when the modules are imported.
+    """
+    from sentry.taskworker.app import import_app
+
+    import_app(app_module).load_modules()
+
+    try:
+        # Grouping tasks would otherwise compile the built-in enhancements on first use.
+        from sentry.grouping.enhancer import warm_enhancements_cache
+
+        warm_enhancements_cache()
+    except Exception:
+        logger.exception("taskworker.worker.warm_caches_failed")
+
+
 @contextlib.contextmanager
 def timeout_alarm(
     seconds: int, handler: Callable[[int, FrameType | None], None]
@@ -100,6 +128,7 @@ def child_process(
     max_task_count: int | None,
     processing_pool_name: str,
     process_type: str,
+    standby_event: Event | None = None,
 ) -> None:
     """
     The entrypoint for spawned worker children.
@@ -107,6 +136,9 @@ def child_process(
     Any import that could pull in django needs to be put inside this functiona
     and not the module root. If modules that include django are imported at
     the module level the wrong django settings will be used.
+
+    When a `standby_event` is provided the child initializes itself and then
+    waits for the event before it starts processing tasks.
     """
     child_worker_init(process_type)
 
@@ -115,10 +147,11 @@ def child_process(
     from sentry.taskworker.state import clear_current_task, current_task, set_current_task
     from sentry.taskworker.task import Task
     from sentry.utils import metrics
+    from sentry.utils.local_buffer import flush_local_write_buffers
     from sentry.utils.memory import track_memory_usage
 
+    preload_app(app_module)
     app = import_app(app_module)
-    app.load_modules()
     taskregistry = app.taskregistry
 
     def _get_known_task(activation: TaskActivation) -> Task[Any, Any] | None:
@@ -463,6 +496,15 @@ def child_process(
                 status=monitor_status,
             )
 
+    if standby_event is not None:
+        while not standby_event.wait(timeout=1.0):
+            if shutdown_event.is_set():
+                return
+        metrics.incr(
+            "taskworker.worker.standby_child.activated",
+            tags={"processing_pool": processing_pool_name},
+        )
+
     # Run the worker loop
     run_worker(
         child_tasks,
@@ -472,3 +514,6 @@ def child_process(
         processing_pool_name,
         process_type,
     )
+
+    # Write what tasks left in process-local write buffers before the child exits
+    flush_local_write_buffers()
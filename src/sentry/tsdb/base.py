@@ -1,7 +1,8 @@
 from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import Any, TypedDict, TypeVar
+from typing import Any, Generic, TypedDict, TypeVar
 
 from django.conf import settings
 from django.utils import timezone
@@ -111,10 +112,32 @@ class TSDBModel(Enum):
     sentry_app_component_interacted = 801
 
 
+@dataclass(frozen=True)
+class TSDBSeriesMatrix(Generic[TSDBKey]):
+    """
+    Counts of ``keys`` over a shared ``series`` of bucket timestamps, where
+    ``values[i][j]`` is the count of ``keys[i]`` in the bucket ``series[j]``.
+    """
+
+    keys: list[TSDBKey]
+    series: list[int]
+    values: list[list[int]]
+
+    def sums(self) -> dict[TSDBKey, int]:
+        return {key: sum(row) for key, row in zip(self.keys, self.values)}
+
+    def to_range(self) -> dict[TSDBKey, list[tuple[int, int]]]:
+        """
+        Returns the counts in the format of ``BaseTSDB.get_range``.
+        """
+        return {key: list(zip(self.series, row)) for key, row in zip(self.keys, self.values)}
+
+
 class BaseTSDB(Service):
     __read_methods__ = frozenset(
         [
             "get_range",
+            "get_range_matrix",
             "get_sums",
             "get_timeseries_sums",
             "get_distinct_counts_series",
@@ -439,6 +462,37 @@ class BaseTSDB(Service):
         """
         raise NotImplementedError
 
+    def get_range_matrix(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+    ) -> TSDBSeriesMatrix[TSDBKey]:
+        """
+        Same as ``get_range``, but returns the counts as a keys by buckets
+        matrix, for callers that only need the counts in bucket order.
+        """
+        range_set = self.get_range(
+            model,
+            keys,
+            start,
+            end,
+            rollup,
+            environment_ids=[environment_id] if environment_id is not None else None,
+            tenant_ids=tenant_ids,
+        )
+        unique_keys = list(dict.fromkeys(keys))
+        series = sorted({ts for points in range_set.values() for ts, _ in points})
+        values = []
+        for key in unique_keys:
+            counts = dict(range_set.get(key, ()))
+            values.append([counts.get(ts, 0) for ts in series])
+        return TSDBSeriesMatrix(unique_keys, series, values)
+
     def get_timeseries_sums(
         self,
         model: TSDBModel,
@@ -4,6 +4,7 @@ import logging
 import uuid
 from collections import defaultdict, namedtuple
 from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
 from datetime import datetime
 from hashlib import md5
 from typing import Any, ContextManager, Generic, TypeVar
@@ -13,6 +14,7 @@ from django.utils import timezone
 from django.utils.encoding import force_bytes
 from redis.client import Script
 
+from sentry import options
 from sentry.tsdb.base import (
     BaseTSDB,
     IncrMultiOptions,
@@ -20,8 +22,10 @@ from sentry.tsdb.base import (
     TSDBItem,
     TSDBKey,
     TSDBModel,
+    TSDBSeriesMatrix,
 )
 from sentry.utils.dates import to_datetime
+from sentry.utils.local_buffer import LocalWriteBuffer
 from sentry.utils.redis import check_cluster_versions, get_cluster_from_options, load_redis_script
 from sentry.utils.versioning import Version
 
@@ -32,6 +36,7 @@ T = TypeVar("T")
 SketchParameters = namedtuple("SketchParameters", "depth width capacity")
 
 CountMinScript = load_redis_script("tsdb/cmsketch.lua")
+PFCountSeriesScript = load_redis_script("tsdb/pfcount_series.lua")
 
 
 def _crc32(data: bytes) -> int:
@@ -66,6 +71,99 @@ class SuppressionWrapper(Generic[T]):
         return True
 
 
+@dataclass
+class PendingTSDBWrites:
+    """
+    Counter increments and distinct counter additions waiting to be written to
+    a single cluster.
+    """
+
+    # (hash key, hash field) -> count
+    counters: dict[tuple[str, str | int], int] = field(default_factory=lambda: defaultdict(int))
+    # key -> (routing key, values)
+    distinct: dict[str | int, tuple[str | int, set[str]]] = field(default_factory=dict)
+    # key -> (routing key, latest expiry)
+    expiries: dict[str | int, tuple[str | int, float]] = field(default_factory=dict)
+
+    def merge(
+        self,
+        counters: Mapping[tuple[str, str | int], int],
+        distinct: Mapping[str | int, tuple[str | int, Iterable[str]]],
+        expiries: Mapping[str | int, tuple[str | int, float]],
+    ) -> int:
+        """
+        Returns the number of entries that were added, i.e. counter fields and
+        distinct values which weren't pending yet.
+        """
+        added = 0
+        for counter, count in counters.items():
+            if counter not in self.counters:
+                added += 1
+            self.counters[counter] += count
+        for key, (routing_key, values) in distinct.items():
+            if key not in self.distinct:
+                self.distinct[key] = (routing_key, set())
+            pending_values = self.distinct[key][1]
+            size = len(pending_values)
+            pending_values.update(values)
+            added += len(pending_values) - size
+        for key, (routing_key, expiry) in expiries.items():
+            if key not in self.expiries or self.expiries[key][1] < expiry:
+                self.expiries[key] = (routing_key, expiry)
+        return added
+
+
+class TSDBWriteCombiner(LocalWriteBuffer[tuple[rb.Cluster, bool], PendingTSDBWrites]):
+    """
+    Combines ``RedisTSDB`` counter increments and distinct counter additions in
+    process, so that writes to the same key and rollup bucket reach Redis once.
+
+    Pending writes of every model are flushed together, with one pipeline per
+    host, every ``flush_interval`` seconds, or once there are ``max_entries`` of
+    them. Writes of a flush that fails are retried with the next one. See
+    ``LocalWriteBuffer``.
+    """
+
+    def __init__(self, write: Callable[[rb.Cluster, PendingTSDBWrites], None]):
+        super().__init__("tsdb-write-combiner")
+        self._write_cluster = write
+
+    def add(
+        self,
+        cluster: tuple[rb.Cluster, bool],
+        counters: Mapping[tuple[str, str | int], int],
+        distinct: Mapping[str | int, tuple[str | int, Iterable[str]]],
+        expiries: Mapping[str | int, tuple[str | int, float]],
+        max_entries: int,
+        flush_interval: float,
+    ) -> bool:
+        """
+        Returns ``False`` if too many writes are pending, in which case they
+        have to be written directly.
+        """
+        writes = PendingTSDBWrites()
+        writes.merge(counters, distinct, expiries)
+        return self._add(cluster, writes, max_entries, flush_interval)
+
+    def _write(
+        self, pending: dict[tuple[rb.Cluster, bool], PendingTSDBWrites]
+    ) -> dict[tuple[rb.Cluster, bool], PendingTSDBWrites]:
+        failed: dict[tuple[rb.Cluster, bool], PendingTSDBWrites] = {}
+        for (cluster, durable), writes in pending.items():
+            try:
+                self._write_cluster(cluster, writes)
+            except Exception:
+                logger.exception("tsdb.write_combiner.flush_failed")
+                failed[(cluster, durable)] = writes
+        return failed
+
+    def _merge(self, pending: PendingTSDBWrites, newer: PendingTSDBWrites) -> int:
+        return pending.merge(newer.counters, newer.distinct, newer.expiries)
+
+    def _size_of(self, pending: PendingTSDBWrites) -> int:
+        return len(pending.counters) + sum(len(values) for _, values in pending.distinct.values())
+
+
 class RedisTSDB(BaseTSDB):
     """
     A time series storage backend for Redis.
@@ -129,6 +227,7 @@ class RedisTSDB(BaseTSDB):
         self.prefix = prefix
         self.vnodes = vnodes
         self.enable_frequency_sketches = options.pop("enable_frequency_sketches", False)
+        self._write_combiner = TSDBWriteCombiner(self._write_combined)
         super().__init__(**options)
 
     def validate(self) -> None:
@@ -199,21 +298,22 @@ class RedisTSDB(BaseTSDB):
         """
         model_key = self.get_model_key(key)
 
-        if isinstance(model_key, int):
-            vnode = model_key % self.vnodes
-        else:
-            vnode = _crc32(force_bytes(model_key)) % self.vnodes
-
         return (
-            "{prefix}{model}:{epoch}:{vnode}".format(
-                prefix=self.prefix,
-                model=model.value,
-                epoch=self.normalize_to_rollup(timestamp, rollup),
-                vnode=vnode,
+            self._make_counter_hash_key(
+                model, self.normalize_to_rollup(timestamp, rollup), self._get_vnode(model_key)
             ),
             self.add_environment_parameter(model_key, environment_id),
         )
 
+    def _make_counter_hash_key(self, model: TSDBModel, epoch: int, vnode: int) -> str:
+        return f"{self.prefix}{model.value}:{epoch}:{vnode}"
+
+    def _get_vnode(self, model_key: int | str) -> int:
+        if isinstance(model_key, int):
+            return model_key % self.vnodes
+        else:
+            return _crc32(force_bytes(model_key)) % self.vnodes
+
     def get_model_key(self, key: int | str | bytes) -> int | str:
         # We specialize integers so that a pure int-map can be optimized by
         # Redis, whereas long strings (say tag values) will store in a more
@@ -267,48 +367,81 @@ class RedisTSDB(BaseTSDB):
         if default_timestamp is None:
             default_timestamp = timezone.now()
 
+        combiner_config = self._get_write_combiner_config()
+
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
-            manager = cluster.map()
-            if not durable:
-                manager = SuppressionWrapper(manager)
+            # (hash_key, hash_field) -> count
+            key_operations: dict[tuple[str, str | int], int] = defaultdict(int)
+            # (hash_key) -> "max expiration encountered"
+            key_expiries: dict[str, float] = defaultdict(float)
+
+            for rollup, max_values in self.rollups.items():
+                for item in items:
+                    if len(item) == 2:
+                        model, key = item
+                        options: IncrMultiOptions = {
+                            "timestamp": default_timestamp,
+                            "count": default_count,
+                        }
+                    else:
+                        model, key, options = item
+
+                    count = options.get("count", default_count)
+                    _timestamp = options.get("timestamp", default_timestamp)
+
+                    expiry = self.calculate_expiry(rollup, max_values, _timestamp)
+
+                    for _environment_id in environment_ids:
+                        hash_key, hash_field = self.make_counter_key(
+                            model, rollup, _timestamp, key, _environment_id
+                        )
 
-            with manager as client:
-                # (hash_key, hash_field) -> count
-                key_operations: dict[tuple[str, str | int], int] = defaultdict(int)
-                # (hash_key) -> "max expiration encountered"
-                key_expiries: dict[str, float] = defaultdict(float)
-
-                for rollup, max_values in self.rollups.items():
-                    for item in items:
-                        if len(item) == 2:
-                            model, key = item
-                            options: IncrMultiOptions = {
-                                "timestamp": default_timestamp,
-                                "count": default_count,
-                            }
-                        else:
-                            model, key, options = item
-
-                        count = options.get("count", default_count)
-                        _timestamp = options.get("timestamp", default_timestamp)
-
-                        expiry = self.calculate_expiry(rollup, max_values, _timestamp)
+                        if key_expiries[hash_key] < expiry:
+                            key_expiries[hash_key] = expiry
 
-                        for _environment_id in environment_ids:
-                            hash_key, hash_field = self.make_counter_key(
-                                model, rollup, _timestamp, key, _environment_id
-                            )
+                        key_operations[(hash_key, hash_field)] += count
 
-                            if key_expiries[hash_key] < expiry:
-                                key_expiries[hash_key] = expiry
+            if combiner_config is not None:
+                expiries: dict[str | int, tuple[str | int, float]] = {
+                    hash_key: (hash_key, expiry) for hash_key, expiry in key_expiries.items()
+                }
+                if self._write_combiner.add(
+                    (cluster, durable), key_operations, {}, expiries, *combiner_config
+                ):
+                    continue
 
-                            key_operations[(hash_key, hash_field)] += count
+            manager = cluster.map()
+            if not durable:
+                manager = SuppressionWrapper(manager)
 
+            with manager as client:
                 for (hash_key, hash_field), count in key_operations.items():
                     client.hincrby(hash_key, hash_field, count)
                     if key_expiries.get(hash_key):
                         client.expireat(hash_key, key_expiries.pop(hash_key))
 
+    def _get_write_combiner_config(self) -> tuple[int, float] | None:
+        max_entries = options.get("tsdb.write-combiner.max-entries")
+        if max_entries <= 0:
+            return None
+        return max_entries, options.get("tsdb.write-combiner.flush-interval-ms") / 1000
+
+    def _write_combined(self, cluster: rb.Cluster, writes: PendingTSDBWrites) -> None:
+        with cluster.fanout() as client:
+            for (hash_key, hash_field), count in writes.counters.items():
+                client.target_key(hash_key).hincrby(hash_key, hash_field, count)
+            for key, (routing_key, values) in writes.distinct.items():
+                client.target_key(routing_key).pfadd(key, *values)
+            for key, (routing_key, expiry) in writes.expiries.items():
+                client.target_key(routing_key).expireat(key, expiry)
+
+    def flush_write_combiner(self) -> None:
+        """
+        Write increments and distinct counter additions which are still
+        pending in the process-local write combiner.
+        """
+        self._write_combiner.flush()
+
     def get_range(
         self,
         model: TSDBModel,
@@ -339,31 +472,68 @@ class RedisTSDB(BaseTSDB):
             raise NotImplementedError
         environment_id = environment_ids[0] if environment_ids else None
 
+        return self.get_range_matrix(model, keys, start, end, rollup, environment_id).to_range()
+
+    def get_range_matrix(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+    ) -> TSDBSeriesMatrix[TSDBKey]:
         self.validate_arguments([model], [environment_id])
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
-        _series = [to_datetime(item) for item in series]
+        unique_keys = list(dict.fromkeys(keys))
+
+        # Counters of keys that share a vnode are fields of the same hashes,
+        # so each bucket of a vnode is read with a single HMGET.
+        fields_by_vnode: dict[int, list[str | int]] = defaultdict(list)
+        rows_by_vnode: dict[int, list[int]] = defaultdict(list)
+        for row, key in enumerate(unique_keys):
+            model_key = self.get_model_key(key)
+            vnode = self._get_vnode(model_key)
+            fields_by_vnode[vnode].append(self.add_environment_parameter(model_key, environment_id))
+            rows_by_vnode[vnode].append(row)
 
         results = []
         cluster, _ = self.get_cluster(environment_id)
         with cluster.map() as client:
-            for key in keys:
-                for timestamp in _series:
-                    hash_key, hash_field = self.make_counter_key(
-                        model, rollup, timestamp, key, environment_id
-                    )
-                    results.append(
-                        (int(timestamp.timestamp()), key, client.hget(hash_key, hash_field))
+            for vnode, fields in fields_by_vnode.items():
+                for column, timestamp in enumerate(series):
+                    hash_key = self._make_counter_hash_key(
+                        model, self.normalize_ts_to_rollup(timestamp, rollup), vnode
                     )
+                    results.append((column, rows_by_vnode[vnode], client.hmget(hash_key, fields)))
 
-        results_by_key: dict[TSDBKey, dict[int, int]] = defaultdict(dict)
-        for epoch, key, count in results:
-            results_by_key[key][epoch] = int(count.value or 0)
+        values = [[0] * len(series) for _ in unique_keys]
+        for column, rows, promise in results:
+            for row, count in zip(rows, promise.value):
+                if count is not None:
+                    values[row][column] = int(count)
 
-        output = {}
-        for key, points in results_by_key.items():
-            output[key] = sorted(points.items())
-        return output
+        return TSDBSeriesMatrix(unique_keys, series, values)
+
+    def get_timeseries_sums(
+        self,
+        model: TSDBModel,
+        keys: Sequence[TSDBKey],
+        start: datetime,
+        end: datetime,
+        rollup: int | None = None,
+        environment_id: int | None = None,
+        use_cache: bool = False,
+        jitter_value: int | None = None,
+        tenant_ids: dict[str, str | int] | None = None,
+        referrer_suffix: str | None = None,
+        conditions: list[SnubaCondition] | None = None,
+        group_on_time: bool = True,
+        project_ids: Sequence[int] | None = None,
+    ) -> dict[TSDBKey, int]:
+        return self.get_range_matrix(model, keys, start, end, rollup, environment_id).sums()
 
     def merge(
         self,
@@ -478,7 +648,24 @@ class RedisTSDB(BaseTSDB):
 
         ts = int(timestamp.timestamp())  # ``timestamp`` is not actually a timestamp :(
 
+        combiner_config = self._get_write_combiner_config()
+
         for (cluster, durable), environment_ids in self.get_cluster_groups({None, environment_id}):
+            if combiner_config is not None:
+                distinct: dict[str | int, tuple[str | int, set[str]]] = {}
+                expiries: dict[str | int, tuple[str | int, float]] = {}
+                for model, key, values in items:
+                    for rollup, max_values in self.rollups.items():
+                        expiry = self.calculate_expiry(rollup, max_values, timestamp)
+                        for _environment_id in environment_ids:
+                            k = self.make_key(model, rollup, ts, key, _environment_id)
+                            distinct.setdefault(k, (key, set()))[1].update(values)
+                            expiries[k] = (key, expiry)
+                if self._write_combiner.add(
+                    (cluster, durable), {}, distinct, expiries, *combiner_config
+                ):
+                    continue
+
             manager = cluster.fanout()
             if not durable:
                 manager = SuppressionWrapper(manager)
@@ -510,23 +697,19 @@ class RedisTSDB(BaseTSDB):
 
         rollup, series = self.get_optimal_rollup_series(start, end, rollup)
 
-        responses: dict[int, list[tuple[int, Any]]] = {}
-        cluster, _ = self.get_cluster(environment_id)
-        with cluster.fanout() as client:
-            for key in keys:
-                c = client.target_key(key)
-                r = responses[key] = []
-                for timestamp in series:
-                    r.append(
-                        (
-                            timestamp,
-                            c.pfcount(self.make_key(model, rollup, timestamp, key, environment_id)),
-                        )
-                    )
+        # All buckets of a key are stored on the same host, so their
+        # cardinalities are counted with one script call per key.
+        commands: dict[int, list[tuple[Script, list[str | int], list[Any]]]] = {}
+        for key in keys:
+            ks = [
+                self.make_key(model, rollup, timestamp, key, environment_id) for timestamp in series
+            ]
+            commands[key] = [(PFCountSeriesScript, ks, [])]
 
+        cluster, _ = self.get_cluster(environment_id)
         return {
-            key: [(timestamp, promise.value) for timestamp, promise in value]
-            for key, value in responses.items()
+            key: list(zip(series, responses[0].value))
+            for key, responses in cluster.execute_commands(commands).items()
         }
 
     def get_distinct_counts_totals(
@@ -50,6 +50,8 @@ def run_processor_with_signals(
     quantized_rebalance_delay_secs: int | None = None,
     dump_stacktrace_on_shutdown: bool = False,
 ) -> None:
+    from sentry.utils.local_buffer import flush_local_write_buffers
+
     if quantized_rebalance_delay_secs:
         # delay startup for quantization
         delay_kafka_rebalance(quantized_rebalance_delay_secs)
@@ -65,3 +67,6 @@ def run_processor_with_signals(
     signal.signal(signal.SIGINT, handler)
     signal.signal(signal.SIGTERM, handler)
     processor.run()
+
+    # Write what the consumer left in process-local write buffers
+    flush_local_write_buffers()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import threading
+import weakref
+from collections.abc import Hashable
+from time import monotonic, sleep
+from typing import Generic, TypeVar
+
+from sentry.utils import metrics
+
+logger = logging.getLogger(__name__)
+
+TKey = TypeVar("TKey", bound=Hashable)
+TPending = TypeVar("TPending")
+
+_buffers: weakref.WeakSet[LocalWriteBuffer[object, object]] = weakref.WeakSet()
+# The process which registered `flush_local_write_buffers` to run at exit
+_registered_at_exit: int | None = None
+
+
+class LocalWriteBuffer(Generic[TKey, TPending]):
+    """
+    Combines writes in process, so that many writes to the same key reach the backing store as a
+    single one.
+
+    Pending writes are flushed once there are `max_size` entries, once the oldest one has been
+    waiting for `max_age` seconds (checked by a background thread), and when the process shuts
+    down, see `flush_local_write_buffers`. If writing fails, the writes which weren't written are
+    kept and written with the next flush, and automatic flushes are paused for `max_age` seconds.
+    Once `max_size * MAX_PENDING_FACTOR` entries are pending, `add` refuses further writes, which
+    the caller then has to write directly.
+
+    Forked processes start out with an empty buffer, their parent flushes what was pending.
+
+    Subclasses implement `_write`, `_merge` and `_size_of`.
+    """
+
+    MAX_PENDING_FACTOR = 10
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.max_size = 1
+        self.max_age = 1.0
+        self._reset()
+        _buffers.add(self)
+
+    def _reset(self) -> None:
+        self._pending: dict[TKey, TPending] = {}
+        self._size = 0
+        self._oldest: float | None = None
+        # Automatic flushes are paused until then after a failed flush
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: threading.Thread | None = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _write(self, pending: dict[TKey, TPending]) -> dict[TKey, TPending]:
+        """
+        Writes the pending writes and returns the ones which weren't written.
+        """
+        raise NotImplementedError
+
+    def _merge(self, pending: TPending, newer: TPending) -> int:
+        """
+        Merges `newer` into `pending` and returns the number of entries that were added.
+        """
+        raise NotImplementedError
+
+    def _size_of(self, pending: TPending) -> int:
+        raise NotImplementedError
+
+    def _add(self, key: TKey, write: TPending, max_size: int, max_age: float) -> bool:
+        """
+        Returns `False` if the buffer is full, in which case the write isn't buffered.
+        """
+        with self._lock:
+            self.max_size = max_size
+            self.max_age = max_age
+            if self._size >= max_size * self.MAX_PENDING_FACTOR:
+                metrics.incr("local_write_buffer.full", tags={"buffer": self.name})
+                return False
+            pending = self._pending.get(key)
+            if pending is None:
+                self._pending[key] = write
+                self._size += self._size_of(write)
+            else:
+                self._size += self._merge(pending, write)
+            if self._oldest is None:
+                self._oldest = monotonic()
+            should_flush = self._size >= max_size and monotonic() >= self._retry_at
+            if self._flusher is None:
+                self._start_flusher()
+
+        if should_flush:
+            self.flush(reason="size")
+        return True
+
+    def flush(self, reason: str = "manual") -> None:
+        # Only one flush at a time, so that retried writes are written in order
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                size, self._size = self._size, 0
+                self._oldest = None
+            if not pending:
+                return
+
+            metrics.distribution(
+                "local_write_buffer.flush_size",
+                size,
+                tags={"buffer": self.name, "reason": reason},
+            )
+            failed = pending
+            try:
+                failed = self._write(pending)
+            finally:
+                if failed:
+                    self._retain(failed)
+
+    def _retain(self, failed: dict[TKey, TPending]) -> None:
+        with self._lock:
+            self._retry_at = monotonic() + self.max_age
+            for key, pending in failed.items():
+                newer = self._pending.get(key)
+                if newer is not None:
+                    self._size -= self._size_of(newer)
+                    self._merge(pending, newer)
+                self._pending[key] = pending
+                self._size += self._size_of(pending)
+            if self._oldest is None:
+                self._oldest = monotonic()
+
+        metrics.incr("local_write_buffer.retained", amount=len(failed), tags={"buffer": self.name})
+
+    def _start_flusher(self) -> None:
+        self._flusher = threading.Thread(target=self._run_flusher, name=self.name, daemon=True)
+        self._flusher.start()
+        _register_at_exit()
+
+    def _run_flusher(self) -> None:
+        while True:
+            oldest = self._oldest
+            if oldest is None:
+                wait = self.max_age
+            else:
+                wait = max(oldest + self.max_age, self._retry_at) - monotonic()
+            if wait > 0:
+                sleep(wait)
+                continue
+            try:
+                self.flush(reason="age")
+            except Exception:
+                logger.exception("local_write_buffer.flush_failed", extra={"buffer": self.name})
+                # Don't retry the failed writes in a hot loop
+                sleep(self.max_age)
+
+
+def flush_local_write_buffers() -> None:
+    """
+    Flushes the writes pending in every `LocalWriteBuffer` of this process.
+
+    This runs at interpreter shutdown, but has to be called explicitly on the shutdown path of
+    processes which may exit without running `atexit` handlers, like forked worker processes.
+    """
+    for buffer in list(_buffers):
+        try:
+            buffer.flush(reason="shutdown")
+        except Exception:
+            logger.exception("local_write_buffer.flush_failed", extra={"buffer": buffer.name})
+
+
+def _register_at_exit() -> None:
+    # Processes forked by `multiprocessing` don't run the `atexit` handlers of their parent, so
+    # register again in every process.
+    global _registered_at_exit
+    if _registered_at_exit != os.getpid():
+        atexit.register(flush_local_write_buffers)
+        _registered_at_exit = os.getpid()
+
+
+def _reset_after_fork() -> None:
+    # The child inherits the pending writes, which the parent flushes, and the locks in whatever
+    # state other threads of the parent held them, but not the flusher thread.
+    for buffer in list(_buffers):
+        buffer._reset()
+
+
+os.register_at_fork(after_in_child=_reset_after_fork)
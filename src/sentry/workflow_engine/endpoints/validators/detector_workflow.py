@@ -15,7 +15,7 @@ from sentry.models.project import Project
 from sentry.utils.audit import create_audit_entry
 from sentry.workflow_engine.models.detector import Detector
 from sentry.workflow_engine.models.detector_workflow import DetectorWorkflow
-from sentry.workflow_engine.models.workflow import Workflow
+from sentry.workflow_engine.models.workflow import Workflow, invalidate_workflow_graphs
 
 # Only those with organization write permissions can edit system-created detectors (e.g. error detectors).
 SYSTEM_CREATED_DETECTOR_REQUIRED_SCOPES = {"org:write"}
@@ -157,6 +157,17 @@ def perform_bulk_detector_workflow_operations(
                     for pair in detector_workflows_to_add
                 ]
             )
+            # bulk_create sends no post_save signals, clear the cached workflow graphs
+            # of the affected projects explicitly.
+            detector_ids = {pair["detector_id"] for pair in detector_workflows_to_add}
+            transaction.on_commit(
+                lambda: invalidate_workflow_graphs(
+                    Detector.objects.filter(id__in=detector_ids).values_list(
+                        "project_id", flat=True
+                    )
+                ),
+                using=router.db_for_write(DetectorWorkflow),
+            )
 
     for detector_workflow in detector_workflows_to_remove:
         create_audit_entry(
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import logging
+from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import replace
+from datetime import timedelta
 from typing import Any, ClassVar, TypedDict
 
 from django.conf import settings
-from django.db import models
-from django.db.models.signals import pre_save
+from django.core.cache import cache
+from django.db import models, router, transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from sentry.backup.scopes import RelocationScope
@@ -16,12 +20,18 @@ from sentry.db.models.fields.hybrid_cloud_foreign_key import HybridCloudForeignK
 from sentry.db.models.manager.base import BaseManager
 from sentry.db.models.manager.base_query_set import BaseQuerySet
 from sentry.models.owner_base import OwnerModel
+from sentry.utils.function_cache import cache_func, cache_key_for_cached_func
 from sentry.workflow_engine.models.data_condition import DataCondition, is_slow_condition
 from sentry.workflow_engine.models.data_condition_group import (
     DataConditionGroup,
     DataConditionGroupSnapshot,
 )
-from sentry.workflow_engine.processors.data_condition_group import TriggerResult
+from sentry.workflow_engine.models.detector import Detector
+from sentry.workflow_engine.models.detector_workflow import DetectorWorkflow
+from sentry.workflow_engine.processors.data_condition_group import (
+    ConditionGroupPlan,
+    TriggerResult,
+)
 from sentry.workflow_engine.types import ConditionError, WorkflowEventData
 
 from .json_config import JSONConfigBase
@@ -127,7 +137,10 @@ class Workflow(DefaultFieldsModel, OwnerModel, JSONConfigBase):
         }
 
     def evaluate_trigger_conditions(
-        self, event_data: WorkflowEventData, when_data_conditions: list[DataCondition] | None = None
+        self,
+        event_data: WorkflowEventData,
+        when_data_conditions: list[DataCondition] | None = None,
+        when_plan: ConditionGroupPlan | None = None,
     ) -> tuple[TriggerResult, list[DataCondition]]:
         """
         Evaluate the conditions for the workflow trigger and return if the evaluation was successful.
@@ -153,7 +166,7 @@ class Workflow(DefaultFieldsModel, OwnerModel, JSONConfigBase):
             )
             return TriggerResult(False, ConditionError(msg="DataConditionGroup does not exist")), []
         group_evaluation, remaining_conditions = process_data_condition_group(
-            group, workflow_event_data, when_data_conditions
+            group, workflow_event_data, when_data_conditions, when_plan
         )
         return group_evaluation.logic_result, remaining_conditions
 
@@ -173,3 +186,66 @@ def get_slow_conditions(workflow: Workflow) -> list[DataCondition]:
 @receiver(pre_save, sender=Workflow)
 def enforce_config_schema(sender, instance: Workflow, **kwargs):
     instance.validate_config(instance.config_schema)
+
+
+@cache_func(cache_ttl=timedelta(hours=1))
+def get_workflow_graph_for_project(project_id: int) -> dict[int, list[Workflow]]:
+    """
+    Returns the enabled workflows connected to each detector of a project, keyed by detector
+    id, with their environments loaded. The cached graph is cleared whenever a detector, a
+    workflow or a connection between them in the project changes.
+    """
+    graph: defaultdict[int, list[Workflow]] = defaultdict(list)
+    detector_workflows = (
+        DetectorWorkflow.objects.filter(detector__project_id=project_id, workflow__enabled=True)
+        .exclude(
+            workflow__status__in=(ObjectStatus.PENDING_DELETION, ObjectStatus.DELETION_IN_PROGRESS)
+        )
+        .select_related("workflow__environment")
+    )
+    for detector_workflow in detector_workflows:
+        graph[detector_workflow.detector_id].append(detector_workflow.workflow)
+    return dict(graph)
+
+
+def invalidate_workflow_graphs(project_ids: Iterable[int]) -> None:
+    cache.delete_many(
+        [
+            cache_key_for_cached_func(get_workflow_graph_for_project.func, project_id)
+            for project_id in set(project_ids)
+        ]
+    )
+
+
+def invalidate_workflow_graphs_on_commit(project_ids: Iterable[int], using: str) -> None:
+    # Evaluated right away, the rows they come from may be gone by the time of the commit
+    project_ids = set(project_ids)
+    transaction.on_commit(lambda: invalidate_workflow_graphs(project_ids), using=using)
+
+
+@receiver(post_save, sender=Workflow)
+def invalidate_workflow_graphs_for_workflow(sender, instance: Workflow, **kwargs):
+    # Deleting a workflow deletes its DetectorWorkflows first, which clear the graphs.
+    invalidate_workflow_graphs_on_commit(
+        DetectorWorkflow.objects.filter(workflow_id=instance.id).values_list(
+            "detector__project_id", flat=True
+        ),
+        using=router.db_for_write(Workflow),
+    )
+
+
+@receiver(post_save, sender=DetectorWorkflow)
+@receiver(post_delete, sender=DetectorWorkflow)
+def invalidate_workflow_graphs_for_detector_workflow(sender, instance: DetectorWorkflow, **kwargs):
+    invalidate_workflow_graphs_on_commit(
+        Detector.objects_for_deletion.filter(id=instance.detector_id).values_list(
+            "project_id", flat=True
+        ),
+        using=router.db_for_write(DetectorWorkflow),
+    )
+
+
+@receiver(post_save, sender=Detector)
+@receiver(post_delete, sender=Detector)
+def invalidate_workflow_graphs_for_detector(sender, instance: Detector, **kwargs):
+    invalidate_workflow_graphs_on_commit([instance.project_id], using=router.db_for_write(Detector))
@@ -1,10 +1,17 @@
 import dataclasses
 import logging
-from collections.abc import Callable, Iterable
-from typing import ClassVar, NoReturn, TypeVar
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Sequence
+from typing import Any, ClassVar, NoReturn, TypeVar
 
 import sentry_sdk
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
 
+from sentry import options
+from sentry.utils import metrics
 from sentry.utils.function_cache import cache_func_for_models
 from sentry.workflow_engine.models import DataCondition, DataConditionGroup
 from sentry.workflow_engine.models.data_condition import is_slow_condition
@@ -207,6 +214,247 @@ def _get_data_conditions_for_group_shim(data_condition_group_id: int) -> list[Da
     return get_data_conditions_for_group(data_condition_group_id)
 
 
+class ConditionSelectivity:
+    """
+    Process-local counts of how often each fast condition triggers, used to order condition
+    evaluation so that groups which can short-circuit do so as early as possible.
+
+    Counts are halved once a condition has been evaluated `MAX_EVALUATIONS` times, so the
+    rates follow changes in the traffic a condition sees.
+    """
+
+    MAX_EVALUATIONS = 10000
+
+    def __init__(self) -> None:
+        self._counts: dict[int, list[int]] = {}
+
+    def record(self, condition_id: int, triggered: bool) -> None:
+        counts = self._counts.setdefault(condition_id, [0, 0])
+        counts[0] += 1
+        counts[1] += triggered
+        if counts[0] >= self.MAX_EVALUATIONS:
+            counts[0] //= 2
+            counts[1] //= 2
+
+    def trigger_rate(self, condition_id: int) -> float:
+        # Smoothed, so conditions that have not been evaluated yet rank in the middle.
+        evaluations, triggers = self._counts.get(condition_id, (0, 0))
+        return (triggers + 1) / (evaluations + 2)
+
+    def forget(self, condition_ids: Iterable[int]) -> None:
+        for condition_id in condition_ids:
+            self._counts.pop(condition_id, None)
+
+
+_selectivity = ConditionSelectivity()
+
+
+@dataclasses.dataclass(frozen=True)
+class ConditionGroupPlan:
+    """
+    A DataConditionGroup compiled for evaluation: its conditions are loaded and split by speed
+    once, and the fast conditions are ordered by how likely they are to short-circuit the
+    group. Plans are immutable and are replaced when the group's `version` changes.
+    """
+
+    group_id: int
+    version: int
+    logic_type: str
+    # All conditions of the group, in their original order.
+    conditions: tuple[DataCondition, ...]
+    # The fast conditions in evaluation order.
+    fast_conditions: tuple[DataCondition, ...]
+    slow_conditions: tuple[DataCondition, ...]
+    compiled_at: float
+
+    @classmethod
+    def compile(
+        cls,
+        group_id: int,
+        version: int,
+        logic_type: str,
+        conditions: Sequence[DataCondition],
+        selectivity: ConditionSelectivity,
+    ) -> "ConditionGroupPlan":
+        split_conds = split_conditions_by_speed(list(conditions))
+        fast = split_conds.fast
+
+        if len(fast) > 1:
+            rate = lambda condition: selectivity.trigger_rate(condition.id)  # noqa: E731
+            if logic_type == DataConditionGroup.Type.NONE or (
+                # The first triggered condition provides the result, so it can only be
+                # reordered if all conditions have the same result.
+                logic_type == DataConditionGroup.Type.ANY_SHORT_CIRCUIT
+                and len({repr(condition.condition_result) for condition in fast}) == 1
+            ):
+                fast = sorted(fast, key=rate, reverse=True)
+            elif logic_type == DataConditionGroup.Type.ALL:
+                fast = sorted(fast, key=rate)
+
+        return cls(
+            group_id=group_id,
+            version=version,
+            logic_type=logic_type,
+            conditions=tuple(conditions),
+            fast_conditions=tuple(fast),
+            slow_conditions=tuple(split_conds.slow),
+            compiled_at=time.monotonic(),
+        )
+
+    def recompile(self, selectivity: ConditionSelectivity) -> "ConditionGroupPlan":
+        """
+        Order the conditions again by their current selectivity.
+        """
+        return ConditionGroupPlan.compile(
+            self.group_id, self.version, self.logic_type, self.conditions, selectivity
+        )
+
+    def in_original_order(
+        self, condition_results: list[ProcessedDataCondition]
+    ) -> list[ProcessedDataCondition]:
+        return sorted(condition_results, key=lambda result: self.conditions.index(result.condition))
+
+
+PLAN_VERSION_KEY = "workflow_engine.condition_group_plan.version:{}"
+PLAN_VERSION_TTL = 60 * 60 * 24 * 7
+# How often a cached plan is reordered by the selectivity measured since it was compiled.
+PLAN_REORDER_INTERVAL = 300
+
+
+def _new_plan_version() -> int:
+    return time.time_ns()
+
+
+def bump_condition_group_plan_version(group_id: int) -> None:
+    cache.set(PLAN_VERSION_KEY.format(group_id), _new_plan_version(), PLAN_VERSION_TTL)
+
+
+class ConditionGroupPlanCache:
+    """
+    A size-bounded, process-local LRU of compiled condition group plans.
+
+    Every lookup reads the current version of each group from the shared cache; the version
+    is changed whenever a group or one of its conditions is saved or deleted, so a plan is
+    never used after its group has changed.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        self._plans: OrderedDict[int, ConditionGroupPlan] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._plans)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._plans.clear()
+
+    def get_many(self, group_ids: Sequence[int]) -> dict[int, ConditionGroupPlan]:
+        group_ids = list(dict.fromkeys(group_ids))
+        if not group_ids:
+            return {}
+
+        versions = self._get_versions(group_ids)
+        now = time.monotonic()
+        rv: dict[int, ConditionGroupPlan] = {}
+        stale: list[int] = []
+        with self._lock:
+            for group_id in group_ids:
+                plan = self._plans.get(group_id)
+                if plan is None or plan.version != versions[group_id]:
+                    stale.append(group_id)
+                    continue
+                if now - plan.compiled_at > PLAN_REORDER_INTERVAL:
+                    plan = self._plans[group_id] = plan.recompile(_selectivity)
+                self._plans.move_to_end(group_id)
+                rv[group_id] = plan
+
+        metrics.incr("workflow_engine.condition_group_plan.hit", amount=len(rv))
+        if stale:
+            metrics.incr("workflow_engine.condition_group_plan.miss", amount=len(stale))
+            rv.update(self._compile(stale, versions))
+        return rv
+
+    def _get_versions(self, group_ids: list[int]) -> dict[int, int]:
+        keys = {PLAN_VERSION_KEY.format(group_id): group_id for group_id in group_ids}
+        stored: dict[str, Any] = cache.get_many(list(keys))
+        missing = [key for key in keys if key not in stored]
+        if missing:
+            for key in missing:
+                cache.add(key, _new_plan_version(), PLAN_VERSION_TTL)
+            # Another process may have won the race to set a version.
+            stored.update(cache.get_many(missing))
+        # Without a shared version (e.g. a failed cache write) plans are never reused.
+        return {
+            group_id: stored.get(key, _new_plan_version()) for key, group_id in keys.items()
+        }
+
+    def _compile(
+        self, group_ids: list[int], versions: dict[int, int]
+    ) -> dict[int, ConditionGroupPlan]:
+        groups = {
+            group.id: group for group in DataConditionGroup.objects.get_many_from_cache(group_ids)
+        }
+        group_ids = [group_id for group_id in group_ids if group_id in groups]
+        conditions = get_data_conditions_for_group.batch([(group_id,) for group_id in group_ids])
+
+        plans = {
+            group_id: ConditionGroupPlan.compile(
+                group_id,
+                versions[group_id],
+                groups[group_id].logic_type,
+                group_conditions,
+                _selectivity,
+            )
+            for group_id, group_conditions in zip(group_ids, conditions)
+        }
+
+        with self._lock:
+            for group_id, plan in plans.items():
+                old = self._plans.pop(group_id, None)
+                if old is not None:
+                    _selectivity.forget(
+                        condition.id
+                        for condition in old.fast_conditions
+                        if condition not in plan.fast_conditions
+                    )
+                self._plans[group_id] = plan
+            while len(self._plans) > self.max_size:
+                _, evicted = self._plans.popitem(last=False)
+                _selectivity.forget(condition.id for condition in evicted.fast_conditions)
+        return plans
+
+
+condition_group_plans = ConditionGroupPlanCache(max_size=10000)
+
+
+def get_condition_group_plans(
+    data_condition_group_ids: Sequence[int],
+) -> dict[int, ConditionGroupPlan]:
+    """
+    Returns the compiled plans for the given DataConditionGroup IDs, when
+    `workflow_engine.condition_group_plans.enabled` is set. Groups that don't exist are omitted.
+    """
+    if not options.get("workflow_engine.condition_group_plans.enabled"):
+        return {}
+    return condition_group_plans.get_many(data_condition_group_ids)
+
+
+def _bump_version_for_condition(instance: DataCondition, **kwargs: Any) -> None:
+    bump_condition_group_plan_version(instance.condition_group_id)
+
+
+def _bump_version_for_group(instance: DataConditionGroup, **kwargs: Any) -> None:
+    bump_condition_group_plan_version(instance.id)
+
+
+post_save.connect(_bump_version_for_condition, sender=DataCondition, weak=False)
+post_delete.connect(_bump_version_for_condition, sender=DataCondition, weak=False)
+post_save.connect(_bump_version_for_group, sender=DataConditionGroup, weak=False)
+post_delete.connect(_bump_version_for_group, sender=DataConditionGroup, weak=False)
+
+
 @sentry_sdk.trace
 def get_slow_conditions_for_groups(
     data_condition_group_ids: list[int],
@@ -270,10 +518,12 @@ def evaluate_condition_group_results(
 def evaluate_data_conditions(
     conditions_to_evaluate: list[tuple[DataCondition, T]],
     logic_type: DataConditionGroup.Type,
+    selectivity: ConditionSelectivity | None = None,
 ) -> ProcessedDataConditionGroup:
     """
     Evaluate a list of conditions. Each condition is a tuple with the value to evaluate the condition against.
     Next we apply the logic_type to get the results of the list of conditions.
+    If `selectivity` is given, the outcome of every evaluated condition is recorded in it.
     """
     condition_results: list[ProcessedDataCondition] = []
 
@@ -292,6 +542,8 @@ def evaluate_data_conditions(
             triggered=cleaned_result is not None,
             error=evaluation_result if isinstance(evaluation_result, ConditionError) else None,
         )
+        if selectivity is not None:
+            selectivity.record(condition.id, trigger_result.triggered)
 
         if trigger_result.triggered:
             # Check for short-circuiting evaluations
@@ -313,6 +565,12 @@ def evaluate_data_conditions(
                     condition_results=[],
                 )
 
+        elif logic_type == DataConditionGroup.Type.ALL and not trigger_result.is_tainted():
+            # A clean failure decides an ALL group, whatever the remaining conditions return.
+            return ProcessedDataConditionGroup(
+                logic_result=TriggerResult.FALSE, condition_results=[]
+            )
+
         result = ProcessedDataCondition(
             logic_result=trigger_result,
             condition=condition,
@@ -331,7 +589,14 @@ def process_data_condition_group(
     group: DataConditionGroup,
     value: T,
     data_conditions_for_group: list[DataCondition] | None = None,
+    plan: ConditionGroupPlan | None = None,
 ) -> DataConditionGroupResult:
+    """
+    Evaluate the fast conditions of `group` against `value`, returning the result and the slow
+    conditions that still need to be evaluated. Conditions are taken from `plan` or
+    `data_conditions_for_group` if given, otherwise from a cached plan when those are enabled,
+    then from prefetched conditions, and are loaded as a last resort.
+    """
     condition_results: list[ProcessedDataCondition] = []
 
     try:
@@ -346,31 +611,48 @@ def process_data_condition_group(
         )
         return ProcessedDataConditionGroup(logic_result=trigger_result, condition_results=[]), []
 
-    # Check if conditions are already prefetched before using cache
-    all_conditions: list[DataCondition]
-    if data_conditions_for_group is not None:
-        all_conditions = data_conditions_for_group
-    elif (
-        hasattr(group, "_prefetched_objects_cache")
-        and "conditions" in group._prefetched_objects_cache
-    ):
-        all_conditions = list(group.conditions.all())
+    if plan is None and data_conditions_for_group is None:
+        plan = get_condition_group_plans([group.id]).get(group.id)
+
+    fast_conditions: Sequence[DataCondition]
+    slow_conditions: list[DataCondition]
+    if plan is not None:
+        fast_conditions = plan.fast_conditions
+        slow_conditions = list(plan.slow_conditions)
     else:
-        all_conditions = _get_data_conditions_for_group_shim(group.id)
+        # Check if conditions are already prefetched before using cache
+        all_conditions: list[DataCondition]
+        if data_conditions_for_group is not None:
+            all_conditions = data_conditions_for_group
+        elif (
+            hasattr(group, "_prefetched_objects_cache")
+            and "conditions" in group._prefetched_objects_cache
+        ):
+            all_conditions = list(group.conditions.all())
+        else:
+            all_conditions = _get_data_conditions_for_group_shim(group.id)
 
-    split_conds = split_conditions_by_speed(all_conditions)
+        fast_conditions, slow_conditions = split_conditions_by_speed(all_conditions)
 
-    if not split_conds.fast and split_conds.slow:
+    if not fast_conditions and slow_conditions:
         # there are only slow conditions to evaluate, do not evaluate an empty list of conditions
         # which would evaluate to True
         condition_group_result = ProcessedDataConditionGroup(
             logic_result=TriggerResult.FALSE,
             condition_results=condition_results,
         )
-        return condition_group_result, split_conds.slow
+        return condition_group_result, slow_conditions
 
-    conditions_to_evaluate = [(condition, value) for condition in split_conds.fast]
-    processed_condition_group = evaluate_data_conditions(conditions_to_evaluate, logic_type)
+    conditions_to_evaluate = [(condition, value) for condition in fast_conditions]
+    if plan is not None:
+        processed_condition_group = evaluate_data_conditions(
+            conditions_to_evaluate, logic_type, _selectivity
+        )
+        processed_condition_group.condition_results = plan.in_original_order(
+            processed_condition_group.condition_results
+        )
+    else:
+        processed_condition_group = evaluate_data_conditions(conditions_to_evaluate, logic_type)
 
     logic_result = processed_condition_group.logic_result
 
@@ -387,4 +669,4 @@ def process_data_condition_group(
         #  we can short-circuit any remaining conditions since we have a completed logic result
         return processed_condition_group, []
 
-    return processed_condition_group, split_conds.slow
+    return processed_condition_group, slow_conditions
@@ -8,7 +8,7 @@ import sentry_sdk
 from django.db import router, transaction
 from django.db.models import Q
 
-from sentry import features
+from sentry import features, options
 from sentry.models.activity import Activity
 from sentry.models.environment import Environment
 from sentry.services.eventstore.models import GroupEvent
@@ -21,12 +21,14 @@ from sentry.workflow_engine.models import (
     Workflow,
 )
 from sentry.workflow_engine.models.data_condition import DataCondition
+from sentry.workflow_engine.models.workflow import get_workflow_graph_for_project
 from sentry.workflow_engine.models.workflow_data_condition_group import WorkflowDataConditionGroup
 from sentry.workflow_engine.processors.contexts.workflow_event_context import (
     WorkflowEventContext,
     WorkflowEventContextData,
 )
 from sentry.workflow_engine.processors.data_condition_group import (
+    get_condition_group_plans,
     get_data_conditions_for_group,
     process_data_condition_group,
 )
@@ -152,7 +154,10 @@ def evaluate_workflow_triggers(
         if workflow.when_condition_group_id
     ]
     # Retrieve these as a batch to avoid a query/cache-lookup per DCG.
-    data_conditions_by_dcg_id = _get_data_conditions_for_group_by_dcg(dcg_ids)
+    plans_by_dcg_id = get_condition_group_plans(dcg_ids)
+    data_conditions_by_dcg_id = _get_data_conditions_for_group_by_dcg(
+        [dcg_id for dcg_id in dcg_ids if dcg_id not in plans_by_dcg_id]
+    )
 
     project = event_data.event.project  # expected to be already cached
     dual_processing_logs_enabled = features.has(
@@ -162,11 +167,13 @@ def evaluate_workflow_triggers(
 
     for workflow in workflows:
         when_data_conditions = None
+        when_plan = None
         if dcg_id := workflow.when_condition_group_id:
             when_data_conditions = data_conditions_by_dcg_id.get(dcg_id)
+            when_plan = plans_by_dcg_id.get(dcg_id)
 
         evaluation, remaining_conditions = workflow.evaluate_trigger_conditions(
-            event_data, when_data_conditions
+            event_data, when_data_conditions, when_plan
         )
 
         if remaining_conditions:
@@ -273,9 +280,12 @@ def evaluate_workflows_action_filters(
     filtered_action_groups: set[DataConditionGroup] = set()
 
     # Retrieve these as a batch to avoid a query/cache-lookup per DCG.
-    data_conditions_by_dcg_id = _get_data_conditions_for_group_by_dcg(
+    plans_by_dcg_id = get_condition_group_plans(
         [dcg.id for dcg in action_conditions_to_workflow.keys()]
     )
+    data_conditions_by_dcg_id = _get_data_conditions_for_group_by_dcg(
+        [dcg.id for dcg in action_conditions_to_workflow.keys() if dcg.id not in plans_by_dcg_id]
+    )
 
     env_by_id: dict[int, Environment] = {
         env.id: env
@@ -295,6 +305,7 @@ def evaluate_workflows_action_filters(
             action_condition_group,
             workflow_event_data,
             data_conditions_by_dcg_id.get(action_condition_group.id),
+            plans_by_dcg_id.get(action_condition_group.id),
         )
 
         if slow_conditions:
@@ -386,20 +397,29 @@ def _get_associated_workflows(
     This is a wrapper method to get the workflows associated with a detector and environment.
     Used in process_workflows to wrap the query + logging into a single method
     """
-    environment_filter = (
-        (Q(environment_id=None) | Q(environment_id=environment.id))
-        if environment
-        else Q(environment_id=None)
-    )
-    workflows = set(
-        Workflow.objects.filter(
-            environment_filter,
-            detectorworkflow__detector_id=detector.id,
-            enabled=True,
+    if options.get("workflow_engine.workflow_graph_cache.enabled"):
+        graph = get_workflow_graph_for_project(detector.project_id)
+        workflows = {
+            workflow
+            for workflow in graph.get(detector.id, [])
+            if workflow.environment_id is None
+            or (environment is not None and workflow.environment_id == environment.id)
+        }
+    else:
+        environment_filter = (
+            (Q(environment_id=None) | Q(environment_id=environment.id))
+            if environment
+            else Q(environment_id=None)
+        )
+        workflows = set(
+            Workflow.objects.filter(
+                environment_filter,
+                detectorworkflow__detector_id=detector.id,
+                enabled=True,
+            )
+            .select_related("environment")
+            .distinct()
         )
-        .select_related("environment")
-        .distinct()
-    )
 
     if workflows:
         metrics_incr(
@@ -2,6 +2,7 @@ import copy
 import datetime
 import pickle
 import random
+import time
 from collections import defaultdict
 from collections.abc import Mapping
 from unittest import mock
@@ -204,6 +205,213 @@ class TestRedisBuffer:
         else:
             assert pending == [key.encode("utf-8")]
 
+    def _incr_model(self) -> mock.Mock:
+        model = mock.Mock()
+        model.__name__ = "Mock"
+        return model
+
+    def _load_extra(self, value):
+        if self.buf.is_redis_cluster:
+            return self.buf._load_value(json.loads(value))
+        return pickle.loads(value)
+
+    def test_incr_local_aggregation(self, set_sentry_option) -> None:
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = self._incr_model()
+        filters = {"pk": 1}
+        key = make_key(model, filters=filters)
+
+        with (
+            set_sentry_option("buffer.local-aggregation.max-keys", 2),
+            set_sentry_option("buffer.local-aggregation.max-age-ms", 60_000),
+        ):
+            for i in range(5):
+                self.buf.incr(
+                    model, {"times_seen": 1}, filters, extra={"foo": f"bar{i}"}, signal_only=i == 2
+                )
+            assert len(self.buf._local_aggregator) == 1
+            assert not client.exists(key)
+
+            self.buf._local_aggregator.flush()
+
+        result = _hgetall_decode_keys(client, key, self.buf.is_redis_cluster)
+        assert int(result["i+times_seen"]) == 5
+        assert self._load_extra(result["e+foo"]) == "bar4"
+        assert int(result["s"]) == 1
+        assert len(client.zrange("b:p", 0, -1)) == 1
+
+    def test_incr_local_aggregation_flushes_on_size(self, set_sentry_option) -> None:
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        model = self._incr_model()
+
+        with set_sentry_option("buffer.local-aggregation.max-keys", 2):
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+            assert client.zrange("b:p", 0, -1) == []
+
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 2})
+
+        assert len(self.buf._local_aggregator) == 0
+        assert len(client.zrange("b:p", 0, -1)) == 2
+        assert self.buf.get(model, ["times_seen"], {"pk": 1}) == {"times_seen": 2}
+
+    def test_incr_local_aggregation_retains_failed_writes(self, set_sentry_option) -> None:
+        model = self._incr_model()
+
+        with (
+            set_sentry_option("buffer.local-aggregation.max-keys", 10),
+            set_sentry_option("buffer.local-aggregation.max-age-ms", 60_000),
+        ):
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+            self.buf.incr(model, {"times_seen": 2}, {"pk": 2})
+            with mock.patch.object(
+                self.buf, "_incr", side_effect=[None, Exception("redis is down")]
+            ):
+                self.buf._local_aggregator.flush()
+
+            # The failed increment is merged with those which arrived in the meantime
+            assert len(self.buf._local_aggregator) == 1
+            self.buf.incr(model, {"times_seen": 3}, {"pk": 2})
+            self.buf._local_aggregator.flush()
+
+        assert self.buf.get(model, ["times_seen"], {"pk": 2}) == {"times_seen": 5}
+
+    def test_incr_local_aggregation_backs_off_after_failed_flush(self, set_sentry_option) -> None:
+        model = self._incr_model()
+        aggregator = self.buf._local_aggregator
+
+        with (
+            set_sentry_option("buffer.local-aggregation.max-keys", 2),
+            set_sentry_option("buffer.local-aggregation.max-age-ms", 60_000),
+            mock.patch.object(self.buf, "_incr", side_effect=Exception("redis is down")) as incr,
+        ):
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 2})
+            assert incr.call_count == 1
+            assert len(aggregator) == 2
+
+            # No flush is attempted until the backoff has passed
+            self.buf.incr(model, {"times_seen": 1}, {"pk": 3})
+            assert incr.call_count == 1
+
+            with mock.patch(
+                "sentry.utils.local_buffer.monotonic", return_value=time.monotonic() + 61
+            ):
+                self.buf.incr(model, {"times_seen": 1}, {"pk": 1})
+            assert incr.call_count == 2
+            assert len(aggregator) == 3
+
+    def test_incr_local_aggregation_writes_directly_when_full(self, set_sentry_option) -> None:
+        model = self._incr_model()
+        aggregator = self.buf._local_aggregator
+
+        with (
+            set_sentry_option("buffer.local-aggregation.max-keys", 2),
+            set_sentry_option("buffer.local-aggregation.max-age-ms", 60_000),
+        ):
+            with mock.patch.object(self.buf, "_incr", side_effect=Exception("redis is down")):
+                for pk in range(2 * aggregator.MAX_PENDING_FACTOR):
+                    self.buf.incr(model, {"times_seen": 1}, {"pk": pk})
+            assert len(aggregator) == 2 * aggregator.MAX_PENDING_FACTOR
+
+            # Increments which don't fit are written directly instead of being dropped
+            self.buf.incr(model, {"times_seen": 2}, {"pk": 0})
+            assert len(aggregator) == 2 * aggregator.MAX_PENDING_FACTOR
+            assert self.buf.get(model, ["times_seen"], {"pk": 0}) == {"times_seen": 2}
+
+            aggregator.flush()
+
+        assert self.buf.get(model, ["times_seen"], {"pk": 0}) == {"times_seen": 3}
+
+    @django_db_all
+    def test_process_batch_bulk_updates(
+        self, default_project, factories, set_sentry_option
+    ) -> None:
+        groups = [factories.create_group(project=default_project) for _ in range(3)]
+        orig_times_seen = {
+            group.id: Group.objects.get_from_cache(id=group.id).times_seen for group in groups
+        }
+        last_seen = timezone.now().replace(microsecond=0) + datetime.timedelta(minutes=1)
+        for i, group in enumerate(groups):
+            self.buf.incr(Group, {"times_seen": i + 1}, {"id": group.id}, {"last_seen": last_seen})
+        keys = [make_key(Group, {"id": group.id}) for group in groups]
+
+        with (
+            set_sentry_option("buffer.bulk-flush.max-rows", 2),
+            mock.patch("sentry.buffer.redis.metrics") as metrics,
+            mock.patch("sentry.buffer.redis.buffer_incr_complete") as signal,
+        ):
+            self.buf.process(batch_keys=keys)
+
+        metrics.distribution.assert_any_call(
+            "buffer.bulk-flush.rows-per-statement", 2, tags=mock.ANY
+        )
+        metrics.distribution.assert_any_call(
+            "buffer.bulk-flush.rows-per-statement", 1, tags=mock.ANY
+        )
+        assert signal.send_robust.call_count == 3
+        for i, group in enumerate(groups):
+            # the group cache is refreshed, as with `group.update()`
+            cached = Group.objects.get_from_cache(id=group.id)
+            assert cached.times_seen == orig_times_seen[group.id] + i + 1
+            assert cached.last_seen == last_seen
+
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        assert client.zrange("b:p", 0, -1) == []
+        assert not any(client.exists(key) for key in keys)
+
+    @django_db_all
+    def test_process_batch_falls_back(self, default_group, set_sentry_option) -> None:
+        model = self._incr_model()
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1}, signal_only=True)
+        # groups deleted since the increment was buffered match no row
+        self.buf.incr(Group, {"times_seen": 1}, {"id": default_group.id + 1000})
+        keys = [make_key(model, {"pk": 1}), make_key(Group, {"id": default_group.id + 1000})]
+
+        with (
+            set_sentry_option("buffer.bulk-flush.max-rows", 10),
+            mock.patch.object(self.buf, "_base_process") as base_process,
+        ):
+            self.buf.process(batch_keys=keys)
+
+        assert base_process.mock_calls == [
+            mock.call(mock.Mock, {"times_seen": 1}, {"pk": 1}, {}, True),
+            mock.call(Group, {"times_seen": 1}, {"id": default_group.id + 1000}, {}, None),
+        ]
+
+    def test_process_batch_skips_locked_keys(self, set_sentry_option) -> None:
+        model = self._incr_model()
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 1}, signal_only=True)
+        self.buf.incr(model, {"times_seen": 1}, {"pk": 2}, signal_only=True)
+        keys = [make_key(model, {"pk": 1}), make_key(model, {"pk": 2})]
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        client.set(f"l:{keys[0]}", "1")
+
+        with (
+            set_sentry_option("buffer.bulk-flush.max-rows", 10),
+            mock.patch.object(self.buf, "_base_process") as base_process,
+        ):
+            self.buf.process(batch_keys=keys)
+
+        base_process.assert_called_once_with(mock.Mock, {"times_seen": 1}, {"pk": 2}, {}, True)
+        assert client.exists(keys[0])
+        assert not client.exists(f"l:{keys[1]}")
+
+    @mock.patch("sentry.buffer.redis.process_incr", mock.Mock())
+    def test_process_pending_flush_lag(self) -> None:
+        client = get_cluster_routing_client(self.buf.cluster, self.buf.is_redis_cluster)
+        now = time.time()
+        client.zadd("b:p", {"foo": now - 30, "bar": now})
+        with mock.patch("sentry.buffer.redis.metrics") as metrics:
+            self.buf.process_pending()
+
+        (lag,) = (
+            call.args[1]
+            for call in metrics.distribution.mock_calls
+            if call.args[0] == "buffer.flush-lag"
+        )
+        assert lag == pytest.approx(30, abs=5)
+
     def group_rule_data_by_project_id(self, buffer, project_ids):
         project_ids_to_rule_data = defaultdict(list)
         for proj_id in project_ids:
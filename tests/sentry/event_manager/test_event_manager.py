@@ -36,6 +36,7 @@ from sentry.event_manager import (
     has_pending_commit_resolution,
     materialize_metadata,
     save_grouphash_and_group,
+    shared_save_lookups,
 )
 from sentry.exceptions import HashDiscarded
 from sentry.grouping.api import GroupingConfig, load_grouping_config
@@ -1303,6 +1304,28 @@ class EventManagerTest(TestCase, SnubaTestCase, EventManagerTestMixin, Performan
         assert group.first_release is not None
         assert group.first_release.version == "foo-1.0"
 
+    def test_shared_save_lookups(self) -> None:
+        with (
+            mock.patch.object(Release, "get_or_create", wraps=Release.get_or_create) as release,
+            mock.patch.object(
+                Environment, "get_or_create", wraps=Environment.get_or_create
+            ) as environment,
+        ):
+            with shared_save_lookups():
+                for _ in range(3):
+                    manager = EventManager(make_event(release="1.0", dist="1", environment="prod"))
+                    manager.normalize()
+                    event = manager.save(self.project.id)
+                    assert event.get_tag("sentry:release") == "1.0"
+                    assert event.get_tag("sentry:dist") == "1"
+                    assert event.get_tag("environment") == "prod"
+
+            assert release.call_count == 1
+            assert environment.call_count == 1
+
+            self.make_release_event("1.0", self.project.id)
+            assert release.call_count == 2
+
     def test_release_project_slug_long(self) -> None:
         project = self.create_project(name="foo")
         partial_version_len = MAX_VERSION_LENGTH - 4
@@ -24,6 +24,8 @@ from sentry.grouping.ingest.caching import (
 from sentry.grouping.ingest.config import update_or_set_grouping_config_if_needed
 from sentry.grouping.ingest.hashing import (
     _get_cache_expiry,
+    bulk_check_grouphash_existence,
+    bulk_get_or_create_grouphashes,
     find_grouphash_with_group,
     get_or_create_grouphashes,
 )
@@ -604,6 +606,115 @@ class GroupHashCachingTest(TestCase):
         )
 
 
+@override_options({"grouping.use_ingest_grouphash_bulk_lookup": True})
+class GroupHashBulkLookupTest(TestCase):
+    @contextmanager
+    def get_spies(self) -> Generator[tuple[MagicMock, MagicMock, MagicMock]]:
+        with (
+            patch(
+                "sentry.grouping.ingest.hashing.cache.get_many",
+                wraps=cache.get_many,
+            ) as cache_get_many_spy,
+            patch(
+                "sentry.grouping.ingest.hashing.GroupHash.objects.filter",
+                wraps=GroupHash.objects.filter,
+            ) as grouphash_objects_filter_spy,
+            patch(
+                "sentry.grouping.ingest.hashing.GroupHash.objects.get_or_create",
+                wraps=GroupHash.objects.get_or_create,
+            ) as grouphash_objects_get_or_create_spy,
+        ):
+            yield (
+                cache_get_many_spy,
+                grouphash_objects_filter_spy,
+                grouphash_objects_get_or_create_spy,
+            )
+
+    def test_resolves_all_hashes_at_once(self) -> None:
+        event = Event(self.project.id, "11212012123120120415201309082013")
+        GroupHash.objects.create(project=self.project, hash="with_group", group=self.group)
+        GroupHash.objects.create(project=self.project, hash="without_group")
+        hashes = ["new", "with_group", "without_group"]
+
+        with self.get_spies() as (cache_get_many_spy, filter_spy, get_or_create_spy):
+            grouphashes = get_or_create_grouphashes(event, self.project, {}, hashes, "new_config")
+
+            assert [grouphash.hash for grouphash in grouphashes] == hashes
+            assert grouphashes[1].group_id == self.group.id
+            assert cache_get_many_spy.call_count == 1
+            assert filter_spy.call_count == 1
+            # Only the grouphash which didn't exist yet is created individually
+            get_or_create_spy.assert_called_once_with(project=self.project, hash="new")
+
+            grouphashes = get_or_create_grouphashes(event, self.project, {}, hashes, "new_config")
+
+            assert [grouphash.hash for grouphash in grouphashes] == hashes
+            # Only the grouphash with a group is cached, so the other two are looked up again
+            assert filter_spy.call_args.kwargs == {
+                "project_id__in": {self.project.id},
+                "hash__in": {"new", "without_group"},
+            }
+
+    def test_secondary_hashes_negative_cache(self) -> None:
+        event = Event(self.project.id, "11212012123120120415201309082013")
+        GroupHash.objects.create(project=self.project, hash="existing", group=self.group)
+        self.project.update_option("sentry:secondary_grouping_config", "old_config")
+
+        with self.get_spies() as (_, filter_spy, get_or_create_spy):
+            grouphashes = get_or_create_grouphashes(
+                event, self.project, {}, ["missing", "existing"], "old_config"
+            )
+            assert [grouphash.hash for grouphash in grouphashes] == ["existing"]
+            get_or_create_spy.assert_not_called()
+
+            # Both hashes are now cached, including the one which doesn't exist
+            filter_spy.reset_mock()
+            get_or_create_grouphashes(
+                event, self.project, {}, ["missing", "existing"], "old_config"
+            )
+            filter_spy.assert_not_called()
+
+        # Creating the grouphash invalidates the cached non-existence
+        GroupHash.objects.create(project=self.project, hash="missing")
+        grouphashes = get_or_create_grouphashes(
+            event, self.project, {}, ["missing", "existing"], "old_config"
+        )
+        assert [grouphash.hash for grouphash in grouphashes] == ["missing", "existing"]
+
+    def test_micro_batch(self) -> None:
+        other_project = self.create_project(organization=self.organization)
+        GroupHash.objects.create(project=self.project, hash="shared", group=self.group)
+        GroupHash.objects.create(project=other_project, hash="other")
+        batch = [
+            (self.project, ["shared", "new"]),
+            (other_project, ["shared", "other"]),
+            (self.project, ["new"]),
+        ]
+
+        with self.get_spies() as (cache_get_many_spy, filter_spy, get_or_create_spy):
+            existence = bulk_check_grouphash_existence(batch, use_caching=True)
+            assert existence == [{"shared"}, {"other"}, set()]
+            assert cache_get_many_spy.call_count == 1
+            assert filter_spy.call_count == 1
+
+            cache_get_many_spy.reset_mock()
+            filter_spy.reset_mock()
+            results = bulk_get_or_create_grouphashes(batch, use_caching=True)
+            assert cache_get_many_spy.call_count == 1
+            assert filter_spy.call_count == 1
+            # "shared" only exists in the first project, and "new" is only created once
+            assert get_or_create_spy.call_count == 2
+            get_or_create_spy.assert_any_call(project=self.project, hash="new")
+            get_or_create_spy.assert_any_call(project=other_project, hash="shared")
+
+        assert [[(gh.project_id, gh.hash, created) for gh, created in r] for r in results] == [
+            [(self.project.id, "shared", False), (self.project.id, "new", True)],
+            [(other_project.id, "shared", True), (other_project.id, "other", False)],
+            [(self.project.id, "new", True)],
+        ]
+        assert results[0][0][0].group_id == self.group.id
+
+
 class PlaceholderTitleTest(TestCase):
     """
     Tests for a bug where error events were interpreted as default-type events and therefore all
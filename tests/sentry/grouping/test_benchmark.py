@@ -1,15 +1,23 @@
+from collections.abc import Sequence
 from types import ModuleType
 from typing import Any
 
 import pytest
 
+from sentry.grouping.parameterization import (
+    DEFAULT_PARAMETERIZATION_REGEXES,
+    ParameterizationRegex,
+    get_parameterization_matcher,
+)
 from sentry.grouping.strategies.configurations import GROUPING_CONFIG_CLASSES
+from sentry.grouping.strategies.message import REGEX_PATTERN_KEYS
 from tests.sentry.grouping import (
     GROUPING_INPUTS_DIR,
     NO_MSG_PARAM_CONFIG,
     GroupingInput,
     get_grouping_inputs,
 )
+from tests.sentry.grouping.test_parameterization import standard_cases
 
 GROUPING_INPUTS = get_grouping_inputs(GROUPING_INPUTS_DIR)
 
@@ -46,3 +54,34 @@ def run_configuration(grouping_input: GroupingInput, config_name: str) -> None:
     event.project = None  # type: ignore[assignment]
 
     event.get_hashes()
+
+
+PARAMETERIZATION_INPUTS = [input for _, input, _ in standard_cases] + [
+    "Connection reset by peer",
+    "Failed to fetch user 12345 from db-1.example.com after 250ms",
+    "Invalid token=\"abc\" for request 7c1811ed-e98f-4c9c-a9f9-58c757ff494f",
+]
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+@pytest.mark.parametrize("regex", DEFAULT_PARAMETERIZATION_REGEXES, ids=lambda regex: regex.name)
+def test_benchmark_parameterization_regex(
+    regex: ParameterizationRegex, benchmark: ModuleType
+) -> None:
+    run_parameterization(benchmark, [regex.name])
+
+
+@pytest.mark.skipif(not benchmark_available(), reason="requires pytest-benchmark")
+def test_benchmark_parameterization(benchmark: ModuleType) -> None:
+    run_parameterization(benchmark, REGEX_PATTERN_KEYS)
+
+
+def run_parameterization(benchmark: ModuleType, pattern_keys: Sequence[str]) -> None:
+    matcher = get_parameterization_matcher(pattern_keys)
+
+    def parameterize_inputs() -> None:
+        # Bypass the memo, we want to measure the regexes
+        for content in PARAMETERIZATION_INPUTS:
+            matcher._parameterize(content)
+
+    benchmark(parameterize_inputs)
@@ -14,11 +14,14 @@ from sentry.grouping.component import FrameGroupingComponent, StacktraceGrouping
 from sentry.grouping.enhancer import (
     DEFAULT_ENHANCEMENTS_BASE,
     ENHANCEMENT_BASES,
+    ENHANCEMENTS_CONFIG_CACHE,
     EnhancementsConfig,
+    EnhancementsConfigCache,
     _is_valid_profiling_action,
     _is_valid_profiling_matcher,
     _split_rules,
     keep_profiling_rules,
+    warm_enhancements_cache,
 )
 from sentry.grouping.enhancer.actions import EnhancementAction
 from sentry.grouping.enhancer.exceptions import InvalidEnhancerConfig
@@ -26,6 +29,7 @@ from sentry.grouping.enhancer.matchers import ReturnValueCache, _cached, create_
 from sentry.grouping.enhancer.parser import parse_enhancements
 from sentry.grouping.enhancer.rules import EnhancementRule
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import InstaSnapshotter
 
 
@@ -721,6 +725,69 @@ class EnhancementsTest(TestCase):
         }
         assert strategy_config.enhancements.id == DEFAULT_ENHANCEMENTS_BASE
 
+    @override_options({"grouping.enhancements.use_process_cache": True})
+    @patch("sentry.grouping.enhancer.parse_enhancements", wraps=parse_enhancements)
+    def test_process_cache(self, parse_enhancements_spy: MagicMock) -> None:
+        ENHANCEMENTS_CONFIG_CACHE.clear()
+        enhancements = EnhancementsConfig.from_rules_text("function:playFetch +app", version=3)
+        assert parse_enhancements_spy.call_count == 1
+
+        # The default version and the explicit one share an entry, other inputs don't
+        assert EnhancementsConfig.from_rules_text("function:playFetch +app") is enhancements
+        assert parse_enhancements_spy.call_count == 1
+        assert (
+            EnhancementsConfig.from_rules_text(
+                "function:playFetch +app", bases=[DEFAULT_ENHANCEMENTS_BASE]
+            )
+            is not enhancements
+        )
+        assert EnhancementsConfig.from_rules_text("function:playFetch -app") is not enhancements
+        assert parse_enhancements_spy.call_count == 3
+
+        from_base64 = EnhancementsConfig.from_base64_string(enhancements.base64_string)
+        assert from_base64 is not enhancements
+        assert EnhancementsConfig.from_base64_string(enhancements.base64_string) is from_base64
+        assert (
+            EnhancementsConfig.from_base64_string(enhancements.base64_string.encode("ascii"))
+            is from_base64
+        )
+
+        # Invalid configs are not cached
+        for _ in range(2):
+            with pytest.raises(InvalidEnhancerConfig):
+                EnhancementsConfig.from_rules_text("invalid.message:foo -> bar")
+        assert len(ENHANCEMENTS_CONFIG_CACHE) == 4
+
+    def test_process_cache_eviction(self) -> None:
+        cache = EnhancementsConfigCache(max_size=2)
+        configs = [EnhancementsConfig.from_rules_text(f"function:f{i} +app") for i in range(3)]
+
+        for i, config in enumerate(configs[:2]):
+            cache.get_or_create(i, "rules_text", lambda: config)
+        # Using 0 makes 1 the least recently used entry
+        assert cache.get_or_create(0, "rules_text", lambda: configs[2]) is configs[0]
+        cache.get_or_create(2, "rules_text", lambda: configs[2])
+
+        assert len(cache) == 2
+        assert cache.get_or_create(0, "rules_text", lambda: configs[2]) is configs[0]
+        assert cache.get_or_create(1, "rules_text", lambda: configs[2]) is configs[2]
+
+    @override_options({"grouping.enhancements.use_process_cache": True})
+    def test_warm_enhancements_cache(self) -> None:
+        ENHANCEMENTS_CONFIG_CACHE.clear()
+        warm_enhancements_cache()
+        assert len(ENHANCEMENTS_CONFIG_CACHE) == 2 * len(ENHANCEMENT_BASES)
+
+        with patch("sentry.grouping.enhancer._get_rust_enhancements") as get_rust_enhancements:
+            base64_enhancements = EnhancementsConfig.from_rules_text(
+                "", bases=[DEFAULT_ENHANCEMENTS_BASE]
+            ).base64_string
+            load_grouping_config(
+                {"id": DEFAULT_GROUPING_CONFIG, "enhancements": base64_enhancements}
+            )
+        assert get_rust_enhancements.call_count == 0
+        assert len(ENHANCEMENTS_CONFIG_CACHE) == 2 * len(ENHANCEMENT_BASES)
+
     # TODO: This and `test_base64_string_with_old_enhancements_name_runs_default_rules` are here in
     # order to test the temporary shim in the enhancements module which makes the default
     # enhancements able to be looked up by their old name. Once that's removed (once the relevat
@@ -1,6 +1,11 @@
 import pytest
 
-from sentry.grouping.parameterization import Parameterizer
+from sentry.grouping.parameterization import (
+    DEFAULT_PARAMETERIZATION_REGEXES,
+    ParameterizationRegex,
+    Parameterizer,
+    get_parameterization_matcher,
+)
 from sentry.grouping.strategies.message import REGEX_PATTERN_KEYS
 
 
@@ -147,6 +152,46 @@ def test_parameterize_experimental(
     assert f"prefix {expected} suffix" == f"prefix {parameterizer.parameterize_all(input)} suffix"
 
 
+@pytest.mark.parametrize(("name", "input", "expected"), standard_cases)
+def test_prefilter_finds_parameterizable_content(name: str, input: str, expected: str) -> None:
+    matcher = get_parameterization_matcher(REGEX_PATTERN_KEYS)
+    assert matcher.prefilter is not None
+    if input != expected:
+        assert matcher.prefilter.search(input) is not None
+
+
+def test_prefilter_skips_plain_messages() -> None:
+    matcher = get_parameterization_matcher(REGEX_PATTERN_KEYS)
+    assert matcher.prefilter is not None
+    assert matcher.prefilter.search("A quick brown fox jumps over the lazy dog") is None
+
+
+@pytest.mark.parametrize("regex", DEFAULT_PARAMETERIZATION_REGEXES, ids=lambda r: r.name)
+def test_prefilter_per_pattern(regex: ParameterizationRegex) -> None:
+    matcher = get_parameterization_matcher([regex.name])
+    for name, input, expected in standard_cases:
+        if f"<{regex.name}>" in expected:
+            assert matcher.prefilter is not None
+            assert matcher.prefilter.search(input) is not None, f"Case {name} Failed"
+            assert matcher.regex.search(input) is not None, f"Case {name} Failed"
+
+
+def test_matcher_is_shared() -> None:
+    matcher = get_parameterization_matcher(REGEX_PATTERN_KEYS)
+    assert get_parameterization_matcher(list(REGEX_PATTERN_KEYS)) is matcher
+    assert get_parameterization_matcher(REGEX_PATTERN_KEYS, experimental=True) is not matcher
+    assert Parameterizer(REGEX_PATTERN_KEYS)._matcher is matcher
+
+
+def test_memoized_matches_are_counted() -> None:
+    message = "user 1234 logged in from 0.0.0.0 at 15:04:05"
+    for _ in range(2):
+        parameterizer = Parameterizer(REGEX_PATTERN_KEYS)
+        assert parameterizer.parameterize_all(message) == "user <int> logged in from <ip> at <date>"
+        assert parameterizer.parameterize_all(message) == "user <int> logged in from <ip> at <date>"
+        assert parameterizer.matches_counter == {"int": 2, "ip": 2, "date": 2}
+
+
 # These are test cases that we should fix
 @pytest.mark.xfail()
 @pytest.mark.parametrize(
@@ -11,7 +11,7 @@ from arroyo.types import BrokerValue, Message, Partition, Topic
 
 from sentry.conf.types.kafka_definition import Topic as TopicNames
 from sentry.event_manager import EventManager
-from sentry.ingest.consumer.factory import IngestStrategyFactory
+from sentry.ingest.consumer.factory import IngestStrategyFactory, RaiseInvalidMessages
 from sentry.ingest.types import ConsumerType
 from sentry.testutils.pytest.fixtures import django_db_all
 
@@ -87,3 +87,23 @@ def test_dlq_invalid_messages(factories, topic_name: str, consumer_type: Consume
 
         assert exc_info.value.partition == partition
         assert exc_info.value.offset == offset
+
+
+def test_raise_invalid_messages() -> None:
+    partition = Partition(Topic(TopicNames.INGEST_EVENTS.value), 0)
+    next_step = Mock()
+    strategy = RaiseInvalidMessages(next_step)
+
+    invalid_messages = [InvalidMessage(partition, 1), InvalidMessage(partition, 3)]
+    batch = Message(BrokerValue(invalid_messages, partition, 4, datetime.now()))
+    strategy.submit(batch)
+
+    # every invalid message is raised for the DLQ before the batch is committed
+    for offset in (1, 3):
+        with pytest.raises(InvalidMessage) as exc_info:
+            strategy.poll()
+        assert exc_info.value.offset == offset
+        assert not next_step.submit.called
+
+    strategy.poll()
+    next_step.submit.assert_called_once_with(batch)
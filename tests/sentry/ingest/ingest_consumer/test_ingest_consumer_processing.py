@@ -8,12 +8,14 @@ from io import BytesIO
 from typing import Any
 from unittest.mock import patch
 
+import msgpack
 import orjson
 import pytest
 from arroyo.backends.kafka.consumer import KafkaPayload
 from arroyo.backends.local.backend import LocalBroker
 from arroyo.backends.local.storages.memory import MemoryMessageStorage
-from arroyo.types import Partition, Topic
+from arroyo.processing.strategies.batching import ValuesBatch
+from arroyo.types import BrokerValue, Message, Partition, Topic
 from django.conf import settings
 
 from sentry.event_manager import EventManager
@@ -24,6 +26,7 @@ from sentry.ingest.consumer.processors import (
     process_individual_attachment,
     process_userreport,
 )
+from sentry.ingest.consumer.simple_event import process_simple_event_batch
 from sentry.ingest.types import ConsumerType
 from sentry.lang.native.utils import STORE_CRASH_REPORTS_ALL
 from sentry.models.debugfile import create_files_from_dif_zip
@@ -114,6 +117,95 @@ def test_deduplication_works(default_project, task_runner, preprocess_event) ->
     }
 
 
+def _simple_event_batch(payloads: list[bytes]) -> Message[ValuesBatch[KafkaPayload]]:
+    partition = Partition(Topic("ingest-events"), 0)
+    batch: ValuesBatch[KafkaPayload] = [
+        BrokerValue(KafkaPayload(None, payload, []), partition, offset, datetime.datetime.now())
+        for offset, payload in enumerate(payloads)
+    ]
+    return Message(BrokerValue(batch, partition, len(payloads) - 1, datetime.datetime.now()))
+
+
+def _simple_event_payload(payload: dict[str, Any], project_id: int) -> bytes:
+    return msgpack.packb(
+        {
+            "type": "event",
+            "payload": orjson.dumps(payload).decode(),
+            "start_time": time.time(),
+            "event_id": payload["event_id"],
+            "project_id": project_id,
+        }
+    )
+
+
+@django_db_all
+def test_process_simple_event_batch(default_project, task_runner, preprocess_event) -> None:
+    payloads = [
+        _simple_event_payload(
+            get_normalized_event({"message": message}, default_project), default_project.id
+        )
+        for message in ("hello", "world")
+    ]
+
+    process_simple_event_batch(
+        _simple_event_batch(payloads),
+        consumer_type=ConsumerType.Events,
+        reprocess_only_stuck_events=False,
+        max_save_batch_size=10,
+    )
+
+    assert [kwargs["data"]["logentry"]["formatted"] for kwargs in preprocess_event] == [
+        "hello",
+        "world",
+    ]
+
+
+@pytest.mark.parametrize("invalid_offset", [0, 1, 2])
+@django_db_all
+def test_process_simple_event_batch_invalid_message(
+    default_project, task_runner, preprocess_event, invalid_offset
+) -> None:
+    payloads = [
+        _simple_event_payload(
+            get_normalized_event({"message": message}, default_project), default_project.id
+        )
+        for message in ("hello", "world")
+    ]
+    payloads.insert(invalid_offset, b"bogus message")
+
+    invalid_messages = process_simple_event_batch(
+        _simple_event_batch(payloads),
+        consumer_type=ConsumerType.Events,
+        reprocess_only_stuck_events=False,
+        max_save_batch_size=10,
+    )
+
+    # the invalid message goes to the DLQ, the other events are still processed
+    assert [exc.offset for exc in invalid_messages] == [invalid_offset]
+    assert [kwargs["data"]["logentry"]["formatted"] for kwargs in preprocess_event] == [
+        "hello",
+        "world",
+    ]
+
+
+@django_db_all
+def test_process_simple_event_batch_deduplication(
+    default_project, task_runner, preprocess_event
+) -> None:
+    payload = _simple_event_payload(
+        get_normalized_event({"message": "hello"}, default_project), default_project.id
+    )
+
+    process_simple_event_batch(
+        _simple_event_batch([payload, payload]),
+        consumer_type=ConsumerType.Events,
+        reprocess_only_stuck_events=False,
+        max_save_batch_size=10,
+    )
+
+    assert len(preprocess_event) == 1
+
+
 @django_db_all
 def test_transactions_spawn_save_event_transaction(
     default_project,
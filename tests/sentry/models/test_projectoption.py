@@ -28,3 +28,12 @@ class ProjectOptionManagerTest(TransactionTestCase):
         ProjectOption.objects.create(project=self.project, key="foo", value="bar")
         result = ProjectOption.objects.get_value_bulk([self.project], "foo")
         assert result == {self.project: "bar"}
+
+    def test_get_all_values_bulk(self) -> None:
+        other = self.create_project()
+        ProjectOption.objects.create(project=self.project, key="foo", value="bar")
+
+        result = ProjectOption.objects.get_all_values_bulk([self.project.id, other.id])
+        assert result == {self.project.id: {"foo": "bar"}, other.id: {}}
+        assert ProjectOption.objects.get_all_values(self.project) == {"foo": "bar"}
+
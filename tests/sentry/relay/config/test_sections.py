@@ -0,0 +1,77 @@
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+
+from sentry.relay.config.sections import bump_section_versions, get_memoized_section
+from sentry.testutils.helpers.options import override_options
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture
+def project() -> Mock:
+    return Mock(id=2, organization_id=1)
+
+
+@override_options({"relay.project-config.section-cache-ttl": 0})
+def test_disabled(project) -> None:
+    build = Mock(return_value=["quota"])
+    assert get_memoized_section("quotas", project, build) == ["quota"]
+    assert get_memoized_section("quotas", project, build) == ["quota"]
+    assert build.call_count == 2
+
+
+@override_options({"relay.project-config.section-cache-ttl": 60})
+def test_memoized_until_bumped(project) -> None:
+    build = Mock(return_value=["quota"])
+    assert get_memoized_section("quotas", project, build) == ["quota"]
+    assert get_memoized_section("quotas", project, build) == ["quota"]
+    assert build.call_count == 1
+
+    bump_section_versions("projectkey.post_save", project_id=project.id)
+    build.return_value = ["new quota"]
+    assert get_memoized_section("quotas", project, build) == ["new quota"]
+    assert build.call_count == 2
+
+
+@override_options({"relay.project-config.section-cache-ttl": 60})
+def test_trigger_only_bumps_affected_sections(project) -> None:
+    quotas = Mock(return_value=["quota"])
+    filters = Mock(return_value={"csp": {}})
+    get_memoized_section("quotas", project, quotas)
+    get_memoized_section("filterSettings", project, filters)
+
+    bump_section_versions("projectkey.post_save", project_id=project.id)
+    get_memoized_section("quotas", project, quotas)
+    get_memoized_section("filterSettings", project, filters)
+    assert quotas.call_count == 2
+    assert filters.call_count == 1
+
+    # Triggers without a known set of sections invalidate all of them, also
+    # when the invalidation is scheduled for the whole organization.
+    bump_section_versions("organizationoption.post_save", organization_id=1)
+    get_memoized_section("quotas", project, quotas)
+    get_memoized_section("filterSettings", project, filters)
+    assert quotas.call_count == 3
+    assert filters.call_count == 2
+
+
+@override_options({"relay.project-config.section-cache-ttl": 60})
+def test_variants_and_empty_results(project) -> None:
+    build = Mock(return_value=[])
+    get_memoized_section("quotas", project, build, variant="1")
+    get_memoized_section("quotas", project, build, variant="1")
+    get_memoized_section("quotas", project, build, variant="1,2")
+    assert build.call_count == 2
+
+    # Failed builds return None and are retried.
+    failing = Mock(return_value=None)
+    assert get_memoized_section("metricExtraction", project, failing) is None
+    assert get_memoized_section("metricExtraction", project, failing) is None
+    assert failing.call_count == 2
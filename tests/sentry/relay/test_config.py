@@ -17,10 +17,15 @@ from sentry.dynamic_sampling import (
     get_redis_client_for_ds,
 )
 from sentry.dynamic_sampling.rules.base import NEW_MODEL_THRESHOLD_IN_MINUTES
-from sentry.models.projectkey import ProjectKey
+from sentry.models.projectkey import ProjectKey, ProjectKeyStatus
 from sentry.models.projectteam import ProjectTeam
 from sentry.models.transaction_threshold import TransactionMetric
-from sentry.relay.config import ProjectConfig, TransactionNameRule, get_project_config
+from sentry.relay.config import (
+    ProjectConfig,
+    TransactionNameRule,
+    get_project_config,
+    get_project_configs_bulk,
+)
 from sentry.snuba.dataset import Dataset
 from sentry.testutils.factories import Factories
 from sentry.testutils.helpers import Feature
@@ -1635,3 +1640,43 @@ def test_project_config_trusted_relay_settings(
         else:
             # trustedRelaySettings should not be present
             assert trusted_relay_settings is None
+
+
+@django_db_all
+@region_silo_test
+def test_get_project_configs_bulk(default_project) -> None:
+    rate_limited = ProjectKey.objects.create(
+        project=default_project, rate_limit_count=10, rate_limit_window=60
+    )
+    inactive = ProjectKey.objects.create(project=default_project, status=ProjectKeyStatus.INACTIVE)
+    keys = list(ProjectKey.objects.filter(project=default_project))
+    active_keys = [key for key in keys if key.status == ProjectKeyStatus.ACTIVE]
+    assert len(active_keys) == 2
+
+    with Feature({"projects:rate-limits": True, "organizations:profiling": True}):
+        configs = get_project_configs_bulk(
+            default_project.organization, [default_project], {default_project.id: keys}
+        )
+        expected = {
+            key.public_key: get_project_config(default_project, project_keys=[key]).to_dict()
+            for key in active_keys
+        }
+
+    assert configs.pop(inactive.public_key) == {"disabled": True}
+    assert configs.keys() == expected.keys()
+    for public_key, config in configs.items():
+        # Remove keys that change everytime
+        for field in ("lastChange", "lastFetch", "rev"):
+            config.pop(field)
+            expected[public_key].pop(field)
+        assert config == expected[public_key]
+
+    # Key quotas only end up in the config of their key.
+    for public_key, config in configs.items():
+        key_quotas = [
+            quota["scopeId"]
+            for quota in config["config"].get("quotas", [])
+            if quota.get("scope") == "key"
+        ]
+        expected_quotas = [str(rate_limited.id)] if public_key == rate_limited.public_key else []
+        assert key_quotas == expected_quotas
@@ -1,6 +1,7 @@
 from unittest import mock
 
 from sentry.relay.projectconfig_cache import redis
+from sentry.testutils.helpers.options import override_options
 from sentry.testutils.pytest.fixtures import django_db_all
 from sentry.utils import metrics
 
@@ -54,3 +55,79 @@ def test_write_delete() -> None:
     cache.delete_many([dsn])
     assert cache.get(dsn) is None
     assert cache.get_rev(dsn) is None
+
+
+@django_db_all
+def test_exists_many() -> None:
+    cache = redis.RedisProjectConfigCache()
+
+    cache.set_many({"fake-dsn-1": {"my-value": "foo"}, "fake-dsn-2": {"disabled": True}})
+    assert cache.exists_many(["fake-dsn-1", "fake-dsn-2", "fake-dsn-3"]) == {
+        "fake-dsn-1",
+        "fake-dsn-2",
+    }
+
+    cache.delete_many(["fake-dsn-1"])
+    assert cache.exists_many(["fake-dsn-1", "fake-dsn-2"]) == {"fake-dsn-2"}
+
+
+@django_db_all
+@override_options({"relay.projectconfig-cache.skip-unchanged-writes": True})
+def test_skip_unchanged_writes() -> None:
+    cache = redis.RedisProjectConfigCache()
+
+    dsn = "fake-dsn-1"
+    cache.set_many({dsn: {"my-value": "foo", "rev": "my_rev_1"}})
+
+    with mock.patch.object(metrics, "incr") as incr_mock:
+        cache.set_many({dsn: {"my-value": "foo", "rev": "my_rev_2"}})
+
+    assert (
+        mock.call("relay.projectconfig_cache.write", amount=1, tags={"action": "skip_unchanged"})
+        in incr_mock.mock_calls
+    )
+    # The stored config is identical, so it keeps its revision.
+    assert cache.get(dsn) == {"my-value": "foo", "rev": "my_rev_1"}
+    assert cache.get_rev(dsn) == "my_rev_1"
+
+    cache.set_many({dsn: {"my-value": "bar", "rev": "my_rev_3"}})
+    assert cache.get(dsn) == {"my-value": "bar", "rev": "my_rev_3"}
+    assert cache.get_rev(dsn) == "my_rev_3"
+
+    # A config which disappeared is written again, even if its digest is still there.
+    with cache.cluster.pipeline() as p:
+        p.delete(f"relayconfig:{dsn}")
+        p.execute()
+    cache.set_many({dsn: {"my-value": "bar", "rev": "my_rev_4"}})
+    assert cache.get(dsn) == {"my-value": "bar", "rev": "my_rev_4"}
+
+    cache.delete_many([dsn])
+    cache.set_many({dsn: {"my-value": "bar", "rev": "my_rev_5"}})
+    assert cache.get(dsn) == {"my-value": "bar", "rev": "my_rev_5"}
+
+
+@django_db_all
+def test_org_size_metric() -> None:
+    cache = redis.RedisProjectConfigCache()
+
+    with mock.patch.object(metrics, "distribution") as distribution_mock:
+        cache.set_many(
+            {
+                "fake-dsn-1": {"organizationId": 1, "my-value": "foo"},
+                "fake-dsn-2": {"organizationId": 1, "my-value": "bar"},
+                "fake-dsn-3": {"organizationId": 2, "my-value": "baz"},
+            }
+        )
+
+    sizes = [
+        c.args[1]
+        for c in distribution_mock.call_args_list
+        if c.args[0] == "relay.projectconfig_cache.size"
+    ]
+    org_sizes = [
+        c.args[1]
+        for c in distribution_mock.call_args_list
+        if c.args[0] == "relay.projectconfig_cache.org_size"
+    ]
+    assert sorted(org_sizes) == sorted([sizes[0] + sizes[1], sizes[2]])
+
@@ -259,6 +259,21 @@ class ProcessBufferTest(ProcessDelayedAlertConditionsTestBase):
 
         assert mock_process_in_batches.call_count == 3
 
+    @override_options({"delayed_processing.bulk_project_count": 10})
+    @patch("sentry.rules.processing.delayed_processing.apply_delayed.apply_async")
+    @patch("sentry.rules.processing.delayed_processing.apply_delayed_bulk.apply_async")
+    def test_process_in_bulk(
+        self, mock_apply_delayed_bulk: MagicMock, mock_apply_delayed: MagicMock
+    ) -> None:
+        self._push_base_events()
+        process_buffer()
+
+        assert mock_apply_delayed.call_count == 0
+        mock_apply_delayed_bulk.assert_called_once_with(
+            kwargs={"project_ids": sorted([self.project.id, self.project_two.id])},
+            headers={"sentry-propagate-traces": False},
+        )
+
 
 class ProcessInBatchesTest(CreateEventTestCase):
     def setUp(self) -> None:
@@ -24,9 +24,12 @@ from sentry.rules.processing.delayed_processing import (
     LogConfig,
     UniqueConditionQuery,
     apply_delayed,
+    apply_delayed_bulk,
     bulk_fetch_events,
     cleanup_redis_buffer,
+    fetch_project_data,
     generate_unique_queries,
+    get_bulk_condition_group_results,
     get_condition_group_results,
     get_condition_query_groups,
     get_group_to_groupevent,
@@ -34,6 +37,7 @@ from sentry.rules.processing.delayed_processing import (
     get_rules_to_groups,
     get_slow_conditions,
     parse_rulegroup_to_event_data,
+    process_project_results,
 )
 from sentry.rules.processing.processor import PROJECT_ID_BUFFER_LIST_KEY, RuleProcessor
 from sentry.services.eventstore.models import Event, GroupEvent
@@ -796,6 +800,83 @@ class ApplyDelayedTest(ProcessDelayedAlertConditionsTestBase):
         rule_group_data = buffer.backend.get_hash(Project, {"project_id": self.project_two.id})
         assert rule_group_data == {}
 
+    @patch("sentry.rules.conditions.event_frequency.MIN_SESSIONS_TO_FIRE", 1)
+    def test_apply_delayed_bulk(self) -> None:
+        self._push_base_events()
+        apply_delayed_bulk([self.project.id, self.project_two.id])
+
+        rule_fire_histories = RuleFireHistory.objects.filter(
+            project__in=[self.project, self.project_two]
+        ).values_list("rule", "group")
+        assert set(rule_fire_histories) == {
+            (self.rule1.id, self.group1.id),
+            (self.rule2.id, self.group2.id),
+            (self.rule3.id, self.group3.id),
+            (self.rule4.id, self.group4.id),
+        }
+        self.assert_buffer_cleared(project_id=self.project.id)
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+
+    @patch("sentry.rules.conditions.event_frequency.MIN_SESSIONS_TO_FIRE", 1)
+    def test_apply_delayed_bulk_retries_failed_project(self) -> None:
+        self._push_base_events()
+        def fail_first_project(data, *args, **kwargs):
+            if data.project.id == self.project.id:
+                raise Exception("boom")
+            return process_project_results(data, *args, **kwargs)
+
+        with (
+            patch(
+                "sentry.rules.processing.delayed_processing.process_project_results",
+                side_effect=fail_first_project,
+            ),
+            patch("sentry.rules.processing.delayed_processing.apply_delayed") as mock_apply,
+        ):
+            apply_delayed_bulk([self.project.id, self.project_two.id])
+
+        # the other project is processed, the failed one is retried on its own
+        mock_apply.apply_async.assert_called_once_with(
+            kwargs={"project_id": self.project.id}, headers={"sentry-propagate-traces": False}
+        )
+        self.assert_buffer_cleared(project_id=self.project_two.id)
+        rule_group_data = buffer.backend.get_hash(Project, {"project_id": self.project.id})
+        assert rule_group_data != {}
+
+    def test_get_bulk_condition_group_results_shares_queries(self) -> None:
+        project_three = self.create_project(organization=self.organization)
+        rule_one = self.create_project_rule(
+            project=self.project, condition_data=[TEST_RULE_SLOW_CONDITION]
+        )
+        rule_two = self.create_project_rule(
+            project=project_three, condition_data=[TEST_RULE_SLOW_CONDITION]
+        )
+        event_one = self.create_event(self.project.id, FROZEN_TIME, "group-5")
+        event_two = self.create_event(project_three.id, FROZEN_TIME, "group-6")
+        self.create_event(project_three.id, FROZEN_TIME, "group-6")
+        assert event_one.group and event_two.group
+        self.push_to_hash(self.project.id, rule_one.id, event_one.group.id, event_one.event_id)
+        self.push_to_hash(project_three.id, rule_two.id, event_two.group.id, event_two.event_id)
+
+        projects_data = [fetch_project_data(self.project.id), fetch_project_data(project_three.id)]
+        with patch.object(
+            EventFrequencyCondition,
+            "batch_query_hook",
+            autospec=True,
+            side_effect=EventFrequencyCondition.batch_query_hook,
+        ) as mock_batch_query:
+            results = get_bulk_condition_group_results([data for data in projects_data if data])
+
+        assert mock_batch_query.call_count == 1
+        unique_query = UniqueConditionQuery(
+            cls_id=TEST_RULE_SLOW_CONDITION["id"],
+            interval=TEST_RULE_SLOW_CONDITION["interval"],
+            environment_id=rule_one.environment_id,
+        )
+        assert results == {
+            self.project.id: {unique_query: {event_one.group.id: 1}},
+            project_three.id: {unique_query: {event_two.group.id: 2}},
+        }
+
     def test_apply_delayed_issue_platform_event(self) -> None:
         """
         Test that we fire rules triggered from issue platform events
@@ -7,6 +7,7 @@ the mock indexer actually behaves the same as the postgres indexer.
 """
 
 from collections.abc import Mapping
+from unittest.mock import patch
 
 import pytest
 
@@ -446,6 +447,70 @@ def test_already_cached_plus_read_results(indexer, indexer_cache, use_case_id) -
         )
 
 
+def test_local_cache_and_absent_filter(indexer, indexer_cache, use_case_id) -> None:
+    with override_options(
+        {
+            "sentry-metrics.indexer.read-new-cache-namespace": False,
+            "sentry-metrics.indexer.write-new-cache-namespace": False,
+            "sentry-metrics.indexer.local-cache.max-size": 100,
+            "sentry-metrics.indexer.absent-filter.ttl": 60,
+        }
+    ):
+        org_id = 9
+        indexer_cache.set_many("br", {f"{use_case_id.value}:{org_id}:beep": 10})
+        indexer = CachingIndexer(indexer_cache, indexer)
+
+        results = indexer.bulk_record({use_case_id: {org_id: {"beep", "boop"}}})
+        assert results[use_case_id][org_id]["beep"] == 10
+        boop = results[use_case_id][org_id]["boop"]
+        assert boop is not None
+        # "boop" was missing from the cache
+        assert indexer.absent_filter.contains(f"{use_case_id.value}:{org_id}:boop")
+        assert not indexer.absent_filter.contains(f"{use_case_id.value}:{org_id}:beep")
+
+        # Both strings are served from the in-process cache now.
+        with patch.object(indexer_cache, "get_many") as mock_get_many:
+            results = indexer.bulk_record({use_case_id: {org_id: {"beep", "boop"}}})
+            assert mock_get_many.call_count == 0
+        assert results[use_case_id][org_id]["beep"] == 10
+        assert results[use_case_id][org_id]["boop"] == boop
+        assert_fetch_type_for_tag_string_set(
+            results.get_fetch_metadata()[use_case_id][org_id],
+            FetchType.CACHE_HIT,
+            {"beep", "boop"},
+        )
+
+        # Strings known to be absent skip the shared cache.
+        indexer.local_cache.configure(0)
+        with patch.object(indexer_cache, "get_many", wraps=indexer_cache.get_many) as mock_get:
+            results = indexer.bulk_record({use_case_id: {org_id: {"beep", "boop"}}})
+            mock_get.assert_called_once_with("br", [f"{use_case_id.value}:{org_id}:beep"])
+        assert results[use_case_id][org_id]["boop"] == boop
+
+
+def test_absent_filter_requires_local_cache(indexer, indexer_cache, use_case_id) -> None:
+    with override_options(
+        {
+            "sentry-metrics.indexer.read-new-cache-namespace": False,
+            "sentry-metrics.indexer.write-new-cache-namespace": False,
+            "sentry-metrics.indexer.local-cache.max-size": 0,
+            "sentry-metrics.indexer.absent-filter.ttl": 60,
+        }
+    ):
+        org_id = 9
+        indexer = CachingIndexer(indexer_cache, indexer)
+        boop = indexer.bulk_record({use_case_id: {org_id: {"boop"}}})[use_case_id][org_id]["boop"]
+        assert not indexer.absent_filter.contains(f"{use_case_id.value}:{org_id}:boop")
+
+        # Without the in-process cache, the recorded string is read from the
+        # shared cache instead of postgres.
+        results = indexer.bulk_record({use_case_id: {org_id: {"boop"}}})
+        assert results[use_case_id][org_id]["boop"] == boop
+        assert_fetch_type_for_tag_string_set(
+            results.get_fetch_metadata()[use_case_id][org_id], FetchType.CACHE_HIT, {"boop"}
+        )
+
+
 def test_read_when_bulk_record(indexer, use_case_id) -> None:
     with override_options(
         {
@@ -16,7 +16,7 @@ from sentry.sentry_metrics.configuration import (
     GENERIC_METRICS_SCHEMA_VALIDATION_RULES_OPTION_NAME,
     RELEASE_HEALTH_SCHEMA_VALIDATION_RULES_OPTION_NAME,
 )
-from sentry.sentry_metrics.consumers.indexer.batch import IndexerBatch
+from sentry.sentry_metrics.consumers.indexer.batch import IndexerBatch, find_raw_value
 from sentry.sentry_metrics.consumers.indexer.common import BrokerMeta
 from sentry.sentry_metrics.consumers.indexer.processing import INGEST_CODEC
 from sentry.sentry_metrics.consumers.indexer.schema_validator import MetricsSchemaValidator
@@ -1169,6 +1169,72 @@ def test_all_resolved_retention_days_honored(caplog, settings) -> None:
 
 
 @pytest.mark.django_db
+@pytest.mark.parametrize(
+    "payload, value, expected",
+    [
+        (b'{"value":[1,2.5,3],"type":"d"}', [1, 2.5, 3], b"[1,2.5,3]"),
+        (b'{"type":"d", "value" : [ 1, 2 ] }', [1, 2], b"[ 1, 2 ]"),
+        (b'{"type":"s","value":[]}', [], b"[]"),
+        (
+            b'{"value":{"min":1,"max":2,"sum":3,"count":2,"last":2}}',
+            {"min": 1, "max": 2, "sum": 3, "count": 2, "last": 2},
+            b'{"min":1,"max":2,"sum":3,"count":2,"last":2}',
+        ),
+        # scalar values are cheap to serialize
+        (b'{"type":"c","value":1.0}', 1.0, None),
+        # a tag called "value" makes the field ambiguous
+        (b'{"tags":{"value":"a"},"value":[1]}', [1], None),
+    ],
+)
+def test_find_raw_value(payload, value, expected) -> None:
+    assert find_raw_value(payload, value) == expected
+
+
+def test_splice_raw_values() -> None:
+    def reconstruct():
+        outer_message = _construct_outer_message(
+            [
+                (counter_payload, counter_headers),
+                (distribution_payload, distribution_headers),
+                (set_payload, set_headers),
+            ]
+        )
+        batch = IndexerBatch(
+            outer_message,
+            False,
+            False,
+            tags_validator=ReleaseHealthTagsValidator().is_allowed,
+            schema_validator=MetricsSchemaValidator(
+                INGEST_CODEC, RELEASE_HEALTH_SCHEMA_VALIDATION_RULES_OPTION_NAME
+            ).validate,
+        )
+        strings = batch.extract_strings()[UseCaseID.SESSIONS][1]
+        mapping = {string: i for i, string in enumerate(sorted(strings), 1)}
+        snuba_payloads = batch.reconstruct_messages(
+            {UseCaseID.SESSIONS: {1: mapping}},
+            {
+                UseCaseID.SESSIONS: {
+                    1: {
+                        string: Metadata(id=id, fetch_type=FetchType.CACHE_HIT)
+                        for string, id in mapping.items()
+                    }
+                }
+            },
+        ).data
+        return batch, _deconstruct_messages(
+            snuba_payloads, kafka_logical_topic="snuba-generic-metrics"
+        )
+
+    with override_options({"sentry-metrics.indexer.reconstruct.splice-raw-values": False}):
+        _, expected = reconstruct()
+
+    with override_options({"sentry-metrics.indexer.reconstruct.splice-raw-values": True}):
+        batch, spliced = reconstruct()
+
+    assert spliced == expected
+    assert not batch.raw_values_by_meta
+
+
 def test_batch_resolve_with_values_not_indexed(caplog, settings) -> None:
     """
     Tests that the indexer batch skips resolving tag values for indexing and
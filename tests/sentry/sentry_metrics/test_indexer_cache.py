@@ -4,7 +4,12 @@ import pytest
 from django.conf import settings
 from django.utils import timezone
 
-from sentry.sentry_metrics.indexer.cache import StringIndexerCache
+from sentry.sentry_metrics.indexer.cache import (
+    AbsentKeyFilter,
+    BloomFilter,
+    LocalIndexerCache,
+    StringIndexerCache,
+)
 from sentry.sentry_metrics.use_case_id_registry import UseCaseID
 from sentry.testutils.helpers.options import override_options
 from sentry.utils.cache import cache
@@ -240,3 +245,51 @@ def test_is_valid_timestamp() -> None:
 
     assert not indexer_cache._is_valid_timestamp(str(stale_ts))
     assert indexer_cache._is_valid_timestamp(str(new_ts))
+
+
+def test_local_cache() -> None:
+    local_cache = LocalIndexerCache(max_size=2)
+    local_cache.set_many({"spans:1:a": 1, "spans:1:b": 2})
+    assert local_cache.get_many(["spans:1:a", "spans:1:c"]) == {"spans:1:a": 1}
+
+    # "spans:1:b" is the least recently used key
+    local_cache.set_many({"spans:1:c": 3})
+    assert local_cache.get_many(["spans:1:a", "spans:1:b", "spans:1:c"]) == {
+        "spans:1:a": 1,
+        "spans:1:c": 3,
+    }
+
+    local_cache.record_lookups(hits=3, misses=1)
+    assert local_cache.hit_rate == 0.75
+
+
+def test_local_cache_expiry() -> None:
+    local_cache = LocalIndexerCache(max_size=10, ttl=0)
+    local_cache.set_many({"spans:1:a": 1})
+    assert local_cache.get_many(["spans:1:a"]) == {}
+    assert len(local_cache) == 0
+
+
+def test_bloom_filter() -> None:
+    bloom = BloomFilter(capacity=1000)
+    keys = [f"spans:1:{i}" for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+
+    assert all(key in bloom for key in keys)
+    false_positives = sum(f"spans:2:{i}" in bloom for i in range(1000))
+    assert false_positives < 50
+
+
+def test_absent_key_filter() -> None:
+    absent = AbsentKeyFilter(ttl=60, capacity=100)
+    absent.add_many(["spans:1:a", "transactions:1:b"])
+
+    assert absent.contains("spans:1:a")
+    assert absent.contains("transactions:1:b")
+    assert not absent.contains("transactions:1:a")
+
+    # filters are reset once they expire
+    expired = AbsentKeyFilter(ttl=0, capacity=100)
+    expired.add_many(["spans:1:a"])
+    assert not expired.contains("spans:1:a")
@@ -0,0 +1,118 @@
+import os
+from collections.abc import Generator
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from sentry.services.nodestore import codecs
+from sentry.services.nodestore.codecs import (
+    UnknownCodecError,
+    ZstdCompressors,
+    ZstdDictionaries,
+    decode_payload,
+    encode_payload,
+    train_dictionary,
+)
+from sentry.testutils.helpers import override_options
+from sentry.utils import json
+
+
+def _sample(i: int) -> bytes:
+    return json.dumps(
+        {
+            "platform": "python",
+            "sdk": {"name": "sentry.python", "version": "2.0.0"},
+            "contexts": {"runtime": {"name": "CPython", "version": f"3.{i % 13}"}},
+            "exception": {
+                "values": [
+                    {
+                        "type": f"Error{i}",
+                        "stacktrace": {
+                            "frames": [
+                                {"abs_path": f"/srv/app/module_{j}.py", "lineno": i + j}
+                                for j in range(10)
+                            ]
+                        },
+                    }
+                ]
+            },
+        }
+    ).encode()
+
+
+@pytest.fixture
+def dictionaries(tmp_path: Path) -> Generator[ZstdDictionaries]:
+    dictionary = train_dictionary([_sample(i) for i in range(500)], 4096)
+    (tmp_path / "python.20240101000000.zdict").write_bytes(dictionary.as_bytes())
+    rv = ZstdDictionaries(str(tmp_path))
+    with mock.patch.object(codecs, "_dictionaries", rv):
+        yield rv
+
+
+def test_json_codec_is_passthrough() -> None:
+    assert encode_payload(b'{"foo":"bar"}', platform="python") == b'{"foo":"bar"}'
+    assert decode_payload(b'{"foo":"bar"}') == b'{"foo":"bar"}'
+
+
+@override_options({"nodestore.codec": "zstd"})
+def test_zstd_roundtrip_without_dictionary(dictionaries: ZstdDictionaries) -> None:
+    value = _sample(1)
+    encoded = encode_payload(value, platform="javascript")
+    assert encoded.startswith(codecs.CODEC_HEADER)
+    assert decode_payload(encoded) == value
+
+
+@override_options({"nodestore.codec": "zstd"})
+def test_zstd_roundtrip_with_dictionary(dictionaries: ZstdDictionaries) -> None:
+    value = _sample(1000)
+    encoded = encode_payload(value, platform="python")
+    assert len(encoded) < len(encode_payload(value, platform=None))
+    assert decode_payload(encoded) == value
+
+
+@override_options({"nodestore.codec": "zstd"})
+def test_compressors_are_reused(dictionaries: ZstdDictionaries) -> None:
+    compressors = ZstdCompressors()
+    with mock.patch.object(
+        codecs.zstandard, "ZstdCompressor", wraps=codecs.zstandard.ZstdCompressor
+    ) as compressor_cls:
+        for i in range(3):
+            for platform in ("python", None):
+                value = _sample(i)
+                encoded = encode_payload(value, platform=platform, compressors=compressors)
+                assert decode_payload(encoded) == value
+
+    # One compressor with the python dictionary, one without a dictionary
+    assert compressor_cls.call_count == 2
+
+
+@override_options({"nodestore.codec": "zstd"})
+def test_newest_dictionary_is_used_for_writes(
+    dictionaries: ZstdDictionaries, tmp_path: Path
+) -> None:
+    old = encode_payload(_sample(1), platform="python")
+
+    newer = train_dictionary([_sample(i) for i in range(1, 501)], 2048)
+    (tmp_path / "python.20250101000000.zdict").write_bytes(newer.as_bytes())
+    reloaded = ZstdDictionaries(str(tmp_path))
+    with mock.patch.object(codecs, "_dictionaries", reloaded):
+        assert reloaded.for_platform("python").dict_id() == newer.dict_id()
+        # nodes written with the superseded dictionary still decode
+        assert decode_payload(old) == _sample(1)
+
+
+@override_options({"nodestore.codec": "zstd"})
+def test_missing_dictionary(dictionaries: ZstdDictionaries, tmp_path: Path) -> None:
+    encoded = encode_payload(_sample(1), platform="python")
+    for filename in os.listdir(tmp_path):
+        os.remove(tmp_path / filename)
+
+    with mock.patch.object(codecs, "_dictionaries", ZstdDictionaries(str(tmp_path))):
+        with pytest.raises(UnknownCodecError):
+            decode_payload(encoded)
+
+
+def test_unknown_codec_version() -> None:
+    with pytest.raises(UnknownCodecError):
+        decode_payload(codecs.CODEC_HEADER + b"\xff" + b"data")
@@ -6,6 +6,7 @@ Testsuite of backend-independent nodestore tests. Add your backend to the
 from collections.abc import Callable, Generator
 from contextlib import nullcontext
 from typing import ContextManager
+from unittest import mock
 
 import pytest
 
@@ -115,3 +116,45 @@ def test_set_subkeys(ns: NodeStorage) -> None:
     ns.delete("node_1")
     assert ns.get("node_1") is None
     assert ns.get("node_1", subkey="other") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.local-cache.enabled": True,
+    }
+)
+def test_local_cache(ns: NodeStorage) -> None:
+    ns.set("node_1", {"foo": "a"})
+    ns.set("node_2", {"foo": "b"})
+
+    expected = {"node_1": {"foo": "a"}, "node_2": {"foo": "b"}}
+    with mock.patch.object(ns, "_get_bytes_multi", wraps=ns._get_bytes_multi) as get_bytes_multi:
+        assert ns.get_multi(["node_1", "node_2"]) == expected
+        assert ns.get_multi(["node_1", "node_2"]) == expected
+        assert get_bytes_multi.call_count == 1
+
+    # payloads are decoded for every caller, never shared
+    assert ns.get("node_1") is not ns.get("node_1")
+
+    ns.set("node_1", {"foo": "c"})
+    assert ns.get("node_1") == {"foo": "c"}
+
+    ns.delete("node_2")
+    assert ns.get("node_2") is None
+
+
+@override_options(
+    {
+        "nodestore.set-subkeys.enable-set-cache-item": False,
+        "nodestore.codec": "zstd",
+    }
+)
+def test_zstd_codec(ns: NodeStorage) -> None:
+    ns.set_subkeys("node_1", {None: {"platform": "python"}, "other": {"foo": "b"}})
+    assert ns.get("node_1") == {"platform": "python"}
+    assert ns.get("node_1", subkey="other") == {"foo": "b"}
+
+    with override_options({"nodestore.codec": "json"}):
+        # nodes written with a codec stay readable after switching it off
+        assert ns.get_multi(["node_1"]) == {"node_1": {"platform": "python"}}
@@ -0,0 +1,113 @@
+import threading
+from unittest import mock
+
+import pytest
+
+from sentry.services.nodestore.local_cache import LocalNodeCache
+
+
+def test_get_many_and_lru_eviction() -> None:
+    cache = LocalNodeCache(max_bytes=10, ttl=60)
+    cache.set("a", b"aaaa")
+    cache.set("b", b"bbbb")
+    # touch "a" so "b" becomes the least recently used entry
+    assert cache.get("a") == b"aaaa"
+
+    cache.set("c", b"cccc")
+
+    assert cache.get_many(["a", "b", "c"]) == {"a": b"aaaa", "c": b"cccc"}
+    assert cache.size == 8
+
+
+def test_oversized_and_missing_values_are_not_cached() -> None:
+    cache = LocalNodeCache(max_bytes=4, ttl=60)
+    cache.set_many({"a": b"aaaaa", "b": None, "c": b"cc"})
+
+    assert cache.get_many(["a", "b", "c"]) == {"c": b"cc"}
+    assert cache.size == 2
+
+
+def test_expiry() -> None:
+    cache = LocalNodeCache(max_bytes=100, ttl=5)
+    with mock.patch("sentry.services.nodestore.local_cache.time.monotonic", return_value=100):
+        cache.set("a", b"aaaa")
+    with mock.patch("sentry.services.nodestore.local_cache.time.monotonic", return_value=106):
+        assert cache.get("a") is None
+    assert cache.size == 0
+
+
+def test_configure_shrinks() -> None:
+    cache = LocalNodeCache(max_bytes=100, ttl=60)
+    cache.set_many({"a": b"aaaa", "b": b"bbbb"})
+
+    cache.configure(max_bytes=4, ttl=60)
+
+    assert len(cache) == 1
+    assert cache.get("b") == b"bbbb"
+
+
+def test_fetch_many_loads_only_misses() -> None:
+    cache = LocalNodeCache(max_bytes=100, ttl=60)
+    cache.set("a", b"aaaa")
+    loader = mock.Mock(return_value={"b": b"bbbb", "c": None})
+
+    assert cache.fetch_many(["a", "b", "c"], loader) == {"a": b"aaaa", "b": b"bbbb", "c": None}
+    loader.assert_called_once_with(["b", "c"])
+
+    loader.reset_mock(return_value=True)
+    loader.return_value = {"c": None}
+    cache.fetch_many(["a", "b", "c"], loader)
+    loader.assert_called_once_with(["c"])
+
+
+def test_fetch_many_loader_failure() -> None:
+    cache = LocalNodeCache(max_bytes=100, ttl=60)
+
+    with pytest.raises(ValueError):
+        cache.fetch_many(["a"], mock.Mock(side_effect=ValueError))
+
+    assert cache.fetch_many(["a"], lambda ids: {"a": b"aaaa"}) == {"a": b"aaaa"}
+
+
+def test_fetch_many_coalesces_concurrent_loads() -> None:
+    cache = LocalNodeCache(max_bytes=100, ttl=60)
+    loading = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_loader(ids: list[str]) -> dict[str, bytes | None]:
+        calls.append(ids)
+        loading.set()
+        release.wait()
+        return {id: id.encode() * 2 for id in ids}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(cache.fetch_many(["a"], slow_loader)))
+    leader.start()
+    loading.wait()
+
+    follower = threading.Thread(
+        target=lambda: results.append(cache.fetch_many(["a", "b"], slow_loader))
+    )
+    follower.start()
+    # the follower loads "b" itself but waits on the leader for "a"
+    while len(calls) < 2:
+        pass
+    release.set()
+    leader.join()
+    follower.join()
+
+    assert sorted(calls) == [["a"], ["b"]]
+    assert {"a": b"aa"} in results
+    assert {"a": b"aa", "b": b"bb"} in results
+
+
+def test_write_during_load_is_not_cached() -> None:
+    cache = LocalNodeCache(max_bytes=100, ttl=60)
+
+    def loader(ids: list[str]) -> dict[str, bytes | None]:
+        cache.delete("a")
+        return {"a": b"old"}
+
+    assert cache.fetch_many(["a"], loader) == {"a": b"old"}
+    assert cache.get("a") is None
@@ -9,7 +9,7 @@ from arroyo.processing.strategies.noop import Noop
 from django.test import override_settings
 
 from sentry.conf.types.kafka_definition import Topic
-from sentry.spans.buffer import Span, SpansBuffer
+from sentry.spans.buffer import OutputSpan, Span, SpansBuffer
 from sentry.spans.consumers.process.flusher import MultiProducer, SpanFlusher
 from sentry.testutils.helpers.options import override_options
 from tests.sentry.spans.test_buffer import DEFAULT_OPTIONS
@@ -188,3 +188,23 @@ def test_flusher_waits_for_processes_to_start() -> None:
             next_step=Noop(),
             produce_to_pipe=lambda _: None,
         )
+
+
+def test_encode_segment_stream() -> None:
+    chunks = [
+        [OutputSpan(payload={"span_id": "a" * 16}), OutputSpan(payload={"span_id": "b" * 16})],
+        [OutputSpan(payload={"span_id": "c" * 16, "is_segment": True})],
+    ]
+    stream = mock.MagicMock()
+    stream.__iter__.return_value = iter(chunks)
+
+    kafka_payload = SpanFlusher._encode_segment_stream(stream)
+
+    assert kafka_payload is not None
+    assert kafka_payload.value == orjson.dumps(
+        {"spans": [span.payload for chunk in chunks for span in chunk]}
+    )
+
+    empty_stream = mock.MagicMock()
+    empty_stream.__iter__.return_value = iter([])
+    assert SpanFlusher._encode_segment_stream(empty_stream) is None
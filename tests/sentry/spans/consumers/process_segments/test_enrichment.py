@@ -2,7 +2,11 @@ from typing import cast
 
 from sentry_kafka_schemas.schema_types.ingest_spans_v1 import SpanEvent
 
-from sentry.spans.consumers.process_segments.enrichment import TreeEnricher, compute_breakdowns
+from sentry.spans.consumers.process_segments.enrichment import (
+    SegmentTimings,
+    TreeEnricher,
+    compute_breakdowns,
+)
 from sentry.spans.consumers.process_segments.shim import make_compatible
 from sentry.spans.consumers.process_segments.types import CompatibleSpan, attribute_value
 from tests.sentry.spans.consumers.process import build_mock_span
@@ -399,6 +403,128 @@ def test_emit_ops_breakdown() -> None:
     # assert updates["span_ops_2.total.time"]["value"] == 14400000.01
 
 
+def test_ops_breakdown_nested_spans() -> None:
+    spans = [
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1577836800.0,
+            end_timestamp=1577836810.0,
+            span_id="aaaaaaaaaaaaaaaa",
+            span_op="db",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1577836802.0,
+            end_timestamp=1577836803.0,
+            span_id="bbbbbbbbbbbbbbbb",
+            span_op="db",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1577836804.0,
+            end_timestamp=1577836806.0,
+            span_id="cccccccccccccccc",
+            span_op="db.redis",
+        ),
+    ]
+
+    breakdowns_config = {"span_ops": {"type": "spanOperations", "matches": ["db"]}}
+    updates = compute_breakdowns(spans, breakdowns_config)
+
+    # Spans nested within the first span must not be counted again.
+    assert updates["span_ops.ops.db"]["value"] == 10000.0
+
+
+def test_segment_timings() -> None:
+    spans = [
+        build_mock_span(
+            project_id=1,
+            is_segment=True,
+            start_timestamp=1609455600.0,
+            end_timestamp=1609455605.0,
+            span_id="aaaaaaaaaaaaaaaa",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1609455601.0,
+            end_timestamp=1609455604.0,
+            span_id="bbbbbbbbbbbbbbbb",
+            parent_span_id="aaaaaaaaaaaaaaaa",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1609455602.0,
+            end_timestamp=1609455603.0,
+            span_id="cccccccccccccccc",
+            parent_span_id="bbbbbbbbbbbbbbbb",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1609455602.0,
+            end_timestamp=1609455603.0,
+            span_id="dddddddddddddddd",
+            parent_span_id="ffffffffffffffff",
+        ),
+    ]
+
+    timings = SegmentTimings(spans)
+
+    assert len(timings) == 4
+    assert list(timings.parents) == [-1, 0, 1, -1]
+    assert list(timings.iter_ancestors(2)) == [1, 0]
+    assert list(timings.exclusive_times_us()) == [2_000_000, 2_000_000, 1_000_000, 1_000_000]
+
+
+def test_exclusive_time_duplicate_span_ids() -> None:
+    # Children of a span ID count against every span with that ID, and each
+    # of them is measured against its own interval.
+    spans = [
+        build_mock_span(
+            project_id=1,
+            is_segment=True,
+            start_timestamp=1609455600.0,
+            end_timestamp=1609455605.0,
+            span_id="aaaaaaaaaaaaaaaa",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1609455601.0,
+            end_timestamp=1609455604.0,
+            span_id="bbbbbbbbbbbbbbbb",
+            parent_span_id="aaaaaaaaaaaaaaaa",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1609455601.0,
+            end_timestamp=1609455602.0,
+            span_id="bbbbbbbbbbbbbbbb",
+            parent_span_id="aaaaaaaaaaaaaaaa",
+        ),
+        build_mock_span(
+            project_id=1,
+            start_timestamp=1609455602.0,
+            end_timestamp=1609455603.0,
+            span_id="cccccccccccccccc",
+            parent_span_id="bbbbbbbbbbbbbbbb",
+        ),
+    ]
+
+    assert list(SegmentTimings(spans).exclusive_times_us()) == [
+        2_000_000,
+        2_000_000,
+        1_000_000,
+        1_000_000,
+    ]
+
+    _, enriched_spans = TreeEnricher.enrich_spans(spans)
+    assert [attribute_value(span, "sentry.exclusive_time_ms") for span in enriched_spans] == [
+        2000.0,
+        2000.0,
+        1000.0,
+        1000.0,
+    ]
+
+
 def test_write_tags_for_performance_issue_detection():
     segment_span = _mock_performance_issue_span(
         is_segment=True,
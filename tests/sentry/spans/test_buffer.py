@@ -8,7 +8,14 @@ import orjson
 import pytest
 from sentry_redis_tools.clients import StrictRedis
 
-from sentry.spans.buffer import FlushedSegment, OutputSpan, SegmentKey, Span, SpansBuffer
+from sentry.spans.buffer import (
+    AdaptiveBatchSize,
+    FlushedSegment,
+    OutputSpan,
+    SegmentKey,
+    Span,
+    SpansBuffer,
+)
 from sentry.testutils.helpers.options import override_options
 
 DEFAULT_OPTIONS = {
@@ -21,8 +28,13 @@ DEFAULT_OPTIONS = {
     "spans.buffer.max-memory-percentage": 1.0,
     "spans.buffer.flusher.backpressure-seconds": 10,
     "spans.buffer.flusher.max-unhealthy-seconds": 60,
+    "spans.buffer.flusher.streaming": False,
+    "spans.buffer.flusher.stream-prefetch-segments": 50,
     "spans.buffer.compression.level": 0,
     "spans.buffer.pipeline-batch-size": 0,
+    "spans.buffer.pipeline-target-latency-ms": 0,
+    "spans.buffer.batch-subsegments": False,
+    "spans.buffer.compression.threads": 0,
     "spans.buffer.evalsha-latency-threshold": 100,
     "spans.buffer.debug-traces": [],
 }
@@ -707,6 +719,164 @@ def test_compression_functionality(compression_level) -> None:
         assert_clean(buffer.client)
 
 
+def test_batched_subsegments(buffer: SpansBuffer) -> None:
+    spans = [
+        Span(
+            payload=_payload(span_id * 16),
+            trace_id=trace_id * 32,
+            span_id=span_id * 16,
+            parent_span_id=parent_span_id * 16 if parent_span_id else None,
+            segment_id=None,
+            project_id=1,
+            is_segment_span=parent_span_id is None,
+            end_timestamp=1700000000.0,
+        )
+        for trace_id, span_id, parent_span_id in [
+            ("a", "c", "b"),
+            ("a", "e", "f"),
+            ("a", "d", "b"),
+            ("b", "1", "2"),
+            ("a", "b", None),
+        ]
+    ]
+
+    with override_options(
+        {
+            "spans.buffer.batch-subsegments": True,
+            "spans.buffer.compression.threads": 2,
+            "spans.buffer.pipeline-batch-size": 1,
+            "spans.buffer.pipeline-target-latency-ms": 1000,
+        }
+    ):
+        buffer.process_spans(spans, now=0)
+
+    assert_ttls(buffer.client)
+
+    rv = buffer.flush_segments(now=61)
+    _normalize_output(rv)
+    assert rv == {
+        _segment_id(1, "a" * 32, "b" * 16): FlushedSegment(
+            queue_key=mock.ANY,
+            spans=[
+                _output_segment(b"b" * 16, b"b" * 16, True),
+                _output_segment(b"c" * 16, b"b" * 16, False),
+                _output_segment(b"d" * 16, b"b" * 16, False),
+            ],
+        ),
+        _segment_id(1, "a" * 32, "f" * 16): FlushedSegment(
+            queue_key=mock.ANY,
+            spans=[_output_segment(b"e" * 16, b"f" * 16, False)],
+        ),
+        _segment_id(1, "b" * 32, "2" * 16): FlushedSegment(
+            queue_key=mock.ANY,
+            spans=[_output_segment(b"1" * 16, b"2" * 16, False)],
+        ),
+    }
+
+    buffer.done_flush_segments(rv)
+    assert_clean(buffer.client)
+
+
+def test_parallel_compression(buffer: SpansBuffer) -> None:
+    spans = [
+        Span(
+            payload=_payload(span_id * 16),
+            trace_id=trace_id * 32,
+            span_id=span_id * 16,
+            parent_span_id=parent_span_id * 16 if parent_span_id else None,
+            segment_id=None,
+            project_id=1,
+            is_segment_span=parent_span_id is None,
+            end_timestamp=1700000000.0,
+        )
+        for trace_id, span_id, parent_span_id in [
+            ("a", "c", "b"),
+            ("b", "e", "d"),
+            ("a", "b", None),
+            ("b", "d", None),
+        ]
+    ]
+
+    with override_options(
+        {"spans.buffer.compression.level": 3, "spans.buffer.compression.threads": 2}
+    ):
+        buffer.process_spans(spans, now=0)
+        pool = buffer._compression_pool
+        assert pool is not None
+
+    # Every stored payload was compressed on the pool.
+    segment_keys = [_segment_id(1, "a" * 32, "b" * 16), _segment_id(1, "b" * 32, "d" * 16)]
+    stored = [member for key in segment_keys for member, _ in buffer.client.zscan_iter(key)]
+    assert stored
+    assert all(member.startswith(b"\x28\xb5\x2f\xfd") for member in stored)
+
+    rv = buffer.flush_segments(now=61)
+    _normalize_output(rv)
+    assert rv == {
+        segment_keys[0]: FlushedSegment(
+            queue_key=mock.ANY,
+            spans=[
+                _output_segment(b"b" * 16, b"b" * 16, True),
+                _output_segment(b"c" * 16, b"b" * 16, False),
+            ],
+        ),
+        segment_keys[1]: FlushedSegment(
+            queue_key=mock.ANY,
+            spans=[
+                _output_segment(b"d" * 16, b"d" * 16, True),
+                _output_segment(b"e" * 16, b"d" * 16, False),
+            ],
+        ),
+    }
+    buffer.done_flush_segments(rv)
+    assert_clean(buffer.client)
+
+    # Changing the number of threads replaces the pool.
+    with override_options(
+        {"spans.buffer.compression.level": 3, "spans.buffer.compression.threads": 3}
+    ):
+        buffer.process_spans(spans, now=0)
+    assert pool._shutdown
+    assert buffer._compression_pool is not pool
+
+    pool = buffer._compression_pool
+    buffer.close()
+    assert pool._shutdown
+    assert buffer._compression_pool is None
+
+
+def test_adaptive_batch_size() -> None:
+    batch_size = AdaptiveBatchSize()
+
+    with override_options(
+        {
+            "spans.buffer.pipeline-batch-size": 100,
+            "spans.buffer.pipeline-target-latency-ms": 0,
+        }
+    ):
+        assert batch_size.get() == 100
+        batch_size.observe(100, 1000.0)
+        assert batch_size.get() == 100
+
+    with override_options(
+        {
+            "spans.buffer.pipeline-batch-size": 100,
+            "spans.buffer.pipeline-target-latency-ms": 50,
+        }
+    ):
+        assert batch_size.get() == 100
+        batch_size.observe(100, 80.0)
+        assert batch_size.get() == 50
+        # a short batch is judged by its latency per script call
+        batch_size.observe(10, 20.0)
+        assert batch_size.get() == 25
+        batch_size.observe(25, 10.0)
+        assert batch_size.get() == 35
+        for _ in range(10):
+            batch_size.observe(1, 0.1)
+        assert batch_size.get() == 100
+
+
 @mock.patch("sentry.spans.buffer.Project")
 def test_max_segment_spans_limit(mock_project_model, buffer: SpansBuffer) -> None:
     # Mock the project lookup to avoid database access
@@ -915,6 +1085,151 @@ def test_dropped_spans_emit_outcomes(
     assert ingested_bytes_timing_calls[0].args[1] == expected_bytes
 
 
+def test_stream_segments(buffer: SpansBuffer) -> None:
+    spans = [
+        Span(
+            payload=_payload(span_id * 16),
+            trace_id="a" * 32,
+            span_id=span_id * 16,
+            parent_span_id=None if span_id == "a" else "a" * 16,
+            segment_id=None,
+            project_id=1,
+            is_segment_span=span_id == "a",
+            end_timestamp=1700000000.0,
+        )
+        for span_id in "abcde"
+    ]
+
+    process_spans(
+        [span_or_split for span in spans for span_or_split in [span, _SplitBatch()]],
+        buffer,
+        now=0,
+    )
+    assert buffer.stream_segments(now=5) == []
+
+    streams = buffer.stream_segments(now=11)
+    assert len(streams) == 1
+    stream = streams[0]
+    assert stream.segment_key == _segment_id(1, "a" * 32, "a" * 16)
+
+    chunks = list(stream)
+    output_spans = sorted(
+        (span for chunk in chunks for span in chunk), key=lambda span: span.payload["span_id"]
+    )
+    assert output_spans == [
+        _output_segment(span_id.encode() * 16, b"a" * 16, span_id == "a") for span_id in "abcde"
+    ]
+    assert stream.num_spans == 5
+    assert stream.has_root_span
+    assert not stream.truncated
+
+    buffer.done_flush_segment_streams(streams)
+    assert buffer.stream_segments(now=30) == []
+    assert_clean(buffer.client)
+
+
+@mock.patch("sentry.spans.buffer.Project")
+@mock.patch("sentry.spans.buffer.track_outcome")
+def test_stream_segments_truncates(
+    mock_track_outcome, mock_project_model, buffer: SpansBuffer
+) -> None:
+    mock_project = mock.Mock()
+    mock_project.id = 1
+    mock_project.organization_id = 100
+    mock_project_model.objects.get_from_cache.return_value = mock_project
+
+    spans = [
+        Span(
+            payload=_payload(span_id * 16),
+            trace_id="a" * 32,
+            span_id=span_id * 16,
+            parent_span_id=None if span_id == "a" else "a" * 16,
+            segment_id=None,
+            project_id=1,
+            is_segment_span=span_id == "a",
+            end_timestamp=1700000000.0,
+        )
+        for span_id in "abcde"
+    ]
+    process_spans(spans, buffer, now=0)
+
+    # room for exactly two payloads
+    max_segment_bytes = 2 * len(_payload("a" * 16))
+    with override_options({"spans.buffer.max-segment-bytes": max_segment_bytes}):
+        streams = buffer.stream_segments(now=11)
+        (stream,) = streams
+        output_spans = [span for chunk in stream for span in chunk]
+
+    assert len(output_spans) == 2
+    assert stream.truncated
+    assert stream.num_bytes == max_segment_bytes
+
+    buffer.done_flush_segment_streams(streams)
+
+    assert mock_track_outcome.call_count == 1
+    assert mock_track_outcome.call_args.kwargs["reason"] == "segment_too_large"
+    assert mock_track_outcome.call_args.kwargs["quantity"] == 3
+
+    # NB: As with limited segments, redirect keys of truncated spans are
+    # leaked until they expire.
+
+
+def _root_spans(trace_ids: str) -> list[Span]:
+    return [
+        Span(
+            payload=_payload(trace_id * 16),
+            trace_id=trace_id * 32,
+            span_id=trace_id * 16,
+            parent_span_id=None,
+            segment_id=None,
+            project_id=1,
+            is_segment_span=True,
+            end_timestamp=1700000000.0,
+        )
+        for trace_id in trace_ids
+    ]
+
+
+def test_stream_segments_prefetches_pages(buffer: SpansBuffer) -> None:
+    process_spans(_root_spans("abc"), buffer, now=0)
+
+    with (
+        override_options({"spans.buffer.flusher.stream-prefetch-segments": 2}),
+        mock.patch.object(buffer.client, "pipeline", wraps=buffer.client.pipeline) as pipeline,
+    ):
+        streams = buffer.stream_segments(now=11)
+        pipeline.reset_mock()
+        output_spans = [span for stream in streams for chunk in stream for span in chunk]
+
+    # The first pages of two segments are fetched in the first round trip,
+    # the last segment in the second one.
+    assert pipeline.call_count == 2
+    assert sorted(span.payload["span_id"] for span in output_spans) == [
+        trace_id * 16 for trace_id in "abc"
+    ]
+    assert [stream.num_spans for stream in streams] == [1, 1, 1]
+
+    buffer.done_flush_segment_streams(streams)
+    assert_clean(buffer.client)
+
+
+def test_stream_segments_backpressure(buffer: SpansBuffer) -> None:
+    # The traces land in three different shards.
+    process_spans(_root_spans("abc"), buffer, now=0)
+
+    # Two segments may be flushed per shard, and no shard has that many.
+    with override_options({"spans.buffer.max-flush-segments": 64}):
+        streams = buffer.stream_segments(now=11)
+    assert len(streams) == 3
+    assert not buffer.any_shard_at_limit
+
+    # A single segment per shard, and the shards are at their limit.
+    with override_options({"spans.buffer.max-flush-segments": 32}):
+        streams = buffer.stream_segments(now=11)
+    assert len(streams) == 3
+    assert buffer.any_shard_at_limit
+
+
 def test_kafka_slice_id(buffer: SpansBuffer) -> None:
     with override_options(DEFAULT_OPTIONS):
         buffer = SpansBuffer(assigned_shards=list(range(1)), slice_id=2)
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import abc
+import threading
 import time
 import uuid
 from datetime import datetime, timedelta
@@ -55,11 +56,21 @@ from sentry.silo.base import SiloMode
 from sentry.silo.safety import unguarded_write
 from sentry.tasks.merge import merge_groups
 from sentry.tasks.post_process import (
+    GROUP_CATEGORY_POST_PROCESS_PIPELINE,
     HIGHER_ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT,
     ISSUE_OWNERS_PER_PROJECT_PER_MIN_RATELIMIT,
+    POST_PROCESS_STEP_DEPENDENCIES,
+    PostProcessJob,
+    PostProcessStepDependencies,
+    _run_pipeline_concurrently,
     feedback_filter_decorator,
+    get_pipeline_step_dependencies,
     locks,
     post_process_group,
+    process_commits,
+    process_rules,
+    process_service_hooks,
+    process_snoozes,
     run_post_process_job,
 )
 from sentry.testutils.cases import BaseTestCase, PerformanceIssueTestCase, SnubaTestCase, TestCase
@@ -4271,3 +4282,82 @@ class ProcessDataForwardingTest(BasePostProcessGroupMixin, SnubaTestCase):
 
         # should not be called when feature flag is disabled
         assert mock_forward.call_count == 0
+
+
+class PostProcessPipelineTest(TestCase):
+    def test_step_dependencies(self) -> None:
+        pipeline = GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.ERROR]
+        dependencies = dict(zip(pipeline, get_pipeline_step_dependencies(tuple(pipeline))))
+
+        assert dependencies[process_commits] == frozenset()
+        assert pipeline.index(process_snoozes) in dependencies[process_rules]
+        assert dependencies[process_service_hooks] == {pipeline.index(process_rules)}
+
+        undeclared = Mock(__name__="undeclared")
+        dependencies_with_undeclared = get_pipeline_step_dependencies(
+            (process_commits, undeclared, process_service_hooks)
+        )
+        assert dependencies_with_undeclared == [frozenset(), {0}, {1}]
+
+        feedback_pipeline = GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.FEEDBACK]
+        assert get_pipeline_step_dependencies(tuple(feedback_pipeline))[0] == frozenset()
+
+    def test_run_pipeline_concurrently(self) -> None:
+        calls = []
+        first_started = threading.Event()
+
+        def first(job: PostProcessJob) -> None:
+            first_started.set()
+            calls.append("first")
+
+        def independent(job: PostProcessJob) -> None:
+            # Only finishes if it runs alongside `first`
+            assert first_started.wait(timeout=5)
+            calls.append("independent")
+            raise Exception("failing steps don't stop the pipeline")
+
+        def dependent(job: PostProcessJob) -> None:
+            assert job["has_alert"] is True
+            calls.append("dependent")
+
+        def writer(job: PostProcessJob) -> None:
+            job["has_alert"] = True
+            calls.append("writer")
+
+        with patch.dict(
+            POST_PROCESS_STEP_DEPENDENCIES,
+            {
+                first: PostProcessStepDependencies(),
+                independent: PostProcessStepDependencies(),
+                writer: PostProcessStepDependencies(writes=frozenset(["has_alert"])),
+                dependent: PostProcessStepDependencies(reads=frozenset(["has_alert"])),
+            },
+        ):
+            job: PostProcessJob = {"event": Mock(), "is_reprocessed": False, "has_alert": False}
+            _run_pipeline_concurrently(job, [independent, writer, first, dependent], None, 4)
+
+        assert sorted(calls) == ["dependent", "first", "independent", "writer"]
+        assert calls.index("writer") < calls.index("dependent")
+
+    @override_options({"post_process.pipeline.max-concurrent-steps": 4})
+    @patch("sentry.tasks.post_process._run_pipeline_concurrently")
+    def test_run_post_process_job_concurrently(self, mock_run_concurrently: MagicMock) -> None:
+        event = self.create_event(data={"message": "oh no"}, project_id=self.project.id)
+        job: PostProcessJob = {
+            "event": event.for_group(event.group),
+            "group_state": {
+                "id": event.group.id,
+                "is_new": False,
+                "is_regression": False,
+                "is_new_group_environment": False,
+            },
+            "is_reprocessed": False,
+            "has_reappeared": False,
+            "has_alert": False,
+            "has_escalated": False,
+        }
+        run_post_process_job(job)
+
+        mock_run_concurrently.assert_called_once_with(
+            job, GROUP_CATEGORY_POST_PROCESS_PIPELINE[GroupCategory.ERROR], "error", 4
+        )
@@ -16,6 +16,7 @@ from sentry.tasks.relay import (
     schedule_build_project_config,
     schedule_invalidate_project_config,
 )
+from sentry.testutils.factories import Factories
 from sentry.testutils.helpers.options import override_options
 from sentry.testutils.helpers.task_runner import BurstTaskRunner
 from sentry.testutils.hybrid_cloud import simulated_transaction_watermarks
@@ -454,6 +455,35 @@ class TestInvalidationTask:
             assert new_cfg is not None
             assert new_cfg != cfg
 
+    @override_options({"relay.project-config.bulk-org-compute": True})
+    def test_invalidate_org_bulk(
+        self,
+        default_project,
+        default_organization,
+        default_projectkey,
+        redis_cache,
+        task_runner,
+        django_cache,
+    ):
+        uncached_project = Factories.create_project(organization=default_organization)
+        cfg = {"dummy-key": "val"}
+        redis_cache.set_many({default_projectkey.public_key: cfg})
+
+        with task_runner():
+            schedule_invalidate_project_config(
+                organization_id=default_organization.id, trigger="test"
+            )
+
+        new_cfg = redis_cache.get(default_projectkey.public_key)
+        assert new_cfg is not None
+        assert new_cfg["disabled"] is False
+        assert new_cfg["projectId"] == default_project.id
+        assert new_cfg["publicKeys"][0]["publicKey"] == default_projectkey.public_key
+
+        # Configs which were not cached are not computed.
+        for cache_key in _cache_keys_for_project(uncached_project):
+            assert redis_cache.get(cache_key) is None
+
     @mock.patch(
         "sentry.tasks.relay._schedule_invalidate_project_config",
         wraps=_schedule_invalidate_project_config,
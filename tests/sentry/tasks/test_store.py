@@ -8,10 +8,13 @@ from sentry.event_manager import EventManager
 from sentry.exceptions import HashDiscarded
 from sentry.plugins.base.v2 import Plugin2
 from sentry.tasks.store import (
+    batch_save_events,
+    defer_until_submitted,
     is_process_disabled,
     preprocess_event,
     process_event,
     save_event,
+    save_event_batch,
     save_event_transaction,
 )
 from sentry.testutils.pytest.fixtures import django_db_all
@@ -395,3 +398,90 @@ def test_store_consumer_type(
     mock_transaction_processing_store.get.assert_called_once_with("tx:3")
     mock_transaction_processing_store.delete_by_key.assert_called_once_with("tx:3")
     mock_transaction_processing_store.store.assert_not_called()
+
+
+@pytest.fixture
+def mock_save_event_batch():
+    with mock.patch("sentry.tasks.store.save_event_batch") as m:
+        yield m
+
+
+@django_db_all
+def test_batch_save_events(
+    default_project, mock_process_event, mock_save_event, mock_save_event_batch, register_plugin
+):
+    register_plugin(globals(), BasicPreprocessorPlugin)
+    accepted = []
+
+    with batch_save_events(max_size=2):
+        for i in range(3):
+            data = {
+                "project": default_project.id,
+                "platform": "NOTMATTLANG",
+                "logentry": {"formatted": "test"},
+                "event_id": f"{i:032x}",
+            }
+            preprocess_event(cache_key=f"e:{i}", data=data, start_time=1)
+            defer_until_submitted(lambda: accepted.append(mock_save_event_batch.delay.call_count))
+
+        # without a cache key the event can not be batched
+        preprocess_event(cache_key="", data={**data, "event_id": EVENT_ID}, start_time=1)
+
+        assert mock_save_event_batch.delay.call_count == 0
+        assert accepted == []
+
+    assert mock_save_event.delay.call_count == 1
+    assert mock_save_event_batch.delay.call_args_list == [
+        mock.call(
+            project_id=default_project.id,
+            events=[
+                {"cache_key": f"e:{i}", "event_id": f"{i:032x}", "start_time": 1}
+                for i in range(2)
+            ],
+        ),
+        mock.call(
+            project_id=default_project.id,
+            events=[{"cache_key": "e:2", "event_id": f"{2:032x}", "start_time": 1}],
+        ),
+    ]
+    # deduplication markers are only set once all tasks were submitted
+    assert accepted == [2, 2, 2]
+
+
+@django_db_all
+def test_save_event_batch_requeues_after_failure(default_project, mock_save_event_batch):
+    events = [
+        {"cache_key": f"e:{i}", "event_id": f"{i:032x}", "start_time": None} for i in range(3)
+    ]
+
+    with (
+        mock.patch(
+            "sentry.tasks.store._do_save_event", side_effect=[None, ValueError, None]
+        ) as do_save,
+        pytest.raises(ValueError),
+    ):
+        save_event_batch(project_id=default_project.id, events=events)
+
+    # the failure is surfaced, and the events after it are saved by a new task
+    assert [c.kwargs["cache_key"] for c in do_save.call_args_list] == ["e:0", "e:1"]
+    mock_save_event_batch.delay.assert_called_once_with(
+        project_id=default_project.id, events=events[2:]
+    )
+
+
+@django_db_all
+def test_save_event_batch_requeues_after_time_budget(default_project, mock_save_event_batch):
+    events = [
+        {"cache_key": f"e:{i}", "event_id": f"{i:032x}", "start_time": None} for i in range(3)
+    ]
+
+    with (
+        mock.patch("sentry.tasks.store._do_save_event") as do_save,
+        mock.patch("sentry.tasks.store.time", side_effect=[0, 200]),
+    ):
+        save_event_batch(project_id=default_project.id, events=events)
+
+    assert [c.kwargs["cache_key"] for c in do_save.call_args_list] == ["e:0"]
+    mock_save_event_batch.delay.assert_called_once_with(
+        project_id=default_project.id, events=events[1:]
+    )
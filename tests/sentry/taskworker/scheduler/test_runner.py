@@ -7,7 +7,7 @@ from django.utils import timezone
 from sentry.conf.types.taskworker import crontab
 from sentry.silo.base import SiloMode
 from sentry.taskworker.app import TaskworkerApp
-from sentry.taskworker.scheduler.runner import RunStorage, ScheduleRunner
+from sentry.taskworker.scheduler.runner import RunStorage, ScheduleRunner, ScheduleSharding
 from sentry.testutils.helpers.datetime import freeze_time
 from sentry.testutils.thread_leaks.pytest import thread_leak_allowlist
 from sentry.utils.redis import redis_clusters
@@ -57,6 +57,77 @@ def test_runstorage_double_set(run_storage: RunStorage) -> None:
         assert second is False, "writing a key that exists should fail"
 
 
+def test_runstorage_set_many(run_storage: RunStorage) -> None:
+    with freeze_time("2025-07-19 14:25:00"):
+        now = timezone.now()
+        assert run_storage.set("test:do_stuff", now + timedelta(minutes=5))
+
+        result = run_storage.set_many(
+            {
+                "test:do_stuff": now + timedelta(minutes=5),
+                "test:other_stuff": now + timedelta(minutes=5),
+            }
+        )
+        assert result == {"test:do_stuff": False, "test:other_stuff": True}
+        assert run_storage.read("test:other_stuff") == now
+
+
+def test_schedule_sharding_partitions(run_storage: RunStorage) -> None:
+    redis = redis_clusters.get("default")
+    first = ScheduleSharding(redis, runner_id="first", partition_count=8)
+    assert first.owned_partitions() == frozenset(range(8))
+
+    # A second runner takes over the partitions assigned to it once the
+    # first runner hands them over on its next refresh.
+    second = ScheduleSharding(redis, runner_id="second", partition_count=8)
+    second_owned = second.owned_partitions()
+    assert not second_owned
+
+    first._next_refresh = 0
+    first_owned = first.owned_partitions()
+    second._next_refresh = 0
+    second_owned = second.owned_partitions()
+    assert first_owned | second_owned == frozenset(range(8))
+    assert not first_owned & second_owned
+    assert second_owned
+
+    # Leases of a runner that shuts down are picked up by the others.
+    second.release()
+    first._next_refresh = 0
+    assert first.owned_partitions() == frozenset(range(8))
+
+
+@pytest.mark.django_db
+def test_schedulerunner_tick_sharded(task_app: TaskworkerApp, run_storage: RunStorage) -> None:
+    run_storage = Mock(spec=RunStorage)
+    sharding = ScheduleSharding(redis_clusters.get("default"), runner_id="a", partition_count=1)
+    schedule_set = ScheduleRunner(app=task_app, run_storage=run_storage, sharding=sharding)
+    schedule_set.add("valid", {"task": "test:valid", "schedule": timedelta(minutes=5)})
+    schedule_set.add("second", {"task": "test:second", "schedule": timedelta(minutes=10)})
+
+    run_storage.read_many.return_value = {
+        "test:valid": datetime(2025, 1, 24, 14, 19, 55, tzinfo=UTC),
+        "test:second": None,
+    }
+    run_storage.set_many.return_value = {"test:valid": True, "test:second": False}
+
+    namespace = task_app.taskregistry.get("test")
+    with freeze_time("2025-01-24 14:25:00"), patch.object(namespace, "send_task") as mock_send:
+        sleep_time = schedule_set.tick()
+        # Limited by the partition lease refresh
+        assert 0 < sleep_time <= sharding.refresh_interval
+        # second was spawned by another scheduler
+        assert extract_sent_tasks(mock_send) == ["valid"]
+
+    run_storage.set_many.assert_called_once_with(
+        {
+            "test:valid": datetime(2025, 1, 24, 14, 30, 0, tzinfo=UTC),
+            "test:second": datetime(2025, 1, 24, 14, 35, 0, tzinfo=UTC),
+        }
+    )
+    assert run_storage.set.call_count == 0
+
+
 @pytest.mark.django_db
 def test_schedulerunner_add_invalid(task_app) -> None:
     run_storage = Mock(spec=RunStorage)
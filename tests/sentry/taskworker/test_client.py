@@ -67,6 +67,12 @@ class MockServiceMethod:
             return res.response(*args, **kwargs)
         return res.response
 
+    def future(self, *args, **kwargs):
+        try:
+            return MockFuture(self(*args, **kwargs))
+        except grpc.RpcError as err:
+            return err
+
     def with_call(self, *args, **kwargs):
         res = self.responses[0]
         if res.metadata:
@@ -76,6 +82,14 @@ class MockServiceMethod:
         return (res.response, None)
 
 
+class MockFuture:
+    def __init__(self, response: Any):
+        self._response = response
+
+    def result(self):
+        return self._response
+
+
 class MockChannel:
     def __init__(self):
         self._responses = defaultdict(list)
@@ -344,6 +358,82 @@ def test_get_task_failure() -> None:
             client.get_task()
 
 
+def test_get_tasks_ok() -> None:
+    def get_task_response(request: GetTaskRequest) -> GetTaskResponse:
+        return GetTaskResponse(
+            task=TaskActivation(
+                id="".join(random.choices(string.ascii_letters, k=8)),
+                namespace="testing",
+                taskname="do_thing",
+                parameters="",
+                headers={},
+                processing_deadline_duration=10,
+            )
+        )
+
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        get_task_response,
+    )
+
+    with patch("sentry.taskworker.client.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient(["localhost-0:50051"], application="sentry")
+        result = client.get_tasks(count=3)
+
+        assert len(result) == 3
+        assert len({task.activation.id for task in result}) == 3
+        assert all(task.host == "localhost-0:50051" for task in result)
+
+
+def test_get_tasks_partial() -> None:
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        GetTaskResponse(
+            task=TaskActivation(
+                id="abc123",
+                namespace="testing",
+                taskname="do_thing",
+                parameters="",
+                headers={},
+                processing_deadline_duration=10,
+            )
+        ),
+    )
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.NOT_FOUND, "no pending task found"),
+    )
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.INTERNAL, "something bad"),
+    )
+
+    with patch("sentry.taskworker.client.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient(["localhost-0:50051"], application="sentry")
+        result = client.get_tasks(count=3)
+
+        # Fetched tasks are returned even though some of the calls failed
+        assert [task.activation.id for task in result] == ["abc123"]
+
+
+def test_get_tasks_failure() -> None:
+    channel = MockChannel()
+    channel.add_response(
+        "/sentry_protos.taskbroker.v1.ConsumerService/GetTask",
+        MockGrpcError(grpc.StatusCode.INTERNAL, "something bad"),
+    )
+
+    with patch("sentry.taskworker.client.client.grpc.insecure_channel") as mock_channel:
+        mock_channel.return_value = channel
+        client = TaskworkerClient(["localhost-0:50051"], application="sentry")
+        with pytest.raises(grpc.RpcError):
+            client.get_tasks(count=2)
+
+
 @django_db_all
 def test_update_task_writes_to_health_check_file() -> None:
     channel = MockChannel()
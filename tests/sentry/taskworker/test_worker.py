@@ -1,4 +1,5 @@
 import base64
+import gc
 import queue
 import time
 from multiprocessing import Event
@@ -24,7 +25,7 @@ from sentry.taskworker.constants import CompressionType
 from sentry.taskworker.retry import NoRetriesRemainingError
 from sentry.taskworker.state import current_task
 from sentry.taskworker.worker import TaskWorker
-from sentry.taskworker.workerchild import ProcessingDeadlineExceeded, child_process
+from sentry.taskworker.workerchild import ProcessingDeadlineExceeded, child_process, preload_app
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.options import override_options
 from sentry.testutils.thread_leaks.pytest import thread_leak_allowlist
@@ -189,6 +190,120 @@ class TestTaskWorker(TestCase):
             mock_get.assert_called_once()
         assert task is None
 
+    def test_add_task_prefetched(self) -> None:
+        taskworker = TaskWorker(
+            app_module="sentry.taskworker.runtime:app",
+            broker_hosts=["127.0.0.1:50051"],
+            max_child_task_count=100,
+            process_type="fork",
+            child_tasks_queue_maxsize=2,
+            fetch_batch_size=3,
+        )
+        with mock.patch.object(taskworker.client, "get_tasks") as mock_get:
+            mock_get.return_value = [SIMPLE_TASK, RETRY_TASK, FAIL_TASK]
+
+            assert taskworker._add_task()
+            mock_get.assert_called_once_with(None, 2)
+            # The task that did not fit is handed out before fetching again
+            assert list(taskworker._prefetched) == [FAIL_TASK]
+
+            assert taskworker._child_tasks.get(timeout=1) == SIMPLE_TASK
+            assert taskworker._add_task()
+            assert mock_get.call_count == 1
+            assert not taskworker._prefetched
+
+        assert taskworker._child_tasks.get(timeout=1) == RETRY_TASK
+        assert taskworker._child_tasks.get(timeout=1) == FAIL_TASK
+
+    def test_add_task_prefetched_no_task(self) -> None:
+        taskworker = TaskWorker(
+            app_module="sentry.taskworker.runtime:app",
+            broker_hosts=["127.0.0.1:50051"],
+            max_child_task_count=100,
+            process_type="fork",
+            fetch_batch_size=3,
+        )
+        with mock.patch.object(taskworker.client, "get_tasks") as mock_get:
+            mock_get.return_value = []
+
+            assert not taskworker._add_task()
+            mock_get.assert_called_once()
+        assert taskworker._gettask_backoff_seconds == 1
+
+    def test_spawn_children_with_standby(self) -> None:
+        taskworker = TaskWorker(
+            app_module="sentry.taskworker.runtime:app",
+            broker_hosts=["127.0.0.1:50051"],
+            max_child_task_count=100,
+            process_type="fork",
+            standby_children=1,
+        )
+        taskworker.start_spawn_children_thread()
+        try:
+            start = time.time()
+            while len(taskworker._children) < 1 or len(taskworker._standby) < 1:
+                if time.time() - start > 5:
+                    raise AssertionError("Timeout waiting for children to be spawned")
+                time.sleep(0.1)
+
+            standby, standby_event = taskworker._standby[0]
+            assert not standby_event.is_set()
+
+            # An exited child is replaced by the standby child.
+            child = taskworker._children[0]
+            child.terminate()
+            child.join()
+            start = time.time()
+            while standby not in taskworker._children:
+                if time.time() - start > 5:
+                    raise AssertionError("Timeout waiting for standby child to be promoted")
+                time.sleep(0.1)
+            assert standby_event.is_set()
+        finally:
+            taskworker.shutdown()
+
+    def test_run_once_preloaded_with_standby(self) -> None:
+        max_runtime = 10
+        taskworker = TaskWorker(
+            app_module="sentry.taskworker.runtime:app",
+            broker_hosts=["127.0.0.1:50051"],
+            max_child_task_count=1,
+            process_type="fork",
+            preload=True,
+            standby_children=1,
+        )
+        with (
+            mock.patch.object(taskworker, "client") as mock_client,
+            mock.patch(
+                "sentry.taskworker.worker.preload_app", wraps=preload_app
+            ) as mock_preload_app,
+            # Closing connections would break the test transaction.
+            mock.patch("django.db.connections.close_all"),
+        ):
+            mock_client.get_task.return_value = SIMPLE_TASK
+            mock_client.update_task.return_value = None
+
+            try:
+                taskworker.preload()
+                mock_preload_app.assert_called_once_with("sentry.taskworker.runtime:app")
+
+                taskworker.start_result_thread()
+                taskworker.start_spawn_children_thread()
+                # Every child exits after one task, so the second task is run
+                # by a promoted standby child.
+                start = time.time()
+                while mock_client.update_task.call_count < 2:
+                    taskworker.run_once()
+                    if time.time() - start > max_runtime:
+                        raise AssertionError("Timeout waiting for update_task to be called")
+            finally:
+                taskworker.shutdown()
+                gc.unfreeze()
+
+            for call in mock_client.update_task.call_args_list:
+                assert call.args[0].task_id == SIMPLE_TASK.activation.id
+                assert call.args[0].status == TASK_ACTIVATION_STATUS_COMPLETE
+
     def test_run_once_no_next_task(self) -> None:
         max_runtime = 5
         taskworker = TaskWorker(
@@ -571,6 +686,56 @@ def test_child_process_shutdown() -> None:
     assert processed.qsize() == 0
 
 
+@pytest.mark.django_db
+def test_child_process_standby() -> None:
+    todo: queue.Queue[InflightTaskActivation] = queue.Queue()
+    processed: queue.Queue[ProcessingResult] = queue.Queue()
+    shutdown = Event()
+    standby = Event()
+    standby.set()
+
+    todo.put(SIMPLE_TASK)
+    child_process(
+        "sentry.taskworker.runtime:app",
+        todo,
+        processed,
+        shutdown,
+        max_task_count=1,
+        processing_pool_name="test",
+        process_type="fork",
+        standby_event=standby,
+    )
+
+    # Once activated, a standby child processes tasks like any other child.
+    assert todo.empty()
+    result = processed.get()
+    assert result.task_id == SIMPLE_TASK.activation.id
+    assert result.status == TASK_ACTIVATION_STATUS_COMPLETE
+
+
+def test_child_process_standby_shutdown() -> None:
+    todo: queue.Queue[InflightTaskActivation] = queue.Queue()
+    processed: queue.Queue[ProcessingResult] = queue.Queue()
+    shutdown = Event()
+    shutdown.set()
+
+    todo.put(SIMPLE_TASK)
+    child_process(
+        "sentry.taskworker.runtime:app",
+        todo,
+        processed,
+        shutdown,
+        max_task_count=1,
+        processing_pool_name="test",
+        process_type="fork",
+        standby_event=Event(),
+    )
+
+    # A standby child that is never activated doesn't process tasks.
+    assert todo.qsize() == 1
+    assert processed.qsize() == 0
+
+
 @pytest.mark.django_db
 def test_child_process_unknown_task() -> None:
     todo: queue.Queue[InflightTaskActivation] = queue.Queue()
@@ -1,9 +1,9 @@
 import itertools
 from datetime import datetime, timedelta, timezone
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from sentry.testutils.helpers.datetime import freeze_time
-from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, BaseTSDB
+from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, BaseTSDB, TSDBModel
 
 
 class BaseTSDBTest(TestCase):
@@ -37,6 +37,22 @@ class BaseTSDBTest(TestCase):
         assert len(post_results) == 1
         assert post_results[1] == [[1368889200, 15], [1368892800, 7]]
 
+    def test_get_range_matrix(self) -> None:
+        range_set = {
+            1: [(1368889980, 5), (1368890040, 10)],
+            2: [(1368890040, 7)],
+        }
+        start = datetime(2013, 5, 18, 15, 13, tzinfo=timezone.utc)
+        with mock.patch.object(self.tsdb, "get_range", return_value=range_set):
+            matrix = self.tsdb.get_range_matrix(
+                TSDBModel.project, [1, 2, 3], start, start + timedelta(minutes=1)
+            )
+
+        assert matrix.keys == [1, 2, 3]
+        assert matrix.series == [1368889980, 1368890040]
+        assert matrix.values == [[5, 10], [0, 7], [0, 0]]
+        assert matrix.sums() == {1: 15, 2: 7, 3: 0}
+
     def test_calculate_expiry(self) -> None:
         timestamp = datetime(2013, 5, 18, 15, 13, 58, 132928, tzinfo=timezone.utc)
         result = self.tsdb.calculate_expiry(10, 30, timestamp)
@@ -1,12 +1,13 @@
 from contextlib import contextmanager
 from datetime import datetime, timedelta, timezone
+from unittest import mock
 
 import pytest
 
 from sentry.testutils.cases import TestCase
 from sentry.testutils.helpers.options import override_options
 from sentry.tsdb.base import ONE_DAY, ONE_HOUR, ONE_MINUTE, TSDBModel
-from sentry.tsdb.redis import CountMinScript, RedisTSDB, SuppressionWrapper
+from sentry.tsdb.redis import CountMinScript, RedisTSDB, SuppressionWrapper, TSDBWriteCombiner
 from sentry.utils.dates import to_datetime
 
 
@@ -27,6 +28,59 @@ def test_suppression_wrapper() -> None:
         raise Exception("should not propagate")
 
 
+def test_write_combiner_merges_writes() -> None:
+    write = mock.Mock()
+    combiner = TSDBWriteCombiner(write)
+    cluster = (mock.sentinel.cluster, True)
+
+    combiner.add(cluster, {("ts:1:1:1", 1): 2}, {}, {"ts:1:1:1": ("ts:1:1:1", 10)}, 100, 60)
+    combiner.add(cluster, {("ts:1:1:1", 1): 3}, {}, {"ts:1:1:1": ("ts:1:1:1", 20)}, 100, 60)
+    combiner.add(cluster, {}, {"ts:300:1:1": (1, ["foo"])}, {}, 100, 60)
+    combiner.add(cluster, {}, {"ts:300:1:1": (1, ["foo", "bar"])}, {}, 100, 60)
+    assert len(combiner) == 3
+
+    combiner.flush()
+
+    ((written_cluster, writes),) = (call.args for call in write.mock_calls)
+    assert written_cluster is mock.sentinel.cluster
+    assert writes.counters == {("ts:1:1:1", 1): 5}
+    assert writes.distinct == {"ts:300:1:1": (1, {"foo", "bar"})}
+    assert writes.expiries == {"ts:1:1:1": ("ts:1:1:1", 20)}
+    assert len(combiner) == 0
+
+
+def test_write_combiner_retains_failed_writes() -> None:
+    write = mock.Mock(side_effect=Exception("Boom!"))
+    combiner = TSDBWriteCombiner(write)
+    cluster = (mock.sentinel.cluster, False)
+
+    # a failed flush keeps its writes, merged with those which arrived in the meantime
+    assert combiner.add(cluster, {("ts:1:1:1", 1): 1}, {}, {}, 1, 60)
+    assert write.call_count == 1
+    assert len(combiner) == 1
+    assert combiner.add(cluster, {("ts:1:1:1", 1): 2}, {}, {}, 1, 60)
+    assert len(combiner) == 1
+
+    write.side_effect = None
+    combiner.flush()
+    (_, writes) = write.call_args.args
+    assert writes.counters == {("ts:1:1:1", 1): 3}
+    assert len(combiner) == 0
+
+
+def test_write_combiner_refuses_writes_when_full() -> None:
+    write = mock.Mock(side_effect=Exception("Boom!"))
+    combiner = TSDBWriteCombiner(write)
+    cluster = (mock.sentinel.cluster, True)
+
+    for i in range(combiner.MAX_PENDING_FACTOR):
+        assert combiner.add(cluster, {("ts:1:1:1", i): 1}, {}, {}, 1, 60)
+
+    # the caller writes directly instead of the writes being dropped
+    assert not combiner.add(cluster, {}, {"ts:300:1:1": (1, ["foo"])}, {}, 1, 60)
+    assert len(combiner) == combiner.MAX_PENDING_FACTOR
+
+
 class RedisTSDBTest(TestCase):
     @override_options(
         {"redis.clusters": {"tsdb": {"hosts": {i - 6: {"db": i} for i in range(6, 9)}}}}
@@ -191,6 +245,64 @@ class RedisTSDBTest(TestCase):
         )
         assert sum_results == {1: 0, 2: 0}
 
+    def test_get_range_matrix(self) -> None:
+        now = datetime.now(timezone.utc) - timedelta(hours=4)
+        dts = [now + timedelta(hours=i) for i in range(4)]
+
+        # 1, 65 and 129 share a vnode, and so the hashes they are stored in
+        keys = [1, 65, 129, 2]
+        self.db.incr(TSDBModel.project, 1, dts[0])
+        self.db.incr(TSDBModel.project, 65, dts[0], count=2)
+        self.db.incr(TSDBModel.project, 65, dts[2], count=3)
+        self.db.incr(TSDBModel.project, 129, dts[3], count=4)
+        self.db.incr(TSDBModel.project, 1, dts[3], count=5, environment_id=1)
+
+        matrix = self.db.get_range_matrix(TSDBModel.project, keys + [1], dts[0], dts[-1])
+        assert matrix.keys == keys
+        assert matrix.series == [self.db.normalize_to_epoch(d, ONE_HOUR) for d in dts]
+        assert matrix.values == [
+            [1, 0, 0, 5],
+            [2, 0, 3, 0],
+            [0, 0, 0, 4],
+            [0, 0, 0, 0],
+        ]
+        assert matrix.sums() == {1: 6, 65: 5, 129: 4, 2: 0}
+        assert matrix.to_range() == self.db.get_range(TSDBModel.project, keys, dts[0], dts[-1])
+
+        matrix = self.db.get_range_matrix(
+            TSDBModel.project, keys, dts[0], dts[-1], environment_id=1
+        )
+        assert matrix.values == [[0, 0, 0, 5], [0] * 4, [0] * 4, [0] * 4]
+
+    def test_write_combiner(self) -> None:
+        now = datetime.now(timezone.utc)
+        start = now - timedelta(minutes=1)
+        model = TSDBModel.users_affected_by_group
+
+        with override_options(
+            {
+                "tsdb.write-combiner.max-entries": 1000,
+                "tsdb.write-combiner.flush-interval-ms": 60_000,
+            }
+        ):
+            self.db.incr_multi([(TSDBModel.project, 1), (TSDBModel.project, 2)], now, count=2)
+            self.db.incr(TSDBModel.project, 1, now, environment_id=1)
+            self.db.record(model, 1, ("foo", "bar"), now)
+            self.db.record_multi([(model, 1, ("bar", "baz"))], now)
+
+            # nothing is written until the combiner is flushed
+            assert self.db.get_timeseries_sums(TSDBModel.project, [1, 2], start, now) == {
+                1: 0,
+                2: 0,
+            }
+            self.db.flush_write_combiner()
+
+        assert self.db.get_timeseries_sums(TSDBModel.project, [1, 2], start, now) == {1: 3, 2: 2}
+        assert self.db.get_timeseries_sums(
+            TSDBModel.project, [1, 2], start, now, environment_id=1
+        ) == {1: 1, 2: 0}
+        assert self.db.get_distinct_counts_totals(model, [1], start, now) == {1: 3}
+
     def test_count_distinct(self) -> None:
         now = datetime.now(timezone.utc) - timedelta(hours=4)
         dts = [now + timedelta(hours=i) for i in range(4)]
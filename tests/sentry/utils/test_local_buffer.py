@@ -0,0 +1,84 @@
+import os
+import warnings
+from unittest import mock
+
+from sentry.utils.local_buffer import LocalWriteBuffer, flush_local_write_buffers
+
+
+class CounterBuffer(LocalWriteBuffer[str, dict[str, int]]):
+    def __init__(self) -> None:
+        super().__init__("test-buffer")
+        self.write = mock.Mock(return_value={})
+
+    def add(self, key: str, amount: int, max_size: int = 10) -> bool:
+        return self._add(key, {"amount": amount}, max_size, 60)
+
+    def _write(self, pending: dict[str, dict[str, int]]) -> dict[str, dict[str, int]]:
+        return self.write(dict(pending))
+
+    def _merge(self, pending: dict[str, int], newer: dict[str, int]) -> int:
+        pending["amount"] += newer["amount"]
+        return 0
+
+    def _size_of(self, pending: dict[str, int]) -> int:
+        return 1
+
+
+def test_merges_writes() -> None:
+    buffer = CounterBuffer()
+    assert buffer.add("a", 1)
+    assert buffer.add("a", 2)
+    assert buffer.add("b", 3)
+    assert len(buffer) == 2
+    assert not buffer.write.called
+
+    flush_local_write_buffers()
+
+    buffer.write.assert_called_once_with({"a": {"amount": 3}, "b": {"amount": 3}})
+    assert len(buffer) == 0
+
+
+def test_retains_failed_writes() -> None:
+    buffer = CounterBuffer()
+    buffer.add("a", 1)
+    buffer.add("b", 1)
+    buffer.write.return_value = {"a": {"amount": 1}}
+    buffer.flush()
+
+    # The failed write is merged with those which arrived in the meantime
+    buffer.write.return_value = {}
+    buffer.add("a", 2)
+    assert len(buffer) == 1
+    buffer.flush()
+    buffer.write.assert_called_with({"a": {"amount": 3}})
+
+
+def test_refuses_writes_when_full() -> None:
+    buffer = CounterBuffer()
+    buffer.write.side_effect = lambda pending: pending
+
+    for i in range(buffer.MAX_PENDING_FACTOR):
+        assert buffer.add(str(i), 1, max_size=1)
+    assert buffer.write.call_count == 1
+
+    # Once full, the caller writes directly instead of the write being dropped
+    assert not buffer.add("a", 1, max_size=1)
+    assert len(buffer) == buffer.MAX_PENDING_FACTOR
+
+
+def test_resets_after_fork() -> None:
+    buffer = CounterBuffer()
+    buffer.add("a", 1)
+
+    with buffer._lock, warnings.catch_warnings():
+        # Forking a multi-threaded process warns, the buffer's own flusher thread is running
+        warnings.simplefilter("ignore", DeprecationWarning)
+        pid = os.fork()
+        if pid == 0:
+            # The parent's pending writes and held lock aren't inherited
+            ok = len(buffer) == 0 and buffer.add("b", 1) and len(buffer) == 1
+            os._exit(0 if ok else 1)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert len(buffer) == 1
@@ -2,13 +2,18 @@ import unittest
 from unittest import mock
 
 from sentry.testutils.cases import TestCase
+from sentry.testutils.helpers import override_options
 from sentry.workflow_engine.models import DataConditionGroup
 from sentry.workflow_engine.models.data_condition import Condition, DataCondition
 from sentry.workflow_engine.processors.data_condition_group import (
+    ConditionGroupPlan,
+    ConditionSelectivity,
     ProcessedDataCondition,
     ProcessedDataConditionGroup,
     TriggerResult,
+    condition_group_plans,
     evaluate_data_conditions,
+    get_condition_group_plans,
     get_data_conditions_for_group,
     get_slow_conditions_for_groups,
     process_data_condition_group,
@@ -307,6 +312,19 @@ class TestEvaluateConditionGroupTypeAll(TestEvaluationConditionCase):
         )
         assert result == expected_result
 
+    def test_evaluate_data_conditions__stops_at_first_failure(self) -> None:
+        with mock.patch.object(
+            DataCondition, "evaluate_value", autospec=True, return_value=None
+        ) as mock_evaluate:
+            result = evaluate_data_conditions(
+                self.get_conditions_to_evaluate(1), self.data_condition_group.logic_type
+            )
+
+        assert result == ProcessedDataConditionGroup(
+            logic_result=TriggerResult.FALSE, condition_results=[]
+        )
+        assert mock_evaluate.call_count == 1
+
 
 class TestEvaluateConditionGroupTypeNone(TestEvaluationConditionCase):
     def setUp(self) -> None:
@@ -434,6 +452,108 @@ class TestEvaluateConditionGroupWithSlowConditions(TestCase):
         assert remaining_conditions == []
 
 
+class TestConditionGroupPlan(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        condition_group_plans.clear()
+        self.data_condition_group = self.create_data_condition_group(
+            logic_type=DataConditionGroup.Type.ANY_SHORT_CIRCUIT
+        )
+        self.rare_condition = self.create_data_condition(
+            type=Condition.GREATER,
+            comparison=100,
+            condition_result=True,
+            condition_group=self.data_condition_group,
+        )
+        self.common_condition = self.create_data_condition(
+            type=Condition.GREATER,
+            comparison=1,
+            condition_result=True,
+            condition_group=self.data_condition_group,
+        )
+        self.slow_condition = self.create_data_condition(
+            type=Condition.EVENT_FREQUENCY_COUNT,
+            comparison={"interval": "1d", "value": 7},
+            condition_result=True,
+            condition_group=self.data_condition_group,
+        )
+        self.conditions = [self.rare_condition, self.common_condition, self.slow_condition]
+        self.selectivity = ConditionSelectivity()
+        for _ in range(10):
+            self.selectivity.record(self.rare_condition.id, False)
+            self.selectivity.record(self.common_condition.id, True)
+
+    def compile(self, logic_type: DataConditionGroup.Type) -> ConditionGroupPlan:
+        return ConditionGroupPlan.compile(
+            self.data_condition_group.id, 1, logic_type, self.conditions, self.selectivity
+        )
+
+    def test_compile__orders_by_selectivity(self) -> None:
+        plan = self.compile(DataConditionGroup.Type.ANY_SHORT_CIRCUIT)
+        assert plan.fast_conditions == (self.common_condition, self.rare_condition)
+        assert plan.slow_conditions == (self.slow_condition,)
+
+        plan = self.compile(DataConditionGroup.Type.ALL)
+        assert plan.fast_conditions == (self.rare_condition, self.common_condition)
+
+        plan = self.compile(DataConditionGroup.Type.ANY)
+        assert plan.fast_conditions == (self.rare_condition, self.common_condition)
+
+    def test_compile__keeps_order_with_different_results(self) -> None:
+        self.common_condition.condition_result = DetectorPriorityLevel.HIGH
+        plan = self.compile(DataConditionGroup.Type.ANY_SHORT_CIRCUIT)
+        assert plan.fast_conditions == (self.rare_condition, self.common_condition)
+
+    def test_in_original_order(self) -> None:
+        plan = self.compile(DataConditionGroup.Type.ALL)
+        results = [
+            ProcessedDataCondition(logic_result=TRUE, condition=condition, result=True)
+            for condition in plan.fast_conditions
+        ]
+        assert [r.condition for r in plan.in_original_order(results)] == [
+            self.rare_condition,
+            self.common_condition,
+        ]
+
+    def test_get_condition_group_plans__disabled(self) -> None:
+        assert get_condition_group_plans([self.data_condition_group.id]) == {}
+
+    @override_options({"workflow_engine.condition_group_plans.enabled": True})
+    def test_get_condition_group_plans__cached(self) -> None:
+        plan = get_condition_group_plans([self.data_condition_group.id])[
+            self.data_condition_group.id
+        ]
+        assert plan.slow_conditions == (self.slow_condition,)
+
+        with mock.patch(
+            "sentry.workflow_engine.processors.data_condition_group.get_data_conditions_for_group"
+        ) as mock_fetch_conditions:
+            assert get_condition_group_plans([self.data_condition_group.id]) == {
+                self.data_condition_group.id: plan
+            }
+            mock_fetch_conditions.batch.assert_not_called()
+
+    @override_options({"workflow_engine.condition_group_plans.enabled": True})
+    def test_get_condition_group_plans__invalidated(self) -> None:
+        get_condition_group_plans([self.data_condition_group.id])
+        self.slow_condition.delete()
+
+        plan = get_condition_group_plans([self.data_condition_group.id])[
+            self.data_condition_group.id
+        ]
+        assert plan.slow_conditions == ()
+
+    @override_options({"workflow_engine.condition_group_plans.enabled": True})
+    def test_process_data_condition_group__with_plan(self) -> None:
+        group_evaluation, remaining_conditions = process_data_condition_group(
+            self.data_condition_group, 10
+        )
+
+        assert group_evaluation.logic_result == TriggerResult.TRUE
+        assert [r.condition for r in group_evaluation.condition_results] == [self.common_condition]
+        assert remaining_conditions == []
+
+
 class TestGetSlowConditionsForGroups(TestCase):
     def setUp(self) -> None:
         super().setUp()
@@ -19,6 +19,9 @@ from sentry.types.activity import ActivityType
 from sentry.utils import json
 from sentry.utils.cache import cache
 from sentry.workflow_engine.buffer.batch_client import DelayedWorkflowClient, DelayedWorkflowItem
+from sentry.workflow_engine.endpoints.validators.detector_workflow import (
+    perform_bulk_detector_workflow_operations,
+)
 from sentry.workflow_engine.models import (
     Action,
     DataConditionGroup,
@@ -33,6 +36,7 @@ from sentry.workflow_engine.processors.contexts.workflow_event_context import (
 )
 from sentry.workflow_engine.processors.data_condition_group import get_data_conditions_for_group
 from sentry.workflow_engine.processors.workflow import (
+    _get_associated_workflows,
     delete_workflow,
     enqueue_workflows,
     evaluate_workflow_triggers,
@@ -481,6 +485,82 @@ class TestProcessWorkflows(BaseWorkflowTest):
         assert result.data.associated_detector == self.error_detector
 
 
+@override_options({"workflow_engine.workflow_graph_cache.enabled": True})
+class TestWorkflowGraphCache(BaseWorkflowTest):
+    def setUp(self) -> None:
+        self.workflow, self.detector, _, _ = self.create_detector_and_workflow(
+            detector_type=ErrorGroupType.slug
+        )
+        self.environment = self.create_environment(project=self.project)
+        self.env_workflow = self.create_workflow(environment=self.environment)
+        self.create_detector_workflow(detector=self.detector, workflow=self.env_workflow)
+        self.other_env_workflow = self.create_workflow(
+            environment=self.create_environment(project=self.project)
+        )
+        self.create_detector_workflow(detector=self.detector, workflow=self.other_env_workflow)
+
+        group, _, group_event = self.create_group_event()
+        self.event_data = WorkflowEventData(event=group_event, group=group)
+
+    def get_workflows(self, environment: Environment | None = None) -> set[Workflow]:
+        return _get_associated_workflows(self.detector, environment, self.event_data)
+
+    def test_environments(self) -> None:
+        assert self.get_workflows() == {self.workflow}
+        assert self.get_workflows(self.environment) == {self.workflow, self.env_workflow}
+
+    def test_graph_is_invalidated(self) -> None:
+        assert self.get_workflows() == {self.workflow}
+
+        new_workflow = self.create_workflow()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_detector_workflow(detector=self.detector, workflow=new_workflow)
+        assert self.get_workflows() == {self.workflow, new_workflow}
+
+        self.workflow.enabled = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.workflow.save()
+        assert self.get_workflows() == {new_workflow}
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.detector.delete()
+        assert self.get_workflows() == set()
+
+    def test_graph_is_invalidated_on_commit(self) -> None:
+        assert self.get_workflows() == {self.workflow}
+
+        new_workflow = self.create_workflow()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_detector_workflow(detector=self.detector, workflow=new_workflow)
+            # The cached graph is only cleared once the change is committed
+            assert self.get_workflows() == {self.workflow}
+
+        assert self.get_workflows() == {self.workflow, new_workflow}
+
+    @patch("sentry.workflow_engine.endpoints.validators.detector_workflow.create_audit_entry")
+    def test_graph_is_invalidated_after_bulk_create(self, mock_audit: MagicMock) -> None:
+        assert self.get_workflows() == {self.workflow}
+
+        new_workflow = self.create_workflow()
+        with self.captureOnCommitCallbacks(execute=True):
+            perform_bulk_detector_workflow_operations(
+                [{"detector_id": self.detector.id, "workflow_id": new_workflow.id}],
+                [],
+                request=MagicMock(),
+                organization=self.organization,
+            )
+
+        assert self.get_workflows() == {self.workflow, new_workflow}
+
+    def test_process_workflows__workflow_graph_cache(self) -> None:
+        self.create_detector(project=self.project, type=IssueStreamGroupType.slug)
+        group, _, group_event = self.create_group_event(environment=self.environment.name)
+        event_data = WorkflowEventData(event=group_event, group=group)
+
+        result = process_workflows(DelayedWorkflowClient(), event_data, FROZEN_TIME)
+        assert result.data.workflows == {self.workflow, self.env_workflow}
+
+
 class TestEvaluateWorkflowTriggers(BaseWorkflowTest):
     def setUp(self) -> None:
         (